@@ -12,7 +12,7 @@ import chainer.links as L
 from chainer import Chain
 from functools import partial
 from chainer.serializers import load_npz
-from .common import SimpleSequential, conv1x1_block, conv3x3_block
+from .common import SimpleSequential, conv1x1_block, conv3x3_block, GlobalAvgPool2D
 
 
 class AirBlock(Chain):
@@ -263,10 +263,7 @@ class AirNet(Chain):
                                 ratio=ratio))
                             in_channels = out_channels
                     setattr(self.features, "stage{}".format(i + 1), stage)
-                setattr(self.features, "final_pool", partial(
-                    F.average_pooling_2d,
-                    ksize=7,
-                    stride=1))
+                setattr(self.features, "final_pool", GlobalAvgPool2D())
 
             self.output = SimpleSequential()
             with self.output.init_scope():
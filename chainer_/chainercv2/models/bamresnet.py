@@ -11,7 +11,7 @@ import chainer.links as L
 from chainer import Chain
 from functools import partial
 from chainer.serializers import load_npz
-from .common import SimpleSequential, conv1x1, conv1x1_block, conv3x3_block
+from .common import SimpleSequential, conv1x1, conv1x1_block, conv3x3_block, GlobalAvgPool2D
 from .resnet import ResInitBlock, ResUnit
 
 
@@ -258,10 +258,7 @@ class BamResNet(Chain):
                                 bottleneck=bottleneck))
                             in_channels = out_channels
                     setattr(self.features, "stage{}".format(i + 1), stage)
-                setattr(self.features, 'final_pool', partial(
-                    F.average_pooling_2d,
-                    ksize=7,
-                    stride=1))
+                setattr(self.features, 'final_pool', GlobalAvgPool2D())
 
             self.output = SimpleSequential()
             with self.output.init_scope():
@@ -12,7 +12,7 @@ import chainer.links as L
 from chainer import Chain
 from functools import partial
 from chainer.serializers import load_npz
-from .common import conv1x1_block, conv3x3_block, conv7x7_block, Concurrent, SimpleSequential
+from .common import conv1x1_block, conv3x3_block, conv7x7_block, Concurrent, SimpleSequential, GlobalAvgPool2D
 
 
 class Inception3x3Branch(Chain):
@@ -351,10 +351,7 @@ class BNInception(Chain):
                                     avg_pool=avg_pool))
                             in_channels = out_channels
                     setattr(self.features, "stage{}".format(i + 1), stage)
-                setattr(self.features, "final_pool", partial(
-                    F.average_pooling_2d,
-                    ksize=7,
-                    stride=1))
+                setattr(self.features, "final_pool", GlobalAvgPool2D())
 
             self.output = SimpleSequential()
             with self.output.init_scope():
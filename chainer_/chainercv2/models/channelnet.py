@@ -12,7 +12,7 @@ import chainer.links as L
 from chainer import Chain
 from functools import partial
 from chainer.serializers import load_npz
-from .common import SimpleSequential, ReLU6
+from .common import SimpleSequential, ReLU6, GlobalAvgPool2D
 
 
 def dwconv3x3(in_channels,
@@ -502,10 +502,7 @@ class ChannelNet(Chain):
                             else:
                                 in_channels = out_channels[-1]
                     setattr(self.features, "stage{}".format(i + 1), stage)
-                setattr(self.features, 'final_pool', partial(
-                    F.average_pooling_2d,
-                    ksize=7,
-                    stride=1))
+                setattr(self.features, 'final_pool', GlobalAvgPool2D())
 
             self.output = SimpleSequential()
             with self.output.init_scope():
@@ -2,13 +2,14 @@
     Common routines for models in Chainer.
 """
 
-__all__ = ['ReLU6', 'conv1x1', 'conv3x3', 'depthwise_conv3x3', 'ConvBlock', 'conv1x1_block', 'conv3x3_block',
-           'conv7x7_block', 'dwconv3x3_block', 'PreConvBlock', 'pre_conv1x1_block', 'pre_conv3x3_block',
-           'ChannelShuffle', 'ChannelShuffle2', 'SEBlock', 'SimpleSequential', 'DualPathSequential', 'Concurrent',
-           'ParametricSequential', 'ParametricConcurrent', 'Hourglass', 'SesquialteralHourglass']
+__all__ = ['ReLU6', 'GlobalAvgPool2D', 'conv1x1', 'conv3x3', 'depthwise_conv3x3', 'ConvBlock', 'conv1x1_block',
+           'conv3x3_block', 'conv7x7_block', 'dwconv3x3_block', 'PreConvBlock', 'pre_conv1x1_block',
+           'pre_conv3x3_block', 'ChannelShuffle', 'ChannelShuffle2', 'SEBlock', 'SimpleSequential', 'DualPathSequential',
+           'Concurrent', 'ParametricSequential', 'ParametricConcurrent', 'Hourglass', 'SesquialteralHourglass',
+           'StaticGraphModel']
 
 from inspect import isfunction
-from chainer import Chain
+from chainer import Chain, static_graph
 import chainer.functions as F
 import chainer.links as L
 
@@ -24,6 +25,17 @@ class ReLU6(Chain):
         return F.clip(x, 0.0, 6.0)
 
 
+class GlobalAvgPool2D(Chain):
+    """
+    Global average pooling layer (the window covers the whole input, so the model accepts any input size).
+    """
+    def __init__(self):
+        super(GlobalAvgPool2D, self).__init__()
+
+    def __call__(self, x):
+        return F.average_pooling_2d(x, ksize=x.shape[2:])
+
+
 def conv1x1(in_channels,
             out_channels,
             stride=1,
@@ -888,3 +900,25 @@ class SesquialteralHourglass(Chain):
             y = skip2_outs[self.depth - 1 - i]
             x = self._merge(x, y)
         return x
+
+
+class StaticGraphModel(Chain):
+    """
+    Static-graph wrapper for a model. The first call for an input shape (and a train/test mode) runs the model
+    define-by-run and records the schedule of functions, next calls replay it without executing the Python code of the
+    model blocks. Therefore all array computations of the model should be done by Chainer functions (not on raw
+    arrays). Output arrays are reused by next calls, so they should be copied if retained.
+
+    Parameters:
+    ----------
+    model : Chain
+        Wrapped model.
+    """
+    def __init__(self, model):
+        super(StaticGraphModel, self).__init__()
+        with self.init_scope():
+            self.model = model
+
+    @static_graph
+    def __call__(self, x):
+        return self.model(x)
@@ -14,7 +14,7 @@ from chainer import initializers
 from chainer import Chain
 from functools import partial
 from chainer.serializers import load_npz
-from .common import SimpleSequential, ChannelShuffle
+from .common import SimpleSequential, ChannelShuffle, GlobalAvgPool2D
 
 
 class CondenseSimpleConv(Chain):
@@ -137,7 +137,7 @@ class CondenseComplexConv(Chain):
             self.register_persistent('index')
 
     def __call__(self, x):
-        x = self.xp.take(x.array, self.index, axis=1)
+        x = F.get_item(x, (slice(None), self.index))
         x = self.bn(x)
         x = self.activ(x)
         x = self.conv(x)
@@ -311,7 +311,7 @@ class CondenseLinear(Chain):
             self.register_persistent('index')
 
     def __call__(self, x):
-        x = self.xp.take(x.array, self.index, axis=1)
+        x = F.get_item(x, (slice(None), self.index))
         x = self.dense(x)
         return x
 
@@ -368,10 +368,7 @@ class CondenseNet(Chain):
                     setattr(self.features, "stage{}".format(i + 1), stage)
                 setattr(self.features, 'post_activ', PostActivation(
                     in_channels=in_channels))
-                setattr(self.features, 'final_pool', partial(
-                    F.average_pooling_2d,
-                    ksize=7,
-                    stride=1))
+                setattr(self.features, 'final_pool', GlobalAvgPool2D())
 
             self.output = SimpleSequential()
             with self.output.init_scope():
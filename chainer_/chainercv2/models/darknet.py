@@ -11,7 +11,7 @@ import chainer.links as L
 from chainer import Chain
 from functools import partial
 from chainer.serializers import load_npz
-from .common import conv1x1_block, conv3x3_block, SimpleSequential
+from .common import conv1x1_block, conv3x3_block, SimpleSequential, GlobalAvgPool2D
 
 
 def dark_convYxY(in_channels,
@@ -58,8 +58,6 @@ class DarkNet(Chain):
         Number of output channels for each unit.
     odd_pointwise : bool
         Whether pointwise convolution layer is used for each odd unit.
-    avg_pool_size : int
-        Window size of the final average pooling.
     cls_activ : bool
         Whether classification convolution layer uses an activation.
     alpha : float, default 0.1
@@ -74,7 +72,6 @@ class DarkNet(Chain):
     def __init__(self,
                  channels,
                  odd_pointwise,
-                 avg_pool_size,
                  cls_activ,
                  alpha=0.1,
                  in_channels=3,
@@ -115,10 +112,7 @@ class DarkNet(Chain):
                     setattr(self.output, 'final_activ', partial(
                         F.leaky_relu,
                         slope=alpha))
-                setattr(self.output, 'final_pool', partial(
-                    F.average_pooling_2d,
-                    ksize=avg_pool_size,
-                    stride=1))
+                setattr(self.output, 'final_pool', GlobalAvgPool2D())
                 setattr(self.output, 'final_flatten', partial(
                     F.reshape,
                     shape=(-1, classes)))
@@ -152,18 +146,15 @@ def get_darknet(version,
     if version == 'ref':
         channels = [[16], [32], [64], [128], [256], [512], [1024]]
         odd_pointwise = False
-        avg_pool_size = 3
         cls_activ = True
     elif version == 'tiny':
         channels = [[16], [32], [16, 128, 16, 128], [32, 256, 32, 256], [64, 512, 64, 512, 128]]
         odd_pointwise = True
-        avg_pool_size = 14
         cls_activ = False
     elif version == '19':
         channels = [[32], [64], [128, 64, 128], [256, 128, 256], [512, 256, 512, 256, 512],
                     [1024, 512, 1024, 512, 1024]]
         odd_pointwise = False
-        avg_pool_size = 7
         cls_activ = False
     else:
         raise ValueError("Unsupported DarkNet version {}".format(version))
@@ -171,7 +162,6 @@ def get_darknet(version,
     net = DarkNet(
         channels=channels,
         odd_pointwise=odd_pointwise,
-        avg_pool_size=avg_pool_size,
         cls_activ=cls_activ,
         **kwargs)
 
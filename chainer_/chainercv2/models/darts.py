@@ -11,7 +11,7 @@ import chainer.links as L
 from chainer import Chain
 from functools import partial
 from chainer.serializers import load_npz
-from .common import conv1x1, SimpleSequential
+from .common import conv1x1, SimpleSequential, GlobalAvgPool2D
 from .nasnet import nasnet_dual_path_sequential
 
 
@@ -613,10 +613,7 @@ class DARTS(Chain):
                             prev_in_channels = in_channels
                             in_channels = out_channels
                     setattr(self.features, "stage{}".format(i + 1), stage)
-                setattr(self.features, 'final_pool', partial(
-                    F.average_pooling_2d,
-                    ksize=7,
-                    stride=1))
+                setattr(self.features, 'final_pool', GlobalAvgPool2D())
 
             self.output = SimpleSequential()
             with self.output.init_scope():
@@ -12,7 +12,7 @@ import chainer.links as L
 from chainer import Chain
 from functools import partial
 from chainer.serializers import load_npz
-from .common import SimpleSequential
+from .common import SimpleSequential, GlobalAvgPool2D
 
 
 class DiracConv(Chain):
@@ -163,10 +163,7 @@ class DiracNetV2(Chain):
                                 pad=0))
                     setattr(self.features, "stage{}".format(i + 1), stage)
                 setattr(self.features, "final_activ", F.relu)
-                setattr(self.features, 'final_pool', partial(
-                    F.average_pooling_2d,
-                    ksize=7,
-                    stride=1))
+                setattr(self.features, 'final_pool', GlobalAvgPool2D())
 
             self.output = SimpleSequential()
             with self.output.init_scope():
@@ -10,7 +10,7 @@ import chainer.functions as F
 from chainer import Chain
 from functools import partial
 from chainer.serializers import load_npz
-from .common import conv1x1, conv1x1_block, conv3x3_block, conv7x7_block, SimpleSequential
+from .common import conv1x1, conv1x1_block, conv3x3_block, conv7x7_block, SimpleSequential, GlobalAvgPool2D
 from .resnet import ResBlock, ResBottleneck
 from .resnext import ResNeXtBottleneck
 
@@ -372,10 +372,7 @@ class DLA(Chain):
                         first_tree=first_tree))
                     in_channels = out_channels
 
-                setattr(self.features, "final_pool", partial(
-                    F.average_pooling_2d,
-                    ksize=7,
-                    stride=1))
+                setattr(self.features, "final_pool", GlobalAvgPool2D())
 
             self.output = SimpleSequential()
             with self.output.init_scope():
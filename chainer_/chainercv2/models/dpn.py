@@ -11,34 +11,42 @@ import chainer.links as L
 from chainer import Chain
 from functools import partial
 from chainer.serializers import load_npz
-from .common import conv1x1, SimpleSequential, DualPathSequential
+from .common import conv1x1, GlobalAvgPool2D, SimpleSequential, DualPathSequential
 
 
-class GlobalAvgPool2D(Chain):
+class GlobalAvgMaxPool2D(Chain):
     """
-    Global average pooling operation for spatial data.
+    Global average+max pooling operation for spatial data.
     """
     def __init__(self):
-        super(GlobalAvgPool2D, self).__init__()
+        super(GlobalAvgMaxPool2D, self).__init__()
 
     def __call__(self, x):
         batch, channels, height, width = x.shape
-        x = F.average_pooling_2d(x, ksize=(height, width))
+        x_avg = F.average_pooling_2d(x, ksize=(height, width))
+        x_max = F.max_pooling_2d(x, ksize=(height, width), cover_all=False)
+        x = 0.5 * (x_avg + x_max)
         return x
 
 
-class GlobalAvgMaxPool2D(Chain):
+class TestTimeAvgPool2D(Chain):
     """
-    Global average+max pooling operation for spatial data.
+    Average pooling with a fixed window for test-time pooling. The window is shrunk for smaller inputs, so that the
+    pooling works at any resolution.
+
+    Parameters:
+    ----------
+    ksize : int, default 7
+        Size of the pooling window.
     """
-    def __init__(self):
-        super(GlobalAvgMaxPool2D, self).__init__()
+    def __init__(self,
+                 ksize=7):
+        super(TestTimeAvgPool2D, self).__init__()
+        self.ksize = ksize
 
     def __call__(self, x):
         batch, channels, height, width = x.shape
-        x_avg = F.average_pooling_2d(x, ksize=(height, width))
-        x_max = F.max_pooling_2d(x, ksize=(height, width), cover_all=False)
-        x = 0.5 * (x_avg + x_max)
+        x = F.average_pooling_2d(x, ksize=(min(self.ksize, height), min(self.ksize, width)), stride=1)
         return x
 
 
@@ -434,10 +442,7 @@ class DPN(Chain):
                         F.reshape,
                         shape=(-1, classes)))
                 else:
-                    setattr(self.output, 'avg_pool', partial(
-                        F.average_pooling_2d,
-                        ksize=7,
-                        stride=1))
+                    setattr(self.output, 'avg_pool', TestTimeAvgPool2D(ksize=7))
                     setattr(self.output, 'final_conv', conv1x1(
                         in_channels=in_channels,
                         out_channels=classes,
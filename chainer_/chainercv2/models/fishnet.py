@@ -12,7 +12,8 @@ import chainer.links as L
 from chainer import Chain
 from functools import partial
 from chainer.serializers import load_npz
-from .common import pre_conv1x1_block, pre_conv3x3_block, conv1x1, SesquialteralHourglass, SimpleSequential
+from .common import pre_conv1x1_block, pre_conv3x3_block, conv1x1, SesquialteralHourglass, SimpleSequential,\
+    GlobalAvgPool2D
 from .preresnet import PreResActivation
 from .senet import SEInitBlock
 
@@ -514,10 +515,7 @@ class FishNet(Chain):
                     down2_seq=down2_seq))
                 setattr(self.features, "final_block", FishFinalBlock(in_channels=in_channels))
                 in_channels = in_channels // 2
-                setattr(self.features, "final_pool", partial(
-                    F.average_pooling_2d,
-                    ksize=7,
-                    stride=1))
+                setattr(self.features, "final_pool", GlobalAvgPool2D())
 
             self.output = SimpleSequential()
             with self.output.init_scope():
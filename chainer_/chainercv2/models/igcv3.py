@@ -12,7 +12,7 @@ import chainer.links as L
 from chainer import Chain
 from functools import partial
 from chainer.serializers import load_npz
-from .common import conv1x1_block, conv3x3_block, dwconv3x3_block, ChannelShuffle, SimpleSequential
+from .common import conv1x1_block, conv3x3_block, dwconv3x3_block, ChannelShuffle, SimpleSequential, GlobalAvgPool2D
 
 
 class InvResUnit(Chain):
@@ -132,10 +132,7 @@ class IGCV3(Chain):
                     out_channels=final_block_channels,
                     activation="relu6"))
                 in_channels = final_block_channels
-                setattr(self.features, 'final_pool', partial(
-                    F.average_pooling_2d,
-                    ksize=7,
-                    stride=1))
+                setattr(self.features, 'final_pool', GlobalAvgPool2D())
 
             self.output = SimpleSequential()
             with self.output.init_scope():
@@ -12,7 +12,7 @@ import chainer.links as L
 from chainer import Chain
 from functools import partial
 from chainer.serializers import load_npz
-from .common import conv1x1, SimpleSequential, Concurrent
+from .common import conv1x1, SimpleSequential, Concurrent, GlobalAvgPool2D
 
 
 class InceptConv(Chain):
@@ -549,10 +549,7 @@ class InceptionResNetV2(Chain):
                 setattr(self.features, 'final_conv', incept_conv1x1(
                     in_channels=2080,
                     out_channels=1536))
-                setattr(self.features, 'final_pool', partial(
-                    F.average_pooling_2d,
-                    ksize=8,
-                    stride=1))
+                setattr(self.features, 'final_pool', GlobalAvgPool2D())
 
             in_channels = 1536
             self.output = SimpleSequential()
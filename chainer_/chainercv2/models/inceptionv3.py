@@ -12,7 +12,7 @@ import chainer.links as L
 from chainer import Chain
 from functools import partial
 from chainer.serializers import load_npz
-from .common import SimpleSequential, Concurrent
+from .common import SimpleSequential, Concurrent, GlobalAvgPool2D
 
 
 class InceptConv(Chain):
@@ -610,10 +610,7 @@ class InceptionV3(Chain):
                             in_channels = out_channels
                     setattr(self.features, "stage{}".format(i + 1), stage)
 
-                setattr(self.features, 'final_pool', partial(
-                    F.average_pooling_2d,
-                    ksize=8,
-                    stride=1))
+                setattr(self.features, 'final_pool', GlobalAvgPool2D())
 
             self.output = SimpleSequential()
             with self.output.init_scope():
@@ -12,7 +12,7 @@ import chainer.links as L
 from chainer import Chain
 from functools import partial
 from chainer.serializers import load_npz
-from .common import SimpleSequential, Concurrent
+from .common import SimpleSequential, Concurrent, GlobalAvgPool2D
 
 
 class InceptConv(Chain):
@@ -637,10 +637,7 @@ class InceptionV4(Chain):
                             setattr(stage, "unit{}".format(j + 1), unit())
                     setattr(self.features, "stage{}".format(i + 1), stage)
 
-                setattr(self.features, 'final_pool', partial(
-                    F.average_pooling_2d,
-                    ksize=8,
-                    stride=1))
+                setattr(self.features, 'final_pool', GlobalAvgPool2D())
 
             in_channels = 1536
             self.output = SimpleSequential()
@@ -11,7 +11,7 @@ import chainer.links as L
 from chainer import Chain
 from functools import partial
 from chainer.serializers import load_npz
-from .common import SimpleSequential
+from .common import SimpleSequential, GlobalAvgPool2D
 
 
 class ConvBlock(Chain):
@@ -310,10 +310,7 @@ class MnasNet(Chain):
                     out_channels=final_block_channels,
                     activate=True))
                 in_channels = final_block_channels
-                setattr(self.features, 'final_pool', partial(
-                    F.average_pooling_2d,
-                    ksize=7,
-                    stride=1))
+                setattr(self.features, 'final_pool', GlobalAvgPool2D())
 
             self.output = SimpleSequential()
             with self.output.init_scope():
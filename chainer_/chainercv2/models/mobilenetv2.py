@@ -10,7 +10,7 @@ import chainer.functions as F
 from chainer import Chain
 from functools import partial
 from chainer.serializers import load_npz
-from .common import ReLU6, conv1x1, conv1x1_block, conv3x3_block, dwconv3x3_block, SimpleSequential
+from .common import ReLU6, conv1x1, conv1x1_block, conv3x3_block, dwconv3x3_block, SimpleSequential, GlobalAvgPool2D
 
 
 class LinearBottleneck(Chain):
@@ -121,10 +121,7 @@ class MobileNetV2(Chain):
                     out_channels=final_block_channels,
                     activation=ReLU6()))
                 in_channels = final_block_channels
-                setattr(self.features, 'final_pool', partial(
-                    F.average_pooling_2d,
-                    ksize=7,
-                    stride=1))
+                setattr(self.features, 'final_pool', GlobalAvgPool2D())
 
             self.output = SimpleSequential()
             with self.output.init_scope():
@@ -12,7 +12,7 @@ import chainer.links as L
 from chainer import Chain
 from functools import partial
 from chainer.serializers import load_npz
-from .common import conv1x1, SimpleSequential, DualPathSequential
+from .common import conv1x1, SimpleSequential, DualPathSequential, GlobalAvgPool2D
 
 
 class NasDualPathScheme(object):
@@ -1082,8 +1082,6 @@ class NASNet(Chain):
         Number of output channels for the initial unit.
     stem_blocks_channels : list of 2 int
         Number of output channels for the Stem units.
-    final_pool_size : int
-        Size of the pooling windows for final pool.
     extra_padding : bool
         Whether to use extra padding.
     skip_reduction_layer_input : bool
@@ -1099,7 +1097,6 @@ class NASNet(Chain):
                  channels,
                  init_block_channels,
                  stem_blocks_channels,
-                 final_pool_size,
                  extra_padding,
                  skip_reduction_layer_input,
                  in_channels=3,
@@ -1163,10 +1160,7 @@ class NASNet(Chain):
                     setattr(self.features, "stage{}".format(i + 1), stage)
 
                 setattr(self.features, "final_activ", F.relu)
-                setattr(self.features, 'final_pool', partial(
-                    F.average_pooling_2d,
-                    ksize=final_pool_size,
-                    stride=1))
+                setattr(self.features, 'final_pool', GlobalAvgPool2D())
 
             self.output = SimpleSequential()
             with self.output.init_scope():
@@ -1189,7 +1183,6 @@ class NASNet(Chain):
 def get_nasnet(repeat,
                penultimate_filters,
                init_block_channels,
-               final_pool_size,
                extra_padding,
                skip_reduction_layer_input,
                in_size,
@@ -1208,8 +1201,6 @@ def get_nasnet(repeat,
         Number of filters in the penultimate layer of the network.
     init_block_channels : int
         Number of output channels for the initial unit.
-    final_pool_size : int
-        Size of the pooling windows for final pool.
     extra_padding : bool
         Whether to use extra padding.
     skip_reduction_layer_input : bool
@@ -1237,7 +1228,6 @@ def get_nasnet(repeat,
         channels=channels,
         init_block_channels=init_block_channels,
         stem_blocks_channels=stem_blocks_channels,
-        final_pool_size=final_pool_size,
         extra_padding=extra_padding,
         skip_reduction_layer_input=skip_reduction_layer_input,
         in_size=in_size,
@@ -1272,7 +1262,6 @@ def nasnet_4a1056(**kwargs):
         repeat=4,
         penultimate_filters=1056,
         init_block_channels=32,
-        final_pool_size=7,
         extra_padding=True,
         skip_reduction_layer_input=False,
         in_size=(224, 224),
@@ -1296,7 +1285,6 @@ def nasnet_6a4032(**kwargs):
         repeat=6,
         penultimate_filters=4032,
         init_block_channels=96,
-        final_pool_size=11,
         extra_padding=False,
         skip_reduction_layer_input=True,
         in_size=(331, 331),
@@ -11,7 +11,7 @@ import chainer.links as L
 from chainer import Chain
 from functools import partial
 from chainer.serializers import load_npz
-from .common import SimpleSequential
+from .common import SimpleSequential, GlobalAvgPool2D
 
 
 class NINConv(Chain):
@@ -122,10 +122,7 @@ class CIFARNIN(Chain):
                     in_channels=in_channels,
                     out_channels=classes,
                     ksize=1))
-                setattr(self.output, 'final_pool', partial(
-                    F.average_pooling_2d,
-                    ksize=8,
-                    stride=1))
+                setattr(self.output, 'final_pool', GlobalAvgPool2D())
                 setattr(self.output, "final_flatten", partial(
                     F.reshape,
                     shape=(-1, classes)))
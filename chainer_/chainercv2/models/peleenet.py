@@ -11,7 +11,7 @@ import chainer.links as L
 from chainer import Chain
 from functools import partial
 from chainer.serializers import load_npz
-from .common import conv1x1_block, conv3x3_block, Concurrent, SimpleSequential
+from .common import conv1x1_block, conv3x3_block, Concurrent, SimpleSequential, GlobalAvgPool2D
 
 
 class PeleeBranch1(Chain):
@@ -266,10 +266,7 @@ class PeleeNet(Chain):
                 setattr(self.features, "final_block", conv1x1_block(
                     in_channels=in_channels,
                     out_channels=in_channels))
-                setattr(self.features, "final_pool", partial(
-                    F.average_pooling_2d,
-                    ksize=7,
-                    stride=1))
+                setattr(self.features, "final_pool", GlobalAvgPool2D())
 
             self.output = SimpleSequential()
             with self.output.init_scope():
@@ -12,7 +12,7 @@ import chainer.links as L
 from chainer import Chain
 from functools import partial
 from chainer.serializers import load_npz
-from .common import conv1x1, SimpleSequential
+from .common import conv1x1, SimpleSequential, GlobalAvgPool2D
 from .nasnet import nasnet_dual_path_sequential, nasnet_batch_norm, NasConv, NasDwsConv, NasPathBlock, NASNetInitBlock,\
     process_with_padding
 
@@ -495,10 +495,7 @@ class PNASNet(Chain):
                     setattr(self.features, "stage{}".format(i + 1), stage)
 
                 setattr(self.features, "final_activ", F.relu)
-                setattr(self.features, 'final_pool', partial(
-                    F.average_pooling_2d,
-                    ksize=11,
-                    stride=1))
+                setattr(self.features, 'final_pool', GlobalAvgPool2D())
 
             self.output = SimpleSequential()
             with self.output.init_scope():
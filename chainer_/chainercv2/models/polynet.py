@@ -12,7 +12,7 @@ import chainer.links as L
 from chainer import Chain
 from functools import partial
 from chainer.serializers import load_npz
-from .common import SimpleSequential, Concurrent, ParametricSequential, ParametricConcurrent
+from .common import SimpleSequential, Concurrent, ParametricSequential, ParametricConcurrent, GlobalAvgPool2D
 
 
 class ConvBlock(Chain):
@@ -985,10 +985,7 @@ class PolyNet(Chain):
                                     poly_scale=poly_scale))
                     setattr(self.features, "stage{}".format(i + 1), stage)
 
-                setattr(self.features, 'final_pool', partial(
-                    F.average_pooling_2d,
-                    ksize=9,
-                    stride=1))
+                setattr(self.features, 'final_pool', GlobalAvgPool2D())
 
             in_channels = 2048
             self.output = SimpleSequential()
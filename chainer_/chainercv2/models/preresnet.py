@@ -14,7 +14,7 @@ import chainer.links as L
 from chainer import Chain
 from functools import partial
 from chainer.serializers import load_npz
-from .common import pre_conv1x1_block, pre_conv3x3_block, conv1x1, SimpleSequential
+from .common import pre_conv1x1_block, pre_conv3x3_block, conv1x1, SimpleSequential, GlobalAvgPool2D
 
 
 class PreResBlock(Chain):
@@ -267,10 +267,7 @@ class PreResNet(Chain):
                     setattr(self.features, "stage{}".format(i + 1), stage)
                 setattr(self.features, "post_activ", PreResActivation(
                     in_channels=in_channels))
-                setattr(self.features, "final_pool", partial(
-                    F.average_pooling_2d,
-                    ksize=7,
-                    stride=1))
+                setattr(self.features, "final_pool", GlobalAvgPool2D())
 
             self.output = SimpleSequential()
             with self.output.init_scope():
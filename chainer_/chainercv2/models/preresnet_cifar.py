@@ -14,7 +14,7 @@ import chainer.links as L
 from chainer import Chain
 from functools import partial
 from chainer.serializers import load_npz
-from .common import conv3x3, SimpleSequential
+from .common import conv3x3, SimpleSequential, GlobalAvgPool2D
 from .preresnet import PreResUnit, PreResActivation
 
 
@@ -70,10 +70,7 @@ class CIFARPreResNet(Chain):
                     setattr(self.features, "stage{}".format(i + 1), stage)
                 setattr(self.features, "post_activ", PreResActivation(
                     in_channels=in_channels))
-                setattr(self.features, "final_pool", partial(
-                    F.average_pooling_2d,
-                    ksize=8,
-                    stride=1))
+                setattr(self.features, "final_pool", GlobalAvgPool2D())
 
             self.output = SimpleSequential()
             with self.output.init_scope():
@@ -12,7 +12,8 @@ import chainer.links as L
 from chainer import Chain
 from functools import partial
 from chainer.serializers import load_npz
-from .common import conv1x1, conv7x7_block, pre_conv1x1_block, pre_conv3x3_block, Hourglass, SimpleSequential
+from .common import conv1x1, conv7x7_block, pre_conv1x1_block, pre_conv3x3_block, Hourglass, SimpleSequential,\
+    GlobalAvgPool2D
 
 
 class PreResBottleneck(Chain):
@@ -467,10 +468,7 @@ class ResAttNet(Chain):
                     setattr(self.features, "stage{}".format(i + 1), stage)
                 setattr(self.features, 'post_activ', PreActivation(
                     in_channels=in_channels))
-                setattr(self.features, 'final_pool', partial(
-                    F.average_pooling_2d,
-                    ksize=7,
-                    stride=1))
+                setattr(self.features, 'final_pool', GlobalAvgPool2D())
 
             self.output = SimpleSequential()
             with self.output.init_scope():
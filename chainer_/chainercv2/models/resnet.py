@@ -13,7 +13,7 @@ import chainer.links as L
 from chainer import Chain
 from functools import partial
 from chainer.serializers import load_npz
-from .common import conv1x1_block, conv3x3_block, conv7x7_block, SimpleSequential
+from .common import conv1x1_block, conv3x3_block, conv7x7_block, SimpleSequential, GlobalAvgPool2D
 
 
 class ResBlock(Chain):
@@ -243,10 +243,7 @@ class ResNet(Chain):
                                 conv1_stride=conv1_stride))
                             in_channels = out_channels
                     setattr(self.features, "stage{}".format(i + 1), stage)
-                setattr(self.features, "final_pool", partial(
-                    F.average_pooling_2d,
-                    ksize=7,
-                    stride=1))
+                setattr(self.features, "final_pool", GlobalAvgPool2D())
 
             self.output = SimpleSequential()
             with self.output.init_scope():
@@ -13,7 +13,7 @@ import chainer.links as L
 from chainer import Chain
 from functools import partial
 from chainer.serializers import load_npz
-from .common import conv3x3_block, SimpleSequential
+from .common import conv3x3_block, SimpleSequential, GlobalAvgPool2D
 from .resnet import ResUnit
 
 
@@ -67,10 +67,7 @@ class CIFARResNet(Chain):
                                 conv1_stride=False))
                             in_channels = out_channels
                     setattr(self.features, "stage{}".format(i + 1), stage)
-                setattr(self.features, "final_pool", partial(
-                    F.average_pooling_2d,
-                    ksize=8,
-                    stride=1))
+                setattr(self.features, "final_pool", GlobalAvgPool2D())
 
             self.output = SimpleSequential()
             with self.output.init_scope():
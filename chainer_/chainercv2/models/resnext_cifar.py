@@ -12,7 +12,7 @@ import chainer.links as L
 from chainer import Chain
 from functools import partial
 from chainer.serializers import load_npz
-from .common import conv3x3_block, SimpleSequential
+from .common import conv3x3_block, SimpleSequential, GlobalAvgPool2D
 from .resnext import ResNeXtUnit
 
 
@@ -70,10 +70,7 @@ class CIFARResNeXt(Chain):
                                 bottleneck_width=bottleneck_width))
                             in_channels = out_channels
                     setattr(self.features, "stage{}".format(i + 1), stage)
-                setattr(self.features, "final_pool", partial(
-                    F.average_pooling_2d,
-                    ksize=8,
-                    stride=1))
+                setattr(self.features, "final_pool", GlobalAvgPool2D())
 
             self.output = SimpleSequential()
             with self.output.init_scope():
@@ -12,7 +12,7 @@ import chainer.links as L
 from chainer import Chain
 from functools import partial
 from chainer.serializers import load_npz
-from .common import conv1x1_block, conv3x3_block, SEBlock, SimpleSequential
+from .common import conv1x1_block, conv3x3_block, SEBlock, SimpleSequential, GlobalAvgPool2D
 
 
 class SENetBottleneck(Chain):
@@ -227,10 +227,7 @@ class SENet(Chain):
                                 identity_conv3x3=identity_conv3x3))
                             in_channels = out_channels
                     setattr(self.features, "stage{}".format(i + 1), stage)
-                setattr(self.features, "final_pool", partial(
-                    F.average_pooling_2d,
-                    ksize=7,
-                    stride=1))
+                setattr(self.features, "final_pool", GlobalAvgPool2D())
 
             self.output = SimpleSequential()
             with self.output.init_scope():
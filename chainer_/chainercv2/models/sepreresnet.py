@@ -12,7 +12,7 @@ import chainer.links as L
 from chainer import Chain
 from functools import partial
 from chainer.serializers import load_npz
-from .common import conv1x1, SEBlock, SimpleSequential
+from .common import conv1x1, SEBlock, SimpleSequential, GlobalAvgPool2D
 from .preresnet import PreResBlock, PreResBottleneck, PreResInitBlock, PreResActivation
 
 
@@ -126,10 +126,7 @@ class SEPreResNet(Chain):
                     setattr(self.features, "stage{}".format(i + 1), stage)
                 setattr(self.features, "post_activ", PreResActivation(
                     in_channels=in_channels))
-                setattr(self.features, "final_pool", partial(
-                    F.average_pooling_2d,
-                    ksize=7,
-                    stride=1))
+                setattr(self.features, "final_pool", GlobalAvgPool2D())
 
             self.output = SimpleSequential()
             with self.output.init_scope():
@@ -12,7 +12,7 @@ import chainer.links as L
 from chainer import Chain
 from functools import partial
 from chainer.serializers import load_npz
-from .common import conv1x1_block, SEBlock, SimpleSequential
+from .common import conv1x1_block, SEBlock, SimpleSequential, GlobalAvgPool2D
 from .resnet import ResBlock, ResBottleneck, ResInitBlock
 
 
@@ -128,10 +128,7 @@ class SEResNet(Chain):
                                 conv1_stride=conv1_stride))
                             in_channels = out_channels
                     setattr(self.features, "stage{}".format(i + 1), stage)
-                setattr(self.features, "final_pool", partial(
-                    F.average_pooling_2d,
-                    ksize=7,
-                    stride=1))
+                setattr(self.features, "final_pool", GlobalAvgPool2D())
 
             self.output = SimpleSequential()
             with self.output.init_scope():
@@ -11,7 +11,7 @@ import chainer.links as L
 from chainer import Chain
 from functools import partial
 from chainer.serializers import load_npz
-from .common import conv1x1_block, SimpleSequential, SEBlock
+from .common import conv1x1_block, SimpleSequential, SEBlock, GlobalAvgPool2D
 from .resnet import ResInitBlock
 from .resnext import ResNeXtBottleneck
 
@@ -123,10 +123,7 @@ class SEResNeXt(Chain):
                                 bottleneck_width=bottleneck_width))
                             in_channels = out_channels
                     setattr(self.features, "stage{}".format(i + 1), stage)
-                setattr(self.features, "final_pool", partial(
-                    F.average_pooling_2d,
-                    ksize=7,
-                    stride=1))
+                setattr(self.features, "final_pool", GlobalAvgPool2D())
 
             self.output = SimpleSequential()
             with self.output.init_scope():
@@ -14,7 +14,7 @@ import chainer.links as L
 from chainer import Chain
 from functools import partial
 from chainer.serializers import load_npz
-from .common import conv1x1, conv3x3, depthwise_conv3x3, SimpleSequential, ChannelShuffle
+from .common import conv1x1, conv3x3, depthwise_conv3x3, SimpleSequential, ChannelShuffle, GlobalAvgPool2D
 
 
 class ShuffleUnit(Chain):
@@ -181,10 +181,7 @@ class ShuffleNet(Chain):
                                 ignore_group=ignore_group))
                             in_channels = out_channels
                     setattr(self.features, "stage{}".format(i + 1), stage)
-                setattr(self.features, 'final_pool', partial(
-                    F.average_pooling_2d,
-                    ksize=7,
-                    stride=1))
+                setattr(self.features, 'final_pool', GlobalAvgPool2D())
 
             self.output = SimpleSequential()
             with self.output.init_scope():
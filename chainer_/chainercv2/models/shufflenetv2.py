@@ -12,7 +12,8 @@ import chainer.links as L
 from chainer import Chain
 from functools import partial
 from chainer.serializers import load_npz
-from .common import conv1x1, depthwise_conv3x3, conv1x1_block, conv3x3_block, ChannelShuffle, SEBlock, SimpleSequential
+from .common import conv1x1, depthwise_conv3x3, conv1x1_block, conv3x3_block, ChannelShuffle, SEBlock,\
+    SimpleSequential, GlobalAvgPool2D
 
 
 class ShuffleUnit(Chain):
@@ -205,10 +206,7 @@ class ShuffleNetV2(Chain):
                     in_channels=in_channels,
                     out_channels=final_block_channels))
                 in_channels = final_block_channels
-                setattr(self.features, 'final_pool', partial(
-                    F.average_pooling_2d,
-                    ksize=7,
-                    stride=1))
+                setattr(self.features, 'final_pool', GlobalAvgPool2D())
 
             self.output = SimpleSequential()
             with self.output.init_scope():
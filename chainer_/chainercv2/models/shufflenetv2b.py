@@ -13,7 +13,7 @@ from chainer import Chain
 from functools import partial
 from chainer.serializers import load_npz
 from .common import conv1x1_block, conv3x3_block, dwconv3x3_block, ChannelShuffle, ChannelShuffle2, SEBlock,\
-    SimpleSequential
+    SimpleSequential, GlobalAvgPool2D
 
 
 class ShuffleUnit(Chain):
@@ -205,10 +205,7 @@ class ShuffleNetV2b(Chain):
                     in_channels=in_channels,
                     out_channels=final_block_channels))
                 in_channels = final_block_channels
-                setattr(self.features, 'final_pool', partial(
-                    F.average_pooling_2d,
-                    ksize=7,
-                    stride=1))
+                setattr(self.features, 'final_pool', GlobalAvgPool2D())
 
             self.output = SimpleSequential()
             with self.output.init_scope():
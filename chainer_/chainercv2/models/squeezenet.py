@@ -12,7 +12,7 @@ import chainer.links as L
 from chainer import Chain
 from functools import partial
 from chainer.serializers import load_npz
-from .common import SimpleSequential
+from .common import SimpleSequential, GlobalAvgPool2D
 
 
 class FireConv(Chain):
@@ -206,10 +206,7 @@ class SqueezeNet(Chain):
                     out_channels=classes,
                     ksize=1))
                 setattr(self.output, 'final_activ', F.relu)
-                setattr(self.output, 'final_pool', partial(
-                    F.average_pooling_2d,
-                    ksize=13,
-                    stride=1))
+                setattr(self.output, 'final_pool', GlobalAvgPool2D())
                 setattr(self.output, 'final_flatten', partial(
                     F.reshape,
                     shape=(-1, classes)))
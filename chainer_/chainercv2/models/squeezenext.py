@@ -11,7 +11,7 @@ import chainer.links as L
 from chainer import Chain
 from functools import partial
 from chainer.serializers import load_npz
-from .common import ConvBlock, conv1x1_block, conv7x7_block, SimpleSequential
+from .common import ConvBlock, conv1x1_block, conv7x7_block, SimpleSequential, GlobalAvgPool2D
 
 
 class SqnxtUnit(Chain):
@@ -181,10 +181,7 @@ class SqueezeNext(Chain):
                     out_channels=final_block_channels,
                     use_bias=True))
                 in_channels = final_block_channels
-                setattr(self.features, 'final_pool', partial(
-                    F.average_pooling_2d,
-                    ksize=7,
-                    stride=1))
+                setattr(self.features, 'final_pool', GlobalAvgPool2D())
 
             self.output = SimpleSequential()
             with self.output.init_scope():
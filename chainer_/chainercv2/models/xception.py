@@ -11,7 +11,7 @@ import chainer.links as L
 from chainer import Chain
 from functools import partial
 from chainer.serializers import load_npz
-from .common import SimpleSequential
+from .common import SimpleSequential, GlobalAvgPool2D
 
 
 class ConvBlock(Chain):
@@ -362,10 +362,7 @@ class XceptionFinalBlock(Chain):
                 out_channels=2048,
                 activate=True)
             self.activ = F.relu
-            self.pool = partial(
-                F.average_pooling_2d,
-                ksize=10,
-                stride=1)
+            self.pool = GlobalAvgPool2D()
 
     def __call__(self, x):
         x = self.conv1(x)
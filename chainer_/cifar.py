@@ -9,6 +9,8 @@ from chainer import Chain
 from chainer.dataset import DatasetMixin
 from chainer.datasets import cifar
 
+from .chainercv2.models.common import StaticGraphModel
+
 __all__ = ['add_dataset_parser_arguments', 'get_val_data_iterator', 'get_data_iterators', 'CIFARPredictor']
 
 
@@ -36,30 +38,45 @@ def add_dataset_parser_arguments(parser,
 
 
 class CIFARPredictor(Chain):
-
+    """
+    CIFAR predictor. Normalization is done for the whole batch (on the model device).
+
+    Parameters:
+    ----------
+    base_model : Chain
+        Model.
+    mean : tuple of 3 float
+        Mean of image channels.
+    std : tuple of 3 float
+        Standard deviation of image channels.
+    static_graph : bool, default False
+        Whether to run the model as a static graph (see `StaticGraphModel`).
+    """
     def __init__(self,
                  base_model,
                  mean=(0.4914, 0.4822, 0.4465),
-                 std=(0.2023, 0.1994, 0.2010)):
+                 std=(0.2023, 0.1994, 0.2010),
+                 static_graph=False):
         super(CIFARPredictor, self).__init__()
         self.mean = np.array(mean, np.float32)[:, np.newaxis, np.newaxis]
         self.std = np.array(std, np.float32)[:, np.newaxis, np.newaxis]
+        self.static_graph = static_graph
         with self.init_scope():
-            self.model = base_model
-
-    def _preprocess(self, img):
-        img -= self.mean
-        img /= self.std
-        return img
+            self.model = StaticGraphModel(base_model) if static_graph else base_model
 
     def predict(self, imgs):
-        imgs = self.xp.asarray([self._preprocess(img) for img in imgs])
+        xp = self.xp
+        imgs = xp.asarray(np.stack(imgs), dtype=np.float32)
+        imgs -= xp.asarray(self.mean)
+        imgs /= xp.asarray(self.std)
 
         with chainer.using_config('train', False), chainer.function.no_backprop_mode():
             imgs = chainer.Variable(imgs)
             predictions = self.model(imgs)
 
         output = chainer.backends.cuda.to_cpu(predictions.array)
+        if self.static_graph:
+            output = output.copy()
         return output
 
 
@@ -12,6 +12,8 @@ from chainercv.transforms import center_crop
 from chainercv.datasets import directory_parsing_label_names
 from chainercv.datasets import DirectoryParsingLabelDataset
 
+from .chainercv2.models.common import StaticGraphModel
+
 __all__ = ['add_dataset_parser_arguments', 'get_val_data_iterator', 'get_data_iterators', 'ImagenetPredictor']
 
 
@@ -46,13 +48,32 @@ def add_dataset_parser_arguments(parser):
 
 
 class ImagenetPredictor(Chain):
-
+    """
+    ImageNet-1K predictor. Images are only scaled and cropped one by one, normalization is done for the whole batch
+    (on the model device).
+
+    Parameters:
+    ----------
+    base_model : Chain
+        Model.
+    scale_size : int, default 256
+        Size of the shorter side of a scaled image.
+    crop_size : int or tuple of two ints, default 224
+        Size of the center crop.
+    mean : tuple of 3 float
+        Mean of image channels.
+    std : tuple of 3 float
+        Standard deviation of image channels.
+    static_graph : bool, default False
+        Whether to run the model as a static graph (see `StaticGraphModel`).
+    """
     def __init__(self,
                  base_model,
                  scale_size=256,
                  crop_size=224,
                  mean=(0.485, 0.456, 0.406),
-                 std=(0.229, 0.224, 0.225)):
+                 std=(0.229, 0.224, 0.225),
+                 static_graph=False):
         super(ImagenetPredictor, self).__init__()
         self.scale_size = scale_size
         if isinstance(crop_size, int):
@@ -60,27 +81,42 @@ class ImagenetPredictor(Chain):
         self.crop_size = crop_size
         self.mean = np.array(mean, np.float32)[:, np.newaxis, np.newaxis]
         self.std = np.array(std, np.float32)[:, np.newaxis, np.newaxis]
+        self.static_graph = static_graph
         with self.init_scope():
-            self.model = base_model
-
-    def _preprocess(self, img):
-        img = scale(img=img, size=self.scale_size)
-        img = center_crop(img, self.crop_size)
-        img /= 255.0
-        img -= self.mean
-        img /= self.std
-        return img
-
-    def predict(self, imgs):
-        imgs = self.xp.asarray([self._preprocess(img) for img in imgs])
+            self.model = StaticGraphModel(base_model) if static_graph else base_model
+
+    def _scale_crop_batch(self, imgs):
+        batch = np.empty((len(imgs), imgs[0].shape[0]) + self.crop_size, np.float32)
+        for i, img in enumerate(imgs):
+            img = scale(img=img, size=self.scale_size)
+            batch[i] = center_crop(img, self.crop_size)
+        return batch
+
+    def _predict_batch(self, imgs):
+        xp = self.xp
+        imgs = xp.asarray(imgs, dtype=np.float32)
+        imgs /= 255.0
+        imgs -= xp.asarray(self.mean)
+        imgs /= xp.asarray(self.std)
 
         with chainer.using_config('train', False), chainer.function.no_backprop_mode():
             imgs = chainer.Variable(imgs)
             predictions = self.model(imgs)
 
         output = chainer.backends.cuda.to_cpu(predictions.array)
+        if self.static_graph:
+            output = output.copy()
         return output
 
+    def predict(self, imgs):
+        return self._predict_batch(self._scale_crop_batch(imgs))
+
+    def predict_cropped(self, imgs):
+        """
+        Predict for a batch of already scaled and cropped uint8 images (e.g. from `common.val_cache.ValCache`).
+        """
+        return self._predict_batch(imgs)
+
 
 class PreprocessedDataset(DatasetMixin):
 
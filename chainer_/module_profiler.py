@@ -0,0 +1,110 @@
+"""
+    Per-link timing of a model forward pass (Chainer).
+
+    Chainer link hooks are called from `Link.__call__`, which is overridden by chainercv2 chains, so the profiler
+    temporarily wraps `__call__` of each link class of the model instead.
+"""
+
+__all__ = ['attach_module_profiler', 'profile_model']
+
+import numpy as np
+import chainer
+from chainer.backends import cuda
+from common.module_profiler import ModuleProfiler
+
+
+def attach_module_profiler(model,
+                           profiler):
+    """
+    Wrap `__call__` of the model link classes, so that each link forward pass is reported to the profiler.
+
+    Parameters:
+    ----------
+    model : Link
+        Profiled model.
+    profiler : ModuleProfiler
+        Profiler.
+
+    Returns
+    -------
+    function
+        Function, that restores the link classes (detaches the profiler).
+    """
+    names = {}
+    for name, link in model.namedlinks():
+        type_name = type(link).__name__
+        names[id(link)] = (name.lstrip("/").replace("/", ".") if name != "/" else type_name, type_name)
+
+    patched = []
+
+    def wrap(call):
+        def profiled_call(link, *args, **kwargs):
+            name = names.get(id(link))
+            if name is None:
+                return call(link, *args, **kwargs)
+            profiler.begin(*name)
+            try:
+                return call(link, *args, **kwargs)
+            finally:
+                profiler.end()
+        return profiled_call
+
+    # Original methods are taken before patching, so that a class inheriting `__call__` of another patched class is
+    # not wrapped twice:
+    classes = set([type(link) for link in model.links()])
+    calls = dict([(cls, cls.__call__) for cls in classes])
+    for cls in classes:
+        patched.append((cls, cls.__dict__.get("__call__")))
+        cls.__call__ = wrap(calls[cls])
+
+    def detach():
+        for cls, own_call in patched:
+            if own_call is not None:
+                cls.__call__ = own_call
+            else:
+                del cls.__call__
+
+    return detach
+
+
+def profile_model(model,
+                  in_channels,
+                  in_size,
+                  batch_size=1,
+                  num_batches=10,
+                  use_gpu=False):
+    """
+    Time the forward pass of each link on random batches.
+
+    Parameters:
+    ----------
+    model : Link
+        Profiled model.
+    in_channels : int
+        Number of input channels.
+    in_size : tuple of two ints
+        Spatial size of the input image.
+    batch_size : int, default 1
+        Batch size.
+    num_batches : int, default 10
+        Number of profiled batches.
+    use_gpu : bool, default False
+        Whether the model is on GPU.
+
+    Returns
+    -------
+    ModuleProfiler
+        Profiler with recorded events.
+    """
+    profiler = ModuleProfiler(sync_fn=(cuda.Stream.null.synchronize if use_gpu else None))
+    x = np.random.randn(batch_size, in_channels, in_size[0], in_size[1]).astype(np.float32)
+    x = chainer.Variable(model.xp.asarray(x))
+    detach = attach_module_profiler(model, profiler)
+    try:
+        with chainer.using_config('train', False), chainer.no_backprop_mode():
+            profiler.run(
+                forward_fn=(lambda: model(x)),
+                num_batches=num_batches)
+    finally:
+        detach()
+    return profiler
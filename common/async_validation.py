@@ -0,0 +1,345 @@
+"""
+    Asynchronous (out-of-process) validation of training checkpoints (framework independent part).
+
+    A trainer with a validation queue directory doesn't stop after each epoch for full validation. It puts the epoch
+    checkpoint into the queue directory (by the checkpoint writer of `TrainLogParamSaver`, i.e. in background) together
+    with a job file. An evaluator process (an evaluation script in queue mode, on the same or another node with a shared
+    file system) claims jobs, validates checkpoints and writes result files. The trainer collects results in epoch order
+    between epochs and passes them to `TrainLogParamSaver`, which keeps the last/best checkpoints by linking validated
+    queue checkpoints.
+
+    Files of the queue directory for a checkpoint file stem `<stem>` (`<prefix>_<epoch>`):
+    <stem>.<ext> - checkpoint files,
+    <stem>.job.json - validation job, written after checkpoint files,
+    <stem>.running.json - validation job claimed by an evaluator (its modification time is a heartbeat of the
+        evaluator, a job without heartbeats for the stale timeout is returned into the queue),
+    <stem>.result.json - validation values (lower is better),
+    done - marker of the end of training, evaluators exit when there are no jobs left.
+
+    Jobs and results have the identifier of the training run, so results of jobs of an earlier run in the same queue
+    directory (e.g. before a restart) are ignored.
+"""
+
+__all__ = ['add_async_validation_parser_arguments', 'add_val_queue_parser_arguments', 'AsyncValidator',
+           'run_val_queue_evaluator']
+
+import os
+import re
+import json
+import time
+import uuid
+import logging
+import threading
+from collections import OrderedDict
+
+_job_file_suffix = ".job.json"
+_running_file_suffix = ".running.json"
+_result_file_suffix = ".result.json"
+_done_file_name = "done"
+
+
+def add_async_validation_parser_arguments(parser):
+    parser.add_argument(
+        '--val-queue-dir',
+        type=str,
+        default='',
+        help='directory of the validation queue: checkpoints are validated by a separate evaluator process (an '
+             'evaluation script with the same option) and the training loop doesn\'t stop for full validation')
+    parser.add_argument(
+        '--val-queue-stale-timeout',
+        type=float,
+        default=600.0,
+        help='time without heartbeats of an evaluator, after which its validation job is returned into the queue (in '
+             'seconds, should be the same for the training and evaluation scripts)')
+    parser.add_argument(
+        '--val-subset-batches',
+        type=int,
+        default=0,
+        help='number of validation batches evaluated in the training loop after each epoch with a validation queue '
+             '(to monitor divergence), 0 means no in-loop validation')
+
+
+def add_val_queue_parser_arguments(parser):
+    parser.add_argument(
+        '--val-queue-dir',
+        type=str,
+        default='',
+        help='validate checkpoints from the validation queue of a training script (see its --val-queue-dir) until '
+             'the end of training')
+    parser.add_argument(
+        '--val-queue-poll-interval',
+        type=float,
+        default=10.0,
+        help='interval of polling the validation queue for new checkpoints (in seconds)')
+    parser.add_argument(
+        '--val-queue-stale-timeout',
+        type=float,
+        default=600.0,
+        help='time without heartbeats of an evaluator, after which its validation job is returned into the queue (in '
+             'seconds, should be the same for the training and evaluation scripts)')
+
+
+def _write_json(file_path, obj):
+    """
+    Write a JSON file via a temporary file, which is atomically renamed after the writing.
+    """
+    tmp_file_path = file_path + ".tmp"
+    with open(tmp_file_path, "w") as f:
+        json.dump(obj, f)
+    os.replace(tmp_file_path, file_path)
+
+
+def _remove_file(file_path):
+    try:
+        os.remove(file_path)
+    except OSError:
+        pass
+
+
+def _requeue_stale_jobs(queue_dir_path,
+                        stale_timeout):
+    """
+    Return claimed jobs without recent heartbeats (of dead evaluators) into the queue.
+
+    Returns
+    -------
+    list of str
+        File stems of requeued jobs.
+    """
+    file_stems = []
+    for file_name in os.listdir(queue_dir_path):
+        if not file_name.endswith(_running_file_suffix):
+            continue
+        running_file_path = os.path.join(queue_dir_path, file_name)
+        file_stem = running_file_path[:-len(_running_file_suffix)]
+        try:
+            if time.time() - os.path.getmtime(running_file_path) < stale_timeout:
+                continue
+            os.rename(running_file_path, file_stem + _job_file_suffix)
+        except OSError:
+            # The job is finished or requeued by another process:
+            continue
+        logging.warning("Validation job {} is abandoned by its evaluator and returned into the queue".format(
+            file_stem))
+        file_stems.append(file_stem)
+    return file_stems
+
+
+class AsyncValidator(object):
+    """
+    Trainer side of asynchronous validation. Checkpoints are queued by `submit`, validation results are passed to
+    `TrainLogParamSaver.epoch_test_end_callback` by `collect`/`finish` (in epoch order).
+
+    Parameters:
+    ----------
+    queue_dir_path : str
+        Directory of the validation queue.
+    lp_saver : TrainLogParamSaver
+        Train logger with a checkpoint saving callback.
+    checkpoint_file_name_prefix : str
+        Prefix for checkpoint file names in the queue.
+    val_param_indices : list of int
+        Indices of validation values (in the order of evaluator results) in params of `epoch_test_end_callback`.
+    poll_interval : float, default 10.0
+        Interval of polling for results at the end of training (in seconds).
+    stale_timeout : float, default 600.0
+        Time without heartbeats of an evaluator, after which its job is returned into the queue (in seconds).
+    """
+    def __init__(self,
+                 queue_dir_path,
+                 lp_saver,
+                 checkpoint_file_name_prefix,
+                 val_param_indices,
+                 poll_interval=10.0,
+                 stale_timeout=600.0):
+        super(AsyncValidator, self).__init__()
+        assert lp_saver.can_save, "Asynchronous validation requires checkpoint saving"
+        self.queue_dir_path = queue_dir_path
+        self.lp_saver = lp_saver
+        self.checkpoint_file_name_prefix = checkpoint_file_name_prefix
+        self.val_param_indices = val_param_indices
+        self.poll_interval = poll_interval
+        self.stale_timeout = stale_timeout
+        self.run_id = uuid.uuid4().hex
+        self.pending = OrderedDict()
+
+        if not os.path.exists(self.queue_dir_path):
+            os.makedirs(self.queue_dir_path)
+        _remove_file(os.path.join(self.queue_dir_path, _done_file_name))
+        self._remove_stale_files()
+
+    def _remove_stale_files(self):
+        """
+        Remove checkpoints, jobs and results of an earlier training run in the queue directory (nothing is submitted
+        by this run yet).
+        """
+        file_name_pattern = re.compile(r"^{}_\d{{4,}}\.".format(re.escape(self.checkpoint_file_name_prefix)))
+        file_names = [x for x in os.listdir(self.queue_dir_path) if file_name_pattern.match(x)]
+        if file_names:
+            logging.info("Removing {} stale files from validation queue {}".format(len(file_names),
+                                                                                   self.queue_dir_path))
+        for file_name in file_names:
+            _remove_file(os.path.join(self.queue_dir_path, file_name))
+
+    def submit(self,
+               epoch1,
+               params,
+               **kwargs):
+        """
+        Queue a checkpoint for validation.
+
+        Parameters:
+        ----------
+        epoch1 : int
+            Epoch number (starting from 1).
+        params : list
+            Values for `epoch_test_end_callback` (validation values are placeholders).
+        kwargs : dict
+            Keyword arguments of `epoch_test_end_callback` (data of the checkpoint).
+        """
+        file_stem = os.path.join(self.queue_dir_path, "{}_{:04d}".format(self.checkpoint_file_name_prefix, epoch1))
+        self.lp_saver.save_checkpoint(file_stem, **kwargs)
+        job = {"epoch": epoch1, "checkpoint_file_stem": os.path.basename(file_stem), "run_id": self.run_id}
+        self.lp_saver.file_writer.submit(lambda: _write_json(file_stem + _job_file_suffix, job))
+        self.pending[epoch1] = (file_stem, list(params))
+
+    def collect(self):
+        """
+        Pass available validation results to the train logger (stops at the first not validated epoch).
+
+        Returns
+        -------
+        int
+            Number of collected results.
+        """
+        count = 0
+        while self.pending:
+            epoch1, (file_stem, params) = next(iter(self.pending.items()))
+            result_file_path = file_stem + _result_file_suffix
+            if not os.path.exists(result_file_path):
+                break
+            with open(result_file_path, "r") as f:
+                result = json.load(f)
+            if result.get("run_id") != self.run_id:
+                # A late result of a job of an earlier training run:
+                _remove_file(result_file_path)
+                break
+            for ind, value in zip(self.val_param_indices, result["values"]):
+                params[ind] = value
+            logging.info('[Epoch {}] validation: {}'.format(epoch1, "\t".join(
+                ["{}={:.4f}".format(self.lp_saver.param_names[ind], params[ind]) for ind in self.val_param_indices])))
+
+            self.lp_saver.epoch_test_end_callback(
+                epoch1=epoch1,
+                params=params,
+                src_checkpoint_file_stem=file_stem)
+            self.lp_saver.remove_checkpoint(file_stem)
+            self.lp_saver.file_writer.submit(lambda file_path=result_file_path: _remove_file(file_path))
+            del self.pending[epoch1]
+            count += 1
+        return count
+
+    def finish(self):
+        """
+        Wait for validation of all queued checkpoints and stop evaluators.
+        """
+        self.lp_saver.flush()
+        last_log_time = None
+        while True:
+            self.collect()
+            if not self.pending:
+                break
+            _requeue_stale_jobs(self.queue_dir_path, self.stale_timeout)
+            if (last_log_time is None) or (time.time() - last_log_time > 600.0):
+                logging.info("Waiting for validation of epochs: {}".format(list(self.pending.keys())))
+                last_log_time = time.time()
+            time.sleep(self.poll_interval)
+        self.lp_saver.flush()
+        _write_json(os.path.join(self.queue_dir_path, _done_file_name), {})
+
+
+def run_val_queue_evaluator(queue_dir_path,
+                            validate_fn,
+                            poll_interval=10.0,
+                            stale_timeout=600.0):
+    """
+    Validate checkpoints from a validation queue (in epoch order) until the end of training. Several evaluators can
+    share a queue, jobs of dead evaluators are taken over after the stale timeout.
+
+    Parameters:
+    ----------
+    queue_dir_path : str
+        Directory of the validation queue.
+    validate_fn : function
+        Function of a checkpoint file stem, which returns a list of validation values (lower is better).
+    poll_interval : float, default 10.0
+        Interval of polling the queue for new checkpoints (in seconds).
+    stale_timeout : float, default 600.0
+        Time without heartbeats of an evaluator, after which its job is returned into the queue (in seconds), the
+        heartbeat interval is a tenth of it.
+
+    Returns
+    -------
+    int
+        Number of validated checkpoints.
+    """
+    if not os.path.exists(queue_dir_path):
+        os.makedirs(queue_dir_path)
+    logging.info("Waiting for checkpoints in {}".format(queue_dir_path))
+    count = 0
+    while True:
+        _requeue_stale_jobs(queue_dir_path, stale_timeout)
+        job_file_names = sorted([x for x in os.listdir(queue_dir_path) if x.endswith(_job_file_suffix)])
+        if not job_file_names:
+            if os.path.exists(os.path.join(queue_dir_path, _done_file_name)):
+                break
+            time.sleep(poll_interval)
+            continue
+
+        file_stem = os.path.join(queue_dir_path, job_file_names[0][:-len(_job_file_suffix)])
+        running_file_path = file_stem + _running_file_suffix
+        try:
+            os.rename(file_stem + _job_file_suffix, running_file_path)
+        except OSError:
+            # The job is claimed by another evaluator:
+            continue
+        try:
+            os.utime(running_file_path, None)
+            with open(running_file_path, "r") as f:
+                job = json.load(f)
+        except (OSError, ValueError):
+            # The job is removed by a restarted training run:
+            continue
+
+        logging.info("Validation of checkpoint: {} ([Epoch {}])".format(file_stem, job["epoch"]))
+        stop_event = threading.Event()
+
+        def heartbeat():
+            while not stop_event.wait(stale_timeout / 10.0):
+                try:
+                    os.utime(running_file_path, None)
+                except OSError:
+                    pass
+
+        heartbeat_thread = threading.Thread(target=heartbeat)
+        heartbeat_thread.daemon = True
+        heartbeat_thread.start()
+        tic = time.time()
+        try:
+            values = [float(x) for x in validate_fn(file_stem)]
+        finally:
+            stop_event.set()
+            heartbeat_thread.join()
+        if not os.path.exists(running_file_path):
+            # The job is requeued (after a heartbeat loss) or removed by a restarted training run:
+            logging.warning("Validation job {} is taken away, the result is dropped".format(file_stem))
+            continue
+        _write_json(file_stem + _result_file_suffix, {
+            "epoch": job["epoch"],
+            "run_id": job.get("run_id"),
+            "values": values,
+            "time": time.time() - tic})
+        _remove_file(running_file_path)
+        count += 1
+    logging.info("Training is finished, {} checkpoints are validated".format(count))
+    return count
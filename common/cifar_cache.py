@@ -0,0 +1,220 @@
+"""
+    Memory-mappable CIFAR-10/100 cache (framework independent).
+
+    Each split is stored as raw uint8 images (in NHWC layout) together with labels as two NumPy files. Concurrent
+    training processes map the same files, so the dataset is held once in the page cache instead of being unpickled
+    into the memory of every process (and of every data loader worker).
+"""
+
+__all__ = ['add_cifar_cache_parser_arguments', 'get_cifar_cache_file_stem', 'create_cifar_cache',
+           'prepare_cifar_cache', 'load_cifar_cache']
+
+import os
+import pickle
+import tarfile
+import logging
+import numpy as np
+try:
+    from urllib.request import urlretrieve
+except ImportError:
+    from urllib import urlretrieve
+
+
+_cifar_python_sources = {
+    "CIFAR10": ("https://www.cs.toronto.edu/~kriz/cifar-10-python.tar.gz", "cifar-10-batches-py",
+                ["data_batch_{}".format(i) for i in range(1, 6)], ["test_batch"], "labels"),
+    "CIFAR100": ("https://www.cs.toronto.edu/~kriz/cifar-100-python.tar.gz", "cifar-100-python",
+                 ["train"], ["test"], "fine_labels"),
+}
+
+_cifar_binary_sources = {
+    "CIFAR10": ("cifar-10-batches-bin", ["data_batch_{}.bin".format(i) for i in range(1, 6)], ["test_batch.bin"], 1),
+    "CIFAR100": ("cifar-100-binary", ["train.bin"], ["test.bin"], 2),
+}
+
+
+def add_cifar_cache_parser_arguments(parser):
+    parser.add_argument(
+        '--data-cache-dir',
+        type=str,
+        default='',
+        help='directory with a memory-mapped copy of the dataset shared by concurrent processes (built from '
+             '--data-dir if absent)')
+
+
+def get_cifar_cache_file_stem(cache_dir_path,
+                              dataset_name,
+                              train):
+    """
+    Get the path stem for cache files of a split.
+
+    Parameters:
+    ----------
+    cache_dir_path : str
+        Directory with cache files.
+    dataset_name : str
+        Dataset name ('CIFAR10' or 'CIFAR100').
+    train : bool
+        Whether to get the training or the test split.
+
+    Returns
+    -------
+    str
+        Path stem (without '_data.npy'/'_labels.npy' suffixes).
+    """
+    return os.path.join(cache_dir_path, "{}_{}".format(dataset_name.lower(), "train" if train else "val"))
+
+
+def _read_python_batches(dir_path,
+                         file_names,
+                         label_key):
+    """
+    Read batches of CIFAR in the python version (as downloaded by torchvision).
+    """
+    data_list = []
+    labels_list = []
+    for file_name in file_names:
+        with open(os.path.join(dir_path, file_name), "rb") as f:
+            batch = pickle.load(f, encoding="latin1")
+        data_list.append(np.asarray(batch["data"], dtype=np.uint8))
+        labels_list.append(np.asarray(batch[label_key], dtype=np.int32))
+    data = np.concatenate(data_list).reshape((-1, 3, 32, 32)).transpose((0, 2, 3, 1))
+    return np.ascontiguousarray(data), np.concatenate(labels_list)
+
+
+def _read_binary_batches(dir_path,
+                         file_names,
+                         num_label_bytes):
+    """
+    Read batches of CIFAR in the binary version (as downloaded by Gluon), the last label byte is the (fine) label.
+    """
+    records = np.concatenate([np.fromfile(os.path.join(dir_path, file_name), dtype=np.uint8)
+                              for file_name in file_names]).reshape((-1, num_label_bytes + 3 * 32 * 32))
+    data = records[:, num_label_bytes:].reshape((-1, 3, 32, 32)).transpose((0, 2, 3, 1))
+    return np.ascontiguousarray(data), records[:, num_label_bytes - 1].astype(np.int32)
+
+
+def _read_cifar_split(data_dir,
+                      dataset_name,
+                      train):
+    """
+    Read a split of CIFAR from the python or the binary version in the data directory (the python version is
+    downloaded if there is none).
+    """
+    url, python_dir_name, python_train_files, python_val_files, label_key = _cifar_python_sources[dataset_name]
+    binary_dir_name, binary_train_files, binary_val_files, num_label_bytes = _cifar_binary_sources[dataset_name]
+
+    binary_dir_path = os.path.join(data_dir, binary_dir_name)
+    python_dir_path = os.path.join(data_dir, python_dir_name)
+    if os.path.exists(binary_dir_path) and not os.path.exists(python_dir_path):
+        return _read_binary_batches(
+            dir_path=binary_dir_path,
+            file_names=(binary_train_files if train else binary_val_files),
+            num_label_bytes=num_label_bytes)
+
+    if not os.path.exists(python_dir_path):
+        if not os.path.exists(data_dir):
+            os.makedirs(data_dir)
+        archive_file_path = os.path.join(data_dir, os.path.basename(url))
+        logging.info("Downloading {}".format(url))
+        urlretrieve(url, archive_file_path)
+        with tarfile.open(archive_file_path, "r:gz") as tar:
+            tar.extractall(path=data_dir)
+    return _read_python_batches(
+        dir_path=python_dir_path,
+        file_names=(python_train_files if train else python_val_files),
+        label_key=label_key)
+
+
+def create_cifar_cache(data_dir,
+                       file_stem,
+                       dataset_name,
+                       train):
+    """
+    Store a split of CIFAR as a memory-mappable cache.
+
+    Parameters:
+    ----------
+    data_dir : str
+        Path to directory with CIFAR dataset.
+    file_stem : str
+        Path stem for cache files.
+    dataset_name : str
+        Dataset name ('CIFAR10' or 'CIFAR100').
+    train : bool
+        Whether to store the training or the test split.
+    """
+    data, labels = _read_cifar_split(
+        data_dir=data_dir,
+        dataset_name=dataset_name,
+        train=train)
+    assert (data.shape[0] == labels.shape[0])
+    logging.info("Creating CIFAR cache <{}> for {} images...".format(file_stem, data.shape[0]))
+
+    dir_path = os.path.dirname(file_stem)
+    if dir_path and not os.path.exists(dir_path):
+        os.makedirs(dir_path)
+
+    # Write into temporary files and rename them at the end, so that an interrupted build is never picked up:
+    labels_tmp_file_path = file_stem + "_labels.tmp.npy"
+    np.save(labels_tmp_file_path, labels)
+    data_tmp_file_path = file_stem + "_data.tmp.npy"
+    np.save(data_tmp_file_path, data)
+    os.replace(labels_tmp_file_path, file_stem + "_labels.npy")
+    os.replace(data_tmp_file_path, file_stem + "_data.npy")
+
+
+def prepare_cifar_cache(cache_dir_path,
+                        data_dir,
+                        dataset_name,
+                        train):
+    """
+    Get the path stem for CIFAR cache, creating the cache if it doesn't exist.
+
+    Parameters:
+    ----------
+    cache_dir_path : str
+        Directory with cache files.
+    data_dir : str
+        Path to directory with CIFAR dataset.
+    dataset_name : str
+        Dataset name ('CIFAR10' or 'CIFAR100').
+    train : bool
+        Whether to get the training or the test split.
+
+    Returns
+    -------
+    str
+        Path stem for cache files.
+    """
+    file_stem = get_cifar_cache_file_stem(
+        cache_dir_path=cache_dir_path,
+        dataset_name=dataset_name,
+        train=train)
+    if not (os.path.exists(file_stem + "_data.npy") and os.path.exists(file_stem + "_labels.npy")):
+        create_cifar_cache(
+            data_dir=data_dir,
+            file_stem=file_stem,
+            dataset_name=dataset_name,
+            train=train)
+    return file_stem
+
+
+def load_cifar_cache(file_stem):
+    """
+    Map CIFAR cache files.
+
+    Parameters:
+    ----------
+    file_stem : str
+        Path stem for cache files.
+
+    Returns
+    -------
+    tuple of two np.array
+        Read-only memory-mapped uint8 images (NHWC) and int32 labels.
+    """
+    data = np.load(file_stem + "_data.npy", mmap_mode='r')
+    labels = np.load(file_stem + "_labels.npy")
+    assert (data.shape[0] == labels.shape[0])
+    return data, labels
@@ -0,0 +1,71 @@
+"""
+    Evaluation of a model at several input sizes (framework independent).
+
+    All zoo models end with global/adaptive pooling, so that `in_size` is only the default resolution. Evaluating a
+    pretrained model at smaller sizes gives a latency/accuracy table for choosing the resolution of each latency tier.
+"""
+
+__all__ = ['add_input_sizes_parser_arguments', 'parse_input_sizes', 'log_input_size_table']
+
+import logging
+
+
+def add_input_sizes_parser_arguments(parser):
+    parser.add_argument(
+        '--input-sizes',
+        type=str,
+        default='',
+        help='comma-separated list of input sizes (e.g. 128,160,192,224). The model is evaluated at each of them and a '
+             'latency/accuracy table is logged')
+    parser.add_argument(
+        '--latency-batch-size',
+        type=int,
+        default=1,
+        help='batch size for latency measurement')
+    parser.add_argument(
+        '--latency-iters',
+        type=int,
+        default=20,
+        help='number of timed forward passes for latency measurement')
+
+
+def parse_input_sizes(input_sizes):
+    """
+    Parse a list of input sizes.
+
+    Parameters:
+    ----------
+    input_sizes : str
+        Comma-separated input sizes.
+
+    Returns
+    -------
+    list of int
+        Input sizes.
+    """
+    sizes = [int(x) for x in input_sizes.split(',') if x.strip()]
+    assert all(size > 0 for size in sizes)
+    return sizes
+
+
+def log_input_size_table(rows,
+                         batch_size):
+    """
+    Log a latency/accuracy table.
+
+    Parameters:
+    ----------
+    rows : list of tuple of 4 elements
+        Input size, top-1 error (or None), top-5 error (or None) and batch latency (in seconds) for each size.
+    batch_size : int
+        Batch size of latency measurement.
+    """
+    def format_error(err):
+        return "{:.4f}".format(err) if err is not None else "-"
+
+    lines = ["| size | err-top1 | err-top5 | latency, ms | throughput, img/s |",
+             "|-----:|---------:|---------:|------------:|------------------:|"]
+    for size, err_top1, err_top5, latency in rows:
+        lines.append("| {:4d} | {:>8s} | {:>8s} | {:11.2f} | {:17.1f} |".format(
+            size, format_error(err_top1), format_error(err_top5), latency * 1e3, batch_size / latency))
+    logging.info("Latency (batch size {}) and accuracy for input sizes:\n{}".format(batch_size, "\n".join(lines)))
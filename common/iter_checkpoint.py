@@ -0,0 +1,256 @@
+"""
+    Mid-epoch (iteration-level) training checkpoints (framework independent part).
+
+    Every N iterations the trainer saves model and optimizer checkpoint files (the same as for epochs, by the checkpoint
+    writer of `TrainLogParamSaver`, i.e. in background) and then a position file `<stem>.iter` with the training
+    position: epoch, number of processed batches, sampler seed, RNG states, LR scheduler state and accumulated training
+    metrics. Only the latest iteration checkpoint is kept, it's removed when a later epoch checkpoint is saved.
+
+    Training continues from the exact batch with `--resume <stem>.<ext> --resume-state <stem>.states --resume-iter
+    <stem>.iter`: the sampler yields the rest of the epoch sample permutation, so skipped samples aren't read at all.
+"""
+
+__all__ = ['add_iter_checkpoint_parser_arguments', 'ResumableRandomSampler', 'get_host_rng_state',
+           'set_host_rng_state', 'load_train_position', 'IterCheckpointSaver']
+
+import os
+import pickle
+import random
+import logging
+import numpy as np
+
+_position_file_ext = ".iter"
+
+
+def add_iter_checkpoint_parser_arguments(parser):
+    parser.add_argument(
+        '--checkpoint-iters',
+        type=int,
+        default=0,
+        help='interval of saving mid-epoch checkpoints with the training position (in iterations), 0 means only '
+             'epoch checkpoints')
+    parser.add_argument(
+        '--resume-iter',
+        type=str,
+        default='',
+        help='resume from the training position of a mid-epoch checkpoint (`.iter` file), together with --resume and '
+             '--resume-state of the same checkpoint')
+
+
+class ResumableRandomSampler(object):
+    """
+    Sampler of elements of a random permutation of [0, length), which is determined by the seed and the epoch number,
+    so a pass can be repeated from any position without reading preceding samples. For distributed training the
+    permutation is split into shards (all workers should have the same seed). The epoch is incremented after each pass,
+    if it isn't set explicitly.
+
+    Parameters:
+    ----------
+    length : int
+        Length of the sequence.
+    seed : int, default 0
+        Random seed.
+    num_parts : int, default 1
+        Number of shards (workers).
+    part_index : int, default 0
+        Index of the shard (rank of the worker).
+    """
+    def __init__(self,
+                 length,
+                 seed=0,
+                 num_parts=1,
+                 part_index=0):
+        super(ResumableRandomSampler, self).__init__()
+        assert (length > 0)
+        assert (0 <= part_index < num_parts)
+        self.length = length
+        self.seed = seed
+        self.num_parts = num_parts
+        self.part_index = part_index
+        self.part_length = length // num_parts
+        self.epoch = 0
+        self.start_index = 0
+
+    def set_epoch(self,
+                  epoch,
+                  start_index=0):
+        """
+        Set the permutation and the starting position for the next pass.
+
+        Parameters:
+        ----------
+        epoch : int
+            Epoch number (starting from 0).
+        start_index : int, default 0
+            Number of samples of the shard to skip.
+        """
+        assert (0 <= start_index <= self.part_length)
+        self.epoch = epoch
+        self.start_index = start_index
+
+    def __iter__(self):
+        rs = np.random.RandomState(self.seed + self.epoch)
+        indices = rs.permutation(self.length)
+        start = self.part_index * self.part_length
+        indices = indices[(start + self.start_index):(start + self.part_length)]
+        self.epoch += 1
+        self.start_index = 0
+        return iter(indices.tolist())
+
+    def __len__(self):
+        return self.part_length - self.start_index
+
+
+def get_host_rng_state():
+    """
+    Get states of Python and NumPy random generators.
+
+    Returns
+    -------
+    dict
+        RNG states.
+    """
+    return {"python": random.getstate(), "numpy": np.random.get_state()}
+
+
+def set_host_rng_state(state):
+    """
+    Set states of Python and NumPy random generators.
+
+    Parameters:
+    ----------
+    state : dict
+        RNG states, returned by `get_host_rng_state`.
+    """
+    random.setstate(state["python"])
+    np.random.set_state(state["numpy"])
+
+
+def load_train_position(file_path):
+    """
+    Load the training position of a mid-epoch checkpoint.
+
+    Parameters:
+    ----------
+    file_path : str
+        Path to position (`.iter`) file.
+
+    Returns
+    -------
+    dict
+        Training position with `epoch1` (number of the interrupted epoch, starting from 1) and `batch` (number of
+        processed batches of the epoch) items.
+    """
+    logging.info("Loading training position: {}".format(file_path))
+    with open(file_path, "rb") as f:
+        return pickle.load(f)
+
+
+class IterCheckpointSaver(object):
+    """
+    Saver of mid-epoch checkpoints. Checkpoint files are saved by `TrainLogParamSaver` and the position file is
+    written after them (by the same ordered writer), so an existing position file means a complete checkpoint.
+
+    Parameters:
+    ----------
+    lp_saver : TrainLogParamSaver
+        Train logger, which saves checkpoint files.
+    file_path_prefix : str
+        Path prefix for checkpoint files (the epoch and batch numbers are appended).
+    interval : int
+        Saving interval in iterations.
+    last_file_stem : str or None, default None
+        File stem of an existing mid-epoch checkpoint (of the resumed training), which is removed as an outdated one
+        (only if it has the path prefix of this saver).
+    """
+    def __init__(self,
+                 lp_saver,
+                 file_path_prefix,
+                 interval,
+                 last_file_stem=None):
+        super(IterCheckpointSaver, self).__init__()
+        assert (interval > 0)
+        self.lp_saver = lp_saver
+        self.file_path_prefix = file_path_prefix
+        self.interval = interval
+        if (last_file_stem is not None) and\
+                not os.path.abspath(last_file_stem).startswith(os.path.abspath(file_path_prefix)):
+            last_file_stem = None
+        self.last_file_stem = last_file_stem
+
+    def need_save(self, batch):
+        """
+        Check whether a checkpoint should be saved after a number of processed batches of an epoch.
+
+        Parameters:
+        ----------
+        batch : int
+            Number of processed batches.
+
+        Returns
+        -------
+        bool
+            Whether to save a checkpoint.
+        """
+        return (batch % self.interval) == 0
+
+    def save(self,
+             epoch1,
+             batch,
+             position,
+             **kwargs):
+        """
+        Save a mid-epoch checkpoint and remove the previous one.
+
+        Parameters:
+        ----------
+        epoch1 : int
+            Epoch number (starting from 1).
+        batch : int
+            Number of processed batches of the epoch.
+        position : dict
+            Training position data (host objects only, as it's pickled in background).
+        kwargs : dict
+            Keyword arguments for the checkpoint saving of `TrainLogParamSaver`.
+        """
+        file_stem = "{}_{:04d}_{:06d}".format(self.file_path_prefix, epoch1, batch)
+        self.lp_saver.save_checkpoint(file_stem, **kwargs)
+
+        position = dict(position, epoch1=epoch1, batch=batch)
+        last_file_stem = self.last_file_stem
+
+        # A single operation, so that a writer with one pending operation doesn't wait for the checkpoint saving:
+        def write_position():
+            position_file_path = file_stem + _position_file_ext
+            tmp_file_path = position_file_path + ".tmp"
+            with open(tmp_file_path, "wb") as f:
+                pickle.dump(position, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_file_path, position_file_path)
+            if last_file_stem is not None:
+                self._remove_checkpoint_files(last_file_stem)
+        self.lp_saver.file_writer.submit(write_position)
+        self.last_file_stem = file_stem
+
+    def end_epoch(self, epoch1):
+        """
+        Remove the last mid-epoch checkpoint if it's outdated by the epoch checkpoint.
+
+        Parameters:
+        ----------
+        epoch1 : int
+            Epoch number (starting from 1).
+        """
+        if (self.last_file_stem is not None) and\
+                ((epoch1 % self.lp_saver.save_interval == 0) or (epoch1 == self.lp_saver.num_epochs)):
+            last_file_stem = self.last_file_stem
+            self.lp_saver.file_writer.submit(lambda: self._remove_checkpoint_files(last_file_stem))
+            self.last_file_stem = None
+
+    def _remove_checkpoint_files(self, file_stem):
+        """
+        Remove the position file and then checkpoint files.
+        """
+        for ext in (_position_file_ext,) + tuple(self.lp_saver.checkpoint_file_exts):
+            file_path = file_stem + ext
+            if os.path.exists(file_path):
+                os.remove(file_path)
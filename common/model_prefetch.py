@@ -0,0 +1,61 @@
+"""
+    Bulk prefetching of pretrained models for several frameworks into their model stores.
+"""
+
+__all__ = ['prefetch']
+
+import logging
+import importlib
+from concurrent.futures import ThreadPoolExecutor
+
+
+_model_store_module_names = {
+    "gluon": "gluon.gluoncv2.models.model_store",
+    "pytorch": "pytorch.pytorchcv.models.model_store",
+    "chainer": "chainer_.chainercv2.models.model_store",
+    "keras": "keras_.kerascv.models.model_store",
+    "tensorflow": "tensorflow_.tensorflowcv.models.model_store",
+}
+
+
+def prefetch(models=None,
+             frameworks=None,
+             num_workers=8):
+    """
+    Download pretrained models for several frameworks concurrently (through a single thread pool). Models are stored
+    in the default location of each framework (or in the shared `IMGCLSMOB_MODEL_STORE` directory).
+
+    Parameters:
+    ----------
+    models : list of str or None, default None
+        Names of the models (all available models if None). Models without pretrained weights for some framework are
+        skipped for it.
+    frameworks : list of str or None, default None
+        Framework names ('gluon', 'pytorch', 'chainer', 'keras', 'tensorflow'); all frameworks if None.
+    num_workers : int, default 8
+        Number of downloading threads.
+
+    Returns
+    -------
+    dict of (str, str) to str
+        Paths to the pretrained model files for (framework, model) pairs.
+    """
+    if frameworks is None:
+        frameworks = list(_model_store_module_names.keys())
+
+    tasks = []
+    for fwk in frameworks:
+        if fwk not in _model_store_module_names:
+            raise ValueError("Unknown framework: {}".format(fwk))
+        model_store = importlib.import_module(_model_store_module_names[fwk])
+        fwk_models = sorted(model_store._model_sha1.keys()) if models is None else models
+        for model_name in fwk_models:
+            if model_name in model_store._model_sha1:
+                tasks.append((fwk, model_name, model_store.get_model_file))
+            else:
+                logging.warning("Pretrained model {} is not available for {}, skipped".format(model_name, fwk))
+
+    with ThreadPoolExecutor(max_workers=max(1, num_workers)) as executor:
+        futures = [(fwk, model_name, executor.submit(get_model_file, model_name))
+                   for fwk, model_name, get_model_file in tasks]
+        return {(fwk, model_name): future.result() for fwk, model_name, future in futures}
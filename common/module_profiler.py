@@ -0,0 +1,201 @@
+"""
+    Per-module timing of a model forward pass (framework independent part).
+
+    Framework adapters (`pytorch.module_profiler`, `gluon.module_profiler`, `chainer_.module_profiler`) call
+    `ModuleProfiler.begin`/`ModuleProfiler.end` around the forward pass of each module (block, link). The profiler keeps
+    a stack of running modules, so that the self time of a module excludes the time of its submodules.
+"""
+
+__all__ = ['add_profiler_parser_arguments', 'ModuleProfiler', 'log_profile']
+
+import os
+import json
+import time
+import logging
+
+
+def add_profiler_parser_arguments(parser):
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='time the forward pass of each module on random batches, log the slowest modules and save a Chrome trace')
+    parser.add_argument(
+        '--profile-batches',
+        type=int,
+        default=10,
+        help='number of profiled batches (after one warm-up batch)')
+    parser.add_argument(
+        '--profile-top',
+        type=int,
+        default=20,
+        help='number of the slowest module types and modules to log')
+    parser.add_argument(
+        '--profile-trace-file',
+        type=str,
+        default='profile_trace.json',
+        help='file name of the Chrome trace (in the save directory), can be viewed in chrome://tracing')
+
+
+class ModuleProfiler(object):
+    """
+    Per-module timer.
+
+    Parameters:
+    ----------
+    sync_fn : function or None, default None
+        Function waiting for pending device computations (called at each module boundary for asynchronous backends).
+    """
+    def __init__(self,
+                 sync_fn=None):
+        super(ModuleProfiler, self).__init__()
+        self.sync_fn = sync_fn
+        self.enabled = False
+        self.num_batches = 0
+        self.stack = []
+        self.events = []
+
+    def begin(self, name, type_name):
+        """
+        Mark the start of a module forward pass.
+
+        Parameters:
+        ----------
+        name : str
+            Module name (path in the model).
+        type_name : str
+            Module type name.
+        """
+        if not self.enabled:
+            return
+        if self.sync_fn is not None:
+            self.sync_fn()
+        self.stack.append([name, type_name, time.perf_counter(), 0.0])
+
+    def end(self):
+        """
+        Mark the end of the most recently started module forward pass.
+        """
+        if (not self.enabled) or (not self.stack):
+            return
+        if self.sync_fn is not None:
+            self.sync_fn()
+        name, type_name, start, child_time = self.stack.pop()
+        duration = time.perf_counter() - start
+        if self.stack:
+            self.stack[-1][3] += duration
+        self.events.append((name, type_name, start, duration, duration - child_time, len(self.stack)))
+
+    def run(self,
+            forward_fn,
+            num_batches,
+            num_warmup_batches=1):
+        """
+        Profile several forward passes.
+
+        Parameters:
+        ----------
+        forward_fn : function
+            Function running a forward pass for a batch (and waiting for its result).
+        num_batches : int
+            Number of profiled batches.
+        num_warmup_batches : int, default 1
+            Number of batches run before profiling.
+        """
+        for _ in range(num_warmup_batches):
+            forward_fn()
+        self.enabled = True
+        try:
+            for _ in range(num_batches):
+                forward_fn()
+                self.num_batches += 1
+        finally:
+            self.enabled = False
+            self.stack = []
+
+    def get_stats(self, by_type=True):
+        """
+        Aggregate the timing by module type or by module name.
+
+        Parameters:
+        ----------
+        by_type : bool, default True
+            Whether to aggregate by module type (otherwise by module name).
+
+        Returns
+        -------
+        list of tuple of 5 elements
+            Key, module type, number of calls, total self time and total time (in seconds), sorted by self time.
+        """
+        stats = {}
+        for name, type_name, _, duration, self_duration, _ in self.events:
+            key = type_name if by_type else name
+            if key not in stats:
+                stats[key] = [type_name, 0, 0.0, 0.0]
+            stats[key][1] += 1
+            stats[key][2] += self_duration
+            stats[key][3] += duration
+        return sorted([(k,) + tuple(v) for k, v in stats.items()], key=lambda x: -x[3])
+
+    def save_chrome_trace(self, file_path):
+        """
+        Save recorded events in the Chrome trace event format.
+
+        Parameters:
+        ----------
+        file_path : str
+            Path to the output JSON file.
+        """
+        origin = min([event[2] for event in self.events]) if self.events else 0.0
+        trace_events = [{
+            "name": name,
+            "cat": type_name,
+            "ph": "X",
+            "ts": (start - origin) * 1e6,
+            "dur": duration * 1e6,
+            "pid": 0,
+            "tid": 0,
+            "args": {"type": type_name, "self_ms": self_duration * 1e3}}
+            for name, type_name, start, duration, self_duration, _ in self.events]
+        with open(file_path, "w") as f:
+            json.dump({"traceEvents": trace_events, "displayTimeUnit": "ms"}, f)
+
+
+def log_profile(profiler,
+                top=20,
+                trace_file_path=None):
+    """
+    Log the slowest module types and modules (by self time per batch), and save the Chrome trace.
+
+    Parameters:
+    ----------
+    profiler : ModuleProfiler
+        Profiler after a run.
+    top : int, default 20
+        Number of rows in each table.
+    trace_file_path : str or None, default None
+        Path to the Chrome trace file.
+    """
+    num_batches = max(profiler.num_batches, 1)
+    batch_time = sum([event[4] for event in profiler.events]) / num_batches
+
+    def format_table(title, stats):
+        lines = [title,
+                 "| {} | calls/batch | self, ms | self, % | total, ms |".format("module".ljust(40)),
+                 "|{}|------------:|---------:|--------:|----------:|".format("-" * 42)]
+        for key, _, calls, self_time, total_time in stats[:top]:
+            lines.append("| {} | {:11.1f} | {:8.3f} | {:7.2f} | {:9.3f} |".format(
+                key[-40:].ljust(40), calls / num_batches, self_time / num_batches * 1e3,
+                100.0 * self_time / num_batches / batch_time if batch_time > 0.0 else 0.0,
+                total_time / num_batches * 1e3))
+        return "\n".join(lines)
+
+    logging.info("Profile: {:.2f} ms per batch ({} batches)".format(batch_time * 1e3, profiler.num_batches))
+    logging.info(format_table("Slowest module types:", profiler.get_stats(by_type=True)))
+    logging.info(format_table("Slowest modules:", profiler.get_stats(by_type=False)))
+
+    if trace_file_path:
+        dir_path = os.path.dirname(trace_file_path)
+        if dir_path and not os.path.exists(dir_path):
+            os.makedirs(dir_path)
+        profiler.save_chrome_trace(trace_file_path)
+        logging.info("Chrome trace is saved to {}".format(trace_file_path))
@@ -0,0 +1,183 @@
+"""
+    Checking and benchmarking of exported ONNX models with ONNX Runtime (framework independent part).
+
+    Framework adapters (`pytorch.onnx_export`, `gluon.onnx_export`) export a model to an ONNX file with the input
+    named 'data' (NCHW, the batch axis is dynamic, the spatial axes optionally). This module validates such a file with
+    the ONNX checker, runs it on CPU with ONNX Runtime and measures latency/throughput at several thread counts.
+"""
+
+__all__ = ['parse_thread_counts', 'check_onnx_model', 'create_ort_session', 'run_ort_session',
+           'measure_ort_latency', 'log_onnx_table']
+
+import os
+import time
+import logging
+import numpy as np
+import onnx
+import onnxruntime as ort
+
+
+def parse_thread_counts(thread_counts):
+    """
+    Parse a list of thread counts.
+
+    Parameters:
+    ----------
+    thread_counts : str
+        Comma-separated thread counts (0 means the number of CPU cores).
+
+    Returns
+    -------
+    list of int
+        Thread counts.
+    """
+    counts = [int(x) for x in thread_counts.split(',') if x.strip()]
+    counts = [(x if x > 0 else os.cpu_count()) for x in counts]
+    return sorted(set(counts))
+
+
+def check_onnx_model(file_path):
+    """
+    Validate an ONNX file by the ONNX checker (with shape inference).
+
+    Parameters:
+    ----------
+    file_path : str
+        Path to the ONNX file.
+
+    Returns
+    -------
+    int
+        Number of nodes in the graph.
+    """
+    onnx.checker.check_model(file_path, full_check=True)
+    model = onnx.load(file_path)
+    return len(model.graph.node)
+
+
+def create_ort_session(file_path,
+                       num_threads=1):
+    """
+    Create an ONNX Runtime inference session on CPU with all graph optimizations.
+
+    Parameters:
+    ----------
+    file_path : str
+        Path to the ONNX file.
+    num_threads : int, default 1
+        Number of intra-op threads.
+
+    Returns
+    -------
+    InferenceSession
+        Session.
+    """
+    options = ort.SessionOptions()
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+    options.intra_op_num_threads = num_threads
+    options.inter_op_num_threads = 1
+    return ort.InferenceSession(
+        file_path,
+        sess_options=options,
+        providers=["CPUExecutionProvider"])
+
+
+def run_ort_session(session,
+                    x):
+    """
+    Run a session on a batch.
+
+    Parameters:
+    ----------
+    session : InferenceSession
+        Session.
+    x : np.array
+        Input batch.
+
+    Returns
+    -------
+    np.array
+        The first output.
+    """
+    return session.run(None, {session.get_inputs()[0].name: x.astype(np.float32)})[0]
+
+
+def measure_ort_latency(session,
+                        data_shape,
+                        num_iters=20):
+    """
+    Measure the average time of a session run on random data.
+
+    Parameters:
+    ----------
+    session : InferenceSession
+        Session.
+    data_shape : tuple of 4 int
+        Input shape.
+    num_iters : int, default 20
+        Number of timed runs.
+
+    Returns
+    -------
+    float
+        Time of a run (in seconds).
+    """
+    x = np.random.normal(size=data_shape).astype(np.float32)
+    for _ in range(3):
+        run_ort_session(session, x)
+    tic = time.time()
+    for _ in range(num_iters):
+        run_ort_session(session, x)
+    return (time.time() - tic) / num_iters
+
+
+def log_onnx_table(rows,
+                   thread_counts,
+                   batch_size,
+                   table_file_path=None):
+    """
+    Log (and save) a compatibility and speed table of exported models.
+
+    Parameters:
+    ----------
+    rows : list of tuple of 5 elements
+        Model name, status ('ok' or a short error message), maximal absolute error of logits (or None), framework
+        latency (in seconds, or None) and a list of ORT latency/throughput pairs for each thread count (or None).
+    thread_counts : list of int
+        Thread counts.
+    batch_size : int
+        Batch size of throughput measurement.
+    table_file_path : str or None, default None
+        Path to the Markdown file with the table.
+    """
+    def format_value(value, fmt):
+        return fmt.format(value) if value is not None else "-"
+
+    header = "| model | status | max abs err | framework, ms |"
+    delimiter = "|-------|--------|------------:|--------------:|"
+    for num_threads in thread_counts:
+        header += " ORT {0}t, ms | ORT {0}t, img/s |".format(num_threads)
+        delimiter += "----------:|-------------:|"
+    lines = [header, delimiter]
+    for model_name, status, max_abs_err, fwk_latency, ort_results in rows:
+        line = "| {} | {} | {} | {} |".format(
+            model_name, status, format_value(max_abs_err, "{:.2e}"),
+            format_value(fwk_latency * 1e3 if fwk_latency is not None else None, "{:.2f}"))
+        for i in range(len(thread_counts)):
+            latency, throughput = ort_results[i] if ort_results is not None else (None, None)
+            line += " {} | {} |".format(
+                format_value(latency * 1e3 if latency is not None else None, "{:.2f}"),
+                format_value(throughput, "{:.1f}"))
+        lines.append(line)
+    num_ok = len([row for row in rows if row[1] == "ok"])
+    logging.info("ONNX export of {}/{} models is successful (batch 1 latency, batch {} throughput):\n{}".format(
+        num_ok, len(rows), batch_size, "\n".join(lines)))
+
+    if table_file_path:
+        dir_path = os.path.dirname(table_file_path)
+        if dir_path and not os.path.exists(dir_path):
+            os.makedirs(dir_path)
+        with open(table_file_path, "w") as f:
+            f.write("\n".join(lines) + "\n")
+        logging.info("Table is saved to {}".format(table_file_path))
@@ -0,0 +1,167 @@
+"""
+    Progressive-resolution training schedule (framework independent).
+"""
+
+__all__ = ['add_resize_schedule_parser_arguments', 'parse_resize_schedule', 'get_epoch_input_size',
+           'scale_batch_size', 'ScheduledTrainData']
+
+import logging
+
+
+def add_resize_schedule_parser_arguments(parser):
+    parser.add_argument(
+        '--resize-schedule',
+        type=str,
+        default='',
+        help='training input sizes for epoch ranges, as comma-separated start_epoch:size pairs with 1-based epochs '
+             '(e.g. 1:128,16:160,31:224). The model input size is used before the first pair and for validation')
+    parser.add_argument(
+        '--resize-scale-batch',
+        action='store_true',
+        help='scale the training batch size inversely to the number of input pixels, to keep memory usage flat')
+
+
+def parse_resize_schedule(schedule):
+    """
+    Parse a progressive-resolution schedule.
+
+    Parameters:
+    ----------
+    schedule : str
+        Comma-separated `start_epoch:size` pairs (epochs are 1-based).
+
+    Returns
+    -------
+    list of tuple of two ints
+        Sorted pairs of 0-based start epochs and input sizes.
+    """
+    pairs = []
+    for item in schedule.split(','):
+        item = item.strip()
+        if not item:
+            continue
+        start_epoch1, size = item.split(':')
+        start_epoch1, size = int(start_epoch1), int(size)
+        assert (start_epoch1 >= 1) and (size > 0)
+        pairs.append((start_epoch1 - 1, size))
+    return sorted(pairs)
+
+
+def get_epoch_input_size(schedule,
+                         epoch,
+                         default_size):
+    """
+    Get the training input size for an epoch.
+
+    Parameters:
+    ----------
+    schedule : list of tuple of two ints
+        Parsed schedule.
+    epoch : int
+        0-based epoch number.
+    default_size : int
+        Size used before the first schedule entry.
+
+    Returns
+    -------
+    int
+        Input size.
+    """
+    size = default_size
+    for start_epoch, epoch_size in schedule:
+        if epoch >= start_epoch:
+            size = epoch_size
+    return size
+
+
+def scale_batch_size(batch_size,
+                     base_size,
+                     size,
+                     divisor=1):
+    """
+    Scale the batch size inversely to the number of input pixels.
+
+    Parameters:
+    ----------
+    batch_size : int
+        Batch size for the base input size.
+    base_size : int
+        Base input size.
+    size : int
+        Current input size.
+    divisor : int, default 1
+        The result is a multiple of this value (e.g. the number of devices).
+
+    Returns
+    -------
+    int
+        Scaled batch size.
+    """
+    scaled_batch_size = int(batch_size * float(base_size * base_size) / float(size * size))
+    return max(divisor, scaled_batch_size // divisor * divisor)
+
+
+class ScheduledTrainData(object):
+    """
+    Training data source, that is rebuilt when the input size (and the batch size) changes according to the schedule.
+
+    Parameters:
+    ----------
+    schedule : list of tuple of two ints
+        Parsed schedule.
+    base_size : int
+        Model input size (used before the first schedule entry).
+    batch_size : int
+        Batch size for the base input size.
+    create_fn : function
+        Function creating a data source for (input_size, batch_size).
+    scale_batch : bool, default False
+        Whether to scale the batch size inversely to the number of input pixels.
+    batch_size_divisor : int, default 1
+        Scaled batch sizes are multiples of this value (e.g. the number of devices).
+    """
+    def __init__(self,
+                 schedule,
+                 base_size,
+                 batch_size,
+                 create_fn,
+                 scale_batch=False,
+                 batch_size_divisor=1):
+        super(ScheduledTrainData, self).__init__()
+        self.schedule = schedule
+        self.base_size = base_size
+        self.batch_size = batch_size
+        self.create_fn = create_fn
+        self.scale_batch = scale_batch
+        self.batch_size_divisor = batch_size_divisor
+        self.input_size = None
+        self.epoch_batch_size = None
+        self.data = None
+
+    def get(self, epoch):
+        """
+        Get the training data source for an epoch.
+
+        Parameters:
+        ----------
+        epoch : int
+            0-based epoch number.
+
+        Returns
+        -------
+        tuple of 2 elements
+            Data source and its batch size.
+        """
+        input_size = get_epoch_input_size(self.schedule, epoch, self.base_size)
+        if self.scale_batch:
+            epoch_batch_size = scale_batch_size(self.batch_size, self.base_size, input_size, self.batch_size_divisor)
+        else:
+            epoch_batch_size = self.batch_size
+        if (input_size, epoch_batch_size) != (self.input_size, self.epoch_batch_size):
+            logging.info('[Epoch {}] training input size: {}, batch size: {}'.format(
+                epoch + 1, input_size, epoch_batch_size))
+            self.data = None
+            self.data = self.create_fn(input_size, epoch_batch_size)
+            self.input_size = input_size
+            self.epoch_batch_size = epoch_batch_size
+        return self.data, self.epoch_batch_size
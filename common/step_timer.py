@@ -0,0 +1,189 @@
+"""
+    Breakdown of training iteration time into phases (framework independent).
+
+    A training loop marks the end of each phase of an iteration: waiting for the data loader, host-to-device transfer,
+    forward pass (with the loss), backward pass, optimizer step and metric calculation. Phase times are aggregated as
+    percentiles per logging interval and per epoch and appended as JSON lines to a metrics file (next to `score.log`):
+
+        {"type": "interval", "epoch": 1, "batch": 49, "iterations": 50,
+         "data": {"mean": 12.1, "p50": 3.2, "p90": 40.5, "p99": 95.0}, ..., "total": {...}}
+        {"type": "epoch", "epoch": 1, "iterations": 5005, "data": {..., "share": 0.15}, ..., "total": {...}}
+
+    Times are in milliseconds, `share` is the fraction of the total iteration time of the epoch.
+"""
+
+__all__ = ['add_step_timing_parser_arguments', 'StepTimer']
+
+import os
+import json
+import time
+import logging
+import numpy as np
+
+
+def add_step_timing_parser_arguments(parser):
+    parser.add_argument(
+        '--step-timing',
+        action='store_true',
+        help='measure times of data waiting, transfer, forward, backward, optimizer step and metrics in training '
+             'iterations (synchronizes the device after each phase, which slows training down a bit) and write them '
+             'to `step_timing.jsonl` in the save directory')
+
+
+class StepTimer(object):
+    """
+    Timer of training iteration phases. A disabled timer does nothing (and doesn't synchronize the device).
+
+    Parameters:
+    ----------
+    enabled : bool, default True
+        Whether to measure times.
+    file_path : str or None, default None
+        Path to JSONL metrics file (records are appended), nothing is written if None.
+    sync_fn : function or None, default None
+        Function, which waits for the completion of asynchronous device computations before taking a time.
+    phases : tuple of str
+        Names of iteration phases.
+    percentiles : tuple of int, default (50, 90, 99)
+        Percentiles of phase times.
+    """
+    def __init__(self,
+                 enabled=True,
+                 file_path=None,
+                 sync_fn=None,
+                 phases=("data", "transfer", "forward", "backward", "step", "metrics"),
+                 percentiles=(50, 90, 99)):
+        super(StepTimer, self).__init__()
+        self.enabled = enabled
+        self.file_path = file_path
+        self.sync_fn = sync_fn
+        self.phases = tuple(phases)
+        self.percentiles = percentiles
+
+        self.phase_indices = {phase: i for i, phase in enumerate(phases)}
+        self.epoch1 = 0
+        self.last_time = 0.0
+        self.iter_times = [0.0] * len(phases)
+        self.interval_rows = []
+        self.epoch_rows = []
+
+        if self.enabled and self.file_path:
+            dir_path = os.path.dirname(self.file_path)
+            if dir_path and not os.path.exists(dir_path):
+                os.makedirs(dir_path)
+
+    def _time(self):
+        if self.sync_fn is not None:
+            self.sync_fn()
+        return time.perf_counter()
+
+    def start_epoch(self, epoch1):
+        """
+        Start timing of an epoch (before the creation of the data iterator).
+
+        Parameters:
+        ----------
+        epoch1 : int
+            Epoch number (starting from 1).
+        """
+        if not self.enabled:
+            return
+        self.epoch1 = epoch1
+        self.iter_times = [0.0] * len(self.phases)
+        self.interval_rows = []
+        self.epoch_rows = []
+        self.last_time = self._time()
+
+    def mark(self, phase):
+        """
+        Mark the end of an iteration phase, the time since the previous mark is added to the phase.
+
+        Parameters:
+        ----------
+        phase : str
+            Phase name.
+        """
+        if not self.enabled:
+            return
+        curr_time = self._time()
+        self.iter_times[self.phase_indices[phase]] += curr_time - self.last_time
+        self.last_time = curr_time
+
+    def end_iteration(self):
+        """
+        Finish an iteration.
+        """
+        if not self.enabled:
+            return
+        self.interval_rows.append(self.iter_times)
+        self.epoch_rows.append(self.iter_times)
+        self.iter_times = [0.0] * len(self.phases)
+
+    def _calc_stats(self, rows):
+        times = 1000.0 * np.array(rows, dtype=np.float64)
+        times = np.concatenate((times, times.sum(axis=1, keepdims=True)), axis=1)
+        means = times.mean(axis=0)
+        percentile_values = np.percentile(times, self.percentiles, axis=0)
+        stats = {}
+        for i, name in enumerate(self.phases + ("total",)):
+            phase_stats = {"mean": float(means[i])}
+            for percentile, values in zip(self.percentiles, percentile_values):
+                phase_stats["p{}".format(percentile)] = float(values[i])
+            stats[name] = phase_stats
+        return stats
+
+    def _write_record(self, record):
+        if self.file_path:
+            with open(self.file_path, "a") as f:
+                f.write(json.dumps(record) + "\n")
+
+    def end_interval(self, batch):
+        """
+        Write statistics of iterations since the previous logging interval. Time spent in the logging isn't assigned
+        to any phase.
+
+        Parameters:
+        ----------
+        batch : int
+            Index of the last batch of the interval.
+        """
+        if not self.enabled:
+            return
+        if self.interval_rows:
+            record = {"type": "interval", "epoch": self.epoch1, "batch": batch, "iterations": len(self.interval_rows)}
+            record.update(self._calc_stats(self.interval_rows))
+            self._write_record(record)
+            self.interval_rows = []
+        self.last_time = self._time()
+
+    def end_epoch(self):
+        """
+        Write and log statistics of the epoch.
+
+        Returns
+        -------
+        dict or None
+            Statistics of phases (None for a disabled timer or an empty epoch).
+        """
+        if not self.enabled or not self.epoch_rows:
+            return None
+        if self.interval_rows:
+            self.end_interval(batch=(len(self.epoch_rows) - 1))
+        stats = self._calc_stats(self.epoch_rows)
+        epoch_time = sum(sum(row) for row in self.epoch_rows)
+        for i, phase in enumerate(self.phases):
+            phase_time = sum(row[i] for row in self.epoch_rows)
+            stats[phase]["share"] = (phase_time / epoch_time) if epoch_time > 0.0 else 0.0
+        record = {"type": "epoch", "epoch": self.epoch1, "iterations": len(self.epoch_rows)}
+        record.update(stats)
+        self._write_record(record)
+        self.epoch_rows = []
+
+        logging.info('[Epoch {}] step time (share, p50/p90 ms): {}\ttotal={:.1f}/{:.1f}'.format(
+            self.epoch1,
+            "\t".join(["{}={:.1%} ({:.1f}/{:.1f})".format(
+                phase, stats[phase]["share"], stats[phase].get("p50", 0.0), stats[phase].get("p90", 0.0))
+                for phase in self.phases]),
+            stats["total"].get("p50", 0.0),
+            stats["total"].get("p90", 0.0)))
+        return stats
@@ -0,0 +1,241 @@
+"""
+    Cache of teacher logits for knowledge distillation (framework independent).
+
+    Teacher logits are computed once for each augmentation view of the training set (a view is a pass over the dataset
+    with random transforms, that are made reproducible by seeding them with a value derived from the augmentation seed,
+    the view number and the sample index). Only the top-k logits of each sample are kept, as two memory-mappable NumPy
+    files (values and class indices), keyed by sample index. The student training loop reads them alongside batches,
+    epoch `e` uses view `e % num_views`.
+"""
+
+__all__ = ['add_teacher_parser_arguments', 'get_sample_seed', 'split_sample_key', 'ViewSampler',
+           'get_teacher_cache_file_stem', 'create_teacher_cache', 'TeacherLogitsCache']
+
+import os
+import logging
+import numpy as np
+
+
+def add_teacher_parser_arguments(parser):
+    parser.add_argument(
+        '--teacher',
+        type=str,
+        default='',
+        help='name of a pretrained teacher model for knowledge distillation (its logits are precomputed and cached)')
+    parser.add_argument(
+        '--teacher-cache-dir',
+        type=str,
+        default='',
+        help='directory with cached teacher logits (the save directory by default)')
+    parser.add_argument(
+        '--teacher-num-views',
+        type=int,
+        default=4,
+        help='number of cached augmentation views of the training set (epoch e uses view e %% n)')
+    parser.add_argument(
+        '--teacher-topk',
+        type=int,
+        default=10,
+        help='number of cached top logits for each sample')
+    parser.add_argument(
+        '--aug-seed',
+        type=int,
+        default=1,
+        help='seed of reproducible augmentations (shared by the teacher cache and the student)')
+    parser.add_argument(
+        '--kd-temperature',
+        type=float,
+        default=1.0,
+        help='distillation temperature')
+    parser.add_argument(
+        '--kd-alpha',
+        type=float,
+        default=0.9,
+        help='weight of the distillation loss (the weight of the ground truth loss is 1 - alpha)')
+
+
+def get_sample_seed(aug_seed,
+                    view,
+                    index):
+    """
+    Get the seed of random transforms for a sample in an augmentation view.
+
+    Parameters:
+    ----------
+    aug_seed : int
+        Augmentation seed.
+    view : int
+        Augmentation view number.
+    index : int
+        Sample index.
+
+    Returns
+    -------
+    int
+        Seed value (a nonnegative 31-bit integer).
+    """
+    return ((aug_seed * 1000003 + view) * 2000003 + index) % 2147483647
+
+
+def split_sample_key(key,
+                     num_samples):
+    """
+    Split a sample key, produced by `ViewSampler`, into the augmentation view number and the sample index.
+    """
+    return key // num_samples, key % num_samples
+
+
+class ViewSampler(object):
+    """
+    Sampler wrapper, which tags sample indices with the current augmentation view (`view * num_samples + index`).
+    It works in the main process, so changing the view between epochs reaches data loader workers too.
+
+    Parameters:
+    ----------
+    sampler : iterable of int
+        Base sampler.
+    num_samples : int
+        Number of samples in the dataset.
+    view : int, default 0
+        Initial augmentation view number.
+    """
+    def __init__(self,
+                 sampler,
+                 num_samples,
+                 view=0):
+        super(ViewSampler, self).__init__()
+        self.sampler = sampler
+        self.num_samples = num_samples
+        self.view = view
+
+    def __iter__(self):
+        offset = self.view * self.num_samples
+        for index in self.sampler:
+            yield offset + index
+
+    def __len__(self):
+        return len(self.sampler)
+
+
+def get_teacher_cache_file_stem(cache_dir_path,
+                                teacher_name,
+                                aug_seed,
+                                view,
+                                input_image_size,
+                                top_k):
+    """
+    Get the path stem for teacher cache files of an augmentation view.
+    """
+    if isinstance(input_image_size, int):
+        input_image_size = (input_image_size, input_image_size)
+    return os.path.join(
+        cache_dir_path,
+        "teacher_{}_{}x{}_seed{}_view{}_top{}".format(
+            teacher_name, input_image_size[0], input_image_size[1], aug_seed, view, top_k))
+
+
+def create_teacher_cache(file_stem,
+                         num_samples,
+                         top_k,
+                         logits_iter):
+    """
+    Compress teacher logits of an augmentation view and store them as a memory-mappable cache.
+
+    Parameters:
+    ----------
+    file_stem : str
+        Path stem for cache files.
+    num_samples : int
+        Number of samples in the dataset.
+    top_k : int
+        Number of kept logits for each sample.
+    logits_iter : iterable of tuple of two np.array
+        Batches of sample indices and the corresponding teacher logits.
+    """
+    dir_path = os.path.dirname(file_stem)
+    if dir_path and not os.path.exists(dir_path):
+        os.makedirs(dir_path)
+
+    # Write into temporary files and rename them at the end, so that an interrupted build is never picked up:
+    values_tmp_file_path = file_stem + "_values.tmp.npy"
+    classes_tmp_file_path = file_stem + "_classes.tmp.npy"
+    values = np.lib.format.open_memmap(
+        filename=values_tmp_file_path,
+        mode='w+',
+        dtype=np.float16,
+        shape=(num_samples, top_k))
+    classes = np.lib.format.open_memmap(
+        filename=classes_tmp_file_path,
+        mode='w+',
+        dtype=np.int16,
+        shape=(num_samples, top_k))
+    filled = np.zeros((num_samples,), dtype=np.bool_)
+
+    for indices, logits in logits_iter:
+        assert (logits.shape[1] <= np.iinfo(np.int16).max)
+        batch_classes = np.argpartition(-logits, kth=(top_k - 1), axis=1)[:, :top_k]
+        values[indices] = np.take_along_axis(logits, batch_classes, axis=1)
+        classes[indices] = batch_classes
+        filled[indices] = True
+    assert filled.all(), "Teacher logits are missing for some samples"
+
+    values.flush()
+    classes.flush()
+    del values
+    del classes
+    os.replace(classes_tmp_file_path, file_stem + "_classes.npy")
+    os.replace(values_tmp_file_path, file_stem + "_values.npy")
+    logging.info("Teacher cache <{}> is created".format(file_stem))
+
+
+class TeacherLogitsCache(object):
+    """
+    Reader of cached top-k teacher logits of an augmentation view.
+
+    Parameters:
+    ----------
+    file_stem : str
+        Path stem for cache files.
+    """
+    def __init__(self,
+                 file_stem):
+        super(TeacherLogitsCache, self).__init__()
+        self.values = np.load(file_stem + "_values.npy", mmap_mode='r')
+        self.classes = np.load(file_stem + "_classes.npy", mmap_mode='r')
+        assert (self.values.shape == self.classes.shape)
+
+    @staticmethod
+    def exists(file_stem):
+        return os.path.exists(file_stem + "_values.npy") and os.path.exists(file_stem + "_classes.npy")
+
+    def __len__(self):
+        return self.values.shape[0]
+
+    def get_soft_targets(self,
+                         indices,
+                         num_classes,
+                         temperature=1.0):
+        """
+        Get teacher class probabilities for samples (the probability mass is spread over the cached top-k classes).
+
+        Parameters:
+        ----------
+        indices : np.array of int
+            Sample indices.
+        num_classes : int
+            Number of classes.
+        temperature : float, default 1.0
+            Distillation temperature.
+
+        Returns
+        -------
+        np.array
+            Soft targets of shape (len(indices), num_classes).
+        """
+        indices = np.asarray(indices)
+        values = self.values[indices].astype(np.float32) / temperature
+        values = np.exp(values - values.max(axis=1, keepdims=True))
+        values /= values.sum(axis=1, keepdims=True)
+        soft_targets = np.zeros((len(indices), num_classes), dtype=np.float32)
+        np.put_along_axis(soft_targets, self.classes[indices].astype(np.int64), values, axis=1)
+        return soft_targets
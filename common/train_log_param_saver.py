@@ -1,5 +1,92 @@
 import os
 import shutil
+import atexit
+import logging
+import threading
+try:
+    import queue
+except ImportError:
+    import Queue as queue
+
+
+class CheckpointFileWriter(object):
+    """
+    Executor for checkpoint file operations. Operations are executed in submission order, either immediately (on the
+    calling thread) or on a background thread with a bounded number of pending operations.
+
+    Parameters:
+    ----------
+    max_pending : int
+        Maximal number of pending (not finished) operations. If 0 then operations are executed synchronously.
+    """
+    def __init__(self,
+                 max_pending=0):
+        super(CheckpointFileWriter, self).__init__()
+        assert (max_pending >= 0)
+        self.max_pending = max_pending
+        self.error = None
+        if self.max_pending > 0:
+            self.task_queue = queue.Queue(maxsize=self.max_pending)
+            self.thread = threading.Thread(target=self._worker)
+            self.thread.daemon = True
+            self.thread.start()
+            atexit.register(self.close)
+        else:
+            self.task_queue = None
+            self.thread = None
+
+    def _worker(self):
+        while True:
+            task = self.task_queue.get()
+            try:
+                if task is None:
+                    break
+                if self.error is None:
+                    task()
+            except Exception as e:
+                logging.error("Checkpoint writing failed: {}".format(e))
+                self.error = e
+            finally:
+                self.task_queue.task_done()
+
+    def _check_error(self):
+        if self.error is not None:
+            error = self.error
+            self.error = None
+            raise error
+
+    def submit(self, task):
+        """
+        Execute (or enqueue) a file operation. Blocks when there are `max_pending` operations in flight.
+
+        Parameters:
+        ----------
+        task : function
+            Operation without arguments.
+        """
+        self._check_error()
+        if self.task_queue is None:
+            task()
+        else:
+            self.task_queue.put(task)
+
+    def flush(self):
+        """
+        Wait for all pending operations.
+        """
+        if self.task_queue is not None:
+            self.task_queue.join()
+        self._check_error()
+
+    def close(self):
+        """
+        Wait for all pending operations and stop the background thread (does nothing on the background thread itself,
+        e.g. when the last reference to the owner is released by a finished operation).
+        """
+        if (self.thread is not None) and self.thread.is_alive() and (self.thread is not threading.current_thread()):
+            self.task_queue.put(None)
+            self.thread.join()
+        self._check_error()
 
 
 class TrainLogParamSaver(object):
@@ -29,6 +116,13 @@ class TrainLogParamSaver(object):
         count of the best checkpoint files
     checkpoint_file_save_callback : function or None
         Callback for real saving of checkpoint file
+    checkpoint_file_snapshot_callback : function or None
+        Callback for taking a host memory snapshot of checkpoint data on the training thread. It gets keyword arguments
+        of `epoch_test_end_callback` and returns a dict, which is passed to `checkpoint_file_save_callback` instead
+        of them. If None then `checkpoint_file_save_callback` gets keyword arguments of `epoch_test_end_callback`
+    max_pending_saves : int
+        Maximal number of checkpoints being written in background (requires `checkpoint_file_snapshot_callback`)
+        if 0 then checkpoints are written on the training thread
     checkpoint_file_exts : tuple of str
         List of checkpoint file extensions
     save_interval : int
@@ -56,6 +150,8 @@ class TrainLogParamSaver(object):
                  last_checkpoint_file_count=2,
                  best_checkpoint_file_count=2,
                  checkpoint_file_save_callback=None,
+                 checkpoint_file_snapshot_callback=None,
+                 max_pending_saves=0,
                  checkpoint_file_exts=('.params',),
                  save_interval=1,
                  num_epochs=-1,
@@ -95,8 +191,12 @@ class TrainLogParamSaver(object):
         self.best_checkpoint_file_count = best_checkpoint_file_count
 
         self.checkpoint_file_save_callback = checkpoint_file_save_callback
+        self.checkpoint_file_snapshot_callback = checkpoint_file_snapshot_callback
         self.checkpoint_file_exts = checkpoint_file_exts
 
+        assert (max_pending_saves == 0) or (checkpoint_file_snapshot_callback is not None)
+        self.file_writer = CheckpointFileWriter(max_pending=max_pending_saves)
+
         assert (save_interval > 0)
         self.save_interval = save_interval
 
@@ -153,6 +253,7 @@ class TrainLogParamSaver(object):
         """
         Releasing resources.
         """
+        self.file_writer.close()
         if self.score_log_file is not None:
             self.score_log_file.close()
         if self.best_map_log_file is not None:
@@ -161,46 +262,63 @@ class TrainLogParamSaver(object):
     def epoch_test_end_callback(self,
                                 epoch1,
                                 params,
+                                src_checkpoint_file_stem=None,
                                 **kwargs):
+        """
+        Log evaluation metric values of an epoch and save the last/best checkpoints.
+
+        Parameters:
+        ----------
+        epoch1 : int
+            Epoch number (starting from 1).
+        params : list of float
+            Evaluation metric values (in the order of `param_names`).
+        src_checkpoint_file_stem : str or None, default None
+            File stem of the already saved checkpoint of the epoch (e.g. a validated one), which is linked instead of
+            saving a new one from keyword arguments.
+        """
         curr_acc = params[self.acc_ind]
         if self.can_save:
+            need_last = (epoch1 % self.save_interval == 0) or (epoch1 == self.num_epochs)
+            need_best = (self.best_eval_metric_value is None) or (curr_acc < self.best_eval_metric_value)
+
+            # The snapshot (a device-to-host copy) is taken only if some checkpoint is really stored:
+            if (src_checkpoint_file_stem is not None) or not (need_last or need_best):
+                snapshot = None
+            elif self.checkpoint_file_snapshot_callback is not None:
+                snapshot = self.checkpoint_file_snapshot_callback(**kwargs)
+            else:
+                snapshot = kwargs
+
+            def store_checkpoint(file_stem):
+                if src_checkpoint_file_stem is not None:
+                    self._link_checkpoint(src_checkpoint_file_stem, file_stem)
+                else:
+                    self._save_checkpoint(file_stem, snapshot)
+
             last_checkpoint_params_file_stem = None
-            if (epoch1 % self.save_interval == 0) or (epoch1 == self.num_epochs):
+            if need_last:
                 last_checkpoint_params_file_stem = self._get_last_checkpoint_params_file_stem(epoch1, curr_acc)
-                self.checkpoint_file_save_callback(last_checkpoint_params_file_stem, **kwargs)
+                store_checkpoint(last_checkpoint_params_file_stem)
 
                 self.last_checkpoint_params_file_stems.append(last_checkpoint_params_file_stem)
                 if len(self.last_checkpoint_params_file_stems) > self.last_checkpoint_file_count:
-                    removed_checkpoint_file_stem = self.last_checkpoint_params_file_stems[0]
-                    for ext in self.checkpoint_file_exts:
-                        removed_checkpoint_file_path = removed_checkpoint_file_stem + ext
-                        if os.path.exists(removed_checkpoint_file_path):
-                            os.remove(removed_checkpoint_file_path)
+                    self._remove_checkpoint(self.last_checkpoint_params_file_stems[0])
                     del self.last_checkpoint_params_file_stems[0]
 
-            if (self.best_eval_metric_value is None) or (curr_acc < self.best_eval_metric_value):
+            if need_best:
                 self.best_eval_metric_value = curr_acc
                 self.best_eval_metric_epoch = epoch1
                 best_checkpoint_params_file_stem = self._get_best_checkpoint_params_file_stem(epoch1, curr_acc)
 
                 if last_checkpoint_params_file_stem is not None:
-                    for ext in self.checkpoint_file_exts:
-                        last_checkpoint_params_file_path = last_checkpoint_params_file_stem + ext
-                        best_checkpoint_params_file_path = best_checkpoint_params_file_stem + ext
-                        assert (os.path.exists(last_checkpoint_params_file_path))
-                        shutil.copy(
-                            src=last_checkpoint_params_file_path,
-                            dst=best_checkpoint_params_file_path)
+                    self._link_checkpoint(last_checkpoint_params_file_stem, best_checkpoint_params_file_stem)
                 else:
-                    self.checkpoint_file_save_callback(best_checkpoint_params_file_stem, **kwargs)
+                    store_checkpoint(best_checkpoint_params_file_stem)
 
                 self.best_checkpoint_params_file_stems.append(best_checkpoint_params_file_stem)
                 if len(self.best_checkpoint_params_file_stems) > self.best_checkpoint_file_count:
-                    removed_checkpoint_file_stem = self.best_checkpoint_params_file_stems[0]
-                    for ext in self.checkpoint_file_exts:
-                        removed_checkpoint_file_path = removed_checkpoint_file_stem + ext
-                        if os.path.exists(removed_checkpoint_file_path):
-                            os.remove(removed_checkpoint_file_path)
+                    self._remove_checkpoint(self.best_checkpoint_params_file_stems[0])
                     del self.best_checkpoint_params_file_stems[0]
 
                 if self.best_map_log_file is not None:
@@ -213,6 +331,82 @@ class TrainLogParamSaver(object):
             self.score_log_file.write(score_log_file_row)
             self.score_log_file.flush()
 
+    def flush(self):
+        """
+        Wait for all pending checkpoint file operations.
+        """
+        self.file_writer.flush()
+
+    def save_checkpoint(self,
+                        file_stem,
+                        **kwargs):
+        """
+        Save a checkpoint with an arbitrary file stem (e.g. into a validation queue) by the checkpoint writer.
+
+        Parameters:
+        ----------
+        file_stem : str
+            Path of checkpoint files without extension.
+        kwargs : dict
+            Keyword arguments as for `epoch_test_end_callback`.
+        """
+        assert self.can_save
+        if self.checkpoint_file_snapshot_callback is not None:
+            snapshot = self.checkpoint_file_snapshot_callback(**kwargs)
+        else:
+            snapshot = kwargs
+        self._save_checkpoint(file_stem, snapshot)
+
+    def remove_checkpoint(self,
+                          file_stem):
+        """
+        Remove checkpoint files (after all pending operations with them).
+
+        Parameters:
+        ----------
+        file_stem : str
+            Path of checkpoint files without extension.
+        """
+        self._remove_checkpoint(file_stem)
+
+    def _save_checkpoint(self, file_stem, snapshot):
+        """
+        Save checkpoint files via temporary files, which are atomically renamed after the saving.
+        """
+        def task():
+            tmp_file_stem = file_stem + ".tmp"
+            self.checkpoint_file_save_callback(tmp_file_stem, **snapshot)
+            for ext in self.checkpoint_file_exts:
+                os.replace(tmp_file_stem + ext, file_stem + ext)
+        self.file_writer.submit(task)
+
+    def _link_checkpoint(self, src_file_stem, dst_file_stem):
+        """
+        Duplicate checkpoint files by hard links (by copying if the file system doesn't support hard links).
+        """
+        def task():
+            for ext in self.checkpoint_file_exts:
+                src_file_path = src_file_stem + ext
+                dst_file_path = dst_file_stem + ext
+                assert (os.path.exists(src_file_path))
+                if os.path.exists(dst_file_path):
+                    os.remove(dst_file_path)
+                try:
+                    os.link(src_file_path, dst_file_path)
+                except (OSError, AttributeError):
+                    shutil.copy(
+                        src=src_file_path,
+                        dst=dst_file_path)
+        self.file_writer.submit(task)
+
+    def _remove_checkpoint(self, file_stem):
+        def task():
+            for ext in self.checkpoint_file_exts:
+                file_path = file_stem + ext
+                if os.path.exists(file_path):
+                    os.remove(file_path)
+        self.file_writer.submit(task)
+
     @staticmethod
     def _create_checkpoint_file_path_full_prefix(checkpoint_dir_path,
                                                  checkpoint_file_name_prefix,
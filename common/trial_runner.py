@@ -0,0 +1,372 @@
+"""
+    Runner of concurrent training trials over a hyperparameter grid (framework independent part).
+
+    Each trial is a training script process with its own save directory (`score.log`, checkpoints, stdout) and a
+    disjoint set of CPU cores, thread pools of the process are limited to the size of the set. The state of a trial is
+    kept in `trial.json` of its directory, so an interrupted run is continued by the same command: finished trials are
+    skipped, others are resumed from their last checkpoints.
+"""
+
+__all__ = ['parse_grid', 'get_trial_name', 'split_cpu_sets', 'get_thread_env', 'find_last_checkpoint',
+           'read_score_log', 'Trial', 'run_trials', 'get_result_table', 'write_result_table']
+
+import os
+import re
+import json
+import time
+import itertools
+import subprocess
+import logging
+from collections import OrderedDict
+
+_trial_state_file_name = "trial.json"
+_score_log_file_name = "score.log"
+_stdout_file_name = "stdout.log"
+
+
+def parse_grid(grid_items):
+    """
+    Parse a hyperparameter grid.
+
+    Parameters:
+    ----------
+    grid_items : list of str
+        Items like 'lr=0.1,0.05' (parameter name is an option of a training script without leading dashes).
+
+    Returns
+    -------
+    list of OrderedDict
+        Parameters of trials (the cartesian product of parameter values, the last parameter changes fastest).
+    """
+    names = []
+    values_list = []
+    for item in grid_items:
+        name, sep, values = item.partition("=")
+        name = name.strip().lstrip("-")
+        assert sep and name, "Grid item should look like `name=value1,value2`: {}".format(item)
+        assert (name not in names), "Duplicated grid parameter: {}".format(name)
+        names.append(name)
+        values_list.append([x.strip() for x in values.split(",") if x.strip()])
+    return [OrderedDict(zip(names, values)) for values in itertools.product(*values_list)]
+
+
+def get_trial_name(params):
+    """
+    Get a name (directory name) of a trial from its parameters.
+    """
+    name = "_".join(["{}-{}".format(key.replace("-", ""), value) for key, value in params.items()])
+    return re.sub(r"[^\w.\-]", "-", name) if name else "trial"
+
+
+def split_cpu_sets(cpus,
+                   num_parallel,
+                   cpus_per_trial=0):
+    """
+    Split CPU cores into disjoint sets for concurrent trials.
+
+    Parameters:
+    ----------
+    cpus : list of int
+        Available CPU cores.
+    num_parallel : int
+        Number of concurrent trials.
+    cpus_per_trial : int, default 0
+        Number of cores per trial (all cores are shared evenly if 0).
+
+    Returns
+    -------
+    list of list of int
+        Core sets.
+    """
+    cpus = sorted(cpus)
+    assert (num_parallel > 0)
+    if cpus_per_trial <= 0:
+        cpus_per_trial = max(1, len(cpus) // num_parallel)
+    if num_parallel * cpus_per_trial > len(cpus):
+        logging.warning("Not enough CPU cores ({}) for {} trials with {} cores, core sets overlap".format(
+            len(cpus), num_parallel, cpus_per_trial))
+    return [[cpus[(i * cpus_per_trial + j) % len(cpus)] for j in range(cpus_per_trial)] for i in range(num_parallel)]
+
+
+def get_thread_env(num_threads):
+    """
+    Get environment variables limiting thread pools of numeric libraries.
+    """
+    value = str(num_threads)
+    return {
+        "OMP_NUM_THREADS": value,
+        "MKL_NUM_THREADS": value,
+        "OPENBLAS_NUM_THREADS": value,
+        "NUMEXPR_NUM_THREADS": value,
+    }
+
+
+def find_last_checkpoint(dir_path,
+                         checkpoint_file_exts):
+    """
+    Find the latest complete 'last' checkpoint saved by `TrainLogParamSaver`.
+
+    Parameters:
+    ----------
+    dir_path : str
+        Save directory of a trial.
+    checkpoint_file_exts : tuple of str
+        Checkpoint file extensions.
+
+    Returns
+    -------
+    tuple of int and str, or None
+        Epoch and file stem of the checkpoint.
+    """
+    if not os.path.exists(dir_path):
+        return None
+    pattern = re.compile(r"_last_(\d+)_[^_]+$")
+    checkpoints = []
+    for file_name in os.listdir(dir_path):
+        if not file_name.endswith(checkpoint_file_exts[0]):
+            continue
+        file_stem = os.path.join(dir_path, file_name[:-len(checkpoint_file_exts[0])])
+        match = pattern.search(file_stem)
+        if match and all(os.path.exists(file_stem + ext) for ext in checkpoint_file_exts):
+            checkpoints.append((int(match.group(1)), file_stem))
+    return max(checkpoints) if checkpoints else None
+
+
+def read_score_log(file_path):
+    """
+    Read a score log of `TrainLogParamSaver`.
+
+    Parameters:
+    ----------
+    file_path : str
+        Path to the score log.
+
+    Returns
+    -------
+    tuple of list of str and OrderedDict
+        Value names and values for each epoch (the latest row of an epoch, rows of a resumed trial are repeated).
+    """
+    names = []
+    values = OrderedDict()
+    if not os.path.exists(file_path):
+        return names, values
+    with open(file_path, "r") as f:
+        lines = [line.strip() for line in f if line.strip()]
+    if lines:
+        names = lines[0].split("\t")[2:]
+        for line in lines[1:]:
+            row = line.split("\t")
+            values[int(row[1])] = [float(x) for x in row[2:]]
+    return names, OrderedDict(sorted(values.items()))
+
+
+class Trial(object):
+    """
+    Training trial with a save directory.
+
+    Parameters:
+    ----------
+    params : OrderedDict
+        Grid parameters of the trial.
+    save_dir_path : str
+        Parent directory for trial directories.
+    """
+    def __init__(self,
+                 params,
+                 save_dir_path):
+        super(Trial, self).__init__()
+        self.params = params
+        self.name = get_trial_name(params)
+        self.dir_path = os.path.join(save_dir_path, self.name)
+        self.state = {"params": params, "status": "pending", "time": 0.0, "num_launches": 0}
+        state_file_path = os.path.join(self.dir_path, _trial_state_file_name)
+        if os.path.exists(state_file_path):
+            with open(state_file_path, "r") as f:
+                self.state.update(json.load(f))
+
+    @property
+    def finished(self):
+        return self.state["status"] == "finished"
+
+    def save_state(self):
+        if not os.path.exists(self.dir_path):
+            os.makedirs(self.dir_path)
+        state_file_path = os.path.join(self.dir_path, _trial_state_file_name)
+        tmp_file_path = state_file_path + ".tmp"
+        with open(tmp_file_path, "w") as f:
+            json.dump(self.state, f, indent=2)
+        os.replace(tmp_file_path, state_file_path)
+
+    def get_command(self,
+                    base_command,
+                    checkpoint_file_exts):
+        """
+        Get the command line of the trial, with resuming from the last checkpoint if it exists.
+        """
+        command = list(base_command)
+        for key, value in self.params.items():
+            command += ["--{}".format(key.replace("_", "-")), value]
+        command += ["--save-dir", self.dir_path]
+        last_checkpoint = find_last_checkpoint(self.dir_path, checkpoint_file_exts)
+        if last_checkpoint is not None:
+            epoch, file_stem = last_checkpoint
+            logging.info("Trial {} is resumed from epoch {}".format(self.name, epoch))
+            command += [
+                "--resume", file_stem + checkpoint_file_exts[0],
+                "--resume-state", file_stem + checkpoint_file_exts[1],
+                "--start-epoch", str(epoch + 1)]
+        return command
+
+
+def run_trials(trials,
+               base_command,
+               cpu_sets,
+               checkpoint_file_exts,
+               poll_interval=1.0,
+               env=None):
+    """
+    Run trials concurrently (one trial per CPU set), skipping finished ones.
+
+    Parameters:
+    ----------
+    trials : list of Trial
+        Trials.
+    base_command : list of str
+        Command line of the training script without grid parameters and the save directory.
+    cpu_sets : list of list of int
+        Disjoint CPU sets, the number of sets is the number of concurrent trials.
+    checkpoint_file_exts : tuple of str
+        Extensions of model and trainer state checkpoint files.
+    poll_interval : float, default 1.0
+        Interval of polling processes (in seconds).
+    env : dict or None, default None
+        Base environment of trials (the current one if None).
+
+    Returns
+    -------
+    int
+        Number of failed trials.
+    """
+    pending = [trial for trial in trials if not trial.finished]
+    logging.info("Trials: {} total, {} finished, {} to run on {} CPU sets".format(
+        len(trials), len(trials) - len(pending), len(pending), len(cpu_sets)))
+    can_pin = hasattr(os, "sched_setaffinity")
+    if not can_pin:
+        logging.warning("CPU affinity isn't supported on this platform, only thread counts are limited")
+
+    running = {}
+    num_failed = 0
+    try:
+        while pending or running:
+            for slot, (trial, process, stdout_file, tic) in list(running.items()):
+                return_code = process.poll()
+                if return_code is None:
+                    continue
+                stdout_file.close()
+                trial.state["time"] += time.time() - tic
+                trial.state["return_code"] = return_code
+                trial.state["status"] = "finished" if return_code == 0 else "failed"
+                trial.save_state()
+                if return_code != 0:
+                    num_failed += 1
+                    logging.error("Trial {} failed with code {} (see {})".format(
+                        trial.name, return_code, os.path.join(trial.dir_path, _stdout_file_name)))
+                else:
+                    logging.info("Trial {} is finished in {:.1f} sec".format(trial.name, trial.state["time"]))
+                del running[slot]
+
+            for slot, cpu_set in enumerate(cpu_sets):
+                if (slot in running) or (not pending):
+                    continue
+                trial = pending.pop(0)
+                command = trial.get_command(base_command, checkpoint_file_exts)
+                trial.state["status"] = "running"
+                trial.state["num_launches"] += 1
+                trial.state["cpus"] = cpu_set
+                trial.state["command"] = command
+                trial.save_state()
+
+                trial_env = dict(os.environ if env is None else env)
+                trial_env.update(get_thread_env(len(cpu_set)))
+                stdout_file = open(os.path.join(trial.dir_path, _stdout_file_name), "a")
+                process = subprocess.Popen(
+                    command,
+                    env=trial_env,
+                    stdout=stdout_file,
+                    stderr=subprocess.STDOUT,
+                    preexec_fn=((lambda cpus=cpu_set: os.sched_setaffinity(0, cpus)) if can_pin else None))
+                logging.info("Trial {} is started on CPUs {}".format(trial.name, cpu_set))
+                running[slot] = (trial, process, stdout_file, time.time())
+
+            if running:
+                time.sleep(poll_interval)
+    finally:
+        # Interrupted trials are left in the `running` state and are resumed by the next run:
+        for trial, process, stdout_file, tic in running.values():
+            if process.poll() is None:
+                process.terminate()
+                process.wait()
+            stdout_file.close()
+            trial.state["time"] += time.time() - tic
+            trial.save_state()
+    return num_failed
+
+
+def get_result_table(trials):
+    """
+    Collect results of trials from their score logs.
+
+    Parameters:
+    ----------
+    trials : list of Trial
+        Trials.
+
+    Returns
+    -------
+    tuple of list of str and list of list
+        Column names and rows (grid parameters, status, number of epochs, the best value of the first score log column
+        with its epoch, the last values and training time).
+    """
+    param_names = list(trials[0].params.keys()) if trials else []
+    score_logs = [read_score_log(os.path.join(trial.dir_path, _score_log_file_name)) for trial in trials]
+    value_names = max([names for names, _ in score_logs], key=len) if trials else []
+    columns = param_names + ["Status", "Epochs", "Best." + (value_names[0] if value_names else "Value"),
+                             "Best.Epoch"] + value_names + ["Time"]
+    rows = []
+    for trial, (_, values) in zip(trials, score_logs):
+        if values:
+            best_epoch = min(values.keys(), key=(lambda epoch: values[epoch][0]))
+            last_epoch = next(reversed(values))
+            best_value = values[best_epoch][0]
+            last_values = values[last_epoch]
+        else:
+            best_epoch, last_epoch, best_value, last_values = None, 0, None, []
+        last_values = last_values + [None] * (len(value_names) - len(last_values))
+        rows.append([trial.params[name] for name in param_names] +
+                    [trial.state["status"], last_epoch, best_value, best_epoch] + last_values + [trial.state["time"]])
+    return columns, rows
+
+
+def write_result_table(columns,
+                       rows,
+                       file_path):
+    """
+    Write a result table as a TSV file and log it as a Markdown table.
+    """
+    def format_value(value):
+        if value is None:
+            return "-"
+        if isinstance(value, float):
+            return "{:.4f}".format(value)
+        return str(value)
+
+    str_rows = [[format_value(x) for x in row] for row in rows]
+    with open(file_path, "w") as f:
+        f.write("\n".join(["\t".join(columns)] + ["\t".join(row) for row in str_rows]) + "\n")
+
+    widths = [max([len(columns[i])] + [len(row[i]) for row in str_rows]) for i in range(len(columns))]
+    lines = ["| " + " | ".join([name.ljust(width) for name, width in zip(columns, widths)]) + " |",
+             "|" + "|".join(["-" * (width + 2) for width in widths]) + "|"]
+    for row in str_rows:
+        lines.append("| " + " | ".join([value.rjust(width) for value, width in zip(row, widths)]) + " |")
+    logging.info("Results of {} trials ({}):\n{}".format(len(rows), file_path, "\n".join(lines)))
@@ -0,0 +1,263 @@
+"""
+    Preprocessed ImageNet-1K validation set cache (framework independent).
+
+    The cache holds centre-cropped uint8 images (in NCHW layout) together with labels as two memory-mappable NumPy
+    files, one pair per (input_image_size, resize_inv_factor). Evaluation scripts stream batches from it without any
+    JPEG decoding.
+"""
+
+__all__ = ['add_val_cache_parser_arguments', 'get_val_cache_file_stem', 'create_val_cache', 'prepare_val_cache',
+           'ValCache']
+
+import os
+import math
+import logging
+import multiprocessing
+import numpy as np
+from PIL import Image
+
+
+IMG_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.ppm', '.bmp', '.pgm', '.tif', '.tiff', '.webp')
+
+
+def add_val_cache_parser_arguments(parser):
+    parser.add_argument(
+        '--val-cache-dir',
+        type=str,
+        default='',
+        help='directory with preprocessed validation set caches (the cache is built from --data-dir if absent)')
+
+
+def get_val_cache_file_stem(cache_dir_path,
+                            input_image_size,
+                            resize_inv_factor):
+    """
+    Get the path stem for cache files.
+
+    Parameters:
+    ----------
+    cache_dir_path : str
+        Directory with cache files.
+    input_image_size : int or tuple of two ints
+        Spatial size of the cropped images.
+    resize_inv_factor : float
+        Inverted ratio for input image crop.
+
+    Returns
+    -------
+    str
+        Path stem (without '_data.npy'/'_labels.npy' suffixes).
+    """
+    if isinstance(input_image_size, int):
+        input_image_size = (input_image_size, input_image_size)
+    return os.path.join(
+        cache_dir_path,
+        "val_{}x{}_{:.4f}".format(input_image_size[0], input_image_size[1], resize_inv_factor))
+
+
+def _get_image_folder_samples(dir_path):
+    """
+    List samples of image folder dataset in the same order as torchvision/gluon `ImageFolder` does.
+    """
+    classes = sorted([d for d in os.listdir(dir_path) if os.path.isdir(os.path.join(dir_path, d))])
+    samples = []
+    for label, class_name in enumerate(classes):
+        class_dir_path = os.path.join(dir_path, class_name)
+        for root, _, file_names in sorted(os.walk(class_dir_path)):
+            for file_name in sorted(file_names):
+                if file_name.lower().endswith(IMG_EXTENSIONS):
+                    samples.append((os.path.join(root, file_name), label))
+    return samples
+
+
+def _load_and_crop_image(file_path,
+                         resize_value,
+                         input_image_size):
+    """
+    Decode an image, resize its shorter side to `resize_value` and take the central crop (as torchvision
+    `Resize` + `CenterCrop`).
+    """
+    img = Image.open(file_path).convert('RGB')
+    w, h = img.size
+    if w < h:
+        ow = resize_value
+        oh = int(resize_value * h / w)
+    else:
+        oh = resize_value
+        ow = int(resize_value * w / h)
+    img = img.resize((ow, oh), Image.BILINEAR)
+    th, tw = input_image_size
+    i = int(round((oh - th) / 2.0))
+    j = int(round((ow - tw) / 2.0))
+    img = img.crop((j, i, j + tw, i + th))
+    return np.asarray(img, dtype=np.uint8).transpose((2, 0, 1))
+
+
+def _fill_cache_chunk(args):
+    data_file_path, samples, start, resize_value, input_image_size = args
+    data = np.load(data_file_path, mmap_mode='r+')
+    for i, (file_path, _) in enumerate(samples):
+        data[start + i] = _load_and_crop_image(file_path, resize_value, input_image_size)
+    data.flush()
+    del data
+    return len(samples)
+
+
+def create_val_cache(data_dir,
+                     file_stem,
+                     input_image_size=(224, 224),
+                     resize_inv_factor=0.875,
+                     num_workers=4,
+                     chunk_size=500,
+                     samples_fn=None):
+    """
+    Decode the validation set once and store it as a memory-mappable cache.
+
+    Parameters:
+    ----------
+    data_dir : str
+        Path to directory with ImageNet-1K dataset (with 'val' subdirectory).
+    file_stem : str
+        Path stem for cache files.
+    input_image_size : int or tuple of two ints, default (224, 224)
+        Spatial size of the cropped images.
+    resize_inv_factor : float, default 0.875
+        Inverted ratio for input image crop.
+    num_workers : int, default 4
+        Number of decoding processes.
+    chunk_size : int, default 500
+        Number of images decoded by a worker in one task.
+    samples_fn : function or None, default None
+        Function of `data_dir`, which lists validation samples as (image file path, label) pairs. If None then they
+        are listed from 'val' subdirectory with class subfolders (the `ImageFolder` layout).
+    """
+    assert (resize_inv_factor > 0.0)
+    if isinstance(input_image_size, int):
+        input_image_size = (input_image_size, input_image_size)
+    resize_value = int(math.ceil(float(input_image_size[0]) / resize_inv_factor))
+
+    if samples_fn is not None:
+        samples = samples_fn(data_dir)
+    else:
+        samples = _get_image_folder_samples(os.path.join(data_dir, 'val'))
+    num_samples = len(samples)
+    assert (num_samples > 0)
+    logging.info("Creating validation cache <{}> for {} images...".format(file_stem, num_samples))
+
+    dir_path = os.path.dirname(file_stem)
+    if dir_path and not os.path.exists(dir_path):
+        os.makedirs(dir_path)
+
+    # Write into temporary files and rename them at the end, so that an interrupted build is never picked up:
+    data_tmp_file_path = file_stem + "_data.tmp.npy"
+    data = np.lib.format.open_memmap(
+        filename=data_tmp_file_path,
+        mode='w+',
+        dtype=np.uint8,
+        shape=(num_samples, 3) + input_image_size)
+    del data
+
+    tasks = [(data_tmp_file_path, samples[i:i + chunk_size], i, resize_value, input_image_size)
+             for i in range(0, num_samples, chunk_size)]
+    if num_workers > 1:
+        pool = multiprocessing.Pool(processes=num_workers)
+        try:
+            for _ in pool.imap_unordered(_fill_cache_chunk, tasks):
+                pass
+        finally:
+            pool.close()
+            pool.join()
+    else:
+        for task in tasks:
+            _fill_cache_chunk(task)
+
+    labels_tmp_file_path = file_stem + "_labels.tmp.npy"
+    np.save(labels_tmp_file_path, np.array([label for _, label in samples], dtype=np.int32))
+    os.replace(labels_tmp_file_path, file_stem + "_labels.npy")
+    os.replace(data_tmp_file_path, file_stem + "_data.npy")
+
+
+def prepare_val_cache(cache_dir_path,
+                      data_dir,
+                      input_image_size,
+                      resize_inv_factor,
+                      num_workers=4,
+                      samples_fn=None):
+    """
+    Get the path stem for validation set cache, creating the cache if it doesn't exist.
+
+    Parameters:
+    ----------
+    cache_dir_path : str
+        Directory with cache files.
+    data_dir : str
+        Path to directory with ImageNet-1K dataset.
+    input_image_size : int or tuple of two ints
+        Spatial size of the cropped images.
+    resize_inv_factor : float
+        Inverted ratio for input image crop.
+    num_workers : int, default 4
+        Number of decoding processes.
+    samples_fn : function or None, default None
+        Function of `data_dir`, which lists validation samples as (image file path, label) pairs (for a dataset
+        without the `ImageFolder` layout).
+
+    Returns
+    -------
+    str
+        Path stem for cache files.
+    """
+    file_stem = get_val_cache_file_stem(
+        cache_dir_path=cache_dir_path,
+        input_image_size=input_image_size,
+        resize_inv_factor=resize_inv_factor)
+    if not (os.path.exists(file_stem + "_data.npy") and os.path.exists(file_stem + "_labels.npy")):
+        create_val_cache(
+            data_dir=data_dir,
+            file_stem=file_stem,
+            input_image_size=input_image_size,
+            resize_inv_factor=resize_inv_factor,
+            num_workers=num_workers,
+            samples_fn=samples_fn)
+    return file_stem
+
+
+class ValCache(object):
+    """
+    Batch iterator over a preprocessed validation set cache. Yields pairs of uint8 image batches and int32 label
+    batches as NumPy arrays.
+
+    Parameters:
+    ----------
+    file_stem : str
+        Path stem for cache files.
+    batch_size : int
+        Batch size.
+    channels_last : bool, default False
+        Whether to yield images in NHWC layout instead of NCHW.
+    """
+    def __init__(self,
+                 file_stem,
+                 batch_size,
+                 channels_last=False):
+        super(ValCache, self).__init__()
+        assert (batch_size > 0)
+        self.data = np.load(file_stem + "_data.npy", mmap_mode='r')
+        self.labels = np.load(file_stem + "_labels.npy")
+        assert (self.data.shape[0] == self.labels.shape[0])
+        self.batch_size = batch_size
+        self.channels_last = channels_last
+
+    @property
+    def num_samples(self):
+        return self.labels.shape[0]
+
+    def __len__(self):
+        return (self.num_samples + self.batch_size - 1) // self.batch_size
+
+    def __iter__(self):
+        for i in range(0, self.num_samples, self.batch_size):
+            data = self.data[i:i + self.batch_size]
+            if self.channels_last:
+                data = data.transpose((0, 2, 3, 1))
+            yield np.array(data), self.labels[i:i + self.batch_size]
@@ -1,6 +1,9 @@
 import argparse
 import logging
+import os
 import re
+import time
+import multiprocessing
 import numpy as np
 
 import mxnet as mx
@@ -14,22 +17,18 @@ def parse_args():
     parser.add_argument(
         '--src-fwk',
         type=str,
-        required=True,
         help='source model framework name')
     parser.add_argument(
         '--dst-fwk',
         type=str,
-        required=True,
         help='destination model framework name')
     parser.add_argument(
         '--src-model',
         type=str,
-        required=True,
         help='source model name')
     parser.add_argument(
         '--dst-model',
         type=str,
-        required=True,
         help='destination model name')
     parser.add_argument(
         '--src-params',
@@ -67,6 +66,40 @@ def parse_args():
         default=3,
         help='number of input channels for destination model')
 
+    parser.add_argument(
+        '--verify',
+        action='store_true',
+        help='verify conversion by comparing logits of source and destination models on a random batch')
+    parser.add_argument(
+        '--max-abs-err',
+        type=float,
+        default=1e-3,
+        help='maximal absolute difference of logits for successful verification')
+
+    parser.add_argument(
+        '--batch',
+        type=str,
+        default='',
+        help='file with a list of conversion jobs (one job per line: src_fwk dst_fwk src_model [dst_model [src_params'
+             ' [dst_params]]] [name=value ...], `-` means default value, options --remove-module, --src/dst-num-classes'
+             ' and --src/dst-in-channels apply to all jobs and can be overridden by `name=value` fields, e.g.'
+             ' `dst_num_classes=10`); jobs are verified and executed in parallel')
+    parser.add_argument(
+        '--batch-dst-dir',
+        type=str,
+        default='',
+        help='directory for destination parameter files of batch jobs without explicit dst_params')
+    parser.add_argument(
+        '--overwrite',
+        action='store_true',
+        help='convert batch jobs even if destination parameter files exist')
+    parser.add_argument(
+        '-j',
+        '--num-processes',
+        type=int,
+        default=4,
+        help='number of worker processes for batch conversion')
+
     parser.add_argument(
         '--save-dir',
         type=str,
@@ -78,6 +111,10 @@ def parse_args():
         default='train.log',
         help='filename of training log')
     args = parser.parse_args()
+    if not args.batch:
+        for arg_name in ['src_fwk', 'dst_fwk', 'src_model', 'dst_model']:
+            if getattr(args, arg_name) is None:
+                parser.error("the argument --{} is required (if --batch is not used)".format(arg_name.replace('_', '-')))
     return args
 
 
@@ -89,7 +126,8 @@ def prepare_src_model(src_fwk,
                       use_cuda,
                       remove_module=False,
                       num_classes=None,
-                      in_channels=None):
+                      in_channels=None,
+                      use_pretrained=False):
 
     ext_src_param_keys = None
     ext_src_param_keys2 = None
@@ -98,7 +136,7 @@ def prepare_src_model(src_fwk,
         from gluon.utils import prepare_model as prepare_model_gl
         src_net = prepare_model_gl(
             model_name=src_model,
-            use_pretrained=False,
+            use_pretrained=use_pretrained,
             pretrained_model_file_path=src_params_file_path,
             dtype=np.float32,
             tune_layers="",
@@ -132,7 +170,7 @@ def prepare_src_model(src_fwk,
         from pytorch.utils import prepare_model as prepare_model_pt
         src_net = prepare_model_pt(
             model_name=src_model,
-            use_pretrained=False,
+            use_pretrained=use_pretrained,
             pretrained_model_file_path=src_params_file_path,
             use_cuda=use_cuda,
             use_data_parallel=False,
@@ -158,6 +196,7 @@ def prepare_src_model(src_fwk,
             src_param_keys = src2 + src1n
 
     elif src_fwk == "mxnet":
+        src_net = None
         src_sym, src_arg_params, src_aux_params = mx.model.load_checkpoint(
             prefix=src_params_file_path,
             epoch=0)
@@ -182,7 +221,7 @@ def prepare_src_model(src_fwk,
     else:
         raise ValueError("Unsupported src fwk: {}".format(src_fwk))
 
-    return src_params, src_param_keys, ext_src_param_keys, ext_src_param_keys2
+    return src_params, src_param_keys, ext_src_param_keys, ext_src_param_keys2, src_net
 
 
 def prepare_dst_model(dst_fwk,
@@ -884,144 +923,254 @@ def convert_tf2gl(dst_net,
     dst_net.save_parameters(dst_params_file_path)
 
 
-def main():
-    args = parse_args()
+def calc_model_logits(fwk,
+                      net,
+                      x,
+                      ctx):
+    """
+    Calculate logits of a model for a batch.
+
+    Parameters:
+    ----------
+    fwk : str
+        Model framework name.
+    net : object
+        Model.
+    x : np.array
+        Input batch in NCHW layout.
+    ctx : Context
+        MXNet context.
+
+    Returns
+    -------
+    np.array or None
+        Logits (None if the framework is not supported).
+    """
+    if fwk == "gluon":
+        return net(mx.nd.array(x, ctx)).asnumpy()
+    elif fwk == "pytorch":
+        import torch
+        net.eval()
+        with torch.no_grad():
+            return net(torch.from_numpy(x)).cpu().numpy()
+    elif fwk == "chainer":
+        import chainer
+        with chainer.using_config('train', False), chainer.using_config('enable_backprop', False):
+            return chainer.backends.cuda.to_cpu(net(x).array)
+    elif fwk == "keras":
+        from keras import backend as K
+        if K.image_data_format() == 'channels_last':
+            x = x.transpose((0, 2, 3, 1))
+        return net.predict(x)
+    else:
+        return None
 
-    packages = []
-    pip_packages = []
-    if (args.src_fwk == "gluon") or (args.dst_fwk == "gluon"):
-        packages += ['mxnet']
-        pip_packages += ['mxnet-cu92']
-    if (args.src_fwk == "pytorch") or (args.dst_fwk == "pytorch"):
-        packages += ['torch', 'torchvision']
-    if (args.src_fwk == "chainer") or (args.dst_fwk == "chainer"):
-        packages += ['chainer', 'chainercv']
-        pip_packages += ['cupy-cuda92', 'chainer', 'chainercv']
-    if (args.src_fwk == "keras") or (args.dst_fwk == "keras"):
-        packages += ['keras']
-        pip_packages += ['keras', 'keras-mxnet', 'keras-applications', 'keras-preprocessing']
-    if (args.src_fwk == "tensorflow") or (args.dst_fwk == "tensorflow"):
-        packages += ['tensorflow-gpu']
-        pip_packages += ['tensorflow-gpu', 'tensorpack', 'mxnet-cu90']
 
-    _, log_file_exist = initialize_logging(
-        logging_dir_path=args.save_dir,
-        logging_file_name=args.logging_file_name,
-        script_args=args,
-        log_packages=packages,
-        log_pip_packages=pip_packages)
+def verify_conversion(src_fwk,
+                      src_net,
+                      dst_fwk,
+                      dst_model,
+                      dst_params_file_path,
+                      num_classes,
+                      in_channels,
+                      ctx):
+    """
+    Compare logits of the source model and the destination model, loaded from the converted parameter file, on the
+    same random batch.
+
+    Returns
+    -------
+    float or None
+        Maximal absolute difference of logits (None if the conversion can't be verified).
+    str
+        Reason why the conversion isn't verified (empty if it's verified).
+    """
+    if (src_net is None) or (src_fwk not in ["gluon", "pytorch"]) or (dst_fwk not in ["gluon", "pytorch", "chainer",
+                                                                                        "keras"]):
+        reason = "verification is not supported for {}-model to {}-model conversion".format(src_fwk, dst_fwk)
+        logging.warning(reason)
+        return None, reason
 
+    if dst_fwk == "gluon":
+        from gluon.utils import prepare_model as prepare_model_gl
+        dst_net = prepare_model_gl(
+            model_name=dst_model,
+            use_pretrained=False,
+            pretrained_model_file_path=dst_params_file_path,
+            dtype=np.float32,
+            tune_layers="",
+            classes=num_classes,
+            in_channels=in_channels,
+            ctx=ctx)
+    elif dst_fwk == "pytorch":
+        from pytorch.utils import prepare_model as prepare_model_pt
+        dst_net = prepare_model_pt(
+            model_name=dst_model,
+            use_pretrained=False,
+            pretrained_model_file_path=dst_params_file_path,
+            use_cuda=False,
+            use_data_parallel=False)
+    elif dst_fwk == "chainer":
+        from chainer_.utils import prepare_model as prepare_model_ch
+        dst_net = prepare_model_ch(
+            model_name=dst_model,
+            use_pretrained=False,
+            pretrained_model_file_path=dst_params_file_path)
+    else:
+        from keras_.utils import prepare_model as prepare_model_ke
+        dst_net = prepare_model_ke(
+            model_name=dst_model,
+            use_pretrained=False,
+            pretrained_model_file_path=dst_params_file_path)
+
+    in_size = src_net.in_size if hasattr(src_net, 'in_size') else (224, 224)
+    x = np.random.randn(2, in_channels, in_size[0], in_size[1]).astype(np.float32)
+    src_logits = calc_model_logits(src_fwk, src_net, x, ctx)
+    dst_logits = calc_model_logits(dst_fwk, dst_net, x, ctx)
+    if src_logits.shape != dst_logits.shape:
+        reason = "different output shapes: {} vs {}".format(src_logits.shape, dst_logits.shape)
+        logging.warning('Verification is skipped due to {}'.format(reason))
+        return None, reason
+    max_abs_err = float(np.abs(src_logits - dst_logits).max())
+    logging.info('Verification: max abs error of logits = {}'.format(max_abs_err))
+    return max_abs_err, ""
+
+
+def convert_model(src_fwk,
+                  dst_fwk,
+                  src_model,
+                  dst_model,
+                  src_params_file_path,
+                  dst_params_file_path,
+                  remove_module=False,
+                  src_num_classes=1000,
+                  src_in_channels=3,
+                  dst_num_classes=1000,
+                  dst_in_channels=3,
+                  use_pretrained=False,
+                  verify=False):
+    """
+    Convert a model from one framework into another.
+
+    Returns
+    -------
+    float or None
+        Maximal absolute difference of logits if `verify` is set and the conversion is verified, otherwise None.
+    str
+        Reason why the conversion isn't verified (empty if it's verified).
+    """
     ctx = mx.cpu()
     use_cuda = False
 
-    src_params, src_param_keys, ext_src_param_keys, ext_src_param_keys2 = prepare_src_model(
-        src_fwk=args.src_fwk,
-        src_model=args.src_model,
-        src_params_file_path=args.src_params,
-        dst_fwk=args.dst_fwk,
+    src_params, src_param_keys, ext_src_param_keys, ext_src_param_keys2, src_net = prepare_src_model(
+        src_fwk=src_fwk,
+        src_model=src_model,
+        src_params_file_path=src_params_file_path,
+        dst_fwk=dst_fwk,
         ctx=ctx,
         use_cuda=use_cuda,
-        remove_module=args.remove_module,
-        num_classes=args.src_num_classes,
-        in_channels=args.src_in_channels)
+        remove_module=remove_module,
+        num_classes=src_num_classes,
+        in_channels=src_in_channels,
+        use_pretrained=use_pretrained)
 
     dst_params, dst_param_keys, dst_net = prepare_dst_model(
-        dst_fwk=args.dst_fwk,
-        dst_model=args.dst_model,
-        src_fwk=args.src_fwk,
+        dst_fwk=dst_fwk,
+        dst_model=dst_model,
+        src_fwk=src_fwk,
         ctx=ctx,
         use_cuda=use_cuda,
-        num_classes=args.dst_num_classes,
-        in_channels=args.dst_in_channels)
+        num_classes=dst_num_classes,
+        in_channels=dst_in_channels)
 
-    if (args.dst_fwk in ["keras", "tensorflow"]) and any([s.find("convgroup") >= 0 for s in dst_param_keys]) or\
-            ((args.src_fwk == "mxnet") and (args.src_model in ["crunet56", "crunet116"])):
+    if (dst_fwk in ["keras", "tensorflow"]) and any([s.find("convgroup") >= 0 for s in dst_param_keys]) or\
+            ((src_fwk == "mxnet") and (src_model in ["crunet56", "crunet116"])):
         assert (len(src_param_keys) <= len(dst_param_keys))
     else:
         assert (len(src_param_keys) == len(dst_param_keys))
 
-    if args.src_fwk == "gluon" and args.dst_fwk == "gluon":
+    if src_fwk == "gluon" and dst_fwk == "gluon":
         convert_gl2gl(
             dst_net=dst_net,
-            dst_params_file_path=args.dst_params,
+            dst_params_file_path=dst_params_file_path,
             dst_params=dst_params,
             dst_param_keys=dst_param_keys,
             src_params=src_params,
             src_param_keys=src_param_keys,
-            finetune=((args.src_num_classes != args.dst_num_classes) or (args.src_in_channels != args.dst_in_channels)),
+            finetune=((src_num_classes != dst_num_classes) or (src_in_channels != dst_in_channels)),
             ctx=ctx)
-    elif args.src_fwk == "pytorch" and args.dst_fwk == "pytorch":
+    elif src_fwk == "pytorch" and dst_fwk == "pytorch":
         convert_pt2pt(
-            dst_params_file_path=args.dst_params,
+            dst_params_file_path=dst_params_file_path,
             dst_params=dst_params,
             dst_param_keys=dst_param_keys,
             src_params=src_params,
             src_param_keys=src_param_keys,
-            src_model=args.src_model,
-            dst_model=args.dst_model)
-    elif args.src_fwk == "gluon" and args.dst_fwk == "pytorch":
+            src_model=src_model,
+            dst_model=dst_model)
+    elif src_fwk == "gluon" and dst_fwk == "pytorch":
         convert_gl2pt(
-            dst_params_file_path=args.dst_params,
+            dst_params_file_path=dst_params_file_path,
             dst_params=dst_params,
             dst_param_keys=dst_param_keys,
             src_params=src_params,
             src_param_keys=src_param_keys)
-    elif args.src_fwk == "gluon" and args.dst_fwk == "chainer":
+    elif src_fwk == "gluon" and dst_fwk == "chainer":
         convert_gl2ch(
             dst_net=dst_net,
-            dst_params_file_path=args.dst_params,
+            dst_params_file_path=dst_params_file_path,
             dst_params=dst_params,
             dst_param_keys=dst_param_keys,
             src_params=src_params,
             src_param_keys=src_param_keys,
             ext_src_param_keys=ext_src_param_keys,
             ext_src_param_keys2=ext_src_param_keys2,
-            src_model=args.src_model)
-    elif args.src_fwk == "gluon" and args.dst_fwk == "keras":
+            src_model=src_model)
+    elif src_fwk == "gluon" and dst_fwk == "keras":
         convert_gl2ke(
             dst_net=dst_net,
-            dst_params_file_path=args.dst_params,
+            dst_params_file_path=dst_params_file_path,
             dst_params=dst_params,
             dst_param_keys=dst_param_keys,
             src_params=src_params,
             src_param_keys=src_param_keys)
-    elif args.src_fwk == "gluon" and args.dst_fwk == "tensorflow":
+    elif src_fwk == "gluon" and dst_fwk == "tensorflow":
         convert_gl2tf(
-            dst_params_file_path=args.dst_params,
+            dst_params_file_path=dst_params_file_path,
             dst_params=dst_params,
             dst_param_keys=dst_param_keys,
             src_params=src_params,
             src_param_keys=src_param_keys)
-    elif args.src_fwk == "pytorch" and args.dst_fwk == "gluon":
+    elif src_fwk == "pytorch" and dst_fwk == "gluon":
         convert_pt2gl(
             dst_net=dst_net,
-            dst_params_file_path=args.dst_params,
+            dst_params_file_path=dst_params_file_path,
             dst_params=dst_params,
             dst_param_keys=dst_param_keys,
             src_params=src_params,
             src_param_keys=src_param_keys,
             ctx=ctx)
-    elif args.src_fwk == "mxnet" and args.dst_fwk == "gluon":
+    elif src_fwk == "mxnet" and dst_fwk == "gluon":
         convert_mx2gl(
             dst_net=dst_net,
-            dst_params_file_path=args.dst_params,
+            dst_params_file_path=dst_params_file_path,
             dst_params=dst_params,
             dst_param_keys=dst_param_keys,
             src_params=src_params,
             src_param_keys=src_param_keys,
-            src_model=args.src_model,
+            src_model=src_model,
             ctx=ctx)
-    elif args.src_fwk == "tensorflow" and args.dst_fwk == "tensorflow":
+    elif src_fwk == "tensorflow" and dst_fwk == "tensorflow":
         convert_tf2tf(
-            dst_params_file_path=args.dst_params,
+            dst_params_file_path=dst_params_file_path,
             dst_params=dst_params,
             dst_param_keys=dst_param_keys,
             src_params=src_params,
             src_param_keys=src_param_keys)
-    elif args.src_fwk == "tensorflow" and args.dst_fwk == "gluon":
+    elif src_fwk == "tensorflow" and dst_fwk == "gluon":
         convert_tf2gl(
             dst_net=dst_net,
-            dst_params_file_path=args.dst_params,
+            dst_params_file_path=dst_params_file_path,
             dst_params=dst_params,
             dst_param_keys=dst_param_keys,
             src_params=src_params,
@@ -1031,7 +1180,249 @@ def main():
         raise NotImplementedError
 
     logging.info('Convert {}-model {} into {}-model {}'.format(
-        args.src_fwk, args.src_model, args.dst_fwk, args.dst_model))
+        src_fwk, src_model, dst_fwk, dst_model))
+
+    if not verify:
+        return None, "verification is not requested"
+    return verify_conversion(
+        src_fwk=src_fwk,
+        src_net=src_net,
+        dst_fwk=dst_fwk,
+        dst_model=dst_model,
+        dst_params_file_path=dst_params_file_path,
+        num_classes=dst_num_classes,
+        in_channels=dst_in_channels,
+        ctx=ctx)
+
+
+def get_default_params_file_ext(fwk):
+    return {
+        "gluon": ".params",
+        "pytorch": ".pth",
+        "chainer": ".npz",
+        "keras": ".h5",
+        "tensorflow": ".tf.npz",
+    }[fwk]
+
+
+def parse_batch_jobs(batch_file_path,
+                     dst_dir_path,
+                     job_options=None):
+    """
+    Read the list of conversion jobs (one job per line: src_fwk dst_fwk src_model [dst_model [src_params
+    [dst_params]]] [name=value ...], `-` means default value, `#` starts a comment). Trailing `name=value` fields
+    override common job options for the job, e.g. `remove_module=1 dst_num_classes=10`.
+
+    Parameters:
+    ----------
+    batch_file_path : str
+        Path to the job list file.
+    dst_dir_path : str
+        Directory for destination parameter files of jobs without explicit dst_params.
+    job_options : dict or None, default None
+        Common options of jobs (`remove_module`, `src_num_classes`, `src_in_channels`, `dst_num_classes`,
+        `dst_in_channels`), which are passed to `convert_model`.
+
+    Returns
+    -------
+    list of dict
+        Keyword arguments for `convert_model`.
+    """
+    option_types = {
+        "remove_module": (lambda x: x.lower() in ["1", "true", "yes"]),
+        "src_num_classes": int,
+        "src_in_channels": int,
+        "dst_num_classes": int,
+        "dst_in_channels": int,
+    }
+    job_options = job_options if job_options is not None else {}
+    assert all([name in option_types for name in job_options])
+
+    jobs = []
+    with open(batch_file_path, "r") as f:
+        for line in f:
+            fields = line.split("#")[0].split()
+            if not fields:
+                continue
+            options = dict(job_options)
+            for field in [x for x in fields if "=" in x]:
+                name, value = field.split("=", 1)
+                assert (name in option_types), "Invalid job option `{}`: {}".format(name, line)
+                options[name] = option_types[name](value)
+            fields = [x for x in fields if "=" not in x]
+            assert (3 <= len(fields) <= 6), "Invalid job: {}".format(line)
+            fields = [(x if x != "-" else None) for x in fields] + [None] * (6 - len(fields))
+            src_fwk, dst_fwk, src_model, dst_model, src_params_file_path, dst_params_file_path = fields
+            if dst_model is None:
+                dst_model = src_model
+            if dst_params_file_path is None:
+                dst_params_file_path = os.path.join(dst_dir_path, dst_model + get_default_params_file_ext(dst_fwk))
+            jobs.append({
+                "src_fwk": src_fwk,
+                "dst_fwk": dst_fwk,
+                "src_model": src_model,
+                "dst_model": dst_model,
+                "src_params_file_path": (src_params_file_path if src_params_file_path is not None else ""),
+                "dst_params_file_path": dst_params_file_path,
+                "use_pretrained": (src_params_file_path is None),
+            })
+            jobs[-1].update(options)
+    return jobs
+
+
+def init_batch_worker():
+    logging.basicConfig(level=logging.INFO)
+
+
+def run_batch_job(job):
+    """
+    Execute a conversion job in a worker process. Framework modules are imported once per worker.
+
+    Returns
+    -------
+    tuple
+        Job, status ('converted', 'unverified', 'failed'), max abs error (or None), message, time cost.
+    """
+    tic = time.time()
+    if job["dst_fwk"] == "tensorflow":
+        import tensorflow as tf
+        tf.reset_default_graph()
+    if job["dst_fwk"] == "keras":
+        from keras import backend as K
+        K.clear_session()
+    try:
+        max_abs_err, message = convert_model(verify=True, **job)
+        status = "converted" if max_abs_err is not None else "unverified"
+    except Exception as e:
+        logging.exception('Conversion of {src_fwk}-model {src_model} into {dst_fwk}-model {dst_model} failed'.format(
+            **job))
+        max_abs_err = None
+        status = "failed"
+        message = "{}: {}".format(type(e).__name__, e)
+    return job, status, max_abs_err, message, time.time() - tic
+
+
+def convert_batch(jobs,
+                  num_processes,
+                  max_abs_err_threshold,
+                  overwrite=False):
+    """
+    Execute conversion jobs across a process pool and log a summary table. Jobs, whose outputs can't be verified,
+    get the status `unverified` (not `converted`).
+
+    Returns
+    -------
+    list of tuple
+        Job results (job, status, max abs error, message, time cost).
+    """
+    results = []
+    pending_jobs = []
+    for job in jobs:
+        if (not overwrite) and os.path.exists(job["dst_params_file_path"]):
+            results.append((job, "skipped", None, "destination file exists", 0.0))
+        else:
+            dst_dir_path = os.path.dirname(job["dst_params_file_path"])
+            if dst_dir_path and not os.path.exists(dst_dir_path):
+                os.makedirs(dst_dir_path)
+            pending_jobs.append(job)
+
+    # Spawned (not forked) workers, as the parent process has already imported MXNet:
+    mp_ctx = multiprocessing.get_context("spawn")
+    pool = mp_ctx.Pool(
+        processes=max(1, min(num_processes, len(pending_jobs))),
+        initializer=init_batch_worker)
+    try:
+        for result in pool.imap_unordered(run_batch_job, pending_jobs):
+            job, status, max_abs_err, message, time_cost = result
+            if (status == "converted") and (max_abs_err is not None) and (max_abs_err > max_abs_err_threshold):
+                result = (job, "failed", max_abs_err, "logits mismatch", time_cost)
+            logging.info('{src_fwk}-{src_model} -> {dst_fwk}-{dst_model}: '.format(**job) + result[1])
+            results.append(result)
+    finally:
+        pool.close()
+        pool.join()
+
+    row_format = "{:<10} {:<10} {:<32} {:<32} {:<10} {:>12} {:>8}  {}"
+    table = [row_format.format("Src.Fwk", "Dst.Fwk", "Src.Model", "Dst.Model", "Status", "Max.Abs.Err", "Time",
+                               "Message")]
+    for job, status, max_abs_err, message, time_cost in results:
+        table.append(row_format.format(
+            job["src_fwk"], job["dst_fwk"], job["src_model"], job["dst_model"], status,
+            ("{:.3e}".format(max_abs_err) if max_abs_err is not None else "-"), "{:.1f}".format(time_cost), message))
+    statuses = ["converted", "unverified", "skipped", "failed"]
+    counts = {status: len([r for r in results if r[1] == status]) for status in statuses}
+    logging.info("Batch conversion summary:\n{}\nConverted: {converted}, unverified: {unverified}, skipped: {skipped}, "
+                 "failed: {failed}".format("\n".join(table), **counts))
+    return results
+
+
+def main():
+    args = parse_args()
+
+    if args.batch:
+        jobs = parse_batch_jobs(
+            batch_file_path=args.batch,
+            dst_dir_path=args.batch_dst_dir,
+            job_options={
+                "remove_module": args.remove_module,
+                "src_num_classes": args.src_num_classes,
+                "src_in_channels": args.src_in_channels,
+                "dst_num_classes": args.dst_num_classes,
+                "dst_in_channels": args.dst_in_channels,
+            })
+        fwks = set([job["src_fwk"] for job in jobs] + [job["dst_fwk"] for job in jobs])
+    else:
+        fwks = {args.src_fwk, args.dst_fwk}
+
+    packages = []
+    pip_packages = []
+    if "gluon" in fwks:
+        packages += ['mxnet']
+        pip_packages += ['mxnet-cu92']
+    if "pytorch" in fwks:
+        packages += ['torch', 'torchvision']
+    if "chainer" in fwks:
+        packages += ['chainer', 'chainercv']
+        pip_packages += ['cupy-cuda92', 'chainer', 'chainercv']
+    if "keras" in fwks:
+        packages += ['keras']
+        pip_packages += ['keras', 'keras-mxnet', 'keras-applications', 'keras-preprocessing']
+    if "tensorflow" in fwks:
+        packages += ['tensorflow-gpu']
+        pip_packages += ['tensorflow-gpu', 'tensorpack', 'mxnet-cu90']
+
+    _, log_file_exist = initialize_logging(
+        logging_dir_path=args.save_dir,
+        logging_file_name=args.logging_file_name,
+        script_args=args,
+        log_packages=packages,
+        log_pip_packages=pip_packages)
+
+    if args.batch:
+        convert_batch(
+            jobs=jobs,
+            num_processes=args.num_processes,
+            max_abs_err_threshold=args.max_abs_err,
+            overwrite=args.overwrite)
+    else:
+        max_abs_err, unverified_reason = convert_model(
+            src_fwk=args.src_fwk,
+            dst_fwk=args.dst_fwk,
+            src_model=args.src_model,
+            dst_model=args.dst_model,
+            src_params_file_path=args.src_params,
+            dst_params_file_path=args.dst_params,
+            remove_module=args.remove_module,
+            src_num_classes=args.src_num_classes,
+            src_in_channels=args.src_in_channels,
+            dst_num_classes=args.dst_num_classes,
+            dst_in_channels=args.dst_in_channels,
+            verify=args.verify)
+        if args.verify:
+            if max_abs_err is None:
+                raise AssertionError("Conversion is not verified: {}".format(unverified_reason))
+            if max_abs_err > args.max_abs_err:
+                raise AssertionError("Logits mismatch after conversion: max abs error = {}".format(max_abs_err))
 
 
 if __name__ == '__main__':
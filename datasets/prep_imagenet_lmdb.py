@@ -0,0 +1,120 @@
+if __name__ == '__main__' and __package__ is None:
+    import sys
+    from os import path
+    sys.path.append(path.dirname(path.dirname(path.abspath(__file__))))
+
+import os
+import argparse
+import logging
+
+from common.logger_utils import initialize_logging
+from tensorflow_.imagenet_lmdb import create_lmdb_shards, measure_dataflow_speed
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Prepare sharded LMDB files of ImageNet-1K for TensorFlow/TensorPack scripts',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument(
+        '--data-dir',
+        type=str,
+        default='../imgclsmob_data/imagenet',
+        help='path to directory with ImageNet-1K dataset')
+    parser.add_argument(
+        '--lmdb-dir',
+        type=str,
+        default='',
+        help='directory for destination LMDB shards and log-file (`lmdb` subdirectory of the data directory by default)')
+    parser.add_argument(
+        '--meta-dir',
+        type=str,
+        default='',
+        help='directory with ILSVRC12 metadata (the TensorPack default one by default)')
+
+    parser.add_argument(
+        '--splits',
+        type=str,
+        default='train,val',
+        help='comma-separated list of dataset splits')
+    parser.add_argument(
+        '--shard-size',
+        type=int,
+        default=20000,
+        help='number of images in a shard')
+
+    parser.add_argument(
+        '-j',
+        '--num-data-workers',
+        dest='num_workers',
+        default=4,
+        type=int,
+        help='number of processes writing shards')
+
+    parser.add_argument(
+        '--benchmark-batches',
+        type=int,
+        default=0,
+        help='number of training batches to compare speed (images/sec) of image folder and LMDB dataflows (0 means '
+             'no comparison)')
+    parser.add_argument(
+        '--batch-size',
+        type=int,
+        default=256,
+        help='batch size for speed comparison')
+
+    parser.add_argument(
+        '--logging-file-name',
+        type=str,
+        default='prepare.log',
+        help='filename of log')
+    parser.add_argument(
+        '--log-packages',
+        type=str,
+        default='tensorpack, lmdb, cv2',
+        help='list of python packages for logging')
+    parser.add_argument(
+        '--log-pip-packages',
+        type=str,
+        default='tensorpack, lmdb',
+        help='list of pip packages for logging')
+    args = parser.parse_args()
+    return args
+
+
+def main():
+    args = parse_args()
+    lmdb_dir_path = args.lmdb_dir if args.lmdb_dir else os.path.join(args.data_dir, "lmdb")
+
+    _, log_file_exist = initialize_logging(
+        logging_dir_path=lmdb_dir_path,
+        logging_file_name=args.logging_file_name,
+        script_args=args,
+        log_packages=args.log_packages,
+        log_pip_packages=args.log_pip_packages)
+
+    splits = [x.strip() for x in args.splits.split(',') if x.strip()]
+    for split in splits:
+        index_file_path = create_lmdb_shards(
+            data_dir=args.data_dir,
+            lmdb_dir_path=lmdb_dir_path,
+            split=split,
+            shard_size=args.shard_size,
+            num_workers=args.num_workers,
+            meta_dir=(args.meta_dir if args.meta_dir else None))
+        logging.info("Shards of `{}` split are ready, index: {}".format(split, index_file_path))
+
+    if args.benchmark_batches > 0:
+        from tensorflow_.utils_tp import get_data
+        for data_format in ["folder", "lmdb"]:
+            ds = get_data(
+                is_train=True,
+                batch_size=args.batch_size,
+                data_dir_path=args.data_dir,
+                data_format=data_format,
+                lmdb_dir_path=lmdb_dir_path)
+            speed = measure_dataflow_speed(ds, num_batches=args.benchmark_batches)
+            logging.info("Training dataflow speed ({}): {:.1f} images/sec".format(data_format, speed))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+if __name__ == '__main__' and __package__ is None:
+    import sys
+    from os import path
+    sys.path.append(path.dirname(path.dirname(path.abspath(__file__))))
+
+import argparse
+import logging
+
+from common.logger_utils import initialize_logging
+from common.val_cache import get_val_cache_file_stem, create_val_cache
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Prepare preprocessed ImageNet-1K validation set cache for evaluation scripts',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument(
+        '--data-dir',
+        type=str,
+        default='../imgclsmob_data/imagenet',
+        help='path to directory with ImageNet-1K dataset')
+    parser.add_argument(
+        '--val-cache-dir',
+        type=str,
+        default='../imgclsmob_data/imagenet/val_cache',
+        help='directory for destination cache files and log-file')
+
+    parser.add_argument(
+        '--input-sizes',
+        type=str,
+        default='224',
+        help='comma-separated list of input sizes')
+    parser.add_argument(
+        '--resize-inv-factors',
+        type=str,
+        default='0.875',
+        help='comma-separated list of inverted ratios for input image crop')
+
+    parser.add_argument(
+        '-j',
+        '--num-data-workers',
+        dest='num_workers',
+        default=4,
+        type=int,
+        help='number of decoding processes')
+
+    parser.add_argument(
+        '--logging-file-name',
+        type=str,
+        default='prepare.log',
+        help='filename of log')
+    parser.add_argument(
+        '--log-packages',
+        type=str,
+        default='numpy, PIL',
+        help='list of python packages for logging')
+    parser.add_argument(
+        '--log-pip-packages',
+        type=str,
+        default='',
+        help='list of pip packages for logging')
+    args = parser.parse_args()
+    return args
+
+
+def main():
+    args = parse_args()
+
+    _, log_file_exist = initialize_logging(
+        logging_dir_path=args.val_cache_dir,
+        logging_file_name=args.logging_file_name,
+        script_args=args,
+        log_packages=args.log_packages,
+        log_pip_packages=args.log_pip_packages)
+
+    input_sizes = [int(x) for x in args.input_sizes.split(',')]
+    resize_inv_factors = [float(x) for x in args.resize_inv_factors.split(',')]
+    for input_size in input_sizes:
+        for resize_inv_factor in resize_inv_factors:
+            file_stem = get_val_cache_file_stem(
+                cache_dir_path=args.val_cache_dir,
+                input_image_size=input_size,
+                resize_inv_factor=resize_inv_factor)
+            create_val_cache(
+                data_dir=args.data_dir,
+                file_stem=file_stem,
+                input_image_size=input_size,
+                resize_inv_factor=resize_inv_factor,
+                num_workers=args.num_workers)
+            logging.info("Cache <{}> is ready".format(file_stem))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,3 +1,4 @@
+import os
 import math
 import argparse
 import time
@@ -11,11 +12,14 @@ from chainercv.utils import apply_to_iterator
 from chainercv.utils import ProgressHook
 
 from common.logger_utils import initialize_logging
+from common.val_cache import add_val_cache_parser_arguments, prepare_val_cache, ValCache
+from common.module_profiler import add_profiler_parser_arguments, log_profile
 from chainer_.top_k_accuracy import top_k_accuracy
 from chainer_.utils import prepare_model
 from chainer_.imagenet1k import add_dataset_parser_arguments
 from chainer_.imagenet1k import get_val_data_iterator
 from chainer_.imagenet1k import ImagenetPredictor
+from chainer_.module_profiler import profile_model
 
 
 def parse_args():
@@ -24,12 +28,15 @@ def parse_args():
         formatter_class=argparse.ArgumentDefaultsHelpFormatter)
 
     add_dataset_parser_arguments(parser)
+    add_val_cache_parser_arguments(parser)
+    add_profiler_parser_arguments(parser)
 
     parser.add_argument(
         '--model',
         type=str,
         required=True,
-        help='type of model to use. see model_provider for options.')
+        help='type of model to use. see model_provider for options. a comma-separated list of models is evaluated'
+             ' back-to-back (sweep mode)')
     parser.add_argument(
         '--use-pretrained',
         action='store_true',
@@ -58,6 +65,11 @@ def parse_args():
         type=int,
         default=32,
         help='training batch size per device (CPU/GPU).')
+    parser.add_argument(
+        '--static-graph',
+        action='store_true',
+        help='run the model as a static graph (the Python code of the model is executed only for the first batch of '
+             'each shape)')
 
     parser.add_argument(
         '--save-dir',
@@ -91,7 +103,8 @@ def test(net,
          input_image_size=224,
          resize_inv_factor=0.875,
          calc_weight_count=False,
-         extended_log=False):
+         extended_log=False,
+         static_graph=False):
     assert (resize_inv_factor > 0.0)
     resize_value = int(math.ceil(float(input_image_size) / resize_inv_factor))
 
@@ -100,7 +113,8 @@ def test(net,
     predictor = ImagenetPredictor(
         base_model=net,
         scale_size=resize_value,
-        crop_size=input_image_size)
+        crop_size=input_image_size,
+        static_graph=static_graph)
 
     if num_gpus > 0:
         predictor.to_gpu()
@@ -109,17 +123,26 @@ def test(net,
         weight_count = net.count_params()
         logging.info('Model: {} trainable parameters'.format(weight_count))
 
-    in_values, out_values, rest_values = apply_to_iterator(
-        predictor.predict,
-        val_iterator,
-        hook=ProgressHook(val_dataset_len))
-    del in_values
+    if isinstance(val_iterator, ValCache):
+        pred_probs = []
+        gt_labels = []
+        for data, labels in val_iterator:
+            pred_probs.append(predictor.predict_cropped(data))
+            gt_labels.append(labels)
+        y = np.concatenate(pred_probs)
+        t = np.concatenate(gt_labels)
+    else:
+        in_values, out_values, rest_values = apply_to_iterator(
+            predictor.predict,
+            val_iterator,
+            hook=ProgressHook(val_dataset_len))
+        del in_values
 
-    pred_probs, = out_values
-    gt_labels, = rest_values
+        pred_probs, = out_values
+        gt_labels, = rest_values
 
-    y = np.array(list(pred_probs))
-    t = np.array(list(gt_labels))
+        y = np.array(list(pred_probs))
+        t = np.array(list(gt_labels))
 
     top1_acc = F.accuracy(
         y=y,
@@ -157,30 +180,60 @@ def main():
     if num_gpus > 0:
         cuda.get_device(0).use()
 
-    net = prepare_model(
-        model_name=args.model,
-        use_pretrained=args.use_pretrained,
-        pretrained_model_file_path=args.resume.strip(),
-        num_gpus=num_gpus)
-    num_classes = net.classes if hasattr(net, 'classes') else 1000
-    input_image_size = net.in_size[0] if hasattr(net, 'in_size') else args.input_size
-
-    val_iterator, val_dataset_len = get_val_data_iterator(
-        data_dir=args.data_dir,
-        batch_size=args.batch_size,
-        num_workers=args.num_workers,
-        num_classes=num_classes)
-
-    assert (args.use_pretrained or args.resume.strip())
-    test(
-        net=net,
-        val_iterator=val_iterator,
-        val_dataset_len=val_dataset_len,
-        num_gpus=num_gpus,
-        input_image_size=input_image_size,
-        resize_inv_factor=args.resize_inv_factor,
-        calc_weight_count=True,
-        extended_log=True)
+    model_names = [x.strip() for x in args.model.split(',') if x.strip()]
+    assert (len(model_names) == 1) or (not args.resume.strip())
+    for model_name in model_names:
+        if len(model_names) > 1:
+            logging.info('Model: {}'.format(model_name))
+        net = prepare_model(
+            model_name=model_name,
+            use_pretrained=args.use_pretrained,
+            pretrained_model_file_path=args.resume.strip(),
+            num_gpus=num_gpus)
+        num_classes = net.classes if hasattr(net, 'classes') else 1000
+        input_image_size = net.in_size[0] if hasattr(net, 'in_size') else args.input_size
+
+        if args.profile:
+            log_profile(
+                profiler=profile_model(
+                    model=net,
+                    in_channels=args.in_channels,
+                    in_size=(input_image_size, input_image_size),
+                    batch_size=args.batch_size,
+                    num_batches=args.profile_batches,
+                    use_gpu=(num_gpus > 0)),
+                top=args.profile_top,
+                trace_file_path=os.path.join(args.save_dir, args.profile_trace_file if len(model_names) == 1 else
+                                             "{}_{}".format(model_name, args.profile_trace_file)))
+
+        if args.val_cache_dir:
+            val_iterator = ValCache(
+                file_stem=prepare_val_cache(
+                    cache_dir_path=args.val_cache_dir,
+                    data_dir=args.data_dir,
+                    input_image_size=input_image_size,
+                    resize_inv_factor=args.resize_inv_factor,
+                    num_workers=args.num_workers),
+                batch_size=args.batch_size)
+            val_dataset_len = val_iterator.num_samples
+        else:
+            val_iterator, val_dataset_len = get_val_data_iterator(
+                data_dir=args.data_dir,
+                batch_size=args.batch_size,
+                num_workers=args.num_workers,
+                num_classes=num_classes)
+
+        assert (args.use_pretrained or args.resume.strip())
+        test(
+            net=net,
+            val_iterator=val_iterator,
+            val_dataset_len=val_dataset_len,
+            num_gpus=num_gpus,
+            input_image_size=input_image_size,
+            resize_inv_factor=args.resize_inv_factor,
+            calc_weight_count=True,
+            extended_log=True,
+            static_graph=args.static_graph)
 
 
 if __name__ == '__main__':
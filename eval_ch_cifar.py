@@ -63,6 +63,11 @@ def parse_args():
         type=int,
         default=32,
         help='training batch size per device (CPU/GPU).')
+    parser.add_argument(
+        '--static-graph',
+        action='store_true',
+        help='run the model as a static graph (the Python code of the model is executed only for the first batch of '
+             'each shape)')
 
     parser.add_argument(
         '--save-dir',
@@ -94,10 +99,13 @@ def test(net,
          val_dataset_len,
          num_gpus,
          calc_weight_count=False,
-         extended_log=False):
+         extended_log=False,
+         static_graph=False):
     tic = time.time()
 
-    predictor = CIFARPredictor(base_model=net)
+    predictor = CIFARPredictor(
+        base_model=net,
+        static_graph=static_graph)
 
     if num_gpus > 0:
         predictor.to_gpu()
@@ -167,7 +175,8 @@ def main():
         val_dataset_len=val_dataset_len,
         num_gpus=num_gpus,
         calc_weight_count=True,
-        extended_log=True)
+        extended_log=True,
+        static_graph=args.static_graph)
 
 
 if __name__ == '__main__':
@@ -1,3 +1,4 @@
+import os
 import argparse
 import time
 import logging
@@ -5,11 +6,18 @@ import logging
 import mxnet as mx
 
 from common.logger_utils import initialize_logging
+from common.val_cache import add_val_cache_parser_arguments, prepare_val_cache
+from common.input_sizes import add_input_sizes_parser_arguments, parse_input_sizes, log_input_size_table
+from common.module_profiler import add_profiler_parser_arguments, log_profile
+from common.async_validation import add_val_queue_parser_arguments, run_val_queue_evaluator
 from gluon.utils import prepare_mx_context, prepare_model, calc_net_weight_count, validate
-from gluon.model_stats import measure_model
+from gluon.merge_branches import merge_branches
+from gluon.module_profiler import profile_model
+from gluon.model_stats import measure_model, measure_latency
 from gluon.imagenet1k import add_dataset_parser_arguments
 from gluon.imagenet1k import get_batch_fn
 from gluon.imagenet1k import get_val_data_source
+from gluon.imagenet1k import ValCacheDataSource
 
 
 def parse_args():
@@ -18,12 +26,17 @@ def parse_args():
         formatter_class=argparse.ArgumentDefaultsHelpFormatter)
 
     add_dataset_parser_arguments(parser)
+    add_val_cache_parser_arguments(parser)
+    add_input_sizes_parser_arguments(parser)
+    add_profiler_parser_arguments(parser)
+    add_val_queue_parser_arguments(parser)
 
     parser.add_argument(
         '--model',
         type=str,
         required=True,
-        help='type of model to use. see model_provider for options.')
+        help='type of model to use. see model_provider for options. a comma-separated list of models is evaluated'
+             ' back-to-back (sweep mode)')
     parser.add_argument(
         '--use-pretrained',
         action='store_true',
@@ -48,6 +61,10 @@ def parse_args():
         dest='calc_flops_only',
         action='store_true',
         help='calculate FLOPs without quality estimation')
+    parser.add_argument(
+        '--merge-branches',
+        action='store_true',
+        help='merge sibling convolution branches (e.g. of Inception/Fire blocks) for faster inference')
 
     parser.add_argument(
         '--num-gpus',
@@ -105,6 +122,7 @@ def test(net,
          calc_flops=False,
          calc_flops_only=True,
          extended_log=False):
+    err_top1_val, err_top5_val = None, None
     if not calc_flops_only:
         acc_top1 = mx.metric.Accuracy()
         acc_top5 = mx.metric.TopKAccuracy(5)
@@ -142,6 +160,78 @@ def test(net,
             flops2=num_flops / 2, flops2_m=num_flops / 2 / 1e6,
             macs=num_macs, macs_m=num_macs / 1e6))
 
+    return err_top1_val, err_top5_val
+
+
+def get_val_data(args,
+                 input_image_size,
+                 batch_size):
+    if args.val_cache_dir:
+        val_data = ValCacheDataSource(
+            file_stem=prepare_val_cache(
+                cache_dir_path=args.val_cache_dir,
+                data_dir=args.data_dir,
+                input_image_size=input_image_size,
+                resize_inv_factor=args.resize_inv_factor,
+                num_workers=args.num_workers),
+            batch_size=batch_size)
+        batch_fn = ValCacheDataSource.batch_fn
+        data_source_needs_reset = False
+    else:
+        val_data = get_val_data_source(
+            dataset_args=args,
+            batch_size=batch_size,
+            num_workers=args.num_workers,
+            input_image_size=input_image_size,
+            resize_inv_factor=args.resize_inv_factor)
+        batch_fn = get_batch_fn(dataset_args=args)
+        data_source_needs_reset = args.use_rec
+    return val_data, batch_fn, data_source_needs_reset
+
+
+def validate_queue(args,
+                   ctx,
+                   batch_size):
+    """
+    Validate checkpoints from the validation queue of train_gl.py until the end of training.
+    """
+    val_data_dict = {}
+
+    def validate_checkpoint(file_stem):
+        net = prepare_model(
+            model_name=args.model,
+            use_pretrained=False,
+            pretrained_model_file_path=(file_stem + '.params'),
+            dtype=args.dtype,
+            tune_layers="",
+            classes=args.num_classes,
+            in_channels=args.in_channels,
+            ctx=ctx)
+        input_image_size = net.in_size if hasattr(net, 'in_size') else (args.input_size, args.input_size)
+        if input_image_size not in val_data_dict:
+            val_data_dict[input_image_size] = get_val_data(
+                args=args,
+                input_image_size=input_image_size,
+                batch_size=batch_size)
+        val_data, batch_fn, data_source_needs_reset = val_data_dict[input_image_size]
+        err_top1_val, err_top5_val = test(
+            net=net,
+            val_data=val_data,
+            batch_fn=batch_fn,
+            data_source_needs_reset=data_source_needs_reset,
+            dtype=args.dtype,
+            ctx=ctx,
+            input_image_size=input_image_size,
+            in_channels=args.in_channels,
+            calc_flops_only=False)
+        return [err_top1_val, err_top5_val]
+
+    run_val_queue_evaluator(
+        queue_dir_path=args.val_queue_dir,
+        validate_fn=validate_checkpoint,
+        poll_interval=args.val_queue_poll_interval,
+        stale_timeout=args.val_queue_stale_timeout)
+
 
 def main():
     args = parse_args()
@@ -157,41 +247,91 @@ def main():
         num_gpus=args.num_gpus,
         batch_size=args.batch_size)
 
-    net = prepare_model(
-        model_name=args.model,
-        use_pretrained=args.use_pretrained,
-        pretrained_model_file_path=args.resume.strip(),
-        dtype=args.dtype,
-        tune_layers="",
-        classes=args.num_classes,
-        in_channels=args.in_channels,
-        do_hybridize=(not args.calc_flops),
-        ctx=ctx)
-    input_image_size = net.in_size if hasattr(net, 'in_size') else (args.input_size, args.input_size)
-
-    val_data = get_val_data_source(
-        dataset_args=args,
-        batch_size=batch_size,
-        num_workers=args.num_workers,
-        input_image_size=input_image_size,
-        resize_inv_factor=args.resize_inv_factor)
-    batch_fn = get_batch_fn(dataset_args=args)
-
-    assert (args.use_pretrained or args.resume.strip() or args.calc_flops_only)
-    test(
-        net=net,
-        val_data=val_data,
-        batch_fn=batch_fn,
-        data_source_needs_reset=args.use_rec,
-        dtype=args.dtype,
-        ctx=ctx,
-        input_image_size=input_image_size,
-        in_channels=args.in_channels,
-        # calc_weight_count=(not log_file_exist),
-        calc_weight_count=True,
-        calc_flops=args.calc_flops,
-        calc_flops_only=args.calc_flops_only,
-        extended_log=True)
+    if args.val_queue_dir:
+        validate_queue(
+            args=args,
+            ctx=ctx,
+            batch_size=batch_size)
+        return
+
+    model_names = [x.strip() for x in args.model.split(',') if x.strip()]
+    assert (len(model_names) == 1) or (not args.resume.strip())
+    for model_name in model_names:
+        if len(model_names) > 1:
+            logging.info('Model: {}'.format(model_name))
+        net = prepare_model(
+            model_name=model_name,
+            use_pretrained=args.use_pretrained,
+            pretrained_model_file_path=args.resume.strip(),
+            dtype=args.dtype,
+            tune_layers="",
+            classes=args.num_classes,
+            in_channels=args.in_channels,
+            do_hybridize=(not args.calc_flops and not args.profile),
+            ctx=ctx)
+        if args.merge_branches:
+            merge_branches(net)
+        input_image_size = net.in_size if hasattr(net, 'in_size') else (args.input_size, args.input_size)
+
+        if args.profile:
+            log_profile(
+                profiler=profile_model(
+                    net=net,
+                    in_channels=args.in_channels,
+                    in_size=input_image_size,
+                    batch_size=args.batch_size,
+                    num_batches=args.profile_batches,
+                    dtype=args.dtype,
+                    ctx=ctx[0]),
+                top=args.profile_top,
+                trace_file_path=os.path.join(args.save_dir, args.profile_trace_file if len(model_names) == 1 else
+                                             "{}_{}".format(model_name, args.profile_trace_file)))
+            if not args.calc_flops:
+                net.hybridize(
+                    static_alloc=True,
+                    static_shape=True)
+
+        # The model input size is only the default one, models can be evaluated at other sizes:
+        input_image_sizes = [(x, x) for x in parse_input_sizes(args.input_sizes)]
+        table_rows = []
+        for input_image_size in (input_image_sizes if input_image_sizes else [input_image_size]):
+            if input_image_sizes:
+                logging.info('Input size: {}'.format(input_image_size[0]))
+
+            val_data, batch_fn, data_source_needs_reset = get_val_data(
+                args=args,
+                input_image_size=input_image_size,
+                batch_size=batch_size)
+
+            assert (args.use_pretrained or args.resume.strip() or args.calc_flops_only)
+            err_top1_val, err_top5_val = test(
+                net=net,
+                val_data=val_data,
+                batch_fn=batch_fn,
+                data_source_needs_reset=data_source_needs_reset,
+                dtype=args.dtype,
+                ctx=ctx,
+                input_image_size=input_image_size,
+                in_channels=args.in_channels,
+                # calc_weight_count=(not log_file_exist),
+                calc_weight_count=True,
+                calc_flops=args.calc_flops,
+                calc_flops_only=args.calc_flops_only,
+                extended_log=True)
+
+            if input_image_sizes:
+                latency = measure_latency(
+                    model=net,
+                    in_channels=args.in_channels,
+                    in_size=input_image_size,
+                    batch_size=args.latency_batch_size,
+                    num_iters=args.latency_iters,
+                    dtype=args.dtype,
+                    ctx=ctx[0])
+                table_rows.append((input_image_size[0], err_top1_val, err_top5_val, latency))
+
+        if input_image_sizes:
+            log_input_size_table(table_rows, batch_size=args.latency_batch_size)
 
 
 if __name__ == '__main__':
@@ -5,6 +5,7 @@ import logging
 import mxnet as mx
 
 from common.logger_utils import initialize_logging
+from common.async_validation import add_val_queue_parser_arguments, run_val_queue_evaluator
 from gluon.utils import prepare_mx_context, prepare_model, calc_net_weight_count
 from gluon.khpa import add_dataset_parser_arguments
 from gluon.khpa import get_batch_fn
@@ -18,6 +19,7 @@ def parse_args():
         formatter_class=argparse.ArgumentDefaultsHelpFormatter)
 
     add_dataset_parser_arguments(parser)
+    add_val_queue_parser_arguments(parser)
 
     parser.add_argument(
         '--model',
@@ -115,6 +117,55 @@ def test(net,
         time.time() - tic))
 
 
+def validate_queue(args,
+                   ctx,
+                   batch_size):
+    """
+    Validate checkpoints from the validation queue of train_gl_khpa.py (by the F1 metric of its training loop) until
+    the end of training.
+    """
+    val_data_dict = {}
+    batch_fn = get_batch_fn()
+
+    def validate_checkpoint(file_stem):
+        net = prepare_model(
+            model_name=args.model,
+            use_pretrained=False,
+            pretrained_model_file_path=(file_stem + '.params'),
+            dtype=args.dtype,
+            tune_layers="",
+            classes=args.num_classes,
+            in_channels=args.in_channels,
+            ctx=ctx)
+        input_image_size = net.in_size if hasattr(net, 'in_size') else (args.input_size, args.input_size)
+        if input_image_size not in val_data_dict:
+            val_data_dict[input_image_size] = get_val_data_source(
+                dataset_args=args,
+                batch_size=batch_size,
+                num_workers=args.num_workers,
+                input_image_size=input_image_size,
+                resize_inv_factor=args.resize_inv_factor)
+        tic = time.time()
+        val_metric_name, val_metric_value = validate(
+            metric_calc=mx.metric.F1(),
+            net=net,
+            val_data=val_data_dict[input_image_size],
+            batch_fn=batch_fn,
+            data_source_needs_reset=False,
+            dtype=args.dtype,
+            ctx=ctx)
+        logging.info('Test: {}={:.4f}'.format(val_metric_name, val_metric_value))
+        logging.info('Time cost: {:.4f} sec'.format(
+            time.time() - tic))
+        return [-val_metric_value]
+
+    run_val_queue_evaluator(
+        queue_dir_path=args.val_queue_dir,
+        validate_fn=validate_checkpoint,
+        poll_interval=args.val_queue_poll_interval,
+        stale_timeout=args.val_queue_stale_timeout)
+
+
 def main():
     args = parse_args()
 
@@ -129,6 +180,13 @@ def main():
         num_gpus=args.num_gpus,
         batch_size=args.batch_size)
 
+    if args.val_queue_dir:
+        validate_queue(
+            args=args,
+            ctx=ctx,
+            batch_size=batch_size)
+        return
+
     net = prepare_model(
         model_name=args.model,
         use_pretrained=args.use_pretrained,
@@ -5,7 +5,9 @@ import logging
 import keras
 
 from common.logger_utils import initialize_logging
-from keras_.utils import prepare_ke_context, prepare_model, get_data_rec, get_data_generator, backend_agnostic_compile
+from common.val_cache import add_val_cache_parser_arguments, prepare_val_cache
+from keras_.utils import prepare_ke_context, prepare_model, get_data_rec_sequences, backend_agnostic_compile
+from keras_.utils import get_val_cache_generator
 
 
 def parse_args():
@@ -32,12 +34,19 @@ def parse_args():
         type=str,
         default='../imgclsmob_data/imagenet/rec/val.idx',
         help='the index of validation data')
+    parser.add_argument(
+        '--data-dir',
+        type=str,
+        default='../imgclsmob_data/imagenet',
+        help='path to directory with ImageNet-1K dataset (used for building validation cache)')
+    add_val_cache_parser_arguments(parser)
 
     parser.add_argument(
         '--model',
         type=str,
         required=True,
-        help='type of model to use. see model_provider for options.')
+        help='type of model to use. see model_provider for options. a comma-separated list of models is evaluated'
+             ' back-to-back (sweep mode)')
     parser.add_argument(
         '--use-pretrained',
         action='store_true',
@@ -76,6 +85,16 @@ def parse_args():
         default=4,
         type=int,
         help='number of preprocessing workers')
+    parser.add_argument(
+        '--num-readers',
+        type=int,
+        default=4,
+        help='number of parallel reader threads (each reads its own part of .rec file)')
+    parser.add_argument(
+        '--prefetch-batches',
+        type=int,
+        default=8,
+        help='number of prefetched batches')
 
     parser.add_argument(
         '--batch-size',
@@ -110,9 +129,10 @@ def parse_args():
 
 def test(net,
          val_gen,
-         val_size,
-         batch_size,
+         val_steps,
          num_gpus,
+         num_workers=1,
+         max_queue_size=10,
          calc_weight_count=False,
          extended_log=False):
 
@@ -120,20 +140,23 @@ def test(net,
 
     backend_agnostic_compile(
         model=net,
-        loss='categorical_crossentropy',
+        loss='sparse_categorical_crossentropy',
         optimizer=keras.optimizers.SGD(
             lr=0.01,
             momentum=0.0,
             decay=0.0,
             nesterov=False),
-        metrics=[keras.metrics.categorical_accuracy, keras.metrics.top_k_categorical_accuracy],
+        metrics=[keras.metrics.sparse_categorical_accuracy, keras.metrics.sparse_top_k_categorical_accuracy],
         num_gpus=num_gpus)
 
     # net.summary()
     tic = time.time()
     score = net.evaluate_generator(
         generator=val_gen,
-        steps=(val_size // batch_size),
+        steps=val_steps,
+        max_queue_size=max_queue_size,
+        workers=num_workers,
+        use_multiprocessing=False,
         verbose=True)
     err_top1_val = 1.0 - score[1]
     err_top5_val = 1.0 - score[2]
@@ -165,36 +188,55 @@ def main():
         num_gpus=args.num_gpus,
         batch_size=args.batch_size)
 
-    net = prepare_model(
-        model_name=args.model,
-        use_pretrained=args.use_pretrained,
-        pretrained_model_file_path=args.resume.strip())
-    num_classes = net.classes if hasattr(net, 'classes') else 1000
-    input_image_size = net.in_size if hasattr(net, 'in_size') else (args.input_size, args.input_size)
-
-    train_data, val_data = get_data_rec(
-        rec_train=args.rec_train,
-        rec_train_idx=args.rec_train_idx,
-        rec_val=args.rec_val,
-        rec_val_idx=args.rec_val_idx,
-        batch_size=batch_size,
-        num_workers=args.num_workers,
-        input_image_size=input_image_size,
-        resize_inv_factor=args.resize_inv_factor)
-    val_gen = get_data_generator(
-        data_iterator=val_data,
-        num_classes=num_classes)
-
-    val_size = 50000
-    assert (args.use_pretrained or args.resume.strip())
-    test(
-        net=net,
-        val_gen=val_gen,
-        val_size=val_size,
-        batch_size=batch_size,
-        num_gpus=args.num_gpus,
-        calc_weight_count=True,
-        extended_log=True)
+    model_names = [x.strip() for x in args.model.split(',') if x.strip()]
+    assert (len(model_names) == 1) or (not args.resume.strip())
+    for model_name in model_names:
+        if len(model_names) > 1:
+            logging.info('Model: {}'.format(model_name))
+            keras.backend.clear_session()
+        net = prepare_model(
+            model_name=model_name,
+            use_pretrained=args.use_pretrained,
+            pretrained_model_file_path=args.resume.strip())
+        input_image_size = net.in_size if hasattr(net, 'in_size') else (args.input_size, args.input_size)
+
+        if args.val_cache_dir:
+            val_gen, val_steps = get_val_cache_generator(
+                file_stem=prepare_val_cache(
+                    cache_dir_path=args.val_cache_dir,
+                    data_dir=args.data_dir,
+                    input_image_size=input_image_size,
+                    resize_inv_factor=args.resize_inv_factor,
+                    num_workers=args.num_workers),
+                batch_size=batch_size)
+        else:
+            _, val_gen = get_data_rec_sequences(
+                rec_train=args.rec_train,
+                rec_train_idx=args.rec_train_idx,
+                rec_val=args.rec_val,
+                rec_val_idx=args.rec_val_idx,
+                batch_size=batch_size,
+                num_workers=args.num_workers,
+                num_readers=args.num_readers,
+                prefetch_batches=args.prefetch_batches,
+                val_num_examples=50000,
+                input_image_size=input_image_size,
+                resize_inv_factor=args.resize_inv_factor)
+            val_steps = len(val_gen)
+
+        assert (args.use_pretrained or args.resume.strip())
+        test(
+            net=net,
+            val_gen=val_gen,
+            val_steps=val_steps,
+            num_gpus=args.num_gpus,
+            # Batches are served sequentially, the data is read in parallel by reader threads of the sequence:
+            num_workers=1,
+            max_queue_size=args.prefetch_batches,
+            calc_weight_count=True,
+            extended_log=True)
+        if hasattr(val_gen, 'close'):
+            val_gen.close()
 
 
 if __name__ == '__main__':
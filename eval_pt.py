@@ -1,11 +1,18 @@
+import os
 import argparse
 import time
 import logging
 
 from common.logger_utils import initialize_logging
-from pytorch.model_stats import measure_model
-from pytorch.imagenet1k import add_dataset_parser_arguments, get_val_data_loader
+from common.val_cache import add_val_cache_parser_arguments, prepare_val_cache
+from common.input_sizes import add_input_sizes_parser_arguments, parse_input_sizes, log_input_size_table
+from common.module_profiler import add_profiler_parser_arguments, log_profile
+from common.async_validation import add_val_queue_parser_arguments, run_val_queue_evaluator
+from pytorch.model_stats import measure_model, measure_latency
+from pytorch.imagenet1k import add_dataset_parser_arguments, get_val_data_loader, ValCacheDataLoader
 from pytorch.utils import prepare_pt_context, prepare_model, calc_net_weight_count, validate, AverageMeter
+from pytorch.merge_branches import merge_branches
+from pytorch.module_profiler import profile_model
 
 
 def parse_args():
@@ -14,12 +21,17 @@ def parse_args():
         formatter_class=argparse.ArgumentDefaultsHelpFormatter)
 
     add_dataset_parser_arguments(parser)
+    add_val_cache_parser_arguments(parser)
+    add_input_sizes_parser_arguments(parser)
+    add_profiler_parser_arguments(parser)
+    add_val_queue_parser_arguments(parser)
 
     parser.add_argument(
         '--model',
         type=str,
         required=True,
-        help='type of model to use. see model_provider for options.')
+        help='type of model to use. see model_provider for options. a comma-separated list of models is evaluated'
+             ' back-to-back (sweep mode)')
     parser.add_argument(
         '--use-pretrained',
         action='store_true',
@@ -39,6 +51,15 @@ def parse_args():
         dest='calc_flops_only',
         action='store_true',
         help='calculate FLOPs without quality estimation')
+    parser.add_argument(
+        '--merge-branches',
+        action='store_true',
+        help='merge sibling convolution branches (e.g. of Inception/Fire blocks) for faster inference')
+    parser.add_argument(
+        '--channel-spec',
+        type=str,
+        default='',
+        help='channel specification file of a pruned model (saved by train_pt.py with --prune-ratio)')
     parser.add_argument(
         '--remove-module',
         action='store_true',
@@ -97,6 +118,7 @@ def test(net,
          calc_flops=False,
          calc_flops_only=True,
          extended_log=False):
+    err_top1_val, err_top5_val = None, None
     if not calc_flops_only:
         acc_top1 = AverageMeter()
         acc_top5 = AverageMeter()
@@ -131,6 +153,68 @@ def test(net,
             flops2=num_flops / 2, flops2_m=num_flops / 2 / 1e6,
             macs=num_macs, macs_m=num_macs / 1e6))
 
+    return err_top1_val, err_top5_val
+
+
+def get_val_data(args,
+                 input_image_size,
+                 batch_size):
+    if args.val_cache_dir:
+        return ValCacheDataLoader(
+            file_stem=prepare_val_cache(
+                cache_dir_path=args.val_cache_dir,
+                data_dir=args.data_dir,
+                input_image_size=input_image_size,
+                resize_inv_factor=args.resize_inv_factor,
+                num_workers=args.num_workers),
+            batch_size=batch_size)
+    else:
+        return get_val_data_loader(
+            data_dir=args.data_dir,
+            batch_size=batch_size,
+            num_workers=args.num_workers,
+            input_image_size=input_image_size,
+            resize_inv_factor=args.resize_inv_factor)
+
+
+def validate_queue(args,
+                   use_cuda,
+                   batch_size):
+    """
+    Validate checkpoints from the validation queue of train_pt.py until the end of training.
+    """
+    val_data_dict = {}
+
+    def validate_checkpoint(file_stem):
+        net = prepare_model(
+            model_name=args.model,
+            use_pretrained=False,
+            pretrained_model_file_path=(file_stem + '.pth'),
+            use_cuda=use_cuda,
+            remove_module=args.remove_module,
+            channel_spec_file_path=args.channel_spec.strip())
+        net_ = net.module if hasattr(net, 'module') else net
+        input_image_size = net_.in_size[0] if hasattr(net_, 'in_size') else args.input_size
+        if input_image_size not in val_data_dict:
+            val_data_dict[input_image_size] = get_val_data(
+                args=args,
+                input_image_size=input_image_size,
+                batch_size=batch_size)
+        err_top1_val, err_top5_val = test(
+            net=net,
+            val_data=val_data_dict[input_image_size],
+            use_cuda=use_cuda,
+            input_image_size=(input_image_size, input_image_size),
+            in_channels=args.in_channels,
+            calc_flops_only=False)
+        return [err_top1_val, err_top5_val]
+
+    run_val_queue_evaluator(
+        queue_dir_path=args.val_queue_dir,
+        validate_fn=validate_checkpoint,
+        poll_interval=args.val_queue_poll_interval,
+        stale_timeout=args.val_queue_stale_timeout)
+
 
 def main():
     args = parse_args()
@@ -146,36 +230,83 @@ def main():
         num_gpus=args.num_gpus,
         batch_size=args.batch_size)
 
-    net = prepare_model(
-        model_name=args.model,
-        use_pretrained=args.use_pretrained,
-        pretrained_model_file_path=args.resume.strip(),
-        use_cuda=use_cuda,
-        remove_module=args.remove_module)
-    if hasattr(net, 'module'):
-        input_image_size = net.module.in_size[0] if hasattr(net.module, 'in_size') else args.input_size
-    else:
-        input_image_size = net.in_size[0] if hasattr(net, 'in_size') else args.input_size
-
-    val_data = get_val_data_loader(
-        data_dir=args.data_dir,
-        batch_size=batch_size,
-        num_workers=args.num_workers,
-        input_image_size=input_image_size,
-        resize_inv_factor=args.resize_inv_factor)
-
-    assert (args.use_pretrained or args.resume.strip() or args.calc_flops_only)
-    test(
-        net=net,
-        val_data=val_data,
-        use_cuda=use_cuda,
-        # calc_weight_count=(not log_file_exist),
-        input_image_size=(input_image_size, input_image_size),
-        in_channels=args.in_channels,
-        calc_weight_count=True,
-        calc_flops=args.calc_flops,
-        calc_flops_only=args.calc_flops_only,
-        extended_log=True)
+    if args.val_queue_dir:
+        validate_queue(
+            args=args,
+            use_cuda=use_cuda,
+            batch_size=batch_size)
+        return
+
+    model_names = [x.strip() for x in args.model.split(',') if x.strip()]
+    assert (len(model_names) == 1) or (not args.resume.strip())
+    for model_name in model_names:
+        if len(model_names) > 1:
+            logging.info('Model: {}'.format(model_name))
+        net = prepare_model(
+            model_name=model_name,
+            use_pretrained=args.use_pretrained,
+            pretrained_model_file_path=args.resume.strip(),
+            use_cuda=use_cuda,
+            remove_module=args.remove_module,
+            channel_spec_file_path=args.channel_spec.strip())
+        if args.merge_branches:
+            net.eval()
+            merge_branches(net.module if hasattr(net, 'module') else net)
+        if hasattr(net, 'module'):
+            input_image_size = net.module.in_size[0] if hasattr(net.module, 'in_size') else args.input_size
+        else:
+            input_image_size = net.in_size[0] if hasattr(net, 'in_size') else args.input_size
+
+        if args.profile:
+            log_profile(
+                profiler=profile_model(
+                    model=(net.module if hasattr(net, 'module') else net),
+                    in_channels=args.in_channels,
+                    in_size=(input_image_size, input_image_size),
+                    batch_size=batch_size,
+                    num_batches=args.profile_batches,
+                    use_cuda=use_cuda),
+                top=args.profile_top,
+                trace_file_path=os.path.join(args.save_dir, args.profile_trace_file if len(model_names) == 1 else
+                                             "{}_{}".format(model_name, args.profile_trace_file)))
+
+        # The model input size is only the default one, models can be evaluated at other sizes:
+        input_image_sizes = parse_input_sizes(args.input_sizes)
+        table_rows = []
+        for input_image_size in (input_image_sizes if input_image_sizes else [input_image_size]):
+            if input_image_sizes:
+                logging.info('Input size: {}'.format(input_image_size))
+
+            val_data = get_val_data(
+                args=args,
+                input_image_size=input_image_size,
+                batch_size=batch_size)
+
+            assert (args.use_pretrained or args.resume.strip() or args.calc_flops_only)
+            err_top1_val, err_top5_val = test(
+                net=net,
+                val_data=val_data,
+                use_cuda=use_cuda,
+                # calc_weight_count=(not log_file_exist),
+                input_image_size=(input_image_size, input_image_size),
+                in_channels=args.in_channels,
+                calc_weight_count=True,
+                calc_flops=args.calc_flops,
+                calc_flops_only=args.calc_flops_only,
+                extended_log=True)
+
+            if input_image_sizes:
+                latency = measure_latency(
+                    model=net,
+                    in_channels=args.in_channels,
+                    in_size=(input_image_size, input_image_size),
+                    batch_size=args.latency_batch_size,
+                    num_iters=args.latency_iters,
+                    use_cuda=use_cuda)
+                table_rows.append((input_image_size, err_top1_val, err_top5_val, latency))
+
+        if input_image_sizes:
+            log_input_size_table(table_rows, batch_size=args.latency_batch_size)
 
 
 if __name__ == '__main__':
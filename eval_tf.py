@@ -3,12 +3,16 @@ import tqdm
 import time
 import logging
 
+import tensorflow as tf
 from tensorpack.predict import PredictConfig, FeedfreePredictor
 from tensorpack.utils.stats import RatioCounter
 from tensorpack.input_source import QueueInput, StagingInput
 
 from common.logger_utils import initialize_logging
-from tensorflow_.utils_tp import prepare_tf_context, prepare_model, get_data, calc_flops
+from common.val_cache import add_val_cache_parser_arguments, prepare_val_cache
+from tensorflow_.utils_tp import prepare_tf_context, prepare_model, get_data, calc_flops, ValCacheDataFlow,\
+    get_val_samples
+from tensorflow_.imagenet_lmdb import add_data_format_parser_arguments
 
 
 def parse_args():
@@ -20,12 +24,15 @@ def parse_args():
         type=str,
         default='../imgclsmob_data/imagenet',
         help='training and validation pictures to use.')
+    add_data_format_parser_arguments(parser)
+    add_val_cache_parser_arguments(parser)
 
     parser.add_argument(
         '--model',
         type=str,
         required=True,
-        help='type of model to use. see model_provider for options.')
+        help='type of model to use. see model_provider for options. a comma-separated list of models is evaluated'
+             ' back-to-back (sweep mode)')
     parser.add_argument(
         '--use-pretrained',
         action='store_true',
@@ -155,25 +162,44 @@ def main():
         num_gpus=args.num_gpus,
         batch_size=args.batch_size)
 
-    net, inputs_desc = prepare_model(
-        model_name=args.model,
-        use_pretrained=args.use_pretrained,
-        pretrained_model_file_path=args.resume.strip())
-
-    val_dataflow = get_data(
-        is_train=False,
-        batch_size=batch_size,
-        data_dir_path=args.data_dir,
-        input_image_size=net.image_size,
-        resize_inv_factor=args.resize_inv_factor)
-
-    assert (args.use_pretrained or args.resume.strip())
-    test(
-        net=net,
-        session_init=inputs_desc,
-        val_dataflow=val_dataflow,
-        do_calc_flops=args.calc_flops,
-        extended_log=True)
+    model_names = [x.strip() for x in args.model.split(',') if x.strip()]
+    assert (len(model_names) == 1) or (not args.resume.strip())
+    for model_name in model_names:
+        if len(model_names) > 1:
+            logging.info('Model: {}'.format(model_name))
+            tf.reset_default_graph()
+        net, inputs_desc = prepare_model(
+            model_name=model_name,
+            use_pretrained=args.use_pretrained,
+            pretrained_model_file_path=args.resume.strip())
+
+        if args.val_cache_dir:
+            val_dataflow = ValCacheDataFlow(
+                file_stem=prepare_val_cache(
+                    cache_dir_path=args.val_cache_dir,
+                    data_dir=args.data_dir,
+                    input_image_size=net.image_size,
+                    resize_inv_factor=args.resize_inv_factor,
+                    num_workers=args.num_workers,
+                    samples_fn=get_val_samples),
+                batch_size=batch_size)
+        else:
+            val_dataflow = get_data(
+                is_train=False,
+                batch_size=batch_size,
+                data_dir_path=args.data_dir,
+                input_image_size=net.image_size,
+                resize_inv_factor=args.resize_inv_factor,
+                data_format=args.data_format,
+                lmdb_dir_path=args.lmdb_dir)
+
+        assert (args.use_pretrained or args.resume.strip())
+        test(
+            net=net,
+            session_init=inputs_desc,
+            val_dataflow=val_dataflow,
+            do_calc_flops=args.calc_flops,
+            extended_log=True)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,275 @@
+import os
+import sys
+import time
+import argparse
+import logging
+import subprocess
+import tempfile
+import shutil
+import numpy as np
+
+import mxnet as mx
+
+from common.logger_utils import initialize_logging
+from gluon.utils import prepare_mx_context, prepare_model, export_model
+from gluon.merge_branches import merge_branches
+from gluon.model_stats import measure_latency
+from gluon.predictor import create_predictor
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Export a model as a symbol with parameters, for serving without the model zoo (Gluon)',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument(
+        '--model',
+        type=str,
+        required=True,
+        help='type of model to use. see model_provider for options.')
+    parser.add_argument(
+        '--use-pretrained',
+        action='store_true',
+        help='enable using pretrained model from gluon.')
+    parser.add_argument(
+        '--dtype',
+        type=str,
+        default='float32',
+        help='data type of the exported model')
+    parser.add_argument(
+        '--resume',
+        type=str,
+        default='',
+        help='resume from previously saved parameters if not None')
+    parser.add_argument(
+        '--num-classes',
+        type=int,
+        default=1000,
+        help='number of classes')
+    parser.add_argument(
+        '--in-channels',
+        type=int,
+        default=3,
+        help='number of input channels')
+    parser.add_argument(
+        '--input-size',
+        type=int,
+        default=0,
+        help='size of the input for the exported model (the model input size by default)')
+    parser.add_argument(
+        '--batch-size',
+        type=int,
+        default=1,
+        help='batch size of the exported model (the predictor is bound to this shape by default)')
+    parser.add_argument(
+        '--merge-branches',
+        action='store_true',
+        help='merge sibling convolution branches (e.g. of Inception/Fire blocks) before export')
+
+    parser.add_argument(
+        '--output-prefix',
+        type=str,
+        default='',
+        help='path prefix of exported files (the model name in the save directory by default)')
+    parser.add_argument(
+        '--verify',
+        action='store_true',
+        help='verify export by comparing outputs of the network and the predictors on a random batch')
+    parser.add_argument(
+        '--max-abs-err',
+        type=float,
+        default=1e-3,
+        help='maximal absolute difference of outputs for successful verification')
+    parser.add_argument(
+        '--timing',
+        action='store_true',
+        help='compare cold start time and batch latency of the hybridized network and the predictors')
+    parser.add_argument(
+        '--timing-iters',
+        type=int,
+        default=20,
+        help='number of timed forward passes for latency measurement')
+
+    parser.add_argument(
+        '--num-gpus',
+        type=int,
+        default=0,
+        help='number of gpus to use.')
+
+    parser.add_argument(
+        '--save-dir',
+        type=str,
+        default='',
+        help='directory of exported models and log-files')
+    parser.add_argument(
+        '--logging-file-name',
+        type=str,
+        default='export.log',
+        help='filename of export log')
+
+    parser.add_argument(
+        '--log-packages',
+        type=str,
+        default='mxnet',
+        help='list of python packages for logging')
+    parser.add_argument(
+        '--log-pip-packages',
+        type=str,
+        default='mxnet-cu92',
+        help='list of pip packages for logging')
+    args = parser.parse_args()
+    return args
+
+
+def measure_cold_start(code):
+    """
+    Measure the time of running a Python code in a new process (from the process start to the exit).
+
+    Parameters:
+    ----------
+    code : str
+        Python code.
+
+    Returns
+    -------
+    float
+        Elapsed time (in seconds).
+    """
+    tic = time.time()
+    subprocess.check_call(
+        [sys.executable, "-c", code],
+        cwd=os.path.dirname(os.path.abspath(__file__)))
+    return time.time() - tic
+
+
+def compare_cold_start(net,
+                       model_name,
+                       file_prefix,
+                       data_shape,
+                       dtype,
+                       num_classes,
+                       in_channels,
+                       ctx_str):
+    """
+    Log cold start times (imports, model creation, loading and the first forward pass) of the hybridized network and
+    the predictors.
+    """
+    tmp_dir_path = tempfile.mkdtemp()
+    try:
+        block_params_file_path = os.path.join(tmp_dir_path, "block.params")
+        net.save_parameters(block_params_file_path)
+        block_code = "\n".join([
+            "import mxnet as mx",
+            "from gluon.gluoncv2.model_provider import get_model",
+            "ctx = {}".format(ctx_str),
+            "net = get_model('{}', classes={}, in_channels={}, ctx=ctx)".format(model_name, num_classes, in_channels),
+            "net.load_parameters('{}', ctx=ctx)".format(block_params_file_path),
+            "net.cast('{}')".format(dtype),
+            "net.hybridize(static_alloc=True, static_shape=True)",
+            "net(mx.nd.zeros({}, ctx=ctx, dtype='{}')).wait_to_read()".format(tuple(data_shape), dtype)])
+        block_time = measure_cold_start(block_code)
+        logging.info("Cold start of hybridized network: {:.3f} sec".format(block_time))
+
+        for backend in ["module", "symbol_block"]:
+            predictor_code = "\n".join([
+                "import mxnet as mx",
+                "from gluon.predictor import create_predictor",
+                "ctx = {}".format(ctx_str),
+                "predictor = create_predictor('{}', backend='{}', ctx=ctx)".format(file_prefix, backend),
+                "predictor(mx.nd.zeros({}, ctx=ctx)).wait_to_read()".format(tuple(data_shape))])
+            predictor_time = measure_cold_start(predictor_code)
+            logging.info("Cold start of {} predictor: {:.3f} sec ({:.2f}x)".format(
+                backend, predictor_time, block_time / predictor_time))
+    finally:
+        shutil.rmtree(tmp_dir_path)
+
+
+def main():
+    args = parse_args()
+
+    _, log_file_exist = initialize_logging(
+        logging_dir_path=args.save_dir,
+        logging_file_name=args.logging_file_name,
+        script_args=args,
+        log_packages=args.log_packages,
+        log_pip_packages=args.log_pip_packages)
+
+    ctx, _ = prepare_mx_context(
+        num_gpus=args.num_gpus,
+        batch_size=1)
+    ctx = ctx[0]
+
+    net = prepare_model(
+        model_name=args.model,
+        use_pretrained=args.use_pretrained,
+        pretrained_model_file_path=args.resume.strip(),
+        dtype=args.dtype,
+        tune_layers="",
+        classes=args.num_classes,
+        in_channels=args.in_channels,
+        ctx=ctx)
+    if args.merge_branches:
+        merge_branches(net)
+
+    if args.input_size > 0:
+        input_image_size = (args.input_size, args.input_size)
+    else:
+        input_image_size = net.in_size if hasattr(net, 'in_size') else (224, 224)
+    data_shape = (args.batch_size, args.in_channels, input_image_size[0], input_image_size[1])
+
+    file_prefix = args.output_prefix if args.output_prefix else os.path.join(args.save_dir, args.model)
+    file_paths = export_model(
+        net=net,
+        model_name=args.model,
+        file_prefix=file_prefix,
+        data_shape=data_shape,
+        dtype=args.dtype,
+        ctx=ctx)
+    logging.info("Exported files: {}".format(", ".join(file_paths)))
+
+    if args.verify or args.timing:
+        predictors = [(backend, create_predictor(file_prefix, backend=backend, ctx=ctx))
+                      for backend in ["module", "symbol_block"]]
+
+    if args.verify:
+        x = mx.nd.random.normal(shape=data_shape, ctx=ctx).astype(args.dtype)
+        y_net = net(x).astype("float32").asnumpy()
+        for backend, predictor in predictors:
+            y_predictor = predictor(x).astype("float32").asnumpy()
+            dist = np.max(np.abs(y_net - y_predictor))
+            logging.info("Verification of {} predictor: max_abs_err={:.2e}".format(backend, dist))
+            assert (dist < args.max_abs_err), "Exported model mismatches the network"
+
+    if args.timing:
+        net_latency = measure_latency(
+            model=net,
+            in_channels=args.in_channels,
+            in_size=input_image_size,
+            batch_size=args.batch_size,
+            num_iters=args.timing_iters,
+            dtype=args.dtype,
+            ctx=ctx)
+        logging.info("Batch latency of hybridized network: {:.2f} ms".format(net_latency * 1e3))
+        for backend, predictor in predictors:
+            predictor_latency = measure_latency(
+                model=predictor,
+                in_channels=args.in_channels,
+                in_size=input_image_size,
+                batch_size=args.batch_size,
+                num_iters=args.timing_iters,
+                dtype=args.dtype,
+                ctx=ctx)
+            logging.info("Batch latency of {} predictor: {:.2f} ms".format(backend, predictor_latency * 1e3))
+
+        compare_cold_start(
+            net=net,
+            model_name=args.model,
+            file_prefix=os.path.abspath(file_prefix),
+            data_shape=data_shape,
+            dtype=args.dtype,
+            num_classes=args.num_classes,
+            in_channels=args.in_channels,
+            ctx_str=("mx.gpu(0)" if args.num_gpus > 0 else "mx.cpu()"))
+
+
+if __name__ == '__main__':
+    main()
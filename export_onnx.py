@@ -0,0 +1,334 @@
+import os
+import argparse
+import logging
+import numpy as np
+
+from common.logger_utils import initialize_logging
+from common.onnx_runtime import parse_thread_counts, check_onnx_model, create_ort_session, run_ort_session,\
+    measure_ort_latency, log_onnx_table
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Export models to ONNX, verify them and benchmark them with ONNX Runtime on CPU (PyTorch/Gluon)',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument(
+        '--fwk',
+        type=str,
+        default='pytorch',
+        choices=['pytorch', 'gluon'],
+        help='model framework name')
+    parser.add_argument(
+        '--model',
+        type=str,
+        required=True,
+        help='type of model to use. see model_provider for options. a comma-separated list of models or `all` (the '
+             'whole model zoo) gives a compatibility and speed table')
+    parser.add_argument(
+        '--use-pretrained',
+        action='store_true',
+        help='enable using pretrained model from github.')
+    parser.add_argument(
+        '--resume',
+        type=str,
+        default='',
+        help='resume from previously saved parameters if not None')
+    parser.add_argument(
+        '--in-channels',
+        type=int,
+        default=3,
+        help='number of input channels')
+    parser.add_argument(
+        '--input-size',
+        type=int,
+        default=0,
+        help='size of the input for tracing (the model input size by default)')
+    parser.add_argument(
+        '--dynamic-hw',
+        action='store_true',
+        help='make the spatial axes of the input dynamic (the batch axis is always dynamic)')
+    parser.add_argument(
+        '--opset',
+        type=int,
+        default=13,
+        help='ONNX opset version')
+
+    parser.add_argument(
+        '--max-abs-err',
+        type=float,
+        default=1e-3,
+        help='maximal absolute difference of logits for successful verification')
+    parser.add_argument(
+        '--num-threads',
+        type=str,
+        default='1,2,4,0',
+        help='comma-separated list of ONNX Runtime thread counts for benchmarking (0 means the number of CPU cores)')
+    parser.add_argument(
+        '--batch-size',
+        type=int,
+        default=16,
+        help='batch size for throughput measurement (latency is measured for a batch of one image)')
+    parser.add_argument(
+        '--timing-iters',
+        type=int,
+        default=20,
+        help='number of timed forward passes for latency measurement')
+    parser.add_argument(
+        '--no-benchmark',
+        action='store_true',
+        help='only export and verify models')
+    parser.add_argument(
+        '--remove-files',
+        action='store_true',
+        help='remove exported files after benchmarking (for zoo-wide runs)')
+
+    parser.add_argument(
+        '--save-dir',
+        type=str,
+        default='',
+        help='directory of exported models and log-files')
+    parser.add_argument(
+        '--table-file-name',
+        type=str,
+        default='onnx_table.md',
+        help='filename of compatibility and speed table (in the save directory)')
+    parser.add_argument(
+        '--logging-file-name',
+        type=str,
+        default='export_onnx.log',
+        help='filename of export log')
+
+    parser.add_argument(
+        '--log-packages',
+        type=str,
+        default='torch, mxnet, onnx, onnxruntime',
+        help='list of python packages for logging')
+    parser.add_argument(
+        '--log-pip-packages',
+        type=str,
+        default='torch, mxnet, onnx, onnxruntime',
+        help='list of pip packages for logging')
+    args = parser.parse_args()
+    return args
+
+
+def get_model_names(fwk):
+    """
+    Get names of all models in the model zoo of a framework.
+    """
+    if fwk == "pytorch":
+        from pytorch.pytorchcv.model_provider import _models
+    else:
+        from gluon.gluoncv2.model_provider import _models
+    return sorted(_models.keys())
+
+
+def prepare_net(fwk,
+                model_name,
+                use_pretrained,
+                pretrained_model_file_path):
+    """
+    Create a network on CPU in inference mode.
+    """
+    if fwk == "pytorch":
+        from pytorch.utils import prepare_model
+        net = prepare_model(
+            model_name=model_name,
+            use_pretrained=use_pretrained,
+            pretrained_model_file_path=pretrained_model_file_path,
+            use_cuda=False,
+            use_data_parallel=False)
+        net.eval()
+    else:
+        from gluon.utils import prepare_model
+        net = prepare_model(
+            model_name=model_name,
+            use_pretrained=use_pretrained,
+            pretrained_model_file_path=pretrained_model_file_path,
+            dtype="float32",
+            tune_layers="",
+            do_hybridize=False)
+    return net
+
+
+def export_net(fwk,
+               net,
+               model_name,
+               file_path,
+               in_channels,
+               in_size,
+               dynamic_hw,
+               opset_version):
+    """
+    Export a network to an ONNX file.
+    """
+    if fwk == "pytorch":
+        from pytorch.onnx_export import export_onnx
+        return export_onnx(
+            net=net,
+            file_path=file_path,
+            in_channels=in_channels,
+            in_size=in_size,
+            dynamic_hw=dynamic_hw,
+            opset_version=opset_version)
+    else:
+        from gluon.onnx_export import export_onnx
+        return export_onnx(
+            net=net,
+            model_name=model_name,
+            file_path=file_path,
+            in_channels=in_channels,
+            in_size=in_size,
+            dynamic_hw=dynamic_hw,
+            opset_version=opset_version)
+
+
+def calc_net_outputs(fwk,
+                     net,
+                     x):
+    """
+    Calculate logits of a network for a batch.
+    """
+    if fwk == "pytorch":
+        import torch
+        with torch.no_grad():
+            return net(torch.from_numpy(x)).numpy()
+    else:
+        import mxnet as mx
+        return net(mx.nd.array(x)).asnumpy()
+
+
+def measure_net_latency(fwk,
+                        net,
+                        in_channels,
+                        in_size,
+                        num_iters):
+    """
+    Measure the latency of a network in the framework for a batch of one image.
+    """
+    if fwk == "pytorch":
+        from pytorch.model_stats import measure_latency
+    else:
+        from gluon.model_stats import measure_latency
+    return measure_latency(
+        model=net,
+        in_channels=in_channels,
+        in_size=in_size,
+        batch_size=1,
+        num_iters=num_iters)
+
+
+def process_model(args,
+                  model_name,
+                  thread_counts):
+    """
+    Export, verify and benchmark a model.
+
+    Returns
+    -------
+    tuple of 5 elements
+        Row of the compatibility and speed table (see `log_onnx_table`).
+    """
+    net = prepare_net(
+        fwk=args.fwk,
+        model_name=model_name,
+        use_pretrained=args.use_pretrained,
+        pretrained_model_file_path=args.resume.strip())
+    if args.input_size > 0:
+        in_size = (args.input_size, args.input_size)
+    else:
+        in_size = net.in_size if hasattr(net, "in_size") else (224, 224)
+
+    file_path = os.path.join(args.save_dir, "{}.onnx".format(model_name))
+    export_net(
+        fwk=args.fwk,
+        net=net,
+        model_name=model_name,
+        file_path=file_path,
+        in_channels=args.in_channels,
+        in_size=in_size,
+        dynamic_hw=args.dynamic_hw,
+        opset_version=args.opset)
+    num_nodes = check_onnx_model(file_path)
+    logging.info("Model {} is exported to {} ({} nodes)".format(model_name, file_path, num_nodes))
+
+    # A batch of two images checks the dynamic batch axis:
+    x = np.random.normal(size=(2, args.in_channels, in_size[0], in_size[1])).astype(np.float32)
+    y_net = calc_net_outputs(args.fwk, net, x)
+    y_ort = run_ort_session(create_ort_session(file_path), x)
+    max_abs_err = float(np.max(np.abs(y_net - y_ort)))
+    status = "ok" if max_abs_err < args.max_abs_err else "mismatch"
+    logging.info("Verification of {}: max_abs_err={:.2e}".format(model_name, max_abs_err))
+
+    fwk_latency = None
+    ort_results = None
+    if not args.no_benchmark:
+        fwk_latency = measure_net_latency(
+            fwk=args.fwk,
+            net=net,
+            in_channels=args.in_channels,
+            in_size=in_size,
+            num_iters=args.timing_iters)
+        ort_results = []
+        for num_threads in thread_counts:
+            session = create_ort_session(file_path, num_threads=num_threads)
+            latency = measure_ort_latency(
+                session=session,
+                data_shape=(1, args.in_channels, in_size[0], in_size[1]),
+                num_iters=args.timing_iters)
+            batch_latency = measure_ort_latency(
+                session=session,
+                data_shape=(args.batch_size, args.in_channels, in_size[0], in_size[1]),
+                num_iters=max(1, args.timing_iters // args.batch_size))
+            ort_results.append((latency, args.batch_size / batch_latency))
+            logging.info("ONNX Runtime ({} threads): latency {:.2f} ms, throughput {:.1f} img/s".format(
+                num_threads, latency * 1e3, args.batch_size / batch_latency))
+            del session
+
+    if args.remove_files:
+        for path in [file_path] + [os.path.splitext(file_path)[0] + suffix for suffix in
+                                   ["-symbol.json", "-0000.params", "-meta.json"]]:
+            if os.path.exists(path):
+                os.remove(path)
+    return model_name, status, max_abs_err, fwk_latency, ort_results
+
+
+def main():
+    args = parse_args()
+
+    _, log_file_exist = initialize_logging(
+        logging_dir_path=args.save_dir,
+        logging_file_name=args.logging_file_name,
+        script_args=args,
+        log_packages=args.log_packages,
+        log_pip_packages=args.log_pip_packages)
+
+    if args.model.strip() == "all":
+        model_names = get_model_names(args.fwk)
+    else:
+        model_names = [x.strip() for x in args.model.split(',') if x.strip()]
+    assert (len(model_names) == 1) or (not args.resume.strip())
+    thread_counts = parse_thread_counts(args.num_threads)
+
+    rows = []
+    for model_name in model_names:
+        try:
+            rows.append(process_model(
+                args=args,
+                model_name=model_name,
+                thread_counts=thread_counts))
+        except Exception as e:
+            # A failed model is a row of the compatibility table, the sweep goes on:
+            error = "{}: {}".format(type(e).__name__, str(e).strip().split("\n")[0])
+            logging.info("Export of {} failed with {}".format(model_name, error))
+            rows.append((model_name, error[:80].replace("|", "/"), None, None, None))
+
+    log_onnx_table(
+        rows=rows,
+        thread_counts=thread_counts,
+        batch_size=args.batch_size,
+        table_file_path=os.path.join(args.save_dir, args.table_file_name))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,247 @@
+import os
+import sys
+import time
+import argparse
+import logging
+import subprocess
+import tempfile
+import shutil
+import numpy as np
+
+import tensorflow as tf
+
+from common.logger_utils import initialize_logging
+from tensorflow_.utils import save_model_params, prepare_model_session, export_frozen_model
+from tensorflow_.predictor import FrozenGraphPredictor
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Export a model as a frozen BatchNorm-folded graph, for serving without the model zoo (TensorFlow)',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument(
+        '--model',
+        type=str,
+        required=True,
+        help='type of model to use. see model_provider for options.')
+    parser.add_argument(
+        '--use-pretrained',
+        action='store_true',
+        help='enable using pretrained model from gluon.')
+    parser.add_argument(
+        '--resume',
+        type=str,
+        default='',
+        help='resume from previously saved parameters if not None')
+    parser.add_argument(
+        '--batch-size',
+        type=int,
+        default=1,
+        help='batch size for verification and latency measurement (the exported batch axis is dynamic)')
+
+    parser.add_argument(
+        '--output-prefix',
+        type=str,
+        default='',
+        help='path prefix of exported files (the model name in the save directory by default)')
+    parser.add_argument(
+        '--verify',
+        action='store_true',
+        help='verify export by comparing outputs of the network and the predictor on a random batch')
+    parser.add_argument(
+        '--max-abs-err',
+        type=float,
+        default=1e-3,
+        help='maximal absolute difference of outputs for successful verification')
+    parser.add_argument(
+        '--timing',
+        action='store_true',
+        help='compare cold start time and batch latency of the network graph and the predictor')
+    parser.add_argument(
+        '--timing-iters',
+        type=int,
+        default=20,
+        help='number of timed forward passes for latency measurement')
+
+    parser.add_argument(
+        '--num-gpus',
+        type=int,
+        default=0,
+        help='number of gpus to use.')
+
+    parser.add_argument(
+        '--save-dir',
+        type=str,
+        default='',
+        help='directory of exported models and log-files')
+    parser.add_argument(
+        '--logging-file-name',
+        type=str,
+        default='export.log',
+        help='filename of export log')
+
+    parser.add_argument(
+        '--log-packages',
+        type=str,
+        default='tensorflow-gpu',
+        help='list of python packages for logging')
+    parser.add_argument(
+        '--log-pip-packages',
+        type=str,
+        default='tensorflow-gpu',
+        help='list of pip packages for logging')
+    args = parser.parse_args()
+    return args
+
+
+def measure_latency(model,
+                    data_shape,
+                    num_iters=20):
+    """
+    Measure the average time of a forward pass on random data.
+
+    Parameters:
+    ----------
+    model : callable
+        Tested model (a function of a numpy batch).
+    data_shape : tuple of 4 int
+        Input shape.
+    num_iters : int, default 20
+        Number of timed forward passes.
+
+    Returns
+    -------
+    float
+        Time of a forward pass (in seconds).
+    """
+    x = np.random.normal(size=data_shape).astype(np.float32)
+    for _ in range(3):
+        model(x)
+    tic = time.time()
+    for _ in range(num_iters):
+        model(x)
+    return (time.time() - tic) / num_iters
+
+
+def measure_cold_start(code):
+    """
+    Measure the time of running a Python code in a new process (from the process start to the exit).
+
+    Parameters:
+    ----------
+    code : str
+        Python code.
+
+    Returns
+    -------
+    float
+        Elapsed time (in seconds).
+    """
+    tic = time.time()
+    subprocess.check_call(
+        [sys.executable, "-c", code],
+        cwd=os.path.dirname(os.path.abspath(__file__)))
+    return time.time() - tic
+
+
+def compare_cold_start(sess,
+                       model_name,
+                       file_prefix,
+                       data_shape,
+                       use_gpu):
+    """
+    Log cold start times (imports, graph building or loading, weight loading and the first forward pass) of the model
+    zoo path and the predictor.
+    """
+    tmp_dir_path = tempfile.mkdtemp()
+    try:
+        params_file_path = os.path.join(tmp_dir_path, "model.npz")
+        with sess.graph.as_default():
+            save_model_params(sess, params_file_path)
+        zoo_code = "\n".join([
+            "import numpy as np",
+            "from tensorflow_.utils import prepare_model_session",
+            "sess, x, y = prepare_model_session('{}', use_pretrained=False, pretrained_model_file_path='{}')".format(
+                model_name, params_file_path),
+            "sess.run(y, feed_dict={{x: np.zeros({}, np.float32)}})".format(tuple(data_shape))])
+        zoo_time = measure_cold_start(zoo_code)
+        logging.info("Cold start of model zoo graph: {:.3f} sec".format(zoo_time))
+
+        predictor_code = "\n".join([
+            "import numpy as np",
+            "from tensorflow_.predictor import FrozenGraphPredictor",
+            "predictor = FrozenGraphPredictor('{}', use_gpu={})".format(file_prefix, use_gpu),
+            "predictor(np.zeros({}, np.float32))".format(tuple(data_shape))])
+        predictor_time = measure_cold_start(predictor_code)
+        logging.info("Cold start of frozen graph predictor: {:.3f} sec ({:.2f}x)".format(
+            predictor_time, zoo_time / predictor_time))
+    finally:
+        shutil.rmtree(tmp_dir_path)
+
+
+def main():
+    args = parse_args()
+
+    _, log_file_exist = initialize_logging(
+        logging_dir_path=args.save_dir,
+        logging_file_name=args.logging_file_name,
+        script_args=args,
+        log_packages=args.log_packages,
+        log_pip_packages=args.log_pip_packages)
+
+    use_gpu = (args.num_gpus > 0)
+    config = tf.ConfigProto()
+    if not use_gpu:
+        config.device_count["GPU"] = 0
+
+    sess, x, y_net = prepare_model_session(
+        model_name=args.model,
+        use_pretrained=args.use_pretrained,
+        pretrained_model_file_path=args.resume.strip(),
+        config=config)
+    data_shape = [args.batch_size] + x.shape.as_list()[1:]
+
+    file_prefix = args.output_prefix if args.output_prefix else os.path.join(args.save_dir, args.model)
+    file_paths = export_frozen_model(
+        sess=sess,
+        x=x,
+        y_net=y_net,
+        model_name=args.model,
+        file_prefix=file_prefix)
+    logging.info("Exported files: {}".format(", ".join(file_paths)))
+
+    def net(data):
+        return sess.run(y_net, feed_dict={x: data})
+
+    if args.verify or args.timing:
+        predictor = FrozenGraphPredictor(file_prefix, use_gpu=use_gpu)
+
+    if args.verify:
+        data = np.random.normal(size=data_shape).astype(np.float32)
+        dist = np.max(np.abs(net(data) - predictor(data)))
+        logging.info("Verification of frozen graph predictor: max_abs_err={:.2e}".format(dist))
+        assert (dist < args.max_abs_err), "Exported model mismatches the network"
+
+    if args.timing:
+        net_latency = measure_latency(
+            model=net,
+            data_shape=data_shape,
+            num_iters=args.timing_iters)
+        logging.info("Batch latency of model zoo graph: {:.2f} ms".format(net_latency * 1e3))
+        predictor_latency = measure_latency(
+            model=predictor,
+            data_shape=data_shape,
+            num_iters=args.timing_iters)
+        logging.info("Batch latency of frozen graph predictor: {:.2f} ms ({:.2f}x)".format(
+            predictor_latency * 1e3, net_latency / predictor_latency))
+
+        compare_cold_start(
+            sess=sess,
+            model_name=args.model,
+            file_prefix=os.path.abspath(file_prefix),
+            data_shape=data_shape,
+            use_gpu=use_gpu)
+
+
+if __name__ == '__main__':
+    main()
@@ -2,8 +2,8 @@
     CIFAR dataset routines.
 """
 
-__all__ = ['add_dataset_parser_arguments', 'batch_fn', 'get_train_data_source', 'get_val_data_source',
-           'num_training_samples']
+__all__ = ['add_dataset_parser_arguments', 'CIFARCacheDataset', 'get_dataset', 'batch_fn', 'get_train_data_source',
+           'get_val_data_source', 'num_training_samples']
 
 import numpy as np
 import mxnet as mx
@@ -11,6 +11,8 @@ from mxnet import gluon
 from mxnet.gluon import Block
 from mxnet.gluon.data.vision import transforms
 
+from common.cifar_cache import prepare_cifar_cache, load_cifar_cache
+
 
 num_training_samples = 50000
 
@@ -59,6 +61,51 @@ class CIFAR100Fine(gluon.data.vision.CIFAR100):
             train=train)
 
 
+class CIFARCacheDataset(gluon.data.Dataset):
+    """
+    CIFAR dataset over a memory-mapped cache (see `common.cifar_cache`), with the same samples as Gluon
+    `CIFAR10`/`CIFAR100` (with fine labels).
+
+    Parameters:
+    ----------
+    file_stem : str
+        Path stem for cache files.
+    """
+    def __init__(self,
+                 file_stem):
+        super(CIFARCacheDataset, self).__init__()
+        self._data, self._label = load_cifar_cache(file_stem)
+
+    def __len__(self):
+        return self._label.shape[0]
+
+    def __getitem__(self, idx):
+        return mx.nd.array(self._data[idx], dtype=np.uint8), self._label[idx]
+
+
+def get_dataset(dataset_name,
+                dataset_dir,
+                train,
+                data_cache_dir=''):
+    if data_cache_dir:
+        return CIFARCacheDataset(
+            file_stem=prepare_cifar_cache(
+                cache_dir_path=data_cache_dir,
+                data_dir=dataset_dir,
+                dataset_name=dataset_name,
+                train=train))
+
+    if dataset_name == "CIFAR10":
+        dataset_class = gluon.data.vision.CIFAR10
+    elif dataset_name == "CIFAR100":
+        dataset_class = CIFAR100Fine
+    else:
+        raise Exception('Unrecognized dataset: {}'.format(dataset_name))
+    return dataset_class(
+        root=dataset_dir,
+        train=train)
+
+
 class RandomCrop(Block):
     """Randomly crop `src` with `size` (width, height).
     Padding is optional.
@@ -113,7 +160,8 @@ def batch_fn(batch, ctx):
 def get_train_data_source(dataset_name,
                           dataset_dir,
                           batch_size,
-                          num_workers):
+                          num_workers,
+                          data_cache_dir=''):
     jitter_param = 0.4
     lighting_param = 0.1
     mean_rgb = (0.4914, 0.4822, 0.4465)
@@ -133,17 +181,12 @@ def get_train_data_source(dataset_name,
             std=std_rgb)
     ])
 
-    if dataset_name == "CIFAR10":
-        dataset_class = gluon.data.vision.CIFAR10
-    elif dataset_name == "CIFAR100":
-        dataset_class = CIFAR100Fine
-    else:
-        raise Exception('Unrecognized dataset: {}'.format(dataset_name))
-
     return gluon.data.DataLoader(
-        dataset=dataset_class(
-            root=dataset_dir,
-            train=True).transform_first(fn=transform_train),
+        dataset=get_dataset(
+            dataset_name=dataset_name,
+            dataset_dir=dataset_dir,
+            train=True,
+            data_cache_dir=data_cache_dir).transform_first(fn=transform_train),
         batch_size=batch_size,
         shuffle=True,
         last_batch='discard',
@@ -153,7 +196,8 @@ def get_train_data_source(dataset_name,
 def get_val_data_source(dataset_name,
                         dataset_dir,
                         batch_size,
-                        num_workers):
+                        num_workers,
+                        data_cache_dir=''):
     mean_rgb = (0.4914, 0.4822, 0.4465)
     std_rgb = (0.2023, 0.1994, 0.2010)
 
@@ -164,17 +208,12 @@ def get_val_data_source(dataset_name,
             std=std_rgb)
     ])
 
-    if dataset_name == "CIFAR10":
-        dataset_class = gluon.data.vision.CIFAR10
-    elif dataset_name == "CIFAR100":
-        dataset_class = CIFAR100Fine
-    else:
-        raise Exception('Unrecognized dataset: {}'.format(dataset_name))
-
     return gluon.data.DataLoader(
-        dataset=dataset_class(
-            root=dataset_dir,
-            train=False).transform_first(fn=transform_val),
+        dataset=get_dataset(
+            dataset_name=dataset_name,
+            dataset_dir=dataset_dir,
+            train=False,
+            data_cache_dir=data_cache_dir).transform_first(fn=transform_val),
         batch_size=batch_size,
         shuffle=False,
         num_workers=num_workers)
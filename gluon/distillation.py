@@ -0,0 +1,184 @@
+"""
+    Knowledge distillation with cached teacher logits (see `common.teacher_cache`).
+"""
+
+__all__ = ['calc_teacher_cache', 'prepare_teacher_caches', 'DistillationSoftmaxCrossEntropyLoss']
+
+import time
+import logging
+import numpy as np
+from mxnet import gluon
+
+from common.teacher_cache import ViewSampler, get_teacher_cache_file_stem, create_teacher_cache, TeacherLogitsCache
+from .utils import prepare_model
+
+
+def calc_teacher_cache(teacher_net,
+                       dataset,
+                       view,
+                       file_stem,
+                       batch_size,
+                       num_workers,
+                       top_k,
+                       dtype,
+                       ctx):
+    """
+    Calculate teacher logits for an augmentation view of the training set and store them in the cache.
+
+    Parameters:
+    ----------
+    teacher_net : HybridBlock
+        Teacher model.
+    dataset : ReproducibleAugDataset
+        Training dataset with reproducible augmentation.
+    view : int
+        Augmentation view number.
+    file_stem : str
+        Path stem for cache files.
+    batch_size : int
+        Batch size.
+    num_workers : int
+        Number of preprocessing workers.
+    top_k : int
+        Number of kept logits for each sample.
+    dtype : str
+        Base data type for tensors.
+    ctx : list of Context
+        MXNet contexts.
+    """
+    data_loader = gluon.data.DataLoader(
+        dataset=dataset,
+        batch_size=batch_size,
+        sampler=ViewSampler(
+            sampler=range(len(dataset)),
+            num_samples=len(dataset),
+            view=view),
+        last_batch='keep',
+        num_workers=num_workers)
+
+    def logits_iter():
+        for data, _, indices in data_loader:
+            data_list = gluon.utils.split_and_load(data, ctx_list=ctx, batch_axis=0, even_split=False)
+            logits = [teacher_net(X.astype(dtype, copy=False)).astype("float32").asnumpy() for X in data_list]
+            yield indices.asnumpy().astype(np.int64), np.concatenate(logits, axis=0)
+
+    create_teacher_cache(
+        file_stem=file_stem,
+        num_samples=len(dataset),
+        top_k=top_k,
+        logits_iter=logits_iter())
+
+
+def prepare_teacher_caches(teacher_name,
+                           dataset,
+                           cache_dir_path,
+                           num_views,
+                           input_image_size,
+                           top_k,
+                           batch_size,
+                           num_workers,
+                           dtype,
+                           ctx,
+                           rank=0):
+    """
+    Get teacher caches for all augmentation views, calculating the missing ones (the teacher is loaded only in this
+    case). In distributed training, caches are calculated by the worker with zero rank, the other workers wait for
+    them.
+
+    Parameters:
+    ----------
+    teacher_name : str
+        Name of the pretrained teacher model.
+    dataset : ReproducibleAugDataset
+        Training dataset with reproducible augmentation.
+    cache_dir_path : str
+        Directory with cache files.
+    num_views : int
+        Number of augmentation views.
+    input_image_size : tuple of two ints
+        Spatial size of the input images.
+    top_k : int
+        Number of kept logits for each sample.
+    batch_size : int
+        Batch size.
+    num_workers : int
+        Number of preprocessing workers.
+    dtype : str
+        Base data type for tensors.
+    ctx : list of Context
+        MXNet contexts.
+    rank : int, default 0
+        Rank of the worker in distributed training.
+
+    Returns
+    -------
+    list of TeacherLogitsCache
+        Caches for all views.
+    """
+    file_stems = [get_teacher_cache_file_stem(
+        cache_dir_path=cache_dir_path,
+        teacher_name=teacher_name,
+        aug_seed=dataset.aug_seed,
+        view=view,
+        input_image_size=input_image_size,
+        top_k=top_k) for view in range(num_views)]
+    missing_views = [view for view, file_stem in enumerate(file_stems) if not TeacherLogitsCache.exists(file_stem)]
+    if missing_views and (rank == 0):
+        teacher_net = prepare_model(
+            model_name=teacher_name,
+            use_pretrained=True,
+            pretrained_model_file_path='',
+            dtype=dtype,
+            tune_layers='',
+            ctx=ctx)
+        for view in missing_views:
+            logging.info('Calculating teacher logits for augmentation view {}'.format(view))
+            calc_teacher_cache(
+                teacher_net=teacher_net,
+                dataset=dataset,
+                view=view,
+                file_stem=file_stems[view],
+                batch_size=batch_size,
+                num_workers=num_workers,
+                top_k=top_k,
+                dtype=dtype,
+                ctx=ctx)
+        del teacher_net
+    else:
+        while not all(TeacherLogitsCache.exists(file_stem) for file_stem in file_stems):
+            time.sleep(10)
+    return [TeacherLogitsCache(file_stem) for file_stem in file_stems]
+
+
+class DistillationSoftmaxCrossEntropyLoss(gluon.loss.Loss):
+    """
+    Knowledge distillation loss: a mix of cross-entropy with softened teacher probabilities and the ground truth loss.
+
+    Parameters:
+    ----------
+    temperature : float, default 1.0
+        Distillation temperature.
+    alpha : float, default 0.9
+        Weight of the distillation loss.
+    weight : float or None, default None
+        Global scalar weight for loss.
+    batch_axis : int, default 0
+        The axis that represents mini-batch.
+    """
+    def __init__(self,
+                 temperature=1.0,
+                 alpha=0.9,
+                 weight=None,
+                 batch_axis=0,
+                 **kwargs):
+        super(DistillationSoftmaxCrossEntropyLoss, self).__init__(weight, batch_axis, **kwargs)
+        self.temperature = temperature
+        self.alpha = alpha
+
+    def hybrid_forward(self, F, pred, label, soft_label):
+        log_prob = F.log_softmax(pred / self.temperature, axis=-1)
+        loss = -F.sum(log_prob * soft_label, axis=-1) * (self.alpha * self.temperature * self.temperature)
+        if self.alpha != 1.0:
+            ce_loss = -F.pick(F.log_softmax(pred, axis=-1), label, axis=-1)
+            loss = loss + (1.0 - self.alpha) * ce_loss
+        return loss
@@ -305,9 +305,7 @@ class AirNet(HybridBlock):
                         in_channels = out_channels
                         in_size = tuple([x // strides for x in in_size])
                 self.features.add(stage)
-            self.features.add(nn.AvgPool2D(
-                pool_size=7,
-                strides=1))
+            self.features.add(nn.GlobalAvgPool2D())
 
             self.output = nn.HybridSequential(prefix='')
             self.output.add(nn.Flatten())
@@ -386,9 +386,7 @@ class BNInception(HybridBlock):
                                 avg_pool=avg_pool))
                         in_channels = out_channels
                 self.features.add(stage)
-            self.features.add(nn.AvgPool2D(
-                pool_size=7,
-                strides=1))
+            self.features.add(nn.GlobalAvgPool2D())
 
             self.output = nn.HybridSequential(prefix='')
             self.output.add(nn.Flatten())
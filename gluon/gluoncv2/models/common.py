@@ -9,6 +9,7 @@ __all__ = ['ReLU6', 'conv1x1', 'conv3x3', 'depthwise_conv3x3', 'ConvBlock', 'con
 
 import math
 from inspect import isfunction
+import mxnet as mx
 from mxnet.gluon import nn, HybridBlock
 
 
@@ -717,6 +718,7 @@ class IBN(HybridBlock):
                  inst_first=True,
                  **kwargs):
         super(IBN, self).__init__(**kwargs)
+        self.bn_use_global_stats = bn_use_global_stats
         self.inst_first = inst_first
         h1_channels = int(math.floor(channels * first_fraction))
         h2_channels = channels - h1_channels
@@ -739,6 +741,10 @@ class IBN(HybridBlock):
                 scale=True)
 
     def hybrid_forward(self, F, x):
+        # Batch statistics of the BN part (and their running averages) are only available inside the BatchNorm
+        # operator, so the fused path is taken only when the BN part normalizes with the global statistics:
+        if self.bn_use_global_stats or ((F is mx.nd) and not mx.autograd.is_training()):
+            return self._fused_forward(F, x)
         x1, x2 = split(x, sizes=self.split_sections, axis=1)
         if self.inst_first:
             x1 = self.inst_norm(x1)
@@ -749,6 +755,51 @@ class IBN(HybridBlock):
         x = F.concat(x1, x2, dim=1)
         return x
 
+    def _fused_forward(self, F, x):
+        """
+        Normalize both parts of channels with a single per-sample affine transform, without splitting the input.
+        """
+        if F is mx.nd:
+            def get_value(param):
+                return param.data(x.context)
+        else:
+            def get_value(param):
+                return param.var()
+
+        if self.inst_first:
+            inst_begin, inst_end = 0, self.split_sections[0]
+        else:
+            inst_begin, inst_end = self.split_sections[0], sum(self.split_sections)
+        mean, var = F.moments(x, axes=(2, 3))
+        inst_mean = F.slice_axis(mean, axis=1, begin=inst_begin, end=inst_end)
+        inst_var = F.slice_axis(var, axis=1, begin=inst_begin, end=inst_end)
+        inst_scale = F.broadcast_div(
+            F.expand_dims(get_value(self.inst_norm.gamma), axis=0),
+            F.sqrt(inst_var + self.inst_norm._kwargs["eps"]))
+        inst_shift = F.broadcast_sub(
+            F.expand_dims(get_value(self.inst_norm.beta), axis=0),
+            inst_mean * inst_scale)
+
+        bn_gamma = get_value(self.batch_norm.gamma)
+        if self.batch_norm._kwargs["fix_gamma"]:
+            bn_gamma = F.ones_like(bn_gamma)
+        bn_scale = bn_gamma / F.sqrt(get_value(self.batch_norm.running_var) + self.batch_norm._kwargs["eps"])
+        bn_shift = get_value(self.batch_norm.beta) - get_value(self.batch_norm.running_mean) * bn_scale
+        batch_mean = F.slice_axis(mean, axis=1, begin=0, end=1)
+        bn_scale = F.broadcast_like(F.expand_dims(bn_scale, axis=0), batch_mean, lhs_axes=(0,), rhs_axes=(0,))
+        bn_shift = F.broadcast_like(F.expand_dims(bn_shift, axis=0), batch_mean, lhs_axes=(0,), rhs_axes=(0,))
+
+        if self.inst_first:
+            scale = F.concat(inst_scale, bn_scale, dim=1)
+            shift = F.concat(inst_shift, bn_shift, dim=1)
+        else:
+            scale = F.concat(bn_scale, inst_scale, dim=1)
+            shift = F.concat(bn_shift, inst_shift, dim=1)
+        scale = F.expand_dims(F.expand_dims(scale, axis=2), axis=3)
+        shift = F.expand_dims(F.expand_dims(shift, axis=2), axis=3)
+        x = F.broadcast_add(F.broadcast_mul(x, scale), shift)
+        return x
+
 
 class DualPathSequential(nn.HybridSequential):
     """
@@ -403,9 +403,7 @@ class CondenseNet(HybridBlock):
             self.features.add(PostActivation(
                 in_channels=in_channels,
                 bn_use_global_stats=bn_use_global_stats))
-            self.features.add(nn.AvgPool2D(
-                pool_size=7,
-                strides=1))
+            self.features.add(nn.GlobalAvgPool2D())
 
             self.output = nn.HybridSequential(prefix='')
             self.output.add(nn.Flatten())
@@ -480,9 +480,7 @@ class CRUNet(HybridBlock):
             self.features.add(PreResActivation(
                 in_channels=in_channels,
                 bn_use_global_stats=bn_use_global_stats))
-            self.features.add(nn.AvgPool2D(
-                pool_size=7,
-                strides=1))
+            self.features.add(nn.GlobalAvgPool2D())
 
             self.output = nn.HybridSequential(prefix='')
             self.output.add(nn.Flatten())
@@ -158,9 +158,7 @@ class DiracNetV2(HybridBlock):
                             padding=0))
                 self.features.add(stage)
             self.features.add(nn.Activation('relu'))
-            self.features.add(nn.AvgPool2D(
-                pool_size=7,
-                strides=1))
+            self.features.add(nn.GlobalAvgPool2D())
 
             self.output = nn.HybridSequential(prefix='')
             self.output.add(nn.Flatten())
@@ -413,9 +413,7 @@ class DLA(HybridBlock):
                     first_tree=first_tree))
                 in_channels = out_channels
 
-            self.features.add(nn.AvgPool2D(
-                pool_size=7,
-                strides=1))
+            self.features.add(nn.GlobalAvgPool2D())
 
             self.output = nn.HybridSequential(prefix='')
             self.output.add(conv1x1(
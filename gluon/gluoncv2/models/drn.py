@@ -415,9 +415,7 @@ class DRN(HybridBlock):
                             residual=(residuals[i][j] == 1)))
                         in_channels = out_channels
                 self.features.add(stage)
-            self.features.add(nn.AvgPool2D(
-                pool_size=28,
-                strides=1))
+            self.features.add(nn.GlobalAvgPool2D())
 
             self.output = nn.HybridSequential(prefix='')
             self.output.add(nn.Conv2D(
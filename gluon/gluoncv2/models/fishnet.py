@@ -555,9 +555,7 @@ class FishNet(HybridBlock):
                 in_channels=in_channels,
                 bn_use_global_stats=bn_use_global_stats))
             in_channels = in_channels // 2
-            self.features.add(nn.AvgPool2D(
-                pool_size=7,
-                strides=1))
+            self.features.add(nn.GlobalAvgPool2D())
 
             self.output = nn.HybridSequential(prefix='')
             self.output.add(conv1x1(
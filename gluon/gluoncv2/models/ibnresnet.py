@@ -71,7 +71,9 @@ class IBNConvBlock(HybridBlock):
                 use_bias=use_bias,
                 in_channels=in_channels)
             if self.use_ibn:
-                self.ibn = IBN(channels=out_channels)
+                self.ibn = IBN(
+                    channels=out_channels,
+                    bn_use_global_stats=bn_use_global_stats)
             else:
                 self.bn = nn.BatchNorm(
                     in_channels=out_channels,
@@ -292,9 +294,7 @@ class IBNResNet(HybridBlock):
                             bn_use_global_stats=bn_use_global_stats))
                         in_channels = out_channels
                 self.features.add(stage)
-            self.features.add(nn.AvgPool2D(
-                pool_size=7,
-                strides=1))
+            self.features.add(nn.GlobalAvgPool2D())
 
             self.output = nn.HybridSequential(prefix='')
             self.output.add(nn.Flatten())
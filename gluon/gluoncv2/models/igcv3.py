@@ -143,9 +143,7 @@ class IGCV3(HybridBlock):
                 bn_use_global_stats=bn_use_global_stats,
                 activation=ReLU6()))
             in_channels = final_block_channels
-            self.features.add(nn.AvgPool2D(
-                pool_size=7,
-                strides=1))
+            self.features.add(nn.GlobalAvgPool2D())
 
             self.output = nn.HybridSequential(prefix='')
             self.output.add(nn.Flatten())
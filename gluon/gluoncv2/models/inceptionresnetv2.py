@@ -630,9 +630,7 @@ class InceptionResNetV2(HybridBlock):
                 in_channels=2080,
                 out_channels=1536,
                 bn_use_global_stats=bn_use_global_stats))
-            self.features.add(nn.AvgPool2D(
-                pool_size=8,
-                strides=1))
+            self.features.add(nn.GlobalAvgPool2D())
 
             self.output = nn.HybridSequential(prefix='')
             self.output.add(nn.Flatten())
@@ -677,9 +677,7 @@ class InceptionV3(HybridBlock):
                         in_channels = out_channels
                 self.features.add(stage)
 
-            self.features.add(nn.AvgPool2D(
-                pool_size=8,
-                strides=1))
+            self.features.add(nn.GlobalAvgPool2D())
 
             self.output = nn.HybridSequential(prefix='')
             self.output.add(nn.Flatten())
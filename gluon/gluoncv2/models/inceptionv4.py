@@ -749,9 +749,7 @@ class InceptionV4(HybridBlock):
                         stage.add(unit(bn_use_global_stats=bn_use_global_stats))
                 self.features.add(stage)
 
-            self.features.add(nn.AvgPool2D(
-                pool_size=8,
-                strides=1))
+            self.features.add(nn.GlobalAvgPool2D())
 
             self.output = nn.HybridSequential(prefix='')
             self.output.add(nn.Flatten())
@@ -344,9 +344,7 @@ class MnasNet(HybridBlock):
                 bn_use_global_stats=bn_use_global_stats,
                 activate=True))
             in_channels = final_block_channels
-            self.features.add(nn.AvgPool2D(
-                pool_size=7,
-                strides=1))
+            self.features.add(nn.GlobalAvgPool2D())
 
             self.output = nn.HybridSequential(prefix='')
             self.output.add(nn.Flatten())
@@ -2,12 +2,12 @@
     Model store which provides pretrained models.
 """
 
-__all__ = ['get_model_file']
+__all__ = ['get_model_file', 'prefetch']
 
 import os
 import zipfile
 import logging
-from mxnet.gluon.utils import download, check_sha1
+import hashlib
 
 _model_sha1 = {name: (error, checksum, repo_release_tag) for name, error, checksum, repo_release_tag in [
     ('alexnet', '2126', '9cb87ebd09523bec00e10d8ba9abb81a2c632e8b', 'v0.0.108'),
@@ -188,7 +188,12 @@ _model_sha1 = {name: (error, checksum, repo_release_tag) for name, error, checks
     ('wrn28_10_cifar10', '0239', '16f3c8a249993f23b0f81d9ce3650faef5e455d8', 'v0.0.166'),
     ('wrn40_8_cifar10', '0237', '3b81d261706b751f5b731149b05fa92f500218e8', 'v0.0.166')]}
 
-imgclsmob_repo_url = 'https://github.com/osmr/imgclsmob'
+imgclsmob_repo_url = os.environ.get('IMGCLSMOB_REPO_URL', 'https://github.com/osmr/imgclsmob')
+
+_default_model_store_dir_path = os.path.join('~', '.mxnet', 'models')
+
+# Size of buffers for streaming of downloaded and extracted files:
+_chunk_size = 4 * 1024 * 1024
 
 
 def get_model_name_suffix_data(model_name):
@@ -198,11 +203,35 @@ def get_model_name_suffix_data(model_name):
     return error, sha1_hash, repo_release_tag
 
 
+def get_model_store_dir_path(local_model_store_dir_path=os.path.join('~', '.mxnet', 'models')):
+    """
+    Get the directory for keeping pretrained models. The default location is replaced by a shared cache directory
+    if the `IMGCLSMOB_MODEL_STORE` environment variable is set (file names of different frameworks do not clash, so
+    one directory can be shared by all of them).
+
+    Parameters
+    ----------
+    local_model_store_dir_path : str, default $MXNET_HOME/models
+        Location for keeping the model parameters.
+
+    Returns
+    -------
+    str
+        Absolute path to the directory.
+    """
+    shared_dir_path = os.environ.get('IMGCLSMOB_MODEL_STORE', '')
+    if shared_dir_path and (local_model_store_dir_path == _default_model_store_dir_path):
+        local_model_store_dir_path = shared_dir_path
+    return os.path.abspath(os.path.expanduser(local_model_store_dir_path))
+
+
 def get_model_file(model_name,
                    local_model_store_dir_path=os.path.join('~', '.mxnet', 'models')):
     """
     Return location for the pretrained on local file system. This function will download from online model zoo when
-    model cannot be found or has mismatch. The root directory will be created if it doesn't exist.
+    model cannot be found or has mismatch. The root directory will be created if it doesn't exist. It is safe to call
+    this function from concurrent processes and threads sharing the same directory: the file is downloaded only once
+    (under a file lock) and appears under its final name only after its hash is verified.
 
     Parameters
     ----------
@@ -222,32 +251,282 @@ def get_model_file(model_name,
         name=model_name,
         error=error,
         short_sha1=short_sha1)
-    local_model_store_dir_path = os.path.expanduser(local_model_store_dir_path)
+    local_model_store_dir_path = get_model_store_dir_path(local_model_store_dir_path)
     file_path = os.path.join(local_model_store_dir_path, file_name)
-    if os.path.exists(file_path):
-        if check_sha1(file_path, sha1_hash):
-            return file_path
-        else:
-            logging.warning('Mismatch in the content of model file detected. Downloading again.')
-    else:
-        logging.info('Model file not found. Downloading to {}.'.format(file_path))
+    if os.path.exists(file_path) and _check_sha1(file_path, sha1_hash):
+        return file_path
 
     if not os.path.exists(local_model_store_dir_path):
         os.makedirs(local_model_store_dir_path)
 
-    zip_file_path = file_path + '.zip'
-    download(
-        url='{repo_url}/releases/download/{repo_release_tag}/{file_name}.zip'.format(
-            repo_url=imgclsmob_repo_url,
-            repo_release_tag=repo_release_tag,
-            file_name=file_name),
-        path=zip_file_path,
-        overwrite=True)
-    with zipfile.ZipFile(zip_file_path) as zf:
-        zf.extractall(local_model_store_dir_path)
-    os.remove(zip_file_path)
-
-    if check_sha1(file_path, sha1_hash):
-        return file_path
+    with _FileLock(file_path + '.lock'):
+        # The file could be downloaded by another worker while we were waiting for the lock:
+        if os.path.exists(file_path):
+            if _check_sha1(file_path, sha1_hash):
+                return file_path
+            logging.warning('Mismatch in the content of model file detected. Downloading again.')
+        else:
+            logging.info('Model file not found. Downloading to {}.'.format(file_path))
+
+        zip_file_path = _download(
+            url='{repo_url}/releases/download/{repo_release_tag}/{file_name}.zip'.format(
+                repo_url=imgclsmob_repo_url,
+                repo_release_tag=repo_release_tag,
+                file_name=file_name),
+            path=file_path + '.zip',
+            overwrite=True)
+        try:
+            _extract_file(
+                zip_file_path=zip_file_path,
+                file_name=file_name,
+                file_path=file_path,
+                sha1_hash=sha1_hash)
+        finally:
+            os.remove(zip_file_path)
+
+    return file_path
+
+
+def prefetch(model_names,
+             local_model_store_dir_path=os.path.join('~', '.mxnet', 'models'),
+             num_workers=8):
+    """
+    Download several pretrained models concurrently.
+
+    Parameters
+    ----------
+    model_names : list of str
+        Names of the models.
+    local_model_store_dir_path : str, default $MXNET_HOME/models
+        Location for keeping the model parameters.
+    num_workers : int, default 8
+        Number of downloading threads.
+
+    Returns
+    -------
+    list of str
+        Paths to the pretrained model files.
+    """
+    from functools import partial
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=max(1, num_workers)) as executor:
+        return list(executor.map(
+            partial(get_model_file, local_model_store_dir_path=local_model_store_dir_path),
+            model_names))
+
+
+class _FileLock(object):
+    """
+    Inter-process (and inter-thread) exclusive lock on a file.
+
+    Parameters
+    ----------
+    file_path : str
+        Path to the lock file.
+    """
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.fd = None
+
+    def __enter__(self):
+        self.fd = os.open(self.file_path, os.O_RDWR | os.O_CREAT)
+        if os.name == 'nt':
+            import msvcrt
+            while True:
+                try:
+                    msvcrt.locking(self.fd, msvcrt.LK_LOCK, 1)
+                    break
+                except (IOError, OSError):
+                    pass
+        else:
+            import fcntl
+            fcntl.flock(self.fd, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if os.name == 'nt':
+            import msvcrt
+            msvcrt.locking(self.fd, msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(self.fd, fcntl.LOCK_UN)
+        os.close(self.fd)
+        self.fd = None
+
+
+def _make_temp_file(file_path):
+    """
+    Create a unique temporary file next to the target one (for a subsequent atomic rename).
+    """
+    import tempfile
+    fd, tmp_file_path = tempfile.mkstemp(
+        suffix='.tmp',
+        prefix=os.path.basename(file_path) + '.',
+        dir=os.path.dirname(file_path))
+    return os.fdopen(fd, 'wb'), tmp_file_path
+
+
+def _replace_file(src_file_path, dst_file_path):
+    """
+    Rename a file, overwriting the destination one (Python 2 has no `os.replace`).
+    """
+    if hasattr(os, 'replace'):
+        os.replace(src_file_path, dst_file_path)
+    else:
+        if (os.name == 'nt') and os.path.exists(dst_file_path):
+            os.remove(dst_file_path)
+        os.rename(src_file_path, dst_file_path)
+
+
+def _extract_file(zip_file_path, file_name, file_path, sha1_hash):
+    """
+    Extract a file from a zip archive, verifying its hash on the fly.
+
+    Parameters
+    ----------
+    zip_file_path : str
+        Path to the archive.
+    file_name : str
+        Name of the file in the archive.
+    file_path : str
+        Destination path.
+    sha1_hash : str
+        Expected sha1 hash in hexadecimal digits.
+    """
+    sha1 = hashlib.sha1()
+    f, tmp_file_path = _make_temp_file(file_path)
+    try:
+        with f, zipfile.ZipFile(zip_file_path) as zf, zf.open(file_name) as src:
+            while True:
+                data = src.read(_chunk_size)
+                if not data:
+                    break
+                sha1.update(data)
+                f.write(data)
+        if sha1.hexdigest() != sha1_hash:
+            raise ValueError('Downloaded file has different hash. Please try again.')
+        _replace_file(tmp_file_path, file_path)
+    except BaseException:
+        os.remove(tmp_file_path)
+        raise
+
+
+def _download(url, path=None, overwrite=False, sha1_hash=None, retries=5, verify_ssl=True):
+    """
+    Download an given URL. The content is streamed into a temporary file (with hashing on the fly) which is renamed
+    to the destination path only after the download is complete.
+
+    Parameters
+    ----------
+    url : str
+        URL to download
+    path : str, optional
+        Destination path to store downloaded file. By default stores to the
+        current directory with same name as in url.
+    overwrite : bool, optional
+        Whether to overwrite destination file if already exists.
+    sha1_hash : str, optional
+        Expected sha1 hash in hexadecimal digits. Will ignore existing file when hash is specified
+        but doesn't match.
+    retries : integer, default 5
+        The number of times to attempt the download in case of failure or non 200 return codes
+    verify_ssl : bool, default True
+        Verify SSL certificates.
+
+    Returns
+    -------
+    str
+        The file path of the downloaded file.
+    """
+    import warnings
+    try:
+        import requests
+    except ImportError:
+        class requests_failed_to_import(object):
+            pass
+        requests = requests_failed_to_import
+
+    if path is None:
+        fname = url.split('/')[-1]
+        # Empty filenames are invalid
+        assert fname, 'Can\'t construct file-name from this URL. ' \
+            'Please set the `path` option manually.'
     else:
-        raise ValueError('Downloaded file has different hash. Please try again.')
+        path = os.path.expanduser(path)
+        if os.path.isdir(path):
+            fname = os.path.join(path, url.split('/')[-1])
+        else:
+            fname = path
+    assert retries >= 0, "Number of retries should be at least 0"
+
+    if not verify_ssl:
+        warnings.warn(
+            'Unverified HTTPS request is being made (verify_ssl=False). '
+            'Adding certificate verification is strongly advised.')
+
+    if overwrite or not os.path.exists(fname) or (sha1_hash and not _check_sha1(fname, sha1_hash)):
+        dirname = os.path.dirname(os.path.abspath(os.path.expanduser(fname)))
+        if not os.path.exists(dirname):
+            os.makedirs(dirname)
+        while retries + 1 > 0:
+            # Disable pyling too broad Exception
+            # pylint: disable=W0703
+            try:
+                print('Downloading {} from {}...'.format(fname, url))
+                r = requests.get(url, stream=True, verify=verify_ssl)
+                if r.status_code != 200:
+                    raise RuntimeError("Failed downloading url {}".format(url))
+                sha1 = hashlib.sha1()
+                f, tmp_fname = _make_temp_file(os.path.abspath(fname))
+                try:
+                    with f:
+                        for chunk in r.iter_content(chunk_size=_chunk_size):
+                            if chunk:  # filter out keep-alive new chunks
+                                sha1.update(chunk)
+                                f.write(chunk)
+                    if sha1_hash and (sha1.hexdigest() != sha1_hash):
+                        raise UserWarning('File {} is downloaded but the content hash does not match.'
+                                          ' The repo may be outdated or download may be incomplete. '
+                                          'If the "repo_url" is overridden, consider switching to '
+                                          'the default repo.'.format(fname))
+                    _replace_file(tmp_fname, fname)
+                except BaseException:
+                    os.remove(tmp_fname)
+                    raise
+                break
+            except Exception as e:
+                retries -= 1
+                if retries <= 0:
+                    raise e
+                else:
+                    print("download failed, retrying, {} attempt{} left"
+                          .format(retries, 's' if retries > 1 else ''))
+
+    return fname
+
+
+def _check_sha1(file_name, sha1_hash):
+    """
+    Check whether the sha1 hash of the file content matches the expected hash.
+
+    Parameters
+    ----------
+    file_name : str
+        Path to the file.
+    sha1_hash : str
+        Expected sha1 hash in hexadecimal digits.
+
+    Returns
+    -------
+    bool
+        Whether the file content matches the expected hash.
+    """
+    sha1 = hashlib.sha1()
+    with open(file_name, 'rb') as f:
+        while True:
+            data = f.read(_chunk_size)
+            if not data:
+                break
+            sha1.update(data)
+
+    return sha1.hexdigest() == sha1_hash
@@ -384,9 +384,7 @@ class MSDClassifier(HybridBlock):
                 in_channels=in_channels,
                 out_channels=in_channels,
                 strides=2))
-            self.features.add(nn.AvgPool2D(
-                pool_size=2,
-                strides=2))
+            self.features.add(nn.GlobalAvgPool2D())
 
             self.output = nn.HybridSequential(prefix='')
             self.output.add(nn.Flatten())
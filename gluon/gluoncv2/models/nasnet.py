@@ -1093,8 +1093,6 @@ class NASNet(HybridBlock):
         Number of output channels for the initial unit.
     stem_blocks_channels : list of 2 int
         Number of output channels for the Stem units.
-    final_pool_size : int
-        Size of the pooling windows for final pool.
     extra_padding : bool
         Whether to use extra padding.
     skip_reduction_layer_input : bool
@@ -1110,7 +1108,6 @@ class NASNet(HybridBlock):
                  channels,
                  init_block_channels,
                  stem_blocks_channels,
-                 final_pool_size,
                  extra_padding,
                  skip_reduction_layer_input,
                  in_channels=3,
@@ -1177,9 +1174,7 @@ class NASNet(HybridBlock):
                 self.features.add(stage)
 
             self.features.add(nn.Activation('relu'))
-            self.features.add(nn.AvgPool2D(
-                pool_size=final_pool_size,
-                strides=1))
+            self.features.add(nn.GlobalAvgPool2D())
 
             self.output = nn.HybridSequential(prefix='')
             self.output.add(nn.Flatten())
@@ -1197,7 +1192,6 @@ class NASNet(HybridBlock):
 def get_nasnet(repeat,
                penultimate_filters,
                init_block_channels,
-               final_pool_size,
                extra_padding,
                skip_reduction_layer_input,
                in_size,
@@ -1217,8 +1211,6 @@ def get_nasnet(repeat,
         Number of filters in the penultimate layer of the network.
     init_block_channels : int
         Number of output channels for the initial unit.
-    final_pool_size : int
-        Size of the pooling windows for final pool.
     extra_padding : bool
         Whether to use extra padding.
     skip_reduction_layer_input : bool
@@ -1248,7 +1240,6 @@ def get_nasnet(repeat,
         channels=channels,
         init_block_channels=init_block_channels,
         stem_blocks_channels=stem_blocks_channels,
-        final_pool_size=final_pool_size,
         extra_padding=extra_padding,
         skip_reduction_layer_input=skip_reduction_layer_input,
         in_size=in_size,
@@ -1285,7 +1276,6 @@ def nasnet_4a1056(**kwargs):
         repeat=4,
         penultimate_filters=1056,
         init_block_channels=32,
-        final_pool_size=7,
         extra_padding=True,
         skip_reduction_layer_input=False,
         in_size=(224, 224),
@@ -1311,7 +1301,6 @@ def nasnet_6a4032(**kwargs):
         repeat=6,
         penultimate_filters=4032,
         init_block_channels=96,
-        final_pool_size=11,
         extra_padding=False,
         skip_reduction_layer_input=True,
         in_size=(331, 331),
@@ -113,9 +113,7 @@ class CIFARNIN(HybridBlock):
                 in_channels=in_channels,
                 out_channels=classes,
                 kernel_size=1))
-            self.output.add(nn.AvgPool2D(
-                pool_size=8,
-                strides=1))
+            self.output.add(nn.GlobalAvgPool2D())
             self.output.add(nn.Flatten())
 
     def hybrid_forward(self, F, x):
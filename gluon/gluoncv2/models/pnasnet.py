@@ -495,9 +495,7 @@ class PNASNet(HybridBlock):
                 self.features.add(stage)
 
             self.features.add(nn.Activation('relu'))
-            self.features.add(nn.AvgPool2D(
-                pool_size=11,
-                strides=1))
+            self.features.add(nn.GlobalAvgPool2D())
 
             self.output = nn.HybridSequential(prefix='')
             self.output.add(nn.Flatten())
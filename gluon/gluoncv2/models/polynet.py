@@ -1155,9 +1155,7 @@ class PolyNet(HybridBlock):
                                 bn_use_global_stats=bn_use_global_stats))
                 self.features.add(stage)
 
-            self.features.add(nn.AvgPool2D(
-                pool_size=9,
-                strides=1))
+            self.features.add(nn.GlobalAvgPool2D())
 
             self.output = nn.HybridSequential(prefix='')
             self.output.add(nn.Flatten())
@@ -202,9 +202,7 @@ class ShuffleNetV2b(HybridBlock):
                 in_channels=in_channels,
                 out_channels=final_block_channels))
             in_channels = final_block_channels
-            self.features.add(nn.AvgPool2D(
-                pool_size=7,
-                strides=1))
+            self.features.add(nn.GlobalAvgPool2D())
 
             self.output = nn.HybridSequential(prefix='')
             self.output.add(nn.Flatten())
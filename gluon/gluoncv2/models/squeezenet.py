@@ -204,9 +204,7 @@ class SqueezeNet(HybridBlock):
                 kernel_size=1,
                 in_channels=in_channels))
             self.output.add(nn.Activation('relu'))
-            self.output.add(nn.AvgPool2D(
-                pool_size=13,
-                strides=1))
+            self.output.add(nn.GlobalAvgPool2D())
             self.output.add(nn.Flatten())
 
     def hybrid_forward(self, F, x):
@@ -179,9 +179,7 @@ class SqueezeNext(HybridBlock):
                 out_channels=final_block_channels,
                 use_bias=True))
             in_channels = final_block_channels
-            self.features.add(nn.AvgPool2D(
-                pool_size=7,
-                strides=1))
+            self.features.add(nn.GlobalAvgPool2D())
 
             self.output = nn.HybridSequential(prefix='')
             self.output.add(nn.Flatten())
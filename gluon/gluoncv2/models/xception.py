@@ -397,9 +397,7 @@ class XceptionFinalBlock(HybridBlock):
                 bn_use_global_stats=bn_use_global_stats,
                 activate=True)
             self.activ = nn.Activation('relu')
-            self.pool = nn.AvgPool2D(
-                pool_size=10,
-                strides=1)
+            self.pool = nn.GlobalAvgPool2D()
 
     def hybrid_forward(self, F, x):
         x = self.conv1(x)
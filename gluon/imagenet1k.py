@@ -2,16 +2,22 @@
     ImageNet-1K dataset routines.
 """
 
-__all__ = ['add_dataset_parser_arguments', 'get_batch_fn', 'get_train_data_source', 'get_val_data_source',
-           'num_training_samples']
+__all__ = ['add_dataset_parser_arguments', 'get_batch_fn', 'ReproducibleAugDataset', 'get_train_data_source',
+           'get_val_data_source', 'ValCacheDataSource', 'num_training_samples']
 
 import os
 import math
+import random
+import numpy as np
 import mxnet as mx
 from mxnet import gluon
 from mxnet.gluon.data.vision import transforms
 from mxnet.gluon.data.vision import ImageFolderDataset
 
+from common.val_cache import ValCache
+from common.teacher_cache import get_sample_seed, split_sample_key, ViewSampler
+from common.iter_checkpoint import ResumableRandomSampler
+
 
 num_training_samples = 1281167
 
@@ -95,6 +101,48 @@ class ImageNet(ImageFolderDataset):
         super(ImageNet, self).__init__(root=root, flag=1, transform=transform)
 
 
+class ReproducibleAugDataset(gluon.data.Dataset):
+    """
+    Dataset wrapper with reproducible random transforms: random generators are seeded with a value derived from the
+    augmentation seed, the augmentation view and the sample index. Samples are addressed by keys of `ViewSampler`
+    (`view * len(dataset) + index`) and returned together with their indices. Note that the global MXNet CPU random
+    generator is reseeded for each sample (its state can't be restored), so data loader workers should be used.
+
+    Parameters
+    ----------
+    dataset : Dataset
+        Base dataset (without transforms).
+    transform : function
+        Random transform of samples.
+    aug_seed : int
+        Augmentation seed.
+    """
+    def __init__(self,
+                 dataset,
+                 transform,
+                 aug_seed):
+        self.dataset = dataset
+        self.transform = transform
+        self.aug_seed = aug_seed
+
+    def __len__(self):
+        return len(self.dataset)
+
+    def __getitem__(self, key):
+        view, index = split_sample_key(key, len(self.dataset))
+        img, label = self.dataset[index]
+        seed = get_sample_seed(self.aug_seed, view, index)
+        random_state = random.getstate()
+        np_random_state = np.random.get_state()
+        random.seed(seed)
+        np.random.seed(seed)
+        mx.random.seed(seed, ctx=mx.cpu())
+        img = self.transform(img)
+        random.setstate(random_state)
+        np.random.set_state(np_random_state)
+        return img, label, index
+
+
 def get_batch_fn(dataset_args):
     if dataset_args.use_rec:
         def batch_fn(batch, ctx):
@@ -118,7 +166,9 @@ def get_train_data_rec(rec_train,
                        mean_rgb,
                        std_rgb,
                        jitter_param,
-                       lighting_param):
+                       lighting_param,
+                       num_parts=1,
+                       part_index=0):
     assert isinstance(data_shape, tuple) and len(data_shape) == 3
     return mx.io.ImageRecordIter(
         path_imgrec=rec_train,
@@ -126,6 +176,8 @@ def get_train_data_rec(rec_train,
         preprocess_threads=num_workers,
         shuffle=True,
         batch_size=batch_size,
+        num_parts=num_parts,
+        part_index=part_index,
 
         data_shape=data_shape,
         mean_r=mean_rgb[0],
@@ -179,7 +231,17 @@ def get_train_data_loader(data_dir,
                           mean_rgb,
                           std_rgb,
                           jitter_param,
-                          lighting_param):
+                          lighting_param,
+                          num_parts=1,
+                          part_index=0,
+                          seed=0,
+                          aug_seed=None):
+    """
+    Create training data loader. If `aug_seed` is specified, the augmentation is reproducible, batches include sample
+    indices and the augmentation view is selected by the `view` attribute of the loader's `view_sampler` (the loader
+    gets `dataset` and `view_sampler` attributes). Samples are shuffled by the `resumable_sampler` attribute of the
+    loader (`ResumableRandomSampler`, the same permutation is sharded for distributed training).
+    """
     transform_train = transforms.Compose([
         transforms.RandomResizedCrop(input_image_size),
         transforms.RandomFlipLeftRight(),
@@ -193,14 +255,47 @@ def get_train_data_loader(data_dir,
             mean=mean_rgb,
             std=std_rgb)
     ])
-    return gluon.data.DataLoader(
-        dataset=ImageNet(
-            root=data_dir,
-            train=True).transform_first(fn=transform_train),
+    if aug_seed is not None:
+        dataset = ReproducibleAugDataset(
+            dataset=ImageNet(
+                root=data_dir,
+                train=True),
+            transform=transform_train,
+            aug_seed=aug_seed)
+        sampler = ResumableRandomSampler(
+            length=len(dataset),
+            seed=seed,
+            num_parts=num_parts,
+            part_index=part_index)
+        view_sampler = ViewSampler(
+            sampler=sampler,
+            num_samples=len(dataset))
+        data_loader = gluon.data.DataLoader(
+            dataset=dataset,
+            batch_size=batch_size,
+            sampler=view_sampler,
+            last_batch='discard',
+            num_workers=num_workers)
+        data_loader.dataset = dataset
+        data_loader.view_sampler = view_sampler
+        data_loader.resumable_sampler = sampler
+        return data_loader
+    dataset = ImageNet(
+        root=data_dir,
+        train=True).transform_first(fn=transform_train)
+    sampler = ResumableRandomSampler(
+        length=len(dataset),
+        seed=seed,
+        num_parts=num_parts,
+        part_index=part_index)
+    data_loader = gluon.data.DataLoader(
+        dataset=dataset,
         batch_size=batch_size,
-        shuffle=True,
+        sampler=sampler,
         last_batch='discard',
         num_workers=num_workers)
+    data_loader.resumable_sampler = sampler
+    return data_loader
 
 
 def get_val_data_loader(data_dir,
@@ -230,11 +325,16 @@ def get_val_data_loader(data_dir,
 def get_train_data_source(dataset_args,
                           batch_size,
                           num_workers,
-                          input_image_size=(224, 224)):
+                          input_image_size=(224, 224),
+                          num_parts=1,
+                          part_index=0,
+                          seed=0,
+                          aug_seed=None):
     jitter_param = 0.4
     lighting_param = 0.1
 
     if dataset_args.use_rec:
+        assert (aug_seed is None), "Reproducible augmentation isn't supported by the image record iterator"
         if isinstance(input_image_size, int):
             input_image_size = (input_image_size, input_image_size)
         data_shape = (3,) + input_image_size
@@ -250,7 +350,9 @@ def get_train_data_source(dataset_args,
             mean_rgb=mean_rgb,
             std_rgb=std_rgb,
             jitter_param=jitter_param,
-            lighting_param=lighting_param)
+            lighting_param=lighting_param,
+            num_parts=num_parts,
+            part_index=part_index)
     else:
         mean_rgb = (0.485, 0.456, 0.406)
         std_rgb = (0.229, 0.224, 0.225)
@@ -263,7 +365,11 @@ def get_train_data_source(dataset_args,
             mean_rgb=mean_rgb,
             std_rgb=std_rgb,
             jitter_param=jitter_param,
-            lighting_param=lighting_param)
+            lighting_param=lighting_param,
+            num_parts=num_parts,
+            part_index=part_index,
+            seed=seed,
+            aug_seed=aug_seed)
 
 
 def get_val_data_source(dataset_args,
@@ -302,3 +408,48 @@ def get_val_data_source(dataset_args,
             resize_value=resize_value,
             mean_rgb=mean_rgb,
             std_rgb=std_rgb)
+
+
+class ValCacheDataSource(object):
+    """
+    Validation data source over preprocessed validation set cache (see `common.val_cache`). Batches are compatible
+    with the batch function for `DataLoader` (i.e. `use_rec=False`).
+
+    Parameters:
+    ----------
+    file_stem : str
+        Path stem for cache files.
+    batch_size : int
+        Batch size.
+    mean_rgb : tuple of 3 float
+        Mean of RGB channels for normalization.
+    std_rgb : tuple of 3 float
+        STD of RGB channels for normalization.
+    """
+    def __init__(self,
+                 file_stem,
+                 batch_size,
+                 mean_rgb=(0.485, 0.456, 0.406),
+                 std_rgb=(0.229, 0.224, 0.225)):
+        super(ValCacheDataSource, self).__init__()
+        self.cache = ValCache(
+            file_stem=file_stem,
+            batch_size=batch_size)
+        self.mean = mx.nd.array(mean_rgb).reshape((1, 3, 1, 1)) * 255.0
+        self.std = mx.nd.array(std_rgb).reshape((1, 3, 1, 1)) * 255.0
+
+    def __len__(self):
+        return len(self.cache)
+
+    def __iter__(self):
+        for data, labels in self.cache:
+            data = mx.nd.array(data, dtype="float32")
+            data = mx.nd.broadcast_div(mx.nd.broadcast_sub(data, self.mean), self.std)
+            label = mx.nd.array(labels, dtype="float32")
+            yield data, label
+
+    @staticmethod
+    def batch_fn(batch, ctx):
+        data = gluon.utils.split_and_load(batch[0], ctx_list=ctx, batch_axis=0)
+        label = gluon.utils.split_and_load(batch[1], ctx_list=ctx, batch_axis=0)
+        return data, label
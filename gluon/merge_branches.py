@@ -0,0 +1,417 @@
+"""
+    Inference graph rewrite, that merges sibling convolution branches (which consume the same input and whose outputs
+    are concatenated) into a single wider convolution.
+"""
+
+__all__ = ['merge_branches', 'MergedConv', 'MergedConcurrent', 'MergedUnit']
+
+import numpy as np
+import mxnet as mx
+from mxnet.gluon import nn, HybridBlock
+from mxnet.gluon.contrib.nn import HybridConcurrent
+
+# Classes of convolution units with `conv` -> `bn` (optional) -> `activ` (optional) forward scheme:
+CONV_UNIT_CLASS_NAMES = ('ConvBlock', 'InceptConv', 'FireConv')
+
+# Attributes of branch blocks, which hold the first block applied to the branch input:
+BRANCH_HEAD_ATTRS = {
+    'Conv1x1Branch': 'conv',
+    'Conv3x3Branch': 'conv',
+    'ConvSeqBranch': 'conv_list',
+    'Inception3x3Branch': 'conv1',
+    'InceptionDouble3x3Branch': 'conv1',
+}
+
+# Units with hard-coded sibling convolutions (pre-block attribute, sibling unit attributes, residual flag attribute):
+SIBLING_UNITS = {
+    'FireUnit': ('squeeze', ('expand1x1', 'expand3x3'), 'residual'),
+    'ConvSeq3x3Branch': ('conv_list', ('conv1x3', 'conv3x1'), None),
+}
+
+
+class MergedConv(HybridBlock):
+    """
+    Merged convolution block (convolution with folded batch normalization and activation).
+
+    Parameters:
+    ----------
+    conv : nn.Conv2D
+        Convolution layer.
+    activ : HybridBlock or None
+        Activation layer.
+    """
+    def __init__(self,
+                 conv,
+                 activ,
+                 **kwargs):
+        super(MergedConv, self).__init__(**kwargs)
+        self.use_activ = (activ is not None)
+
+        with self.name_scope():
+            self.conv = conv
+            if self.use_activ:
+                self.activ = activ
+
+    def hybrid_forward(self, F, x):
+        x = self.conv(x)
+        if self.use_activ:
+            x = self.activ(x)
+        return x
+
+
+class MergedConcurrent(HybridBlock):
+    """
+    A replacement for `HybridConcurrent` container with merged convolution heads of branches. If the merged
+    convolution covers all branches in order, its output is returned as is (without concatenation).
+
+    Parameters:
+    ----------
+    heads : list of MergedConv
+        Merged convolution heads.
+    branches : list of HybridBlock or None
+        Branch tails (for merged branches, None for an identity tail) or whole branches (for other ones).
+    specs : list of tuple of 3 int
+        Head index (or -1 for a branch, that isn't merged), first channel and number of channels in head output for
+        each branch.
+    axis : int, default 1
+        The axis on which to concatenate the outputs.
+    """
+    def __init__(self,
+                 heads,
+                 branches,
+                 specs,
+                 axis=1,
+                 **kwargs):
+        super(MergedConcurrent, self).__init__(**kwargs)
+        assert (len(branches) == len(specs))
+        self.specs = specs
+        self.axis = axis
+        self.direct = (len(heads) == 1) and all([(s[0] == 0) and (b is None) for s, b in zip(specs, branches)])
+
+        with self.name_scope():
+            self.heads = nn.HybridSequential(prefix='')
+            for head in heads:
+                self.heads.add(head)
+            self.branches = []
+            for i, branch in enumerate(branches):
+                if branch is not None:
+                    self.register_child(branch, "branch{}".format(i + 1))
+                self.branches.append(branch)
+
+    def hybrid_forward(self, F, x):
+        ys = [head(x) for head in self.heads._children.values()]
+        if self.direct:
+            return ys[0]
+        out = []
+        for branch, (head_ind, start, length) in zip(self.branches, self.specs):
+            if head_ind < 0:
+                out.append(branch(x))
+            else:
+                y = F.slice_axis(ys[head_ind], axis=self.axis, begin=start, end=(start + length))
+                out.append(branch(y) if branch is not None else y)
+        out = F.concat(*out, dim=self.axis)
+        return out
+
+
+class MergedUnit(HybridBlock):
+    """
+    A replacement for units with hard-coded sibling convolutions (like SqueezeNet 'Fire' unit).
+
+    Parameters:
+    ----------
+    body : HybridBlock
+        Unit body.
+    residual : bool, default False
+        Whether use residual connection.
+    """
+    def __init__(self,
+                 body,
+                 residual=False,
+                 **kwargs):
+        super(MergedUnit, self).__init__(**kwargs)
+        self.residual = residual
+
+        with self.name_scope():
+            self.body = body
+
+    def hybrid_forward(self, F, x):
+        out = self.body(x)
+        if self.residual:
+            out = out + x
+        return out
+
+
+def _pair(x):
+    return tuple(x) if isinstance(x, (tuple, list)) else (x, x)
+
+
+def _is_conv_unit(block):
+    return (type(block).__name__ in CONV_UNIT_CLASS_NAMES) and isinstance(getattr(block, 'conv', None), nn.Conv2D)
+
+
+def _get_conv_unit_activ(block):
+    if not getattr(block, 'activate', True):
+        return None
+    return getattr(block, 'activ', None)
+
+
+def _get_merge_key(block,
+                   pad_kernels):
+    """
+    Get a key of a convolution unit, such that units with equal keys can be merged (or None if unit can't be merged).
+    """
+    conv = block.conv
+    kw = conv._kwargs
+    if (kw['num_group'] != 1) or (kw['layout'] != 'NCHW') or (conv.act is not None):
+        return None
+    bn = getattr(block, 'bn', None)
+    if (bn is not None) and (not isinstance(bn, nn.BatchNorm) or (bn._kwargs['axis'] != 1)):
+        return None
+    activ = _get_conv_unit_activ(block)
+    if (activ is not None) and (len(activ.collect_params().keys()) > 0):
+        return None
+    activ_key = None if activ is None else (type(activ).__name__, getattr(activ, '_act_type', None),
+                                            getattr(activ, '_alpha', None))
+    kernel_size = _pair(kw['kernel'])
+    padding = _pair(kw['pad'])
+    dilation = _pair(kw['dilate'])
+    # Relative position of the kernel center to the padded input border:
+    offset = tuple(2 * p - d * (k - 1) for k, p, d in zip(kernel_size, padding, dilation))
+    key = (_pair(kw['stride']), dilation, offset, activ_key, conv._in_channels)
+    if not pad_kernels:
+        key += (kernel_size,)
+    return key
+
+
+def _fold_conv_unit(block):
+    """
+    Get weight and bias of the convolution with folded batch normalization.
+    """
+    conv = block.conv
+    weight = conv.weight.list_data()[0].asnumpy()
+    if conv.bias is not None:
+        bias = conv.bias.list_data()[0].asnumpy()
+    else:
+        bias = np.zeros((weight.shape[0],), weight.dtype)
+    bn = getattr(block, 'bn', None)
+    if bn is not None:
+        std = np.sqrt(bn.running_var.list_data()[0].asnumpy() + bn._kwargs['eps'])
+        gamma = bn.gamma.list_data()[0].asnumpy() if not bn._kwargs['fix_gamma'] else np.ones_like(std)
+        beta = bn.beta.list_data()[0].asnumpy()
+        scale = gamma / std
+        weight = weight * scale.reshape((-1, 1, 1, 1))
+        bias = (bias - bn.running_mean.list_data()[0].asnumpy()) * scale + beta
+    return weight, bias
+
+
+def _merge_conv_units(blocks):
+    """
+    Merge convolution units (with equal merge keys) into a single convolution by zero-padding of kernels.
+    """
+    convs = [b.conv for b in blocks]
+    dilation = _pair(convs[0]._kwargs['dilate'])
+    kernel_sizes = [_pair(c._kwargs['kernel']) for c in convs]
+    kernel_size = tuple(max(k[i] for k in kernel_sizes) for i in range(2))
+    if any([(kernel_size[i] - k[i]) % 2 != 0 for k in kernel_sizes for i in range(2)]):
+        return None
+    k0, p0 = kernel_sizes[0], _pair(convs[0]._kwargs['pad'])
+    padding = tuple(p0[i] + dilation[i] * (kernel_size[i] - k0[i]) // 2 for i in range(2))
+
+    weights = []
+    biases = []
+    for block, k in zip(blocks, kernel_sizes):
+        weight, bias = _fold_conv_unit(block)
+        pad_h = (kernel_size[0] - k[0]) // 2
+        pad_w = (kernel_size[1] - k[1]) // 2
+        weights.append(np.pad(weight, ((0, 0), (0, 0), (pad_h, pad_h), (pad_w, pad_w)), mode='constant'))
+        biases.append(bias)
+    weight = np.concatenate(weights, axis=0)
+    bias = np.concatenate(biases, axis=0)
+
+    ctx = convs[0].weight.list_ctx()
+    dtype = convs[0].weight.dtype
+    conv = nn.Conv2D(
+        channels=weight.shape[0],
+        kernel_size=kernel_size,
+        strides=_pair(convs[0]._kwargs['stride']),
+        padding=padding,
+        dilation=dilation,
+        use_bias=True,
+        in_channels=convs[0]._in_channels)
+    conv.initialize(ctx=ctx)
+    conv.cast(dtype)
+    conv.weight.set_data(mx.nd.array(weight, dtype=dtype))
+    conv.bias.set_data(mx.nd.array(bias, dtype=dtype))
+    return MergedConv(
+        conv=conv,
+        activ=_get_conv_unit_activ(blocks[0]))
+
+
+def _set_child(parent,
+               name,
+               block):
+    """
+    Replace a child block (possibly with a block of another type).
+    """
+    parent.register_child(block, name)
+    if name in parent.__dict__:
+        object.__setattr__(parent, name, block)
+
+
+def _find_branch_head(branch):
+    """
+    Find the convolution unit, that is applied first to the branch input.
+
+    Returns
+    -------
+    tuple of 2 elements
+        Parent block (or None if the branch is the unit itself) and the child name of the unit.
+    """
+    parent = None
+    name = None
+    block = branch
+    while not _is_conv_unit(block):
+        if type(block) is nn.HybridSequential:
+            if len(block._children) == 0:
+                return None
+            name = next(iter(block._children.keys()))
+        elif type(block).__name__ in BRANCH_HEAD_ATTRS:
+            name = BRANCH_HEAD_ATTRS[type(block).__name__]
+        elif isinstance(block, MergedUnit) and not block.residual:
+            name = 'body'
+        else:
+            return None
+        parent = block
+        block = parent._children[name]
+    return parent, name
+
+
+def _is_identity(block):
+    def is_identity_block(b):
+        return ((type(b) is nn.HybridSequential) or (type(b).__name__ in BRANCH_HEAD_ATTRS)) and\
+            all([is_identity_block(c) for c in b._children.values()])
+    return is_identity_block(block) and (len(block.collect_params().keys()) == 0)
+
+
+def _merge_concurrent(block,
+                      pad_kernels):
+    """
+    Merge heads of `HybridConcurrent` container branches.
+
+    Returns
+    -------
+    HybridBlock or None
+        Merged container (or None if there is nothing to merge).
+    """
+    branches = list(block._children.values())
+    heads = [_find_branch_head(b) for b in branches]
+    head_blocks = [(h[0]._children[h[1]] if h[0] is not None else b) if h is not None else None
+                   for b, h in zip(branches, heads)]
+    keys = [_get_merge_key(b, pad_kernels) if b is not None else None for b in head_blocks]
+
+    groups = []
+    for key in set([k for k in keys if k is not None]):
+        inds = [i for i, k in enumerate(keys) if k == key]
+        if len(inds) > 1:
+            groups.append(inds)
+    groups = sorted(groups)
+    if len(groups) == 0:
+        return None
+
+    merged_heads = []
+    new_branches = list(branches)
+    specs = [(-1, 0, 0)] * len(branches)
+    for inds in groups:
+        merged_head = _merge_conv_units([head_blocks[i] for i in inds])
+        if merged_head is None:
+            continue
+        start = 0
+        for i in inds:
+            length = head_blocks[i].conv._channels
+            specs[i] = (len(merged_heads), start, length)
+            start += length
+            parent, name = heads[i]
+            if parent is None:
+                new_branches[i] = None
+            else:
+                # An empty sequential block acts as identity:
+                _set_child(parent, name, nn.HybridSequential(prefix=''))
+                if _is_identity(branches[i]):
+                    new_branches[i] = None
+        merged_heads.append(merged_head)
+    if len(merged_heads) == 0:
+        return None
+
+    return MergedConcurrent(
+        heads=merged_heads,
+        branches=new_branches,
+        specs=specs,
+        axis=block.axis)
+
+
+def _merge_sibling_unit(block,
+                        pad_kernels):
+    """
+    Merge hard-coded sibling convolutions of a unit.
+
+    Returns
+    -------
+    HybridBlock or None
+        Merged unit (or None if there is nothing to merge).
+    """
+    pre_name, sibling_names, residual_name = SIBLING_UNITS[type(block).__name__]
+    siblings = [block._children[name] for name in sibling_names]
+    if not all([_is_conv_unit(b) for b in siblings]):
+        return None
+    keys = [_get_merge_key(b, pad_kernels) for b in siblings]
+    if (keys[0] is None) or any([k != keys[0] for k in keys]):
+        return None
+    merged_head = _merge_conv_units(siblings)
+    if merged_head is None:
+        return None
+    body = nn.HybridSequential(prefix='')
+    body.add(block._children[pre_name])
+    body.add(merged_head)
+    return MergedUnit(
+        body=body,
+        residual=(getattr(block, residual_name) if residual_name is not None else False))
+
+
+def _merge_block(block,
+                 pad_kernels):
+    for name, child in list(block._children.items()):
+        _merge_block(child, pad_kernels)
+        merged = None
+        if type(child).__name__ in SIBLING_UNITS:
+            merged = _merge_sibling_unit(child, pad_kernels)
+        elif type(child) is HybridConcurrent:
+            merged = _merge_concurrent(child, pad_kernels)
+        if merged is not None:
+            _set_child(block, name, merged)
+
+
+def merge_branches(net,
+                   pad_kernels=True):
+    """
+    Merge sibling convolution branches of a model for inference (in place). Convolutions of `HybridConcurrent` branch
+    heads and of hard-coded sibling units (like SqueezeNet 'Fire' unit), that consume the same input, are replaced by
+    a single wider convolution with folded batch normalization. Kernels of different sizes are zero-padded to the
+    largest one (e.g. 1x1 and 3x3 kernels are merged into a 3x3 one), which saves kernel launches at the cost of extra
+    FLOPs, so it pays off mainly on GPU with small batches.
+
+    Parameters:
+    ----------
+    net : HybridBlock
+        Model with initialized parameters.
+    pad_kernels : bool, default True
+        Whether to merge convolutions with different kernel sizes.
+
+    Returns
+    -------
+    HybridBlock
+        The same model with merged branches.
+    """
+    _merge_block(net, pad_kernels)
+    if net._active:
+        net.hybridize(active=True, **dict(net._flags))
+    return net
@@ -1,3 +1,4 @@
+import time
 import logging
 import numpy as np
 import mxnet as mx
@@ -6,7 +7,7 @@ from mxnet.gluon.contrib.nn import Identity
 from .gluoncv2.models.common import ReLU6, ChannelShuffle, ChannelShuffle2
 from .gluoncv2.models.fishnet import InterpolationBlock, ChannelSqueeze
 
-__all__ = ['measure_model']
+__all__ = ['measure_model', 'measure_latency']
 
 
 def calc_block_num_params2(net):
@@ -112,7 +113,7 @@ def measure_model(model,
             extra_num_macs = 0
         elif type(block) in [nn.MaxPool2D, nn.AvgPool2D, nn.GlobalAvgPool2D, nn.GlobalMaxPool2D]:
             assert (x[0].shape[1] == y.shape[1])
-            pool_size = block._kwargs["kernel"]
+            pool_size = x[0].shape[2:4] if block._kwargs["global_pool"] else block._kwargs["kernel"]
             y_h = y.shape[2]
             y_w = y.shape[3]
             channels = x[0].shape[1]
@@ -181,3 +182,44 @@ def measure_model(model,
     [h.detach() for h in hook_handles]
 
     return num_flops, num_macs, num_params1
+
+
+def measure_latency(model,
+                    in_channels,
+                    in_size,
+                    batch_size=1,
+                    num_iters=20,
+                    dtype="float32",
+                    ctx=mx.cpu()):
+    """
+    Measure the average time of a forward pass on random data.
+
+    Parameters:
+    ----------
+    model : HybridBlock or predictor
+        Tested model.
+    in_channels : int
+        Number of input channels.
+    in_size : tuple of two ints
+        Spatial size of the input image.
+    batch_size : int, default 1
+        Batch size.
+    num_iters : int, default 20
+        Number of timed forward passes.
+    dtype : str, default 'float32'
+        Base data type for tensors.
+    ctx : Context, default CPU
+        The context in which to run the model.
+
+    Returns
+    -------
+    float
+        Time of a forward pass (in seconds).
+    """
+    x = mx.nd.random.normal(shape=(batch_size, in_channels, in_size[0], in_size[1]), ctx=ctx).astype(dtype)
+    for _ in range(3):
+        model(x).wait_to_read()
+    tic = time.time()
+    for _ in range(num_iters):
+        model(x).wait_to_read()
+    return (time.time() - tic) / num_iters
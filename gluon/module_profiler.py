@@ -0,0 +1,99 @@
+"""
+    Per-module timing of a model forward pass by means of forward hooks (Gluon).
+"""
+
+__all__ = ['attach_module_profiler', 'profile_model']
+
+import mxnet as mx
+from common.module_profiler import ModuleProfiler
+
+
+def _get_named_blocks(block,
+                      prefix=""):
+    """
+    Get all blocks of a network with their names (paths in the network).
+    """
+    yield prefix, block
+    for child_name, child in block._children.items():
+        for named_block in _get_named_blocks(child, prefix + ("." if prefix else "") + child_name):
+            yield named_block
+
+
+def attach_module_profiler(net,
+                           profiler):
+    """
+    Register forward pre/post hooks, that report each block forward pass to the profiler. Hooks of child blocks are
+    called only if the network is not hybridized.
+
+    Parameters:
+    ----------
+    net : Block
+        Profiled network.
+    profiler : ModuleProfiler
+        Profiler.
+
+    Returns
+    -------
+    list of HookHandle
+        Hook handles (call `detach` on each of them to detach the profiler).
+    """
+    handles = []
+    for name, block in _get_named_blocks(net):
+        type_name = type(block).__name__
+        name = name if name else type_name
+
+        def pre_hook(block, inputs, name=name, type_name=type_name):
+            profiler.begin(name, type_name)
+
+        def hook(block, inputs, outputs):
+            profiler.end()
+
+        handles.append(block.register_forward_pre_hook(pre_hook))
+        handles.append(block.register_forward_hook(hook))
+    return handles
+
+
+def profile_model(net,
+                  in_channels,
+                  in_size,
+                  batch_size=1,
+                  num_batches=10,
+                  dtype="float32",
+                  ctx=mx.cpu()):
+    """
+    Time the forward pass of each block on random batches. The network should not be hybridized.
+
+    Parameters:
+    ----------
+    net : Block
+        Profiled network.
+    in_channels : int
+        Number of input channels.
+    in_size : tuple of two ints
+        Spatial size of the input image.
+    batch_size : int, default 1
+        Batch size.
+    num_batches : int, default 10
+        Number of profiled batches.
+    dtype : str, default 'float32'
+        Base data type for tensors.
+    ctx : Context, default CPU
+        The context in which to run the network.
+
+    Returns
+    -------
+    ModuleProfiler
+        Profiler with recorded events.
+    """
+    assert (not net._active), "Per-block timing requires a non-hybridized network"
+    profiler = ModuleProfiler(sync_fn=mx.nd.waitall)
+    handles = attach_module_profiler(net, profiler)
+    x = mx.nd.random.normal(shape=(batch_size, in_channels, in_size[0], in_size[1]), ctx=ctx).astype(dtype)
+    try:
+        profiler.run(
+            forward_fn=(lambda: net(x).wait_to_read()),
+            num_batches=num_batches)
+    finally:
+        for handle in handles:
+            handle.detach()
+    return profiler
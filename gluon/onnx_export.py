@@ -0,0 +1,67 @@
+"""
+    Export of a model to ONNX (Gluon).
+"""
+
+__all__ = ['export_onnx']
+
+import os
+import numpy as np
+import mxnet as mx
+from .utils import export_model
+
+
+def export_onnx(net,
+                model_name,
+                file_path,
+                in_channels=3,
+                in_size=(224, 224),
+                dynamic_hw=False,
+                opset_version=13,
+                ctx=mx.cpu()):
+    """
+    Export a network to an ONNX file with a dynamic batch axis. The network is exported as a symbol with parameters
+    (by `gluon.utils.export_model`, next to the ONNX file) and then converted by the MXNet ONNX exporter (MXNet 1.9+).
+
+    Parameters:
+    ----------
+    net : HybridBlock
+        Network.
+    model_name : str
+        Model name.
+    file_path : str
+        Path to the ONNX file.
+    in_channels : int, default 3
+        Number of input channels.
+    in_size : tuple of two ints, default (224, 224)
+        Spatial size of the input image, used for tracing.
+    dynamic_hw : bool, default False
+        Whether to make the spatial axes of the input dynamic too.
+    opset_version : int, default 13
+        ONNX opset version.
+    ctx : Context, default CPU
+        The context in which the network is.
+
+    Returns
+    -------
+    str
+        Path to the ONNX file.
+    """
+    assert hasattr(mx, "onnx"), "ONNX export with a dynamic batch axis requires MXNet 1.9+"
+    data_shape = (1, in_channels, in_size[0], in_size[1])
+    symbol_file_path, params_file_path, _ = export_model(
+        net=net,
+        model_name=model_name,
+        file_prefix=os.path.splitext(file_path)[0],
+        data_shape=data_shape,
+        ctx=ctx)
+    dynamic_shape = (None, in_channels, None, None) if dynamic_hw else (None, in_channels, in_size[0], in_size[1])
+    mx.onnx.export_model(
+        sym=symbol_file_path,
+        params=params_file_path,
+        in_shapes=[data_shape],
+        in_types=[np.float32],
+        onnx_file_path=file_path,
+        opset_version=opset_version,
+        dynamic=True,
+        dynamic_input_shapes=[dynamic_shape])
+    return file_path
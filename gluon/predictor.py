@@ -0,0 +1,185 @@
+"""
+    Predictors for exported (symbolic) Gluon models.
+
+    A model is exported by `gluon.utils.export_model` (or export_gl.py) as a symbol JSON file, a parameter file and a
+    small JSON file with the input description. This module depends on MXNet only, so a serving process neither imports
+    the model zoo nor rebuilds and traces the Python block tree.
+"""
+
+__all__ = ['get_export_file_paths', 'save_export_meta', 'load_export_meta', 'SymbolBlockPredictor',
+           'ModulePredictor', 'create_predictor']
+
+import json
+import mxnet as mx
+
+
+def get_export_file_paths(file_prefix,
+                          epoch=0):
+    """
+    Get paths of exported model files.
+
+    Parameters:
+    ----------
+    file_prefix : str
+        Path prefix of exported files.
+    epoch : int, default 0
+        Epoch number of exported parameters.
+
+    Returns
+    -------
+    tuple of 3 str
+        Paths of the symbol, parameter and meta files.
+    """
+    return "{}-symbol.json".format(file_prefix), "{}-{:04d}.params".format(file_prefix, epoch),\
+        "{}-meta.json".format(file_prefix)
+
+
+def save_export_meta(file_prefix,
+                     model_name,
+                     data_shape,
+                     dtype):
+    """
+    Save the input description of an exported model.
+
+    Parameters:
+    ----------
+    file_prefix : str
+        Path prefix of exported files.
+    model_name : str
+        Model name.
+    data_shape : tuple of 4 int
+        Input shape (the predictor is bound to it by default).
+    dtype : str
+        Input data type.
+    """
+    meta = {
+        "model": model_name,
+        "data_name": "data",
+        "data_shape": list(data_shape),
+        "dtype": dtype,
+    }
+    with open(get_export_file_paths(file_prefix)[2], "w") as f:
+        json.dump(meta, f, indent=2)
+
+
+def load_export_meta(file_prefix):
+    """
+    Load the input description of an exported model.
+
+    Parameters:
+    ----------
+    file_prefix : str
+        Path prefix of exported files.
+
+    Returns
+    -------
+    dict
+        Model name, input name, shape and data type.
+    """
+    with open(get_export_file_paths(file_prefix)[2], "r") as f:
+        return json.load(f)
+
+
+class SymbolBlockPredictor(object):
+    """
+    Predictor, that runs an exported model as a Gluon `SymbolBlock` (any input shape is accepted).
+
+    Parameters:
+    ----------
+    file_prefix : str
+        Path prefix of exported files.
+    ctx : Context, default CPU
+        The context in which to run the model.
+    """
+    def __init__(self,
+                 file_prefix,
+                 ctx=mx.cpu()):
+        super(SymbolBlockPredictor, self).__init__()
+        symbol_file_path, params_file_path, _ = get_export_file_paths(file_prefix)
+        self.meta = load_export_meta(file_prefix)
+        self.ctx = ctx
+        self.net = mx.gluon.nn.SymbolBlock.imports(
+            symbol_file=symbol_file_path,
+            input_names=[self.meta["data_name"]],
+            param_file=params_file_path,
+            ctx=ctx)
+        self.net.hybridize(
+            static_alloc=True,
+            static_shape=True)
+
+    def __call__(self, x):
+        x = mx.nd.array(x, ctx=self.ctx, dtype=self.meta["dtype"]) if not isinstance(x, mx.nd.NDArray) else\
+            x.as_in_context(self.ctx).astype(self.meta["dtype"], copy=False)
+        return self.net(x)
+
+
+class ModulePredictor(object):
+    """
+    Predictor, that runs an exported model as an MXNet `Module`, bound for inference to a fixed input shape (inputs of
+    other shapes make the module rebind).
+
+    Parameters:
+    ----------
+    file_prefix : str
+        Path prefix of exported files.
+    data_shape : tuple of 4 int or None, default None
+        Input shape (the export shape by default).
+    ctx : Context, default CPU
+        The context in which to run the model.
+    """
+    def __init__(self,
+                 file_prefix,
+                 data_shape=None,
+                 ctx=mx.cpu()):
+        super(ModulePredictor, self).__init__()
+        self.meta = load_export_meta(file_prefix)
+        self.ctx = ctx
+        if data_shape is None:
+            data_shape = self.meta["data_shape"]
+        data_name = self.meta["data_name"]
+        symbol, arg_params, aux_params = mx.model.load_checkpoint(file_prefix, 0)
+        self.module = mx.mod.Module(
+            symbol=symbol,
+            data_names=[data_name],
+            label_names=None,
+            context=ctx)
+        self.module.bind(
+            data_shapes=[mx.io.DataDesc(name=data_name, shape=tuple(data_shape), dtype=self.meta["dtype"])],
+            for_training=False)
+        self.module.set_params(
+            arg_params=arg_params,
+            aux_params=aux_params)
+
+    def __call__(self, x):
+        x = mx.nd.array(x, ctx=self.ctx, dtype=self.meta["dtype"]) if not isinstance(x, mx.nd.NDArray) else\
+            x.as_in_context(self.ctx).astype(self.meta["dtype"], copy=False)
+        self.module.forward(mx.io.DataBatch(data=[x]), is_train=False)
+        return self.module.get_outputs()[0]
+
+
+def create_predictor(file_prefix,
+                     backend="module",
+                     ctx=mx.cpu()):
+    """
+    Create a predictor for an exported model.
+
+    Parameters:
+    ----------
+    file_prefix : str
+        Path prefix of exported files.
+    backend : str, default 'module'
+        Predictor type ('module' or 'symbol_block').
+    ctx : Context, default CPU
+        The context in which to run the model.
+
+    Returns
+    -------
+    ModulePredictor or SymbolBlockPredictor
+        Predictor.
+    """
+    if backend == "module":
+        return ModulePredictor(file_prefix=file_prefix, ctx=ctx)
+    elif backend == "symbol_block":
+        return SymbolBlockPredictor(file_prefix=file_prefix, ctx=ctx)
+    else:
+        raise ValueError("Unsupported predictor backend: {}".format(backend))
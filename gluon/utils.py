@@ -4,6 +4,7 @@ import logging
 import numpy as np
 import mxnet as mx
 from .gluoncv2.model_provider import get_model
+from .predictor import get_export_file_paths, save_export_meta
 
 
 def prepare_mx_context(num_gpus,
@@ -13,6 +14,31 @@ def prepare_mx_context(num_gpus,
     return ctx, batch_size
 
 
+def prepare_mx_kvstore(kvstore):
+    """
+    Create kvstore for distributed training.
+
+    Parameters:
+    ----------
+    kvstore : str
+        Type of kvstore ('local', 'device', 'dist_sync', 'dist_device_sync', etc.).
+
+    Returns
+    -------
+    str or KVStore
+        Kvstore type or kvstore object (for distributed kvstore).
+    int
+        Rank of the current worker.
+    int
+        Number of workers.
+    """
+    if 'dist' in kvstore:
+        kv = mx.kv.create(kvstore)
+        return kv, kv.rank, kv.num_workers
+    else:
+        return kvstore, 0, 1
+
+
 def prepare_model(model_name,
                   use_pretrained,
                   pretrained_model_file_path,
@@ -68,6 +94,52 @@ def prepare_model(model_name,
     return net
 
 
+def export_model(net,
+                 model_name,
+                 file_prefix,
+                 data_shape,
+                 dtype="float32",
+                 ctx=mx.cpu()):
+    """
+    Export a network as a symbol JSON file with parameters, to be served by `gluon.predictor` without the model zoo.
+
+    Parameters:
+    ----------
+    net : HybridBlock
+        Network.
+    model_name : str
+        Model name.
+    file_prefix : str
+        Path prefix of exported files.
+    data_shape : tuple of 4 int
+        Input shape, used for tracing (the predictor is bound to it by default).
+    dtype : str, default 'float32'
+        Input data type.
+    ctx : Context, default CPU
+        The context in which the network is.
+
+    Returns
+    -------
+    tuple of 3 str
+        Paths of the symbol, parameter and meta files.
+    """
+    dir_path = os.path.dirname(file_prefix)
+    if dir_path and not os.path.exists(dir_path):
+        os.makedirs(dir_path)
+    if not net._active:
+        net.hybridize(
+            static_alloc=True,
+            static_shape=True)
+    net(mx.nd.zeros(data_shape, ctx=ctx, dtype=dtype)).wait_to_read()
+    net.export(file_prefix, epoch=0)
+    save_export_meta(
+        file_prefix=file_prefix,
+        model_name=model_name,
+        data_shape=data_shape,
+        dtype=dtype)
+    return get_export_file_paths(file_prefix)
+
+
 def calc_net_weight_count(net):
     net_params = net.collect_params()
     weight_count = 0
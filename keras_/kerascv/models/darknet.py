@@ -59,7 +59,6 @@ def dark_convYxY(x,
 
 def darknet(channels,
             odd_pointwise,
-            avg_pool_size,
             cls_activ,
             alpha=0.1,
             in_channels=3,
@@ -74,8 +73,6 @@ def darknet(channels,
         Number of output channels for each unit.
     odd_pointwise : bool
         Whether pointwise convolution layer is used for each odd unit.
-    avg_pool_size : int
-        Window size of the final average pooling.
     cls_activ : bool
         Whether classification convolution layer uses an activation.
     alpha : float, default 0.1
@@ -114,7 +111,7 @@ def darknet(channels,
     if cls_activ:
         x = nn.LeakyReLU(alpha=alpha, name="output/final_activ")(x)
     x = nn.AvgPool2D(
-        pool_size=avg_pool_size,
+        pool_size=(x.shape[2:4] if K.image_data_format() == 'channels_first' else x.shape[1:3]),
         strides=1,
         name="output/final_pool")(x)
     x = nn.Flatten()(x)
@@ -148,18 +145,15 @@ def get_darknet(version,
     if version == 'ref':
         channels = [[16], [32], [64], [128], [256], [512], [1024]]
         odd_pointwise = False
-        avg_pool_size = 3
         cls_activ = True
     elif version == 'tiny':
         channels = [[16], [32], [16, 128, 16, 128], [32, 256, 32, 256], [64, 512, 64, 512, 128]]
         odd_pointwise = True
-        avg_pool_size = 14
         cls_activ = False
     elif version == '19':
         channels = [[32], [64], [128, 64, 128], [256, 128, 256], [512, 256, 512, 256, 512],
                     [1024, 512, 1024, 512, 1024]]
         odd_pointwise = False
-        avg_pool_size = 7
         cls_activ = False
     else:
         raise ValueError("Unsupported DarkNet version {}".format(version))
@@ -167,7 +161,6 @@ def get_darknet(version,
     net = darknet(
         channels=channels,
         odd_pointwise=odd_pointwise,
-        avg_pool_size=avg_pool_size,
         cls_activ=cls_activ,
         **kwargs)
 
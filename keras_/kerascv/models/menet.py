@@ -229,7 +229,7 @@ def menet(channels,
                 name="features/stage{}/unit{}".format(i + 1, j + 1))
             in_channels = out_channels
     x = nn.AvgPool2D(
-        pool_size=7,
+        pool_size=(x.shape[2:4] if K.image_data_format() == 'channels_first' else x.shape[1:3]),
         strides=1,
         name="features/final_pool")(x)
 
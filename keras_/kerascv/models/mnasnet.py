@@ -356,7 +356,7 @@ def mnasnet_model(channels,
         name="features/final_block")
     in_channels = final_block_channels
     x = nn.AvgPool2D(
-        pool_size=7,
+        pool_size=(x.shape[2:4] if K.image_data_format() == 'channels_first' else x.shape[1:3]),
         strides=1,
         name="features/final_pool")(x)
 
@@ -225,7 +225,7 @@ def squeezenet(channels,
         name="output/final_conv")(x)
     x = nn.Activation("relu", name="output/final_activ")(x)
     x = nn.AvgPool2D(
-        pool_size=13,
+        pool_size=(x.shape[2:4] if K.image_data_format() == 'channels_first' else x.shape[1:3]),
         strides=1,
         name="output/final_pool")(x)
     x = nn.Flatten()(x)
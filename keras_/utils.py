@@ -1,11 +1,18 @@
 import math
 import logging
 import os
+import threading
+import numpy as np
+try:
+    import queue
+except ImportError:
+    import Queue as queue
 
 from keras import backend as K
-from keras.utils.np_utils import to_categorical
+from keras.utils import Sequence
 import mxnet as mx
 
+from common.val_cache import ValCache
 from keras_.kerascv.model_provider import get_model
 
 
@@ -22,7 +29,9 @@ def get_data_rec(rec_train,
                  batch_size,
                  num_workers,
                  input_image_size=(224, 224),
-                 resize_inv_factor=0.875):
+                 resize_inv_factor=0.875,
+                 num_parts=1,
+                 part_index=0):
     assert (resize_inv_factor > 0.0)
     if isinstance(input_image_size, int):
         input_image_size = (input_image_size, input_image_size)
@@ -44,6 +53,9 @@ def get_data_rec(rec_train,
         preprocess_threads=num_workers,
         shuffle=True,
         batch_size=batch_size,
+        num_parts=num_parts,
+        part_index=part_index,
+        round_batch=False,
 
         data_shape=data_shape,
         mean_r=mean_rgb[0],
@@ -69,6 +81,9 @@ def get_data_rec(rec_train,
         preprocess_threads=num_workers,
         shuffle=False,
         batch_size=batch_size,
+        num_parts=num_parts,
+        part_index=part_index,
+        round_batch=False,
 
         resize=resize_value,
         data_shape=data_shape,
@@ -82,28 +97,253 @@ def get_data_rec(rec_train,
     return train_data, val_data
 
 
-def get_data_generator(data_iterator,
-                       num_classes):
-    def get_arrays(db):
-        data = db.data[0].asnumpy()
-        if K.image_data_format() == 'channels_last':
-            data = data.transpose((0, 2, 3, 1))
-        labels = to_categorical(
-            y=db.label[0].asnumpy(),
-            num_classes=num_classes)
-        return data, labels
+class RecDataSequence(Sequence):
+    """
+    Keras data sequence over MXNet record iterators. Each iterator (typically reading its own part of a .rec file) is
+    drained by a dedicated reader thread into a bounded prefetch queue. The layout transpose and conversion of labels
+    into sparse integer form are done in reader threads, so the training loop only dequeues ready batches.
 
-    while True:
-        try:
-            db = data_iterator.next()
+    A pass over the sequence reads each iterator exactly once (without padding samples), and batches are assembled from
+    samples in the order they are decoded. So the sequence should be read sequentially from the index 0 (e.g. by Keras
+    with `workers=1`); the index 0 always starts a new pass.
 
-        except StopIteration:
-            # logging.warning("get_data exception due to end of data - resetting iterator")
+    Parameters:
+    ----------
+    data_iterators : list of mx.io.DataIter
+        Record iterators (one per reader thread).
+    num_samples : int
+        Number of samples in all iterators.
+    batch_size : int
+        Batch size.
+    drop_last : bool, default False
+        Whether to drop the last incomplete batch.
+    prefetch_batches : int, default 8
+        Capacity of the prefetch queue.
+    """
+    def __init__(self,
+                 data_iterators,
+                 num_samples,
+                 batch_size,
+                 drop_last=False,
+                 prefetch_batches=8):
+        super(RecDataSequence, self).__init__()
+        assert (len(data_iterators) > 0)
+        assert (num_samples > 0) and (batch_size > 0)
+        self.data_iterators = data_iterators
+        self.num_samples = num_samples
+        self.batch_size = batch_size
+        if drop_last:
+            self.num_batches = num_samples // batch_size
+        else:
+            self.num_batches = (num_samples + batch_size - 1) // batch_size
+        assert (self.num_batches > 0)
+        self.channels_last = (K.image_data_format() == 'channels_last')
+        self.queue = queue.Queue(maxsize=max(1, prefetch_batches))
+        self.stop_event = threading.Event()
+        self.readers = None
+        self.num_finished_readers = 0
+        self.chunks = []
+        self.next_index = 0
+
+    def __len__(self):
+        return self.num_batches
+
+    def __getitem__(self, index):
+        if (index == 0) or (self.readers is None):
+            self._start_pass()
+        if index != self.next_index:
+            raise ValueError("Batch {} is requested instead of {}, the sequence should be read sequentially (with "
+                             "workers=1)".format(index, self.next_index))
+        self.next_index += 1
+        batch_size = min(self.batch_size, self.num_samples - index * self.batch_size)
+        num_chunk_samples = sum([len(x[1]) for x in self.chunks])
+        while (num_chunk_samples < batch_size) and (self.num_finished_readers < len(self.readers)):
+            chunk = self.queue.get()
+            if chunk is None:
+                self.num_finished_readers += 1
+            else:
+                self.chunks.append(chunk)
+                num_chunk_samples += len(chunk[1])
+        if num_chunk_samples < batch_size:
+            raise ValueError("Record iterators have less than {} samples".format(self.num_samples))
+        if len(self.chunks[0][1]) == batch_size:
+            return self.chunks.pop(0)
+        data = np.concatenate([x[0] for x in self.chunks])
+        labels = np.concatenate([x[1] for x in self.chunks])
+        self.chunks = [(data[batch_size:], labels[batch_size:])] if num_chunk_samples > batch_size else []
+        return data[:batch_size], labels[:batch_size]
+
+    def close(self):
+        self._stop_readers()
+
+    def _start_pass(self):
+        self._stop_readers()
+        for data_iterator in self.data_iterators:
             data_iterator.reset()
-            db = data_iterator.next()
+        self.num_finished_readers = 0
+        self.chunks = []
+        self.next_index = 0
+        self.stop_event.clear()
+        self.readers = [threading.Thread(target=self._read, args=(data_iterator,))
+                        for data_iterator in self.data_iterators]
+        for reader in self.readers:
+            reader.daemon = True
+            reader.start()
+
+    def _stop_readers(self):
+        if self.readers is not None:
+            self.stop_event.set()
+            for reader in self.readers:
+                reader.join()
+            self.readers = None
+            while not self.queue.empty():
+                self.queue.get_nowait()
+
+    def _put(self, chunk):
+        while not self.stop_event.is_set():
+            try:
+                self.queue.put(chunk, timeout=0.5)
+                return True
+            except queue.Full:
+                pass
+        return False
+
+    def _read(self, data_iterator):
+        while not self.stop_event.is_set():
+            try:
+                db = data_iterator.next()
+            except StopIteration:
+                break
+            data = db.data[0]
+            labels = db.label[0]
+            if db.pad:
+                num_valid = data.shape[0] - db.pad
+                data = data[:num_valid]
+                labels = labels[:num_valid]
+            if self.channels_last:
+                data = mx.nd.transpose(data, axes=(0, 2, 3, 1))
+            if not self._put((data.asnumpy(), labels.asnumpy().astype(np.int32).reshape((-1, 1)))):
+                return
+        self._put(None)
+
+
+def get_data_rec_sequences(rec_train,
+                           rec_train_idx,
+                           rec_val,
+                           rec_val_idx,
+                           batch_size,
+                           num_workers,
+                           num_readers=4,
+                           prefetch_batches=8,
+                           train_num_examples=1281167,
+                           val_num_examples=50000,
+                           input_image_size=(224, 224),
+                           resize_inv_factor=0.875):
+    """
+    Create training and validation data sequences over .rec files, each read by `num_readers` parallel threads. A
+    validation pass covers each sample exactly once, a training pass drops the last incomplete batch.
+
+    Parameters:
+    ----------
+    rec_train : str
+        Path to the training .rec file.
+    rec_train_idx : str
+        Path to the training .idx file.
+    rec_val : str
+        Path to the validation .rec file.
+    rec_val_idx : str
+        Path to the validation .idx file.
+    batch_size : int
+        Batch size.
+    num_workers : int
+        Total number of preprocessing threads (shared among readers).
+    num_readers : int, default 4
+        Number of reader threads (and .rec parts) per sequence.
+    prefetch_batches : int, default 8
+        Capacity of the prefetch queue of each sequence.
+    train_num_examples : int, default 1281167
+        Number of training samples.
+    val_num_examples : int, default 50000
+        Number of validation samples.
+    input_image_size : int or tuple of two ints, default (224, 224)
+        Spatial size of the cropped images.
+    resize_inv_factor : float, default 0.875
+        Inverted ratio for input image crop.
+
+    Returns
+    -------
+    RecDataSequence
+        Training data sequence.
+    RecDataSequence
+        Validation data sequence.
+    """
+    assert (num_readers > 0)
+    data_iterators = [get_data_rec(
+        rec_train=rec_train,
+        rec_train_idx=rec_train_idx,
+        rec_val=rec_val,
+        rec_val_idx=rec_val_idx,
+        batch_size=batch_size,
+        num_workers=max(1, num_workers // num_readers),
+        input_image_size=input_image_size,
+        resize_inv_factor=resize_inv_factor,
+        num_parts=num_readers,
+        part_index=i) for i in range(num_readers)]
+    train_seq = RecDataSequence(
+        data_iterators=[x[0] for x in data_iterators],
+        num_samples=train_num_examples,
+        batch_size=batch_size,
+        drop_last=True,
+        prefetch_batches=prefetch_batches)
+    val_seq = RecDataSequence(
+        data_iterators=[x[1] for x in data_iterators],
+        num_samples=val_num_examples,
+        batch_size=batch_size,
+        drop_last=False,
+        prefetch_batches=prefetch_batches)
+    return train_seq, val_seq
+
+
+def get_val_cache_generator(file_stem,
+                            batch_size):
+    """
+    Create an endless generator over preprocessed validation set cache (see `common.val_cache`).
+
+    Parameters:
+    ----------
+    file_stem : str
+        Path stem for cache files.
+    batch_size : int
+        Batch size.
+
+    Returns
+    -------
+    generator
+        Generator of (data, sparse labels) pairs.
+    int
+        Number of steps per pass.
+    """
+    channels_last = (K.image_data_format() == 'channels_last')
+    cache = ValCache(
+        file_stem=file_stem,
+        batch_size=batch_size,
+        channels_last=channels_last)
+    mean_rgb = np.array([123.68, 116.779, 103.939], np.float32)
+    std_rgb = np.array([58.393, 57.12, 57.375], np.float32)
+    if channels_last:
+        mean_rgb = mean_rgb.reshape((1, 1, 1, 3))
+        std_rgb = std_rgb.reshape((1, 1, 1, 3))
+    else:
+        mean_rgb = mean_rgb.reshape((1, 3, 1, 1))
+        std_rgb = std_rgb.reshape((1, 3, 1, 1))
+
+    def generator():
+        while True:
+            for data, labels in cache:
+                data = (data.astype(np.float32) - mean_rgb) / std_rgb
+                yield data, labels.reshape((-1, 1))
 
-        finally:
-            yield get_arrays(db)
+    return generator(), len(cache)
 
 
 def prepare_model(model_name,
@@ -0,0 +1,130 @@
+"""
+    Launcher for distributed (kvstore `dist_*`) training on localhost. It starts a scheduler, servers and workers as
+    separate processes, e.g.:
+
+        python launch_gl_dist.py --num-workers 2 --num-servers 1 -- python train_gl.py --kvstore dist_sync ...
+"""
+
+import argparse
+import os
+import sys
+import socket
+import subprocess
+import logging
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Launch distributed training (Gluon/kvstore) on localhost',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument(
+        '-n',
+        '--num-workers',
+        type=int,
+        default=2,
+        help='number of worker processes')
+    parser.add_argument(
+        '-s',
+        '--num-servers',
+        type=int,
+        default=None,
+        help='number of server processes (equal to number of workers if not set)')
+    parser.add_argument(
+        '--port',
+        type=int,
+        default=0,
+        help='port of the scheduler (a free port is selected if 0)')
+    parser.add_argument(
+        'command',
+        nargs=argparse.REMAINDER,
+        help='command for workers')
+    args = parser.parse_args()
+    return args
+
+
+def get_free_port():
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.bind(('127.0.0.1', 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+
+def start_process(role,
+                  command,
+                  dmlc_env):
+    env = os.environ.copy()
+    env.update(dmlc_env)
+    env['DMLC_ROLE'] = role
+    return subprocess.Popen(command, env=env)
+
+
+def launch(command,
+           num_workers,
+           num_servers,
+           port=0):
+    """
+    Launch scheduler, servers and workers on localhost and wait for workers.
+
+    Parameters:
+    ----------
+    command : list of str
+        Command for workers.
+    num_workers : int
+        Number of workers.
+    num_servers : int
+        Number of servers.
+    port : int, default 0
+        Port of the scheduler (a free port is selected if 0).
+
+    Returns
+    -------
+    int
+        Zero if all workers are finished successfully, otherwise the first non-zero return code.
+    """
+    assert (num_workers > 0) and (num_servers > 0)
+    dmlc_env = {
+        'DMLC_PS_ROOT_URI': '127.0.0.1',
+        'DMLC_PS_ROOT_PORT': str(port if port > 0 else get_free_port()),
+        'DMLC_NUM_WORKER': str(num_workers),
+        'DMLC_NUM_SERVER': str(num_servers),
+    }
+    # Importing of MXNet with DMLC_ROLE=scheduler/server runs the corresponding kvstore loop:
+    ps_command = [sys.executable, '-c', 'import mxnet']
+    ps_processes = [start_process('scheduler', ps_command, dmlc_env)]
+    ps_processes += [start_process('server', ps_command, dmlc_env) for _ in range(num_servers)]
+    workers = [start_process('worker', command, dmlc_env) for _ in range(num_workers)]
+
+    return_code = 0
+    try:
+        for worker in workers:
+            worker_return_code = worker.wait()
+            if (worker_return_code != 0) and (return_code == 0):
+                logging.error('Worker {} failed with code {}'.format(worker.pid, worker_return_code))
+                return_code = worker_return_code
+    finally:
+        for process in workers + ps_processes:
+            if process.poll() is None:
+                process.terminate()
+        for process in ps_processes:
+            process.wait()
+    return return_code
+
+
+def main():
+    logging.basicConfig(level=logging.INFO)
+    args = parse_args()
+    command = args.command
+    if command and command[0] == '--':
+        command = command[1:]
+    assert command, "Worker command is not specified"
+    num_servers = args.num_servers if args.num_servers is not None else args.num_workers
+    sys.exit(launch(
+        command=command,
+        num_workers=args.num_workers,
+        num_servers=num_servers,
+        port=args.port))
+
+
+if __name__ == '__main__':
+    main()
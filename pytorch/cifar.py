@@ -5,8 +5,12 @@
 import torch.utils.data
 import torchvision.transforms as transforms
 import torchvision.datasets as datasets
+from PIL import Image
 
-__all__ = ['add_dataset_parser_arguments', 'get_train_data_loader', 'get_val_data_loader']
+from common.cifar_cache import prepare_cifar_cache, load_cifar_cache
+
+__all__ = ['add_dataset_parser_arguments', 'CIFARCacheDataset', 'get_dataset', 'get_train_data_loader',
+           'get_val_data_loader']
 
 
 def add_dataset_parser_arguments(parser,
@@ -42,10 +46,67 @@ def add_dataset_parser_arguments(parser,
         help='number of input channels')
 
 
+class CIFARCacheDataset(torch.utils.data.Dataset):
+    """
+    CIFAR dataset over a memory-mapped cache (see `common.cifar_cache`), with the same samples as torchvision
+    `CIFAR10`/`CIFAR100`.
+
+    Parameters:
+    ----------
+    file_stem : str
+        Path stem for cache files.
+    transform : function or None, default None
+        Transformation of a PIL image.
+    """
+    def __init__(self,
+                 file_stem,
+                 transform=None):
+        super(CIFARCacheDataset, self).__init__()
+        self.data, self.targets = load_cifar_cache(file_stem)
+        self.transform = transform
+
+    def __len__(self):
+        return self.targets.shape[0]
+
+    def __getitem__(self, index):
+        img = Image.fromarray(self.data[index])
+        if self.transform is not None:
+            img = self.transform(img)
+        return img, int(self.targets[index])
+
+
+def get_dataset(dataset_name,
+                dataset_dir,
+                train,
+                transform,
+                data_cache_dir=''):
+    if data_cache_dir:
+        return CIFARCacheDataset(
+            file_stem=prepare_cifar_cache(
+                cache_dir_path=data_cache_dir,
+                data_dir=dataset_dir,
+                dataset_name=dataset_name,
+                train=train),
+            transform=transform)
+
+    if dataset_name == "CIFAR10":
+        dataset_class = datasets.CIFAR10
+    elif dataset_name == "CIFAR100":
+        dataset_class = datasets.CIFAR100
+    else:
+        raise Exception('Unrecognized dataset: {}'.format(dataset_name))
+    return dataset_class(
+        root=dataset_dir,
+        train=train,
+        transform=transform,
+        download=True)
+
+
 def get_train_data_loader(dataset_name,
                           dataset_dir,
                           batch_size,
-                          num_workers):
+                          num_workers,
+                          data_cache_dir=''):
     mean_rgb = (0.4914, 0.4822, 0.4465)
     std_rgb = (0.2023, 0.1994, 0.2010)
     jitter_param = 0.4
@@ -63,19 +124,13 @@ def get_train_data_loader(dataset_name,
             std=std_rgb),
     ])
 
-    if dataset_name == "CIFAR10":
-        dataset_class = datasets.CIFAR10
-    elif dataset_name == "CIFAR100":
-        dataset_class = datasets.CIFAR100
-    else:
-        raise Exception('Unrecognized dataset: {}'.format(dataset_name))
-
     train_loader = torch.utils.data.DataLoader(
-        dataset=dataset_class(
-            root=dataset_dir,
+        dataset=get_dataset(
+            dataset_name=dataset_name,
+            dataset_dir=dataset_dir,
             train=True,
             transform=transform_train,
-            download=True),
+            data_cache_dir=data_cache_dir),
         batch_size=batch_size,
         shuffle=True,
         num_workers=num_workers,
@@ -87,7 +142,8 @@ def get_train_data_loader(dataset_name,
 def get_val_data_loader(dataset_name,
                         dataset_dir,
                         batch_size,
-                        num_workers):
+                        num_workers,
+                        data_cache_dir=''):
     mean_rgb = (0.4914, 0.4822, 0.4465)
     std_rgb = (0.2023, 0.1994, 0.2010)
 
@@ -98,19 +154,13 @@ def get_val_data_loader(dataset_name,
             std=std_rgb),
     ])
 
-    if dataset_name == "CIFAR10":
-        dataset_class = datasets.CIFAR10
-    elif dataset_name == "CIFAR100":
-        dataset_class = datasets.CIFAR100
-    else:
-        raise Exception('Unrecognized dataset: {}'.format(dataset_name))
-
     val_loader = torch.utils.data.DataLoader(
-        dataset=dataset_class(
-            root=dataset_dir,
+        dataset=get_dataset(
+            dataset_name=dataset_name,
+            dataset_dir=dataset_dir,
             train=False,
             transform=transform_val,
-            download=True),
+            data_cache_dir=data_cache_dir),
         batch_size=batch_size,
         shuffle=False,
         num_workers=num_workers,
@@ -0,0 +1,168 @@
+"""
+    Knowledge distillation with cached teacher logits (see `common.teacher_cache`).
+"""
+
+__all__ = ['calc_teacher_cache', 'prepare_teacher_caches', 'distillation_loss']
+
+import logging
+import torch.utils.data
+import torch.nn.functional as F
+
+from common.teacher_cache import ViewSampler, get_teacher_cache_file_stem, create_teacher_cache, TeacherLogitsCache
+from .utils import prepare_model
+
+
+def calc_teacher_cache(teacher_net,
+                       dataset,
+                       view,
+                       file_stem,
+                       batch_size,
+                       num_workers,
+                       top_k,
+                       use_cuda):
+    """
+    Calculate teacher logits for an augmentation view of the training set and store them in the cache.
+
+    Parameters:
+    ----------
+    teacher_net : Module
+        Teacher model.
+    dataset : ReproducibleAugDataset
+        Training dataset with reproducible augmentation.
+    view : int
+        Augmentation view number.
+    file_stem : str
+        Path stem for cache files.
+    batch_size : int
+        Batch size.
+    num_workers : int
+        Number of preprocessing workers.
+    top_k : int
+        Number of kept logits for each sample.
+    use_cuda : bool
+        Whether to use CUDA.
+    """
+    data_loader = torch.utils.data.DataLoader(
+        dataset=dataset,
+        batch_size=batch_size,
+        sampler=ViewSampler(
+            sampler=range(len(dataset)),
+            num_samples=len(dataset),
+            view=view),
+        num_workers=num_workers,
+        pin_memory=True)
+
+    def logits_iter():
+        with torch.no_grad():
+            for data, _, indices in data_loader:
+                if use_cuda:
+                    data = data.cuda(non_blocking=True)
+                yield indices.numpy(), teacher_net(data).float().cpu().numpy()
+
+    create_teacher_cache(
+        file_stem=file_stem,
+        num_samples=len(dataset),
+        top_k=top_k,
+        logits_iter=logits_iter())
+
+
+def prepare_teacher_caches(teacher_name,
+                           dataset,
+                           cache_dir_path,
+                           num_views,
+                           input_image_size,
+                           top_k,
+                           batch_size,
+                           num_workers,
+                           use_cuda):
+    """
+    Get teacher caches for all augmentation views, calculating the missing ones (the teacher is loaded only in this
+    case).
+
+    Parameters:
+    ----------
+    teacher_name : str
+        Name of the pretrained teacher model.
+    dataset : ReproducibleAugDataset
+        Training dataset with reproducible augmentation.
+    cache_dir_path : str
+        Directory with cache files.
+    num_views : int
+        Number of augmentation views.
+    input_image_size : int
+        Spatial size of the input images.
+    top_k : int
+        Number of kept logits for each sample.
+    batch_size : int
+        Batch size.
+    num_workers : int
+        Number of preprocessing workers.
+    use_cuda : bool
+        Whether to use CUDA.
+
+    Returns
+    -------
+    list of TeacherLogitsCache
+        Caches for all views.
+    """
+    file_stems = [get_teacher_cache_file_stem(
+        cache_dir_path=cache_dir_path,
+        teacher_name=teacher_name,
+        aug_seed=dataset.aug_seed,
+        view=view,
+        input_image_size=input_image_size,
+        top_k=top_k) for view in range(num_views)]
+    missing_views = [view for view, file_stem in enumerate(file_stems) if not TeacherLogitsCache.exists(file_stem)]
+    if missing_views:
+        teacher_net = prepare_model(
+            model_name=teacher_name,
+            use_pretrained=True,
+            pretrained_model_file_path='',
+            use_cuda=use_cuda)
+        teacher_net.eval()
+        for view in missing_views:
+            logging.info('Calculating teacher logits for augmentation view {}'.format(view))
+            calc_teacher_cache(
+                teacher_net=teacher_net,
+                dataset=dataset,
+                view=view,
+                file_stem=file_stems[view],
+                batch_size=batch_size,
+                num_workers=num_workers,
+                top_k=top_k,
+                use_cuda=use_cuda)
+        del teacher_net
+    return [TeacherLogitsCache(file_stem) for file_stem in file_stems]
+
+
+def distillation_loss(output,
+                      target,
+                      soft_targets,
+                      temperature,
+                      alpha):
+    """
+    Knowledge distillation loss: a mix of cross-entropy with softened teacher probabilities and the ground truth loss.
+
+    Parameters:
+    ----------
+    output : Tensor
+        Student logits.
+    target : Tensor
+        Ground truth labels.
+    soft_targets : Tensor
+        Teacher probabilities (at the given temperature).
+    temperature : float
+        Distillation temperature.
+    alpha : float
+        Weight of the distillation loss.
+
+    Returns
+    -------
+    Tensor
+        Loss value.
+    """
+    kd_loss = -(soft_targets * F.log_softmax(output / temperature, dim=1)).sum(dim=1).mean()
+    kd_loss = kd_loss * (temperature * temperature)
+    if alpha == 1.0:
+        return kd_loss
+    return alpha * kd_loss + (1.0 - alpha) * F.cross_entropy(output, target)
@@ -0,0 +1,34 @@
+"""
+    Inference graph rewrite, that folds batch normalization parts of IBN blocks into preceding convolutions.
+"""
+
+__all__ = ['fold_ibn']
+
+import torch
+from .pytorchcv.models.common import IBN
+from .pytorchcv.models.ibnresnet import IBNConvBlock
+
+
+def fold_ibn(net):
+    """
+    Fold batch normalization parts of IBN blocks into preceding convolutions (in place). Only IBN blocks, that directly
+    follow a convolution (as in IBN-ResNet/IBN-ResNeXt), are folded; pre-activation IBN blocks (as in IBN-DenseNet) are
+    left intact.
+
+    Parameters:
+    ----------
+    net : nn.Module
+        Model (in evaluation mode).
+
+    Returns
+    -------
+    nn.Module
+        The same model with folded IBN blocks.
+    """
+    assert (not net.training), "IBN folding is only valid in evaluation mode"
+    with torch.no_grad():
+        for module in net.modules():
+            if isinstance(module, IBNConvBlock) and module.use_ibn and isinstance(module.ibn, IBN) and\
+                    not module.ibn.bn_folded:
+                module.ibn.fold_batch_norm(module.conv)
+    return net
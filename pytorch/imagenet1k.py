@@ -1,11 +1,17 @@
 import math
 import os
+import random
 
 import torch.utils.data
 import torchvision.transforms as transforms
 import torchvision.datasets as datasets
 
-__all__ = ['add_dataset_parser_arguments', 'get_train_data_loader', 'get_val_data_loader']
+from common.val_cache import ValCache
+from common.teacher_cache import get_sample_seed, split_sample_key, ViewSampler
+from common.iter_checkpoint import ResumableRandomSampler
+
+__all__ = ['add_dataset_parser_arguments', 'get_train_transform', 'ReproducibleAugDataset', 'get_train_data_loader',
+           'get_val_data_loader', 'ValCacheDataLoader']
 
 
 def add_dataset_parser_arguments(parser):
@@ -38,33 +44,108 @@ def add_dataset_parser_arguments(parser):
         help='number of input channels')
 
 
-def get_train_data_loader(data_dir,
-                          batch_size,
-                          num_workers,
-                          input_image_size=224):
+def get_train_transform(input_image_size=224):
     mean_rgb = (0.485, 0.456, 0.406)
     std_rgb = (0.229, 0.224, 0.225)
     jitter_param = 0.4
 
-    train_loader = torch.utils.data.DataLoader(
-        dataset=datasets.ImageFolder(
+    return transforms.Compose([
+        transforms.RandomResizedCrop(input_image_size),
+        transforms.RandomHorizontalFlip(),
+        transforms.ColorJitter(
+            brightness=jitter_param,
+            contrast=jitter_param,
+            saturation=jitter_param),
+        transforms.ToTensor(),
+        transforms.Normalize(
+            mean=mean_rgb,
+            std=std_rgb),
+    ])
+
+
+class ReproducibleAugDataset(torch.utils.data.Dataset):
+    """
+    Dataset wrapper with reproducible random transforms: random generators are seeded with a value derived from the
+    augmentation seed, the augmentation view and the sample index. Samples are addressed by keys of `ViewSampler`
+    (`view * len(dataset) + index`) and returned together with their indices.
+
+    Parameters:
+    ----------
+    dataset : Dataset
+        Base dataset (without transforms).
+    transform : function
+        Random transform of samples.
+    aug_seed : int
+        Augmentation seed.
+    """
+    def __init__(self,
+                 dataset,
+                 transform,
+                 aug_seed):
+        super(ReproducibleAugDataset, self).__init__()
+        self.dataset = dataset
+        self.transform = transform
+        self.aug_seed = aug_seed
+
+    def __len__(self):
+        return len(self.dataset)
+
+    def __getitem__(self, key):
+        view, index = split_sample_key(key, len(self.dataset))
+        img, target = self.dataset[index]
+        seed = get_sample_seed(self.aug_seed, view, index)
+        random_state = random.getstate()
+        with torch.random.fork_rng(devices=[]):
+            torch.manual_seed(seed)
+            random.seed(seed)
+            img = self.transform(img)
+        random.setstate(random_state)
+        return img, target, index
+
+
+def get_train_data_loader(data_dir,
+                          batch_size,
+                          num_workers,
+                          input_image_size=224,
+                          seed=0,
+                          aug_seed=None):
+    """
+    Create training data loader. If `aug_seed` is specified, the augmentation is reproducible, batches include sample
+    indices and the augmentation view is selected by the `view` attribute of the loader's sampler. Samples are shuffled
+    by the `resumable_sampler` attribute of the loader (`ResumableRandomSampler`).
+    """
+    transform_train = get_train_transform(input_image_size)
+
+    if aug_seed is not None:
+        dataset = ReproducibleAugDataset(
+            dataset=datasets.ImageFolder(root=os.path.join(data_dir, 'train')),
+            transform=transform_train,
+            aug_seed=aug_seed)
+        sampler = ResumableRandomSampler(
+            length=len(dataset),
+            seed=seed)
+        train_loader = torch.utils.data.DataLoader(
+            dataset=dataset,
+            batch_size=batch_size,
+            sampler=ViewSampler(
+                sampler=sampler,
+                num_samples=len(dataset)),
+            num_workers=num_workers,
+            pin_memory=True)
+    else:
+        dataset = datasets.ImageFolder(
             root=os.path.join(data_dir, 'train'),
-            transform=transforms.Compose([
-                transforms.RandomResizedCrop(input_image_size),
-                transforms.RandomHorizontalFlip(),
-                transforms.ColorJitter(
-                    brightness=jitter_param,
-                    contrast=jitter_param,
-                    saturation=jitter_param),
-                transforms.ToTensor(),
-                transforms.Normalize(
-                    mean=mean_rgb,
-                    std=std_rgb),
-            ])),
-        batch_size=batch_size,
-        shuffle=True,
-        num_workers=num_workers,
-        pin_memory=True)
+            transform=transform_train)
+        sampler = ResumableRandomSampler(
+            length=len(dataset),
+            seed=seed)
+        train_loader = torch.utils.data.DataLoader(
+            dataset=dataset,
+            batch_size=batch_size,
+            sampler=sampler,
+            num_workers=num_workers,
+            pin_memory=True)
+    train_loader.resumable_sampler = sampler
 
     return train_loader
 
@@ -97,3 +178,40 @@ def get_val_data_loader(data_dir,
         pin_memory=True)
 
     return val_loader
+
+
+class ValCacheDataLoader(object):
+    """
+    Validation data loader over preprocessed validation set cache (see `common.val_cache`).
+
+    Parameters:
+    ----------
+    file_stem : str
+        Path stem for cache files.
+    batch_size : int
+        Batch size.
+    mean_rgb : tuple of 3 float
+        Mean of RGB channels for normalization.
+    std_rgb : tuple of 3 float
+        STD of RGB channels for normalization.
+    """
+    def __init__(self,
+                 file_stem,
+                 batch_size,
+                 mean_rgb=(0.485, 0.456, 0.406),
+                 std_rgb=(0.229, 0.224, 0.225)):
+        super(ValCacheDataLoader, self).__init__()
+        self.cache = ValCache(
+            file_stem=file_stem,
+            batch_size=batch_size)
+        self.mean = torch.tensor(mean_rgb).mul_(255.0).view(1, 3, 1, 1)
+        self.std = torch.tensor(std_rgb).mul_(255.0).view(1, 3, 1, 1)
+
+    def __len__(self):
+        return len(self.cache)
+
+    def __iter__(self):
+        for data, labels in self.cache:
+            data = torch.from_numpy(data).float().sub_(self.mean).div_(self.std)
+            target = torch.from_numpy(labels).long()
+            yield data, target
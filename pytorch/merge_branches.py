@@ -0,0 +1,373 @@
+"""
+    Inference graph rewrite, that merges sibling convolution branches (which consume the same input and whose outputs
+    are concatenated) into a single wider convolution.
+"""
+
+__all__ = ['merge_branches', 'MergedConv', 'MergedConcurrent', 'MergedUnit']
+
+import torch
+import torch.nn as nn
+from .pytorchcv.models.common import Concurrent, Identity
+
+# Classes of convolution units with `conv` -> `bn` (optional) -> `activ` (optional) forward scheme:
+CONV_UNIT_CLASS_NAMES = ('ConvBlock', 'InceptConv', 'FireConv')
+
+# Attributes of branch blocks, which hold the first module applied to the branch input:
+BRANCH_HEAD_ATTRS = {
+    'Conv1x1Branch': 'conv',
+    'Conv3x3Branch': 'conv',
+    'ConvSeqBranch': 'conv_list',
+    'Inception3x3Branch': 'conv1',
+    'InceptionDouble3x3Branch': 'conv1',
+}
+
+# Units with hard-coded sibling convolutions (pre-module attribute, sibling unit attributes, residual flag attribute):
+SIBLING_UNITS = {
+    'FireUnit': ('squeeze', ('expand1x1', 'expand3x3'), 'residual'),
+    'ConvSeq3x3Branch': ('conv_list', ('conv1x3', 'conv3x1'), None),
+}
+
+
+class MergedConv(nn.Module):
+    """
+    Merged convolution block (convolution with folded batch normalization and activation).
+
+    Parameters:
+    ----------
+    conv : nn.Conv2d
+        Convolution layer.
+    activ : nn.Module or None
+        Activation layer.
+    """
+    def __init__(self,
+                 conv,
+                 activ):
+        super(MergedConv, self).__init__()
+        self.conv = conv
+        self.activ = activ
+
+    def forward(self, x):
+        x = self.conv(x)
+        if self.activ is not None:
+            x = self.activ(x)
+        return x
+
+
+class MergedConcurrent(nn.Module):
+    """
+    A replacement for `Concurrent` container with merged convolution heads of branches. If the merged convolution
+    covers all branches in order, its output is returned as is (without concatenation).
+
+    Parameters:
+    ----------
+    heads : list of MergedConv
+        Merged convolution heads.
+    branches : list of nn.Module
+        Branch tails (for merged branches) or whole branches (for other ones).
+    specs : list of tuple of 3 int
+        Head index (or -1 for a branch, that isn't merged), first channel and number of channels in head output for
+        each branch.
+    axis : int, default 1
+        The axis on which to concatenate the outputs.
+    """
+    def __init__(self,
+                 heads,
+                 branches,
+                 specs,
+                 axis=1):
+        super(MergedConcurrent, self).__init__()
+        assert (len(branches) == len(specs))
+        self.heads = nn.ModuleList(heads)
+        self.branches = nn.ModuleList(branches)
+        self.specs = specs
+        self.axis = axis
+        self.direct = (len(heads) == 1) and all([(s[0] == 0) and isinstance(b, Identity) for s, b in
+                                                 zip(specs, branches)])
+
+    def forward(self, x):
+        ys = [head(x) for head in self.heads]
+        if self.direct:
+            return ys[0]
+        out = []
+        for branch, (head_ind, start, length) in zip(self.branches, self.specs):
+            if head_ind < 0:
+                out.append(branch(x))
+            else:
+                out.append(branch(ys[head_ind].narrow(self.axis, start, length)))
+        out = torch.cat(tuple(out), dim=self.axis)
+        return out
+
+
+class MergedUnit(nn.Module):
+    """
+    A replacement for units with hard-coded sibling convolutions (like SqueezeNet 'Fire' unit).
+
+    Parameters:
+    ----------
+    body : nn.Module
+        Unit body.
+    residual : bool, default False
+        Whether use residual connection.
+    """
+    def __init__(self,
+                 body,
+                 residual=False):
+        super(MergedUnit, self).__init__()
+        self.residual = residual
+        self.body = body
+
+    def forward(self, x):
+        out = self.body(x)
+        if self.residual:
+            out = out + x
+        return out
+
+
+def _pair(x):
+    return tuple(x) if isinstance(x, (tuple, list)) else (x, x)
+
+
+def _is_conv_unit(module):
+    return (type(module).__name__ in CONV_UNIT_CLASS_NAMES) and isinstance(getattr(module, 'conv', None), nn.Conv2d)
+
+
+def _get_conv_unit_activ(module):
+    if not getattr(module, 'activate', True):
+        return None
+    return getattr(module, 'activ', None)
+
+
+def _get_merge_key(module,
+                   pad_kernels):
+    """
+    Get a key of a convolution unit, such that units with equal keys can be merged (or None if unit can't be merged).
+    """
+    conv = module.conv
+    if (conv.groups != 1) or (getattr(conv, 'padding_mode', 'zeros') != 'zeros') or isinstance(conv.padding, str):
+        return None
+    bn = getattr(module, 'bn', None)
+    if (bn is not None) and (not isinstance(bn, nn.BatchNorm2d) or not bn.track_running_stats):
+        return None
+    activ = _get_conv_unit_activ(module)
+    if (activ is not None) and (len(list(activ.parameters())) > 0):
+        return None
+    kernel_size = _pair(conv.kernel_size)
+    padding = _pair(conv.padding)
+    dilation = _pair(conv.dilation)
+    # Relative position of the kernel center to the padded input border:
+    offset = tuple(2 * p - d * (k - 1) for k, p, d in zip(kernel_size, padding, dilation))
+    key = (_pair(conv.stride), dilation, offset, type(activ).__name__, conv.in_channels)
+    if not pad_kernels:
+        key += (kernel_size,)
+    return key
+
+
+def _fold_conv_unit(module):
+    """
+    Get weight and bias of the convolution with folded batch normalization.
+    """
+    conv = module.conv
+    weight = conv.weight.detach()
+    bias = conv.bias.detach() if conv.bias is not None else torch.zeros_like(weight[:, 0, 0, 0])
+    bn = getattr(module, 'bn', None)
+    if bn is not None:
+        std = torch.sqrt(bn.running_var.detach() + bn.eps)
+        gamma = bn.weight.detach() if bn.affine else torch.ones_like(std)
+        beta = bn.bias.detach() if bn.affine else torch.zeros_like(std)
+        scale = gamma / std
+        weight = weight * scale.view(-1, 1, 1, 1)
+        bias = (bias - bn.running_mean.detach()) * scale + beta
+    return weight, bias
+
+
+def _merge_conv_units(modules):
+    """
+    Merge convolution units (with equal merge keys) into a single convolution by zero-padding of kernels.
+    """
+    convs = [m.conv for m in modules]
+    dilation = _pair(convs[0].dilation)
+    kernel_sizes = [_pair(c.kernel_size) for c in convs]
+    kernel_size = tuple(max(k[i] for k in kernel_sizes) for i in range(2))
+    if any([(kernel_size[i] - k[i]) % 2 != 0 for k in kernel_sizes for i in range(2)]):
+        return None
+    k0, p0 = kernel_sizes[0], _pair(convs[0].padding)
+    padding = tuple(p0[i] + dilation[i] * (kernel_size[i] - k0[i]) // 2 for i in range(2))
+
+    weights = []
+    biases = []
+    for module, k in zip(modules, kernel_sizes):
+        weight, bias = _fold_conv_unit(module)
+        pad_h = (kernel_size[0] - k[0]) // 2
+        pad_w = (kernel_size[1] - k[1]) // 2
+        weights.append(nn.functional.pad(weight, (pad_w, pad_w, pad_h, pad_h)))
+        biases.append(bias)
+    weight = torch.cat(weights, dim=0)
+
+    conv = nn.Conv2d(
+        in_channels=convs[0].in_channels,
+        out_channels=weight.shape[0],
+        kernel_size=kernel_size,
+        stride=convs[0].stride,
+        padding=padding,
+        dilation=dilation,
+        bias=True).to(device=weight.device, dtype=weight.dtype)
+    conv.weight.data.copy_(weight)
+    conv.bias.data.copy_(torch.cat(biases, dim=0))
+    return MergedConv(
+        conv=conv,
+        activ=_get_conv_unit_activ(modules[0]))
+
+
+def _find_branch_head(branch):
+    """
+    Find the convolution unit, that is applied first to the branch input.
+
+    Returns
+    -------
+    tuple of 2 elements
+        Parent module (or None if the branch is the unit itself) and the attribute name of the unit.
+    """
+    parent = None
+    name = None
+    module = branch
+    while not _is_conv_unit(module):
+        if type(module) is nn.Sequential:
+            if len(module._modules) == 0:
+                return None
+            name = next(iter(module._modules.keys()))
+        elif type(module).__name__ in BRANCH_HEAD_ATTRS:
+            name = BRANCH_HEAD_ATTRS[type(module).__name__]
+        elif isinstance(module, MergedUnit) and not module.residual:
+            name = 'body'
+        else:
+            return None
+        parent = module
+        module = getattr(module, name)
+    return parent, name
+
+
+def _is_identity(module):
+    return all([isinstance(m, (Identity, nn.Sequential)) or (type(m).__name__ in BRANCH_HEAD_ATTRS)
+                for m in module.modules()]) and (len(list(module.parameters())) == 0)
+
+
+def _merge_concurrent(module,
+                      pad_kernels):
+    """
+    Merge heads of `Concurrent` container branches.
+
+    Returns
+    -------
+    nn.Module or None
+        Merged container (or None if there is nothing to merge).
+    """
+    branches = list(module._modules.values())
+    heads = [_find_branch_head(b) for b in branches]
+    head_modules = [(getattr(h[0], h[1]) if h[0] is not None else b) if h is not None else None
+                    for b, h in zip(branches, heads)]
+    keys = [_get_merge_key(m, pad_kernels) if m is not None else None for m in head_modules]
+
+    groups = []
+    for key in set([k for k in keys if k is not None]):
+        inds = [i for i, k in enumerate(keys) if k == key]
+        if len(inds) > 1:
+            groups.append(inds)
+    groups = sorted(groups)
+    if len(groups) == 0:
+        return None
+
+    merged_heads = []
+    new_branches = list(branches)
+    specs = [(-1, 0, 0)] * len(branches)
+    for inds in groups:
+        merged_head = _merge_conv_units([head_modules[i] for i in inds])
+        if merged_head is None:
+            continue
+        start = 0
+        for i in inds:
+            length = head_modules[i].conv.out_channels
+            specs[i] = (len(merged_heads), start, length)
+            start += length
+            parent, name = heads[i]
+            if parent is None:
+                new_branches[i] = Identity()
+            else:
+                setattr(parent, name, Identity())
+                if _is_identity(branches[i]):
+                    new_branches[i] = Identity()
+        merged_heads.append(merged_head)
+    if len(merged_heads) == 0:
+        return None
+
+    return MergedConcurrent(
+        heads=merged_heads,
+        branches=new_branches,
+        specs=specs,
+        axis=module.axis)
+
+
+def _merge_sibling_unit(module,
+                        pad_kernels):
+    """
+    Merge hard-coded sibling convolutions of a unit.
+
+    Returns
+    -------
+    nn.Module or None
+        Merged unit (or None if there is nothing to merge).
+    """
+    pre_name, sibling_names, residual_name = SIBLING_UNITS[type(module).__name__]
+    siblings = [getattr(module, name) for name in sibling_names]
+    if not all([_is_conv_unit(m) for m in siblings]):
+        return None
+    keys = [_get_merge_key(m, pad_kernels) for m in siblings]
+    if (keys[0] is None) or any([k != keys[0] for k in keys]):
+        return None
+    merged_head = _merge_conv_units(siblings)
+    if merged_head is None:
+        return None
+    return MergedUnit(
+        body=nn.Sequential(getattr(module, pre_name), merged_head),
+        residual=(getattr(module, residual_name) if residual_name is not None else False))
+
+
+def _merge_module(module,
+                  pad_kernels):
+    for name, child in list(module._modules.items()):
+        if child is None:
+            continue
+        _merge_module(child, pad_kernels)
+        merged = None
+        if type(child).__name__ in SIBLING_UNITS:
+            merged = _merge_sibling_unit(child, pad_kernels)
+        elif type(child) is Concurrent:
+            merged = _merge_concurrent(child, pad_kernels)
+        if merged is not None:
+            setattr(module, name, merged)
+
+
+def merge_branches(net,
+                   pad_kernels=True):
+    """
+    Merge sibling convolution branches of a model for inference (in place). Convolutions of `Concurrent` branch heads
+    and of hard-coded sibling units (like SqueezeNet 'Fire' unit), that consume the same input, are replaced by a
+    single wider convolution with folded batch normalization. Kernels of different sizes are zero-padded to the
+    largest one (e.g. 1x1 and 3x3 kernels are merged into a 3x3 one), which saves kernel launches at the cost of extra
+    FLOPs, so it pays off mainly on GPU with small batches.
+
+    Parameters:
+    ----------
+    net : nn.Module
+        Model (in evaluation mode).
+    pad_kernels : bool, default True
+        Whether to merge convolutions with different kernel sizes.
+
+    Returns
+    -------
+    nn.Module
+        The same model with merged branches.
+    """
+    assert (not net.training), "Branch merging is only valid in evaluation mode"
+    with torch.no_grad():
+        _merge_module(net, pad_kernels)
+    return net
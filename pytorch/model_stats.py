@@ -1,3 +1,4 @@
+import time
 import logging
 import numpy as np
 import torch
@@ -5,8 +6,9 @@ import torch.nn as nn
 from torch.autograd import Variable
 from .pytorchcv.models.common import ChannelShuffle, ChannelShuffle2, Identity
 from .pytorchcv.models.fishnet import InterpolationBlock, ChannelSqueeze
+from .pytorchcv.models.dpn import TestTimeAvgPool2D
 
-__all__ = ['measure_model']
+__all__ = ['measure_model', 'measure_latency']
 
 
 def calc_block_num_params2(net):
@@ -106,10 +108,12 @@ def measure_model(model,
         elif isinstance(module, nn.BatchNorm1d):
             extra_num_flops = 4 * x[0].numel()
             extra_num_macs = 0
-        elif type(module) in [nn.MaxPool2d, nn.AvgPool2d]:
+        elif type(module) in [nn.MaxPool2d, nn.AvgPool2d, TestTimeAvgPool2D]:
             assert (x[0].shape[1] == y.shape[1])
             kernel_size = module.kernel_size if isinstance(module.kernel_size, tuple) else\
                 (module.kernel_size, module.kernel_size)
+            if isinstance(module, TestTimeAvgPool2D):
+                kernel_size = (min(kernel_size[0], x[0].shape[2]), min(kernel_size[1], x[0].shape[3]))
             y_h = y.shape[2]
             y_w = y.shape[3]
             channels = x[0].shape[1]
@@ -191,3 +195,49 @@ def measure_model(model,
     [h.remove() for h in hook_handles]
 
     return num_flops, num_macs, num_params1
+
+
+def measure_latency(model,
+                    in_channels,
+                    in_size,
+                    batch_size=1,
+                    num_iters=20,
+                    use_cuda=False):
+    """
+    Measure the average time of a forward pass on random data.
+
+    Parameters:
+    ----------
+    model : Module
+        Tested model.
+    in_channels : int
+        Number of input channels.
+    in_size : tuple of two ints
+        Spatial size of the input image.
+    batch_size : int, default 1
+        Batch size.
+    num_iters : int, default 20
+        Number of timed forward passes.
+    use_cuda : bool, default False
+        Whether to use CUDA.
+
+    Returns
+    -------
+    float
+        Time of a forward pass (in seconds).
+    """
+    x = torch.randn(batch_size, in_channels, in_size[0], in_size[1])
+    if use_cuda:
+        x = x.cuda()
+    model.eval()
+    with torch.no_grad():
+        for _ in range(3):
+            model(x)
+        if use_cuda:
+            torch.cuda.synchronize()
+        tic = time.time()
+        for _ in range(num_iters):
+            model(x)
+        if use_cuda:
+            torch.cuda.synchronize()
+    return (time.time() - tic) / num_iters
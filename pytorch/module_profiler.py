@@ -0,0 +1,87 @@
+"""
+    Per-module timing of a model forward pass by means of forward hooks (PyTorch).
+"""
+
+__all__ = ['attach_module_profiler', 'profile_model']
+
+import torch
+from common.module_profiler import ModuleProfiler
+
+
+def attach_module_profiler(model,
+                           profiler):
+    """
+    Register forward pre/post hooks, that report each module forward pass to the profiler.
+
+    Parameters:
+    ----------
+    model : nn.Module
+        Profiled model.
+    profiler : ModuleProfiler
+        Profiler.
+
+    Returns
+    -------
+    list of RemovableHandle
+        Hook handles (call `remove` on each of them to detach the profiler).
+    """
+    handles = []
+    for name, module in model.named_modules():
+        type_name = type(module).__name__
+        name = name if name else type_name
+
+        def pre_hook(module, input, name=name, type_name=type_name):
+            profiler.begin(name, type_name)
+
+        def hook(module, input, output):
+            profiler.end()
+
+        handles.append(module.register_forward_pre_hook(pre_hook))
+        handles.append(module.register_forward_hook(hook))
+    return handles
+
+
+def profile_model(model,
+                  in_channels,
+                  in_size,
+                  batch_size=1,
+                  num_batches=10,
+                  use_cuda=False):
+    """
+    Time the forward pass of each module on random batches.
+
+    Parameters:
+    ----------
+    model : nn.Module
+        Profiled model.
+    in_channels : int
+        Number of input channels.
+    in_size : tuple of two ints
+        Spatial size of the input image.
+    batch_size : int, default 1
+        Batch size.
+    num_batches : int, default 10
+        Number of profiled batches.
+    use_cuda : bool, default False
+        Whether to use CUDA.
+
+    Returns
+    -------
+    ModuleProfiler
+        Profiler with recorded events.
+    """
+    profiler = ModuleProfiler(sync_fn=(torch.cuda.synchronize if use_cuda else None))
+    handles = attach_module_profiler(model, profiler)
+    x = torch.randn(batch_size, in_channels, in_size[0], in_size[1])
+    if use_cuda:
+        x = x.cuda()
+    model.eval()
+    try:
+        with torch.no_grad():
+            profiler.run(
+                forward_fn=(lambda: model(x)),
+                num_batches=num_batches)
+    finally:
+        for handle in handles:
+            handle.remove()
+    return profiler
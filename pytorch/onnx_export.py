@@ -0,0 +1,60 @@
+"""
+    Export of a model to ONNX (PyTorch).
+"""
+
+__all__ = ['export_onnx']
+
+import os
+import inspect
+import torch
+
+
+def export_onnx(net,
+                file_path,
+                in_channels=3,
+                in_size=(224, 224),
+                dynamic_hw=False,
+                opset_version=13):
+    """
+    Export a network to an ONNX file with a dynamic batch axis (the model is traced, so it must be in eval mode).
+
+    Parameters:
+    ----------
+    net : nn.Module
+        Network.
+    file_path : str
+        Path to the ONNX file.
+    in_channels : int, default 3
+        Number of input channels.
+    in_size : tuple of two ints, default (224, 224)
+        Spatial size of the input image, used for tracing.
+    dynamic_hw : bool, default False
+        Whether to make the spatial axes of the input dynamic too.
+    opset_version : int, default 13
+        ONNX opset version.
+
+    Returns
+    -------
+    str
+        Path to the ONNX file.
+    """
+    dir_path = os.path.dirname(file_path)
+    if dir_path and not os.path.exists(dir_path):
+        os.makedirs(dir_path)
+    input_axes = {0: "batch", 2: "height", 3: "width"} if dynamic_hw else {0: "batch"}
+    net.eval()
+    x = torch.randn(1, in_channels, in_size[0], in_size[1])
+    # The tracing exporter is used (newer PyTorch versions default to the `torch.export` based one):
+    export_kwargs = {"dynamo": False} if "dynamo" in inspect.signature(torch.onnx.export).parameters else {}
+    with torch.no_grad():
+        torch.onnx.export(
+            net,
+            x,
+            file_path,
+            input_names=["data"],
+            output_names=["output"],
+            dynamic_axes={"data": input_axes, "output": {0: "batch"}},
+            opset_version=opset_version,
+            do_constant_folding=True,
+            **export_kwargs)
+    return file_path
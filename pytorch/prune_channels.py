@@ -0,0 +1,257 @@
+"""
+    Structured channel pruning for ResNet/MobileNet families. Channels are physically removed from layers, so that the
+    pruned model is a smaller dense model of the same class.
+"""
+
+__all__ = ['ChannelGroup', 'get_channel_groups', 'prune_channels', 'apply_channel_spec', 'save_channel_spec',
+           'load_channel_spec']
+
+import json
+import torch
+import torch.nn as nn
+from .pytorchcv.models.common import ConvBlock
+from .pytorchcv.models.resnet import ResNet, ResBlock, ResBottleneck
+from .pytorchcv.models.mobilenet import MobileNet, DwsConvBlock
+
+
+class ChannelGroup(object):
+    """
+    A set of channels, that must be pruned jointly: outputs of all producers (e.g. convolutions, which outputs are
+    summed in a residual stream), channels of all depthwise pass-through blocks and inputs of all consumers.
+
+    Parameters:
+    ----------
+    name : str
+        Group name (the name of the first producer).
+    producers : list of ConvBlock
+        Blocks producing channels of the group.
+    """
+    def __init__(self,
+                 name,
+                 producers):
+        super(ChannelGroup, self).__init__()
+        self.name = name
+        self.producers = list(producers)
+        self.pass_throughs = []
+        self.consumers = []
+
+    @property
+    def num_channels(self):
+        return self.producers[0].conv.out_channels
+
+    def calc_importance(self, criterion):
+        """
+        Calculate importance of channels of the group.
+
+        Parameters:
+        ----------
+        criterion : str
+            'bn' for the sum of BatchNorm gamma magnitudes over producers, 'l1' for the sum of L1 norms of consumer
+            weights.
+
+        Returns
+        -------
+        Tensor
+            Importance values (one for each channel).
+        """
+        importance = torch.zeros(self.num_channels)
+        if criterion == "bn":
+            for block in self.producers:
+                importance += block.bn.weight.detach().abs().cpu()
+        elif criterion == "l1":
+            for module in self.consumers:
+                weight = module.weight.detach().abs().cpu()
+                importance += weight.transpose(0, 1).reshape(self.num_channels, -1).sum(dim=1)
+        else:
+            raise ValueError("Unknown pruning criterion: {}".format(criterion))
+        return importance
+
+    def prune(self, indices):
+        """
+        Leave only the specified channels in all layers of the group (in place).
+
+        Parameters:
+        ----------
+        indices : Tensor
+            Sorted indices of kept channels.
+        """
+        for block in self.producers:
+            _prune_conv_block(block, indices)
+        for block in self.pass_throughs:
+            _prune_conv_block(block, indices)
+            block.conv.in_channels = len(indices)
+            block.conv.groups = len(indices)
+        for module in self.consumers:
+            module.weight.data = module.weight.data.index_select(1, indices.to(module.weight.device)).contiguous()
+            if isinstance(module, nn.Linear):
+                module.in_features = len(indices)
+            else:
+                module.in_channels = len(indices)
+
+
+def _prune_conv_block(block, indices):
+    """
+    Leave only the specified output channels of a convolution block (in place).
+    """
+    indices = indices.to(block.conv.weight.device)
+    conv = block.conv
+    conv.weight.data = conv.weight.data.index_select(0, indices).contiguous()
+    if conv.bias is not None:
+        conv.bias.data = conv.bias.data.index_select(0, indices).contiguous()
+    conv.out_channels = len(indices)
+    bn = block.bn
+    bn.weight.data = bn.weight.data.index_select(0, indices).contiguous()
+    bn.bias.data = bn.bias.data.index_select(0, indices).contiguous()
+    bn.running_mean.data = bn.running_mean.data.index_select(0, indices).contiguous()
+    bn.running_var.data = bn.running_var.data.index_select(0, indices).contiguous()
+    bn.num_features = len(indices)
+
+
+def _get_resnet_channel_groups(net):
+    groups = []
+    stream = ChannelGroup("features.init_block.conv", [net.features.init_block.conv])
+    for stage_name, stage in net.features.named_children():
+        if not stage_name.startswith("stage"):
+            continue
+        for unit_name, unit in stage.named_children():
+            body = unit.body
+            prefix = "features.{}.{}.".format(stage_name, unit_name)
+            stream.consumers.append(body.conv1.conv)
+            if isinstance(body, ResBottleneck):
+                last_block = body.conv3
+                body_blocks = [("body.conv1", body.conv1, body.conv2), ("body.conv2", body.conv2, body.conv3)]
+            else:
+                assert isinstance(body, ResBlock)
+                last_block = body.conv2
+                body_blocks = [("body.conv1", body.conv1, body.conv2)]
+            for name, producer, consumer in body_blocks:
+                group = ChannelGroup(prefix + name, [producer])
+                group.consumers.append(consumer.conv)
+                groups.append(group)
+            if unit.resize_identity:
+                stream.consumers.append(unit.identity_conv.conv)
+                groups.append(stream)
+                stream = ChannelGroup(prefix + "identity_conv", [unit.identity_conv, last_block])
+            else:
+                stream.producers.append(last_block)
+    stream.consumers.append(net.output)
+    groups.append(stream)
+    return groups
+
+
+def _get_mobilenet_channel_groups(net):
+    groups = []
+    stream = ChannelGroup("features.init_block", [net.features.init_block])
+    for stage_name, stage in net.features.named_children():
+        if not stage_name.startswith("stage"):
+            continue
+        for unit_name, unit in stage.named_children():
+            assert isinstance(unit, DwsConvBlock)
+            stream.pass_throughs.append(unit.dw_conv)
+            stream.consumers.append(unit.pw_conv.conv)
+            groups.append(stream)
+            stream = ChannelGroup("features.{}.{}.pw_conv".format(stage_name, unit_name), [unit.pw_conv])
+    stream.consumers.append(net.output)
+    groups.append(stream)
+    return groups
+
+
+def get_channel_groups(net):
+    """
+    Get groups of jointly prunable channels of a network.
+
+    Parameters:
+    ----------
+    net : nn.Module
+        Network (ResNet or MobileNet/FD-MobileNet).
+
+    Returns
+    -------
+    list of ChannelGroup
+        Channel groups.
+    """
+    if isinstance(net, ResNet):
+        groups = _get_resnet_channel_groups(net)
+    elif isinstance(net, MobileNet):
+        groups = _get_mobilenet_channel_groups(net)
+    else:
+        raise ValueError("Channel pruning isn't supported for {}".format(type(net).__name__))
+    for group in groups:
+        assert all(isinstance(block, ConvBlock) for block in group.producers)
+        assert all((not isinstance(module, nn.Conv2d)) or (module.groups == 1) for module in group.consumers)
+    return groups
+
+
+def prune_channels(net,
+                   ratio,
+                   criterion="bn",
+                   prune_residual=True,
+                   divisor=8):
+    """
+    Prune the least important channels of a network (in place).
+
+    Parameters:
+    ----------
+    net : nn.Module
+        Network (ResNet or MobileNet/FD-MobileNet).
+    ratio : float
+        Fraction of channels to remove in each group.
+    criterion : str, default 'bn'
+        Channel importance criterion: 'bn' for BatchNorm gamma magnitude, 'l1' for L1 norm of the following layer
+        weights.
+    prune_residual : bool, default True
+        Whether to prune channels of residual streams (shared by several units of a stage).
+    divisor : int, default 8
+        Numbers of kept channels are rounded to multiples of this value.
+
+    Returns
+    -------
+    dict of str to int
+        Numbers of kept channels for groups (a channel specification for `apply_channel_spec`).
+    """
+    assert (0.0 <= ratio < 1.0)
+    channel_spec = {}
+    for group in get_channel_groups(net):
+        num_channels = group.num_channels
+        num_kept = num_channels
+        if prune_residual or (len(group.producers) == 1):
+            num_kept = int(round(num_channels * (1.0 - ratio) / divisor)) * divisor
+            num_kept = min(max(num_kept, divisor), num_channels)
+        if num_kept < num_channels:
+            importance = group.calc_importance(criterion)
+            indices = importance.topk(num_kept)[1].sort()[0]
+            group.prune(indices)
+        channel_spec[group.name] = num_kept
+    return channel_spec
+
+
+def apply_channel_spec(net,
+                       channel_spec):
+    """
+    Shrink a network according to a channel specification (in place), keeping the first channels of each group. It is
+    used to rebuild the architecture of a pruned model before loading its parameters.
+
+    Parameters:
+    ----------
+    net : nn.Module
+        Network (ResNet or MobileNet/FD-MobileNet).
+    channel_spec : dict of str to int
+        Numbers of kept channels for groups.
+    """
+    groups = get_channel_groups(net)
+    assert (set(channel_spec.keys()) == set(group.name for group in groups))
+    for group in groups:
+        num_kept = channel_spec[group.name]
+        if num_kept < group.num_channels:
+            group.prune(torch.arange(num_kept))
+
+
+def save_channel_spec(channel_spec,
+                      file_path):
+    with open(file_path, "w") as f:
+        json.dump(channel_spec, f, indent=2, sort_keys=True)
+
+
+def load_channel_spec(file_path):
+    with open(file_path, "r") as f:
+        return json.load(f)
@@ -60,7 +60,7 @@ class AirBlock(nn.Module):
         x = self.conv2(x)
         x = F.interpolate(
             input=x,
-            scale_factor=2,
+            scale_factor=2.0,
             mode="bilinear",
             align_corners=True)
         x = self.conv3(x)
@@ -83,6 +83,8 @@ class AirBottleneck(nn.Module):
     ratio: int
         Air compression ratio.
     """
+    __constants__ = ["use_air_block"]
+
     def __init__(self,
                  in_channels,
                  out_channels,
@@ -135,6 +137,8 @@ class AirUnit(nn.Module):
     ratio: int
         Air compression ratio.
     """
+    __constants__ = ["resize_identity"]
+
     def __init__(self,
                  in_channels,
                  out_channels,
@@ -254,9 +258,7 @@ class AirNet(nn.Module):
                     ratio=ratio))
                 in_channels = out_channels
             self.features.add_module("stage{}".format(i + 1), stage)
-        self.features.add_module("final_pool", nn.AvgPool2d(
-            kernel_size=7,
-            stride=1))
+        self.features.add_module("final_pool", nn.AdaptiveAvgPool2d(output_size=1))
 
         self.output = nn.Linear(
             in_features=in_channels,
@@ -33,6 +33,8 @@ class AirNeXtBottleneck(nn.Module):
     ratio: int
         Air compression ratio.
     """
+    __constants__ = ["use_air_block"]
+
     def __init__(self,
                  in_channels,
                  out_channels,
@@ -95,6 +97,8 @@ class AirNeXtUnit(nn.Module):
     ratio: int
         Air compression ratio.
     """
+    __constants__ = ["resize_identity"]
+
     def __init__(self,
                  in_channels,
                  out_channels,
@@ -186,9 +190,7 @@ class AirNeXt(nn.Module):
                     ratio=ratio))
                 in_channels = out_channels
             self.features.add_module("stage{}".format(i + 1), stage)
-        self.features.add_module("final_pool", nn.AvgPool2d(
-            kernel_size=7,
-            stride=1))
+        self.features.add_module("final_pool", nn.AdaptiveAvgPool2d(output_size=1))
 
         self.output = nn.Linear(
             in_features=in_channels,
@@ -175,6 +175,8 @@ class BamResUnit(nn.Module):
     bottleneck : bool
         Whether to use a bottleneck or simple block in units.
     """
+    __constants__ = ["use_bam"]
+
     def __init__(self,
                  in_channels,
                  out_channels,
@@ -245,9 +247,7 @@ class BamResNet(nn.Module):
                     bottleneck=bottleneck))
                 in_channels = out_channels
             self.features.add_module("stage{}".format(i + 1), stage)
-        self.features.add_module('final_pool', nn.AvgPool2d(
-            kernel_size=7,
-            stride=1))
+        self.features.add_module('final_pool', nn.AdaptiveAvgPool2d(output_size=1))
 
         self.output = nn.Linear(
             in_features=in_channels,
@@ -67,6 +67,8 @@ class ChannetConv(nn.Module):
     activate : bool, default True
         Whether activate the convolution block.
     """
+    __constants__ = ["use_dropout", "activate"]
+
     def __init__(self,
                  in_channels,
                  out_channels,
@@ -279,6 +281,8 @@ class ChannelwiseConv2d(nn.Module):
     dropout_rate : float
         Dropout rate.
     """
+    __constants__ = ["use_dropout"]
+
     def __init__(self,
                  groups,
                  dropout_rate):
@@ -364,6 +368,8 @@ class ChannetUnit(nn.Module):
     merge_type : str
         Type of sub-block output merging.
     """
+    __constants__ = ["merge_type"]
+
     def __init__(self,
                  in_channels,
                  out_channels_list,
@@ -412,14 +418,14 @@ class ChannetUnit(nn.Module):
 
     def forward(self, x):
         x_outs = []
-        for block in self.blocks._modules.values():
+        for block in self.blocks:
             x = block(x)
             x_outs.append(x)
         if self.merge_type == "add":
             for i in range(len(x_outs) - 1):
                 x = x + x_outs[i]
         elif self.merge_type == "cat":
-            x = torch.cat(tuple(x_outs), dim=1)
+            x = torch.cat(x_outs, dim=1)
         return x
 
 
@@ -482,9 +488,7 @@ class ChannelNet(nn.Module):
                 else:
                     in_channels = out_channels[-1]
             self.features.add_module("stage{}".format(i + 1), stage)
-        self.features.add_module('final_pool', nn.AvgPool2d(
-            kernel_size=7,
-            stride=1))
+        self.features.add_module('final_pool', nn.AdaptiveAvgPool2d(output_size=1))
 
         self.output = nn.Linear(
             in_features=in_channels,
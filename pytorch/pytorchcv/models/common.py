@@ -5,10 +5,14 @@
 __all__ = ['conv1x1', 'conv3x3', 'depthwise_conv3x3', 'ConvBlock', 'conv1x1_block', 'conv3x3_block', 'conv7x7_block',
            'dwconv3x3_block', 'PreConvBlock', 'pre_conv1x1_block', 'pre_conv3x3_block', 'ChannelShuffle',
            'ChannelShuffle2', 'SEBlock', 'IBN', 'Identity', 'DualPathSequential', 'Concurrent', 'ParametricSequential',
-           'ParametricConcurrent', 'Hourglass', 'SesquialteralHourglass']
+           'ParametricConcurrent', 'DenseSequential', 'Hourglass', 'SesquialteralHourglass', 'BranchExecutor',
+           'run_branches', 'set_branch_executor']
 
 import math
+import threading
+from typing import Optional
 from inspect import isfunction
+from functools import partial
 import torch
 import torch.nn as nn
 
@@ -126,6 +130,7 @@ class ConvBlock(nn.Module):
     activate : bool, default True
         Whether activate the convolution block.
     """
+    __constants__ = ["activate"]
 
     def __init__(self,
                  in_channels,
@@ -366,6 +371,8 @@ class PreConvBlock(nn.Module):
     activate : bool, default True
         Whether activate the convolution block.
     """
+    __constants__ = ["return_preact", "activate"]
+
     def __init__(self,
                  in_channels,
                  out_channels,
@@ -396,8 +403,7 @@ class PreConvBlock(nn.Module):
         x = self.bn(x)
         if self.activate:
             x = self.activ(x)
-        if self.return_preact:
-            x_pre_activ = x
+        x_pre_activ = x
         x = self.conv(x)
         if self.return_preact:
             return x, x_pre_activ
@@ -480,6 +486,7 @@ def pre_conv3x3_block(in_channels,
 
 def channel_shuffle(x,
                     groups):
+    # type: (torch.Tensor, int) -> torch.Tensor
     """
     Channel shuffle operation from 'ShuffleNet: An Extremely Efficient Convolutional Neural Network for Mobile Devices,'
     https://arxiv.org/abs/1707.01083.
@@ -507,7 +514,8 @@ def channel_shuffle(x,
 
 class ChannelShuffle(nn.Module):
     """
-    Channel shuffle layer. This is a wrapper over the same operation. It is designed to save the number of groups.
+    Channel shuffle layer. It is designed to save the number of groups. The shuffle is computed as a gather with a
+    constant channel permutation (exported to ONNX as a single Gather node, without a subgraph for dynamic shapes).
 
     Parameters:
     ----------
@@ -524,13 +532,15 @@ class ChannelShuffle(nn.Module):
         if channels % groups != 0:
             raise ValueError('channels must be divisible by groups')
         self.groups = groups
+        self.register_buffer("perm", torch.arange(channels).view(groups, -1).t().flatten(), persistent=False)
 
     def forward(self, x):
-        return channel_shuffle(x, self.groups)
+        return x.index_select(dim=1, index=self.perm)
 
 
 def channel_shuffle2(x,
                      groups):
+    # type: (torch.Tensor, int) -> torch.Tensor
     """
     Channel shuffle operation from 'ShuffleNet: An Extremely Efficient Convolutional Neural Network for Mobile Devices,'
     https://arxiv.org/abs/1707.01083. The alternative version.
@@ -558,8 +568,8 @@ def channel_shuffle2(x,
 
 class ChannelShuffle2(nn.Module):
     """
-    Channel shuffle layer. This is a wrapper over the same operation. It is designed to save the number of groups.
-    The alternative version.
+    Channel shuffle layer. It is designed to save the number of groups. The shuffle is computed as a gather with a
+    constant channel permutation (see `ChannelShuffle`). The alternative version.
 
     Parameters:
     ----------
@@ -576,9 +586,10 @@ class ChannelShuffle2(nn.Module):
         if channels % groups != 0:
             raise ValueError('channels must be divisible by groups')
         self.groups = groups
+        self.register_buffer("perm", torch.arange(channels).view(-1, groups).t().flatten(), persistent=False)
 
     def forward(self, x):
-        return channel_shuffle2(x, self.groups)
+        return x.index_select(dim=1, index=self.perm)
 
 
 class SEBlock(nn.Module):
@@ -624,6 +635,9 @@ class IBN(nn.Module):
     """
     Instance-Batch Normalization block from 'Two at Once: Enhancing Learning and Generalization Capacities via IBN-Net,'
     https://arxiv.org/abs/1807.09441.
+    Both normalizations are expressed as per-sample/per-channel affine transforms, so that the whole block is computed
+    as a single multiply-add into one output tensor (without splitting and concatenation copies). A traced block (e.g.
+    exported to ONNX) is split into native instance and batch normalizations instead.
 
     Parameters:
     ----------
@@ -643,6 +657,7 @@ class IBN(nn.Module):
         h1_channels = int(math.floor(channels * first_fraction))
         h2_channels = channels - h1_channels
         self.split_sections = [h1_channels, h2_channels]
+        self.bn_folded = False
 
         if self.inst_first:
             self.inst_norm = nn.InstanceNorm2d(
@@ -656,16 +671,125 @@ class IBN(nn.Module):
                 affine=True)
 
     def forward(self, x):
-        x1, x2 = torch.split(x, split_size_or_sections=self.split_sections, dim=1)
+        if torch.jit.is_tracing():
+            return self._forward_split(x)
+        h1_channels, h2_channels = self.split_sections
+        if self.inst_first:
+            inst_start, inst_channels, batch_start, batch_channels = 0, h1_channels, h1_channels, h2_channels
+        else:
+            inst_start, inst_channels, batch_start, batch_channels = h1_channels, h2_channels, 0, h1_channels
+        bn = self.batch_norm
+        use_batch_stats = (self.training or not bn.track_running_stats) and (not self.bn_folded)
+
+        # Per-sample/per-channel moments (for all channels only if batch statistics are required):
+        x_flat = x.flatten(2)
+        if use_batch_stats:
+            var, mean = self._calc_moments(x_flat)
+            inst_offset = inst_start
+        else:
+            var, mean = self._calc_moments(x_flat.narrow(1, inst_start, inst_channels))
+            inst_offset = 0
+        inst_mean = mean.narrow(1, inst_offset, inst_channels)
+        inst_var = var.narrow(1, inst_offset, inst_channels)
+        inst_scale = self.inst_norm.weight / torch.sqrt(inst_var + self.inst_norm.eps)
+        inst_shift = self.inst_norm.bias - inst_mean * inst_scale
+
+        if self.bn_folded:
+            assert (not self.training)
+            batch_scale = torch.ones((batch_channels,), dtype=x.dtype, device=x.device)
+            batch_shift = torch.zeros_like(batch_scale)
+        else:
+            if use_batch_stats:
+                # Batch variance is the mean within-sample variance plus the variance of sample means (all samples
+                # have the same number of elements):
+                sample_mean = mean.narrow(1, batch_start, batch_channels)
+                batch_mean = sample_mean.mean(dim=0)
+                batch_var = var.narrow(1, batch_start, batch_channels).mean(dim=0) +\
+                    (sample_mean - batch_mean).pow(2).mean(dim=0)
+                if self.training and bn.track_running_stats:
+                    self._update_running_stats(batch_mean, batch_var, x.numel() // x.size(1))
+            else:
+                batch_mean, batch_var = bn.running_mean, bn.running_var
+            batch_scale = bn.weight / torch.sqrt(batch_var + bn.eps)
+            batch_shift = bn.bias - batch_mean * batch_scale
+        batch_scale = batch_scale.expand(x.size(0), -1)
+        batch_shift = batch_shift.expand(x.size(0), -1)
+
+        if self.inst_first:
+            scale = torch.cat((inst_scale, batch_scale), dim=1)
+            shift = torch.cat((inst_shift, batch_shift), dim=1)
+        else:
+            scale = torch.cat((batch_scale, inst_scale), dim=1)
+            shift = torch.cat((batch_shift, inst_shift), dim=1)
+        x = torch.addcmul(shift.unsqueeze(-1).unsqueeze(-1), x, scale.unsqueeze(-1).unsqueeze(-1))
+        return x
+
+    def _forward_split(self, x):
+        x1, x2 = torch.split(x, self.split_sections, dim=1)
         if self.inst_first:
             x1 = self.inst_norm(x1.contiguous())
-            x2 = self.batch_norm(x2.contiguous())
+            if not self.bn_folded:
+                x2 = self.batch_norm(x2.contiguous())
         else:
-            x1 = self.batch_norm(x1.contiguous())
+            if not self.bn_folded:
+                x1 = self.batch_norm(x1.contiguous())
             x2 = self.inst_norm(x2.contiguous())
         x = torch.cat((x1, x2), dim=1)
         return x
 
+    @staticmethod
+    def _calc_moments(x):
+        """
+        Calculate the biased variance and the mean along the last axis. Centered moments are used, as the variance
+        from raw moments (`E[x^2] - E[x]^2`) loses precision in float32 for inputs with a large mean. Two plain passes
+        are several times faster on CPU than `torch.var_mean`.
+        """
+        mean = x.mean(dim=-1)
+        x_centered = x - mean.unsqueeze(-1)
+        if x_centered.requires_grad:
+            x_sqr = x_centered * x_centered
+        else:
+            x_sqr = x_centered.mul_(x_centered)
+        var = x_sqr.mean(dim=-1)
+        return var, mean
+
+    def _update_running_stats(self,
+                              mean,
+                              var,
+                              n):
+        # type: (torch.Tensor, torch.Tensor, int) -> None
+        bn = self.batch_norm
+        with torch.no_grad():
+            bn.num_batches_tracked += 1
+            if bn.momentum is None:
+                momentum = 1.0 / float(bn.num_batches_tracked)
+            else:
+                momentum = bn.momentum
+            bn.running_mean.mul_(1.0 - momentum).add_(momentum * mean)
+            bn.running_var.mul_(1.0 - momentum).add_(momentum * n / max(n - 1, 1) * var)
+
+    def fold_batch_norm(self, conv):
+        """
+        Fold the batch normalization part into the preceding convolution (for inference).
+
+        Parameters:
+        ----------
+        conv : nn.Conv2d
+            Convolution layer, whose output is normalized by this block.
+        """
+        assert (not self.training) and (not self.bn_folded)
+        assert (conv.out_channels == sum(self.split_sections))
+        bn = self.batch_norm
+        start = self.split_sections[0] if self.inst_first else 0
+        length = bn.num_features
+        with torch.no_grad():
+            scale = bn.weight / torch.sqrt(bn.running_var + bn.eps)
+            if conv.bias is None:
+                conv.bias = nn.Parameter(torch.zeros_like(conv.weight[:, 0, 0, 0]))
+            conv.weight[start:(start + length)] *= scale.view(-1, 1, 1, 1)
+            conv.bias[start:(start + length)] = (conv.bias[start:(start + length)] - bn.running_mean) * scale + bn.bias
+        self.bn_folded = True
+
 
 class Identity(nn.Module):
     """
@@ -681,7 +805,9 @@ class Identity(nn.Module):
 class DualPathSequential(nn.Sequential):
     """
     A sequential container for modules with dual inputs/outputs.
-    Modules will be executed in the order they are added.
+    Modules will be executed in the order they are added. An ordinal module gets and returns the first tensor only,
+    other modules get and return both tensors. A model specific scheme of dual path response is implemented by
+    overriding `forward` (see `nasnet.NasDualPathSequential`).
 
     Parameters:
     ----------
@@ -691,37 +817,175 @@ class DualPathSequential(nn.Sequential):
         Number of the first modules with single input/output.
     last_ordinals : int, default 0
         Number of the final modules with single input/output.
-    dual_path_scheme : function
-        Scheme of dual path response for a module.
-    dual_path_scheme_ordinal : function
-        Scheme of dual path response for an ordinal module.
+    dual_path_scheme : function or None, default None
+        Scheme of dual path response for a module (deprecated, isn't supported by TorchScript).
+    dual_path_scheme_ordinal : function or None, default None
+        Scheme of dual path response for an ordinal module (deprecated, isn't supported by TorchScript).
     """
+    __constants__ = ["return_two"]
+
     def __init__(self,
                  return_two=True,
                  first_ordinals=0,
                  last_ordinals=0,
-                 dual_path_scheme=(lambda module, x1, x2: module(x1, x2)),
-                 dual_path_scheme_ordinal=(lambda module, x1, x2: (module(x1), x2))):
+                 dual_path_scheme=None,
+                 dual_path_scheme_ordinal=None):
         super(DualPathSequential, self).__init__()
         self.return_two = return_two
         self.first_ordinals = first_ordinals
         self.last_ordinals = last_ordinals
         self.dual_path_scheme = dual_path_scheme
         self.dual_path_scheme_ordinal = dual_path_scheme_ordinal
+        self.ordinal_mask = None
+
+    def _get_ordinal_mask(self):
+        """
+        Get flags of ordinal modules (calculated once for the current number of modules).
+        """
+        length = len(self)
+        if (self.ordinal_mask is None) or (len(self.ordinal_mask) != length):
+            self.ordinal_mask = [(i < self.first_ordinals) or (i >= length - self.last_ordinals) for i in range(length)]
+        return self.ordinal_mask
+
+    def __prepare_scriptable__(self):
+        """
+        Mark ordinal modules by `dual_path_ordinal` attribute. A scripted container dispatches modules by this attribute
+        (TorchScript evaluates `hasattr` at compile time, but not a comparison of the module index).
+        """
+        assert (self.dual_path_scheme is None) and (self.dual_path_scheme_ordinal is None),\
+            "Custom dual path schemes aren't supported by TorchScript, override `forward` instead"
+        for module, ordinal in zip(self, self._get_ordinal_mask()):
+            if ordinal:
+                module.dual_path_ordinal = True
+            elif hasattr(module, "dual_path_ordinal"):
+                del module.dual_path_ordinal
+        return self
 
     def forward(self, x1, x2=None):
-        length = len(self._modules.values())
-        for i, module in enumerate(self._modules.values()):
-            if (i < self.first_ordinals) or (i >= length - self.last_ordinals):
-                x1, x2 = self.dual_path_scheme_ordinal(module, x1, x2)
+        # type: (torch.Tensor, Optional[torch.Tensor])
+        # The return type isn't specified, it's inferred for the constant `return_two`.
+        if not torch.jit.is_scripting():
+            return self._forward_eager(x1, x2)
+        for module in self:
+            if hasattr(module, "dual_path_ordinal"):
+                x1 = module(x1)
+            else:
+                x1, x2 = module(x1, x2)
+        if self.return_two:
+            return x1, x2
+        else:
+            return x1
+
+    @torch.jit.unused
+    def _forward_eager(self, x1, x2=None):
+        for module, ordinal in zip(self, self._get_ordinal_mask()):
+            if ordinal:
+                if self.dual_path_scheme_ordinal is not None:
+                    x1, x2 = self.dual_path_scheme_ordinal(module, x1, x2)
+                else:
+                    x1 = module(x1)
             else:
-                x1, x2 = self.dual_path_scheme(module, x1, x2)
+                if self.dual_path_scheme is not None:
+                    x1, x2 = self.dual_path_scheme(module, x1, x2)
+                else:
+                    x1, x2 = module(x1, x2)
         if self.return_two:
             return x1, x2
         else:
             return x1
 
 
+class BranchExecutor(object):
+    """
+    Thread pool for concurrent execution of independent branches of multi-branch blocks (at a small batch each branch
+    leaves most cores idle). PyTorch operators release the GIL, so that branches run on different cores. Branches
+    nested in a branch, that is already running in the pool, are executed sequentially.
+
+    Parameters:
+    ----------
+    num_workers : int
+        Number of worker threads.
+    min_branches : int, default 2
+        Minimal number of branches to run them concurrently.
+    """
+    def __init__(self,
+                 num_workers,
+                 min_branches=2):
+        super(BranchExecutor, self).__init__()
+        from concurrent.futures import ThreadPoolExecutor
+        self.min_branches = min_branches
+        self.pool = ThreadPoolExecutor(max_workers=num_workers)
+        self.local = threading.local()
+
+    def _call(self, branch, grad_enabled):
+        # Autograd mode is thread local:
+        self.local.in_branch = True
+        try:
+            with torch.set_grad_enabled(grad_enabled):
+                return branch()
+        finally:
+            self.local.in_branch = False
+
+    def run(self, branches):
+        """
+        Run branches.
+
+        Parameters:
+        ----------
+        branches : list of function
+            Branch functions without arguments.
+
+        Returns
+        -------
+        list
+            Branch results.
+        """
+        if (len(branches) < self.min_branches) or getattr(self.local, "in_branch", False):
+            return [branch() for branch in branches]
+        grad_enabled = torch.is_grad_enabled()
+        futures = [self.pool.submit(self._call, branch, grad_enabled) for branch in branches[1:]]
+        return [self._call(branches[0], grad_enabled)] + [future.result() for future in futures]
+
+
+def run_branches(executor,
+                 branches):
+    """
+    Run independent branches of a block, concurrently if an executor is set.
+
+    Parameters:
+    ----------
+    executor : BranchExecutor or None
+        Branch executor.
+    branches : list of function
+        Branch functions without arguments.
+
+    Returns
+    -------
+    list
+        Branch results.
+    """
+    if executor is not None:
+        return executor.run(branches)
+    return [branch() for branch in branches]
+
+
+def set_branch_executor(net,
+                        executor):
+    """
+    Set (or reset) the branch executor for all multi-branch blocks of a network.
+
+    Parameters:
+    ----------
+    net : nn.Module
+        Network.
+    executor : BranchExecutor or None
+        Branch executor.
+    """
+    for module in net.modules():
+        if hasattr(module, "branch_executor"):
+            module.branch_executor = executor
+
+
 class Concurrent(nn.Sequential):
     """
     A container for concatenation of modules on the base of the sequential container.
@@ -733,33 +997,40 @@ class Concurrent(nn.Sequential):
     """
     def __init__(self, axis=1):
         super(Concurrent, self).__init__()
+        self.branch_executor = None
         self.axis = axis
 
     def forward(self, x):
-        out = []
-        for module in self._modules.values():
-            out.append(module(x))
-        out = torch.cat(tuple(out), dim=self.axis)
+        if self.branch_executor is None:
+            out = []
+            for module in self:
+                out.append(module(x))
+        else:
+            out = run_branches(self.branch_executor, [partial(module, x) for module in self._modules.values()])
+        out = torch.cat(out, dim=self.axis)
         return out
 
 
 class ParametricSequential(nn.Sequential):
     """
     A sequential container for modules with parameters.
-    Modules will be executed in the order they are added.
+    Modules will be executed in the order they are added. Each module gets the same integer parameter (e.g. the index of
+    a shared block application).
     """
     def __init__(self, *args):
         super(ParametricSequential, self).__init__(*args)
 
-    def forward(self, x, **kwargs):
-        for module in self._modules.values():
-            x = module(x, **kwargs)
+    def forward(self, x, index):
+        # type: (torch.Tensor, int) -> torch.Tensor
+        for module in self:
+            x = module(x, index=index)
         return x
 
 
 class ParametricConcurrent(nn.Sequential):
     """
-    A container for concatenation of modules with parameters.
+    A container for concatenation of modules with parameters. Each module gets the same integer parameter (e.g. the
+    index of a shared block application).
 
     Parameters:
     ----------
@@ -768,16 +1039,101 @@ class ParametricConcurrent(nn.Sequential):
     """
     def __init__(self, axis=1):
         super(ParametricConcurrent, self).__init__()
+        self.branch_executor = None
         self.axis = axis
 
-    def forward(self, x, **kwargs):
-        out = []
-        for module in self._modules.values():
-            out.append(module(x, **kwargs))
-        out = torch.cat(tuple(out), dim=self.axis)
+    def forward(self, x, index):
+        # type: (torch.Tensor, int) -> torch.Tensor
+        if self.branch_executor is None:
+            out = []
+            for module in self:
+                out.append(module(x, index=index))
+        else:
+            out = run_branches(self.branch_executor, [partial(module, x, index=index) for module in
+                                                      self._modules.values()])
+        out = torch.cat(out, dim=self.axis)
         return out
 
 
+class _DenseBufferView(torch.autograd.Function):
+    """
+    Differentiable view of the first channels of a dense buffer, which holds the concatenation of the pieces. The
+    buffer is filled without autograd tracking, the gradient is routed to the pieces as for `torch.cat`.
+    """
+    @staticmethod
+    def forward(ctx, buffer, *pieces):
+        ctx.piece_channels = [piece.size(1) for piece in pieces]
+        return buffer.narrow(1, 0, sum(ctx.piece_channels))
+
+    @staticmethod
+    def backward(ctx, grad_output):
+        return (None,) + tuple(torch.split(grad_output, ctx.piece_channels, dim=1))
+
+
+class DenseSequential(nn.Sequential):
+    """
+    A sequential container for DenseNet-style units, each of them concatenates new channels to its input. Instead of
+    concatenation after each unit (with copy traffic growing quadratically with the number of units), the container
+    allocates one output buffer for the final channel count. Each unit writes its new channels into its slice, and the
+    next units read a view of the buffer.
+    Dense units should have `inc_channels` attribute and `forward_inc` method (returning only new channels), leading
+    modules without them (e.g. transition blocks) are executed as usual.
+    The buffer is a memory/speed trade-off, so it's disabled by default. In training activations saved for backward
+    are views of one buffer instead of growing concatenations (about 25% less activation memory), but for a batch of
+    several images the buffer slices are not contiguous, and normalization of such inputs is slower than concatenation
+    (e.g. a training step of densenet121 with batch 2 on CPU takes 979 ms instead of 816 ms, densenet201 takes 1633 ms
+    instead of 1266 ms). So the buffer is intended for memory-bound training runs. A scripted or traced (e.g. exported
+    to ONNX) container always concatenates.
+
+    Parameters:
+    ----------
+    preallocate : bool, default False
+        Whether to use the preallocated buffer (otherwise units concatenate their outputs).
+    """
+    def __init__(self, preallocate=False):
+        super(DenseSequential, self).__init__()
+        self.preallocate = preallocate
+
+    def forward(self, x):
+        if torch.jit.is_scripting() or torch.jit.is_tracing():
+            for module in self:
+                x = module(x)
+            return x
+        return self._forward_preallocated(x)
+
+    @torch.jit.unused
+    def _forward_preallocated(self, x):
+        modules = list(self._modules.values())
+        num_leading = 0
+        while (num_leading < len(modules)) and (not hasattr(modules[num_leading], "forward_inc")):
+            x = modules[num_leading](x)
+            num_leading += 1
+        units = modules[num_leading:]
+        if (not self.preallocate) or (not units):
+            for unit in units:
+                x = unit(x)
+            return x
+
+        batch, channels, height, width = x.size()
+        out_channels = channels + sum([unit.inc_channels for unit in units])
+        # The buffer data is written through `.data` (with a separate version counter), so that writes into the next
+        # slices do not invalidate views of the previous slices saved for backward:
+        buffer = x.new_empty(batch, out_channels, height, width)
+        track_grad = torch.is_grad_enabled() and x.requires_grad
+        pieces = [x]
+        with torch.no_grad():
+            buffer.data.narrow(1, 0, channels).copy_(x)
+        for unit in units:
+            y = _DenseBufferView.apply(buffer, *pieces) if track_grad else buffer.narrow(1, 0, channels)
+            y = unit.forward_inc(y)
+            with torch.no_grad():
+                buffer.data.narrow(1, channels, y.size(1)).copy_(y)
+            channels += y.size(1)
+            pieces.append(y)
+            track_grad = track_grad or (torch.is_grad_enabled() and y.requires_grad)
+        return _DenseBufferView.apply(buffer, *pieces) if track_grad else buffer
+
+
 class Hourglass(nn.Module):
     """
     A hourglass block.
@@ -795,6 +1151,8 @@ class Hourglass(nn.Module):
     return_first_skip : bool, default False
         Whether return the first skip connection output. Used in ResAttNet.
     """
+    __constants__ = ["return_first_skip"]
+
     def __init__(self,
                  down_seq,
                  up_seq,
@@ -813,22 +1171,25 @@ class Hourglass(nn.Module):
         self.up_seq = up_seq
         self.skip_seq = skip_seq
 
-    def forward(self, x, **kwargs):
-        y = None
+    def forward(self, x):
+        y = x
         down_outs = [x]
-        for down_module in self.down_seq._modules.values():
+        for down_module in self.down_seq:
             x = down_module(x)
             down_outs.append(x)
+        # Modules are taken in the reverse order, but a sequential can't be indexed by a variable in TorchScript:
         for i in range(len(down_outs)):
             if i != 0:
                 y = down_outs[self.depth - i]
-                skip_module = self.skip_seq[self.depth - i]
-                y = skip_module(y)
-                if (y is not None) and (self.merge_type == "add"):
+                for j, skip_module in enumerate(self.skip_seq):
+                    if j == self.depth - i:
+                        y = skip_module(y)
+                if self.merge_type == "add":
                     x = x + y
             if i != len(down_outs) - 1:
-                up_module = self.up_seq[self.depth - 1 - i]
-                x = up_module(x)
+                for j, up_module in enumerate(self.up_seq):
+                    if j == self.depth - 1 - i:
+                        x = up_module(x)
         if self.return_first_skip:
             return x, y
         else:
@@ -877,6 +1238,7 @@ class SesquialteralHourglass(nn.Module):
         self.down2_seq = down2_seq
 
     def _merge(self, x, y):
+        # type: (torch.Tensor, Optional[torch.Tensor]) -> torch.Tensor
         if y is not None:
             if self.merge_type == "cat":
                 x = torch.cat((x, y), dim=1)
@@ -884,25 +1246,26 @@ class SesquialteralHourglass(nn.Module):
                 x = x + y
         return x
 
-    def forward(self, x, **kwargs):
-        y = self.skip1_seq[0](x)
-        skip1_outs = [y]
-        for i in range(self.depth):
-            x = self.down1_seq[i](x)
-            y = self.skip1_seq[i + 1](x)
-            skip1_outs.append(y)
+    def forward(self, x):
+        # A sequential can't be indexed by a variable in TorchScript:
+        skip1_outs = []
+        for i, skip1_module in enumerate(self.skip1_seq):
+            if i != 0:
+                for j, down1_module in enumerate(self.down1_seq):
+                    if j == i - 1:
+                        x = down1_module(x)
+            skip1_outs.append(skip1_module(x))
         x = skip1_outs[self.depth]
-        y = self.skip2_seq[0](x)
-        skip2_outs = [y]
-        for i in range(self.depth):
-            x = self.up_seq[i](x)
-            y = skip1_outs[self.depth - 1 - i]
-            x = self._merge(x, y)
-            y = self.skip2_seq[i + 1](x)
-            skip2_outs.append(y)
-        x = self.skip2_seq[self.depth](x)
-        for i in range(self.depth):
-            x = self.down2_seq[i](x)
-            y = skip2_outs[self.depth - 1 - i]
-            x = self._merge(x, y)
+        skip2_outs = []
+        for i, skip2_module in enumerate(self.skip2_seq):
+            if i != 0:
+                for j, up_module in enumerate(self.up_seq):
+                    if j == i - 1:
+                        x = up_module(x)
+                x = self._merge(x, skip1_outs[self.depth - i])
+            skip2_outs.append(skip2_module(x))
+        x = skip2_outs[self.depth]
+        for i, down2_module in enumerate(self.down2_seq):
+            x = down2_module(x)
+            x = self._merge(x, skip2_outs[self.depth - 1 - i])
         return x
@@ -10,7 +10,6 @@ import os
 import torch
 import torch.nn as nn
 import torch.nn.init as init
-from torch.autograd import Variable
 from .common import ChannelShuffle
 
 
@@ -127,7 +126,7 @@ class CondenseComplexConv(nn.Module):
         self.index.fill_(0)
 
     def forward(self, x):
-        x = torch.index_select(x, dim=1, index=Variable(self.index))
+        x = torch.index_select(x, dim=1, index=self.index)
         x = self.bn(x)
         x = self.activ(x)
         x = self.conv(x)
@@ -297,7 +296,7 @@ class CondenseLinear(nn.Module):
         self.index.fill_(0)
 
     def forward(self, x):
-        x = torch.index_select(x, dim=1, index=Variable(self.index))
+        x = torch.index_select(x, dim=1, index=self.index)
         x = self.linear(x)
         return x
 
@@ -350,9 +349,7 @@ class CondenseNet(nn.Module):
                 in_channels = out_channels
             self.features.add_module("stage{}".format(i + 1), stage)
         self.features.add_module('post_activ', PostActivation(in_channels=in_channels))
-        self.features.add_module('final_pool', nn.AvgPool2d(
-            kernel_size=7,
-            stride=1))
+        self.features.add_module('final_pool', nn.AdaptiveAvgPool2d(output_size=1))
 
         self.output = CondenseLinear(
             in_features=in_channels,
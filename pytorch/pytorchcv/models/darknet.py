@@ -56,8 +56,6 @@ class DarkNet(nn.Module):
         Number of output channels for each unit.
     odd_pointwise : bool
         Whether pointwise convolution layer is used for each odd unit.
-    avg_pool_size : int
-        Window size of the final average pooling.
     cls_activ : bool
         Whether classification convolution layer uses an activation.
     alpha : float, default 0.1
@@ -72,7 +70,6 @@ class DarkNet(nn.Module):
     def __init__(self,
                  channels,
                  odd_pointwise,
-                 avg_pool_size,
                  cls_activ,
                  alpha=0.1,
                  in_channels=3,
@@ -107,9 +104,7 @@ class DarkNet(nn.Module):
             self.output.add_module('final_activ', nn.LeakyReLU(
                 negative_slope=alpha,
                 inplace=True))
-        self.output.add_module('final_pool', nn.AvgPool2d(
-            kernel_size=avg_pool_size,
-            stride=1))
+        self.output.add_module('final_pool', nn.AdaptiveAvgPool2d(output_size=1))
 
         self._init_params()
 
@@ -153,18 +148,15 @@ def get_darknet(version,
     if version == 'ref':
         channels = [[16], [32], [64], [128], [256], [512], [1024]]
         odd_pointwise = False
-        avg_pool_size = 3
         cls_activ = True
     elif version == 'tiny':
         channels = [[16], [32], [16, 128, 16, 128], [32, 256, 32, 256], [64, 512, 64, 512, 128]]
         odd_pointwise = True
-        avg_pool_size = 14
         cls_activ = False
     elif version == '19':
         channels = [[32], [64], [128, 64, 128], [256, 128, 256], [512, 256, 512, 256, 512],
                     [1024, 512, 1024, 512, 1024]]
         odd_pointwise = False
-        avg_pool_size = 7
         cls_activ = False
     else:
         raise ValueError("Unsupported DarkNet version {}".format(version))
@@ -172,7 +164,6 @@ def get_darknet(version,
     net = DarkNet(
         channels=channels,
         odd_pointwise=odd_pointwise,
-        avg_pool_size=avg_pool_size,
         cls_activ=cls_activ,
         **kwargs)
 
@@ -6,10 +6,11 @@
 __all__ = ['DARTS', 'darts']
 
 import os
+from functools import partial
 import torch
 import torch.nn as nn
 import torch.nn.init as init
-from .common import conv1x1, Identity
+from .common import conv1x1, Identity, run_branches
 from .nasnet import nasnet_dual_path_sequential
 
 
@@ -82,6 +83,8 @@ class DartsConv(nn.Module):
     activate : bool, default True
         Whether activate the convolution block.
     """
+    __constants__ = ["activate"]
+
     def __init__(self,
                  in_channels,
                  out_channels,
@@ -453,6 +456,7 @@ class DartsMainBlock(nn.Module):
                  channels,
                  reduction):
         super(DartsMainBlock, self).__init__()
+        self.branch_executor = None
         self.concat = [2, 3, 4, 5]
         op_names, indices = zip(*genotype)
         self.indices = indices
@@ -468,17 +472,27 @@ class DartsMainBlock(nn.Module):
         s0 = x_prev
         s1 = x
         states = [s0, s1]
-        for i in range(self.steps):
-            j1 = 2 * i
-            j2 = 2 * i + 1
-            op1 = self.ops[j1]
-            op2 = self.ops[j2]
-            y1 = states[self.indices[j1]]
-            y2 = states[self.indices[j2]]
-            y1 = op1(y1)
-            y2 = op2(y2)
-            s = y1 + y2
-            states += [s]
+        if self.branch_executor is None:
+            y1 = x
+            for j, op in enumerate(self.ops):
+                y = op(states[self.indices[j]])
+                if j % 2 == 0:
+                    y1 = y
+                else:
+                    states.append(y1 + y)
+        else:
+            for i in range(self.steps):
+                j1 = 2 * i
+                j2 = 2 * i + 1
+                op1 = self.ops[j1]
+                op2 = self.ops[j2]
+                y1 = states[self.indices[j1]]
+                y2 = states[self.indices[j2]]
+                y1, y2 = run_branches(self.branch_executor, [
+                    partial(op1, y1),
+                    partial(op2, y2)])
+                s = y1 + y2
+                states += [s]
         x_out = torch.cat([states[i] for i in self.concat], dim=1)
         return x_out
 
@@ -508,6 +522,7 @@ class DartsUnit(nn.Module):
                  reduction,
                  prev_reduction):
         super(DartsUnit, self).__init__()
+        self.branch_executor = None
         mid_channels = out_channels // 4
 
         if prev_reduction:
@@ -529,8 +544,13 @@ class DartsUnit(nn.Module):
             reduction=reduction)
 
     def forward(self, x, x_prev):
-        x = self.preprocess(x)
-        x_prev = self.preprocess_prev(x_prev)
+        if self.branch_executor is None:
+            x = self.preprocess(x)
+            x_prev = self.preprocess_prev(x_prev)
+        else:
+            x, x_prev = run_branches(self.branch_executor, [
+                partial(self.preprocess, x),
+                partial(self.preprocess_prev, x_prev)])
         x_out = self.body(x, x_prev)
         return x_out
 
@@ -595,9 +615,7 @@ class DARTS(nn.Module):
                 in_channels = out_channels
             self.features.add_module("stage{}".format(i + 1), stage)
 
-        self.features.add_module("final_pool", nn.AvgPool2d(
-            kernel_size=7,
-            stride=1))
+        self.features.add_module("final_pool", nn.AdaptiveAvgPool2d(output_size=1))
 
         self.output = nn.Linear(
             in_features=in_channels,
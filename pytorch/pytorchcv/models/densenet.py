@@ -9,7 +9,7 @@ import os
 import torch
 import torch.nn as nn
 import torch.nn.init as init
-from .common import pre_conv1x1_block, pre_conv3x3_block
+from .common import pre_conv1x1_block, pre_conv3x3_block, DenseSequential
 from .preresnet import PreResInitBlock, PreResActivation
 
 
@@ -26,6 +26,8 @@ class DenseUnit(nn.Module):
     dropout_rate : bool
         Parameter of Dropout layer. Faction of the input units to drop.
     """
+    __constants__ = ["use_dropout"]
+
     def __init__(self,
                  in_channels,
                  out_channels,
@@ -34,6 +36,7 @@ class DenseUnit(nn.Module):
         self.use_dropout = (dropout_rate != 0.0)
         bn_size = 4
         inc_channels = out_channels - in_channels
+        self.inc_channels = inc_channels
         mid_channels = inc_channels * bn_size
 
         self.conv1 = pre_conv1x1_block(
@@ -45,15 +48,16 @@ class DenseUnit(nn.Module):
         if self.use_dropout:
             self.dropout = nn.Dropout(p=dropout_rate)
 
-    def forward(self, x):
-        identity = x
+    def forward_inc(self, x):
         x = self.conv1(x)
         x = self.conv2(x)
         if self.use_dropout:
             x = self.dropout(x)
-        x = torch.cat((identity, x), dim=1)
         return x
 
+    def forward(self, x):
+        return torch.cat((x, self.forward_inc(x)), dim=1)
+
 
 class TransitionBlock(nn.Module):
     """
@@ -121,7 +125,7 @@ class DenseNet(nn.Module):
             out_channels=init_block_channels))
         in_channels = init_block_channels
         for i, channels_per_stage in enumerate(channels):
-            stage = nn.Sequential()
+            stage = DenseSequential()
             if i != 0:
                 stage.add_module("trans{}".format(i + 1), TransitionBlock(
                     in_channels=in_channels,
@@ -135,9 +139,7 @@ class DenseNet(nn.Module):
                 in_channels = out_channels
             self.features.add_module("stage{}".format(i + 1), stage)
         self.features.add_module("post_activ", PreResActivation(in_channels=in_channels))
-        self.features.add_module("final_pool", nn.AvgPool2d(
-            kernel_size=7,
-            stride=1))
+        self.features.add_module("final_pool", nn.AdaptiveAvgPool2d(output_size=1))
 
         self.output = nn.Linear(
             in_features=in_channels,
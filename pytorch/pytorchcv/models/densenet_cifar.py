@@ -13,7 +13,7 @@ import os
 import torch
 import torch.nn as nn
 import torch.nn.init as init
-from .common import conv3x3, pre_conv3x3_block
+from .common import conv3x3, pre_conv3x3_block, DenseSequential
 from .preresnet import PreResActivation
 from .densenet import DenseUnit, TransitionBlock
 
@@ -31,6 +31,7 @@ class DenseSimpleUnit(nn.Module):
     dropout_rate : bool
         Parameter of Dropout layer. Faction of the input units to drop.
     """
+    __constants__ = ["use_dropout"]
 
     def __init__(self,
                  in_channels,
@@ -39,6 +40,7 @@ class DenseSimpleUnit(nn.Module):
         super(DenseSimpleUnit, self).__init__()
         self.use_dropout = (dropout_rate != 0.0)
         inc_channels = out_channels - in_channels
+        self.inc_channels = inc_channels
 
         self.conv = pre_conv3x3_block(
             in_channels=in_channels,
@@ -46,14 +48,15 @@ class DenseSimpleUnit(nn.Module):
         if self.use_dropout:
             self.dropout = nn.Dropout(p=dropout_rate)
 
-    def forward(self, x):
-        identity = x
+    def forward_inc(self, x):
         x = self.conv(x)
         if self.use_dropout:
             x = self.dropout(x)
-        x = torch.cat((identity, x), dim=1)
         return x
 
+    def forward(self, x):
+        return torch.cat((x, self.forward_inc(x)), dim=1)
+
 
 class CIFARDenseNet(nn.Module):
     """
@@ -95,7 +98,7 @@ class CIFARDenseNet(nn.Module):
             out_channels=init_block_channels))
         in_channels = init_block_channels
         for i, channels_per_stage in enumerate(channels):
-            stage = nn.Sequential()
+            stage = DenseSequential()
             if i != 0:
                 stage.add_module("trans{}".format(i + 1), TransitionBlock(
                     in_channels=in_channels,
@@ -109,9 +112,7 @@ class CIFARDenseNet(nn.Module):
                 in_channels = out_channels
             self.features.add_module("stage{}".format(i + 1), stage)
         self.features.add_module("post_activ", PreResActivation(in_channels=in_channels))
-        self.features.add_module("final_pool", nn.AvgPool2d(
-            kernel_size=8,
-            stride=1))
+        self.features.add_module("final_pool", nn.AdaptiveAvgPool2d(output_size=1))
 
         self.output = nn.Linear(
             in_features=in_channels,
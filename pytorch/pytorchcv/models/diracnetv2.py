@@ -151,9 +151,7 @@ class DiracNetV2(nn.Module):
                     padding=0))
             self.features.add_module("stage{}".format(i + 1), stage)
         self.features.add_module('final_activ', nn.ReLU(inplace=True))
-        self.features.add_module('final_pool', nn.AvgPool2d(
-            kernel_size=7,
-            stride=1))
+        self.features.add_module('final_pool', nn.AdaptiveAvgPool2d(output_size=1))
 
         self.output = nn.Linear(
             in_features=in_channels,
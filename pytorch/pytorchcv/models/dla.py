@@ -6,6 +6,7 @@
 __all__ = ['DLA', 'dla34', 'dla46c', 'dla46xc', 'dla60', 'dla60x', 'dla60xc', 'dla102', 'dla102x', 'dla102x2', 'dla169']
 
 import os
+from typing import List, Optional
 import torch
 import torch.nn as nn
 import torch.nn.init as init
@@ -89,6 +90,8 @@ class DLAResBlock(nn.Module):
     return_down : bool, default False
         Whether return downsample result.
     """
+    __constants__ = ["return_down", "downsample", "project"]
+
     def __init__(self,
                  in_channels,
                  out_channels,
@@ -143,6 +146,8 @@ class DLARoot(nn.Module):
     residual : bool
         Whether use residual connection.
     """
+    __constants__ = ["residual"]
+
     def __init__(self,
                  in_channels,
                  out_channels,
@@ -158,8 +163,9 @@ class DLARoot(nn.Module):
         self.activ = nn.ReLU(inplace=True)
 
     def forward(self, x2, x1, extra):
+        # type: (torch.Tensor, torch.Tensor, List[torch.Tensor]) -> torch.Tensor
         last_branch = x2
-        x = torch.cat((x2, x1) + tuple(extra), dim=1)
+        x = torch.cat([x2, x1] + extra, dim=1)
         x = self.conv(x)
         if self.residual:
             x += last_branch
@@ -194,6 +200,8 @@ class DLATree(nn.Module):
     return_down : bool, default False
         Whether return downsample result.
     """
+    __constants__ = ["return_down", "add_down", "root_level"]
+
     def __init__(self,
                  levels,
                  in_channels,
@@ -256,6 +264,8 @@ class DLATree(nn.Module):
                 residual=root_residual)
 
     def forward(self, x, extra=None):
+        # type: (torch.Tensor, Optional[List[torch.Tensor]])
+        # The return type isn't specified, it's inferred for the constant `return_down`.
         extra = [] if extra is None else extra
         x1, down = self.tree1(x)
         if self.add_down:
@@ -363,9 +373,7 @@ class DLA(nn.Module):
                 first_tree=first_tree))
             in_channels = out_channels
 
-        self.features.add_module("final_pool", nn.AvgPool2d(
-            kernel_size=7,
-            stride=1))
+        self.features.add_module("final_pool", nn.AdaptiveAvgPool2d(output_size=1))
 
         self.output = conv1x1(
             in_channels=in_channels,
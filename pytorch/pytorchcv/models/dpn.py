@@ -6,9 +6,11 @@
 __all__ = ['DPN', 'dpn68', 'dpn68b', 'dpn98', 'dpn107', 'dpn131']
 
 import os
+from typing import Optional, Tuple
 import torch
 import torch.nn as nn
 import torch.nn.init as init
+import torch.nn.functional as F
 from .common import conv1x1, DualPathSequential
 
 
@@ -34,6 +36,27 @@ class GlobalAvgMaxPool2D(nn.Module):
         return x
 
 
+class TestTimeAvgPool2D(nn.Module):
+    """
+    Average pooling with a fixed window for test-time pooling. The window is shrunk for smaller inputs, so that the
+    pooling works at any resolution.
+
+    Parameters:
+    ----------
+    kernel_size : int, default 7
+        Size of the pooling window.
+    """
+    def __init__(self,
+                 kernel_size=7):
+        super(TestTimeAvgPool2D, self).__init__()
+        self.kernel_size = kernel_size
+
+    def forward(self, x):
+        kernel_size = (min(self.kernel_size, x.size(2)), min(self.kernel_size, x.size(3)))
+        x = F.avg_pool2d(x, kernel_size=kernel_size, stride=1)
+        return x
+
+
 def dpn_batch_norm(channels):
     """
     DPN specific Batch normalization layer.
@@ -188,6 +211,8 @@ class DPNUnit(nn.Module):
     b_case : bool, default False
         Whether to use B-case model.
     """
+    __constants__ = ["has_proj", "b_case"]
+
     def __init__(self,
                  in_channels,
                  mid_channels,
@@ -231,6 +256,7 @@ class DPNUnit(nn.Module):
                 out_channels=bw + inc)
 
     def forward(self, x1, x2=None):
+        # type: (torch.Tensor, Optional[torch.Tensor]) -> Tuple[torch.Tensor, torch.Tensor]
         x_in = torch.cat((x1, x2), dim=1) if x2 is not None else x1
         if self.has_proj:
             x_s = self.conv_proj(x_in)
@@ -412,9 +438,7 @@ class DPN(nn.Module):
                 out_channels=num_classes,
                 bias=True))
         else:
-            self.output.add_module('avg_pool', nn.AvgPool2d(
-                kernel_size=7,
-                stride=1))
+            self.output.add_module('avg_pool', TestTimeAvgPool2D(kernel_size=7))
             self.output.add_module('classifier', conv1x1(
                 in_channels=in_channels,
                 out_channels=num_classes,
@@ -31,6 +31,8 @@ class DRNConv(nn.Module):
     activate : bool
         Whether activate the convolution block.
     """
+    __constants__ = ["activate"]
+
     def __init__(self,
                  in_channels,
                  out_channels,
@@ -229,6 +231,8 @@ class DRNUnit(nn.Module):
     residual : bool
         Whether do residual calculations.
     """
+    __constants__ = ["residual", "resize_identity"]
+
     def __init__(self,
                  in_channels,
                  out_channels,
@@ -363,9 +367,7 @@ class DRN(nn.Module):
                     residual=(residuals[i][j] == 1)))
                 in_channels = out_channels
             self.features.add_module("stage{}".format(i + 1), stage)
-        self.features.add_module('final_pool', nn.AvgPool2d(
-            kernel_size=28,
-            stride=1))
+        self.features.add_module('final_pool', nn.AdaptiveAvgPool2d(output_size=1))
 
         self.output = nn.Conv2d(
             in_channels=in_channels,
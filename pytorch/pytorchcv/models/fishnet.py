@@ -7,6 +7,7 @@
 __all__ = ['FishNet', 'fishnet99', 'fishnet150']
 
 import os
+import torch
 import torch.nn as nn
 import torch.nn.functional as F
 import torch.nn.init as init
@@ -17,6 +18,7 @@ from .senet import SEInitBlock
 
 def channel_squeeze(x,
                     groups):
+    # type: (torch.Tensor, int) -> torch.Tensor
     """
     Channel squeeze operation.
 
@@ -79,7 +81,7 @@ class InterpolationBlock(nn.Module):
                  mode="nearest",
                  align_corners=None):
         super(InterpolationBlock, self).__init__()
-        self.scale_factor = scale_factor
+        self.scale_factor = float(scale_factor)
         self.mode = mode
         self.align_corners = align_corners
 
@@ -196,6 +198,8 @@ class FishBlock(nn.Module):
     squeeze : bool, default False
         Whether to use a channel squeeze operation.
     """
+    __constants__ = ["squeeze", "resize_identity"]
+
     def __init__(self,
                  in_channels,
                  out_channels,
@@ -499,9 +503,7 @@ class FishNet(nn.Module):
             down2_seq=down2_seq))
         self.features.add_module("final_block", FishFinalBlock(in_channels=in_channels))
         in_channels = in_channels // 2
-        self.features.add_module("final_pool", nn.AvgPool2d(
-            kernel_size=7,
-            stride=1))
+        self.features.add_module("final_pool", nn.AdaptiveAvgPool2d(output_size=1))
 
         self.output = nn.Sequential()
         self.output.add_module("final_conv", conv1x1(
@@ -38,6 +38,7 @@ class IBNbConvBlock(nn.Module):
     activate : bool, default True
         Whether activate the convolution block.
     """
+    __constants__ = ["activate"]
 
     def __init__(self,
                  in_channels,
@@ -124,6 +125,8 @@ class IBNbResUnit(nn.Module):
     use_inst_norm : bool
         Whether to use instance normalization.
     """
+    __constants__ = ["use_inst_norm", "resize_identity"]
+
     def __init__(self,
                  in_channels,
                  out_channels,
@@ -238,9 +241,7 @@ class IBNbResNet(nn.Module):
                     use_inst_norm=use_inst_norm))
                 in_channels = out_channels
             self.features.add_module("stage{}".format(i + 1), stage)
-        self.features.add_module("final_pool", nn.AvgPool2d(
-            kernel_size=7,
-            stride=1))
+        self.features.add_module("final_pool", nn.AdaptiveAvgPool2d(output_size=1))
 
         self.output = nn.Linear(
             in_features=in_channels,
@@ -85,6 +85,8 @@ class IBNResNeXtUnit(nn.Module):
     conv1_ibn : bool
         Whether to use IBN normalization in the first convolution layer of the block.
     """
+    __constants__ = ["resize_identity"]
+
     def __init__(self,
                  in_channels,
                  out_channels,
@@ -174,9 +176,7 @@ class IBNResNeXt(nn.Module):
                     conv1_ibn=conv1_ibn))
                 in_channels = out_channels
             self.features.add_module("stage{}".format(i + 1), stage)
-        self.features.add_module("final_pool", nn.AvgPool2d(
-            kernel_size=7,
-            stride=1))
+        self.features.add_module("final_pool", nn.AdaptiveAvgPool2d(output_size=1))
 
         self.output = nn.Linear(
             in_features=in_channels,
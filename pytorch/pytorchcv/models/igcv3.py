@@ -27,6 +27,8 @@ class InvResUnit(nn.Module):
     expansion : bool
         Whether do expansion of channels.
     """
+    __constants__ = ["residual"]
+
     def __init__(self,
                  in_channels,
                  out_channels,
@@ -125,9 +127,7 @@ class IGCV3(nn.Module):
             out_channels=final_block_channels,
             activation="relu6"))
         in_channels = final_block_channels
-        self.features.add_module('final_pool', nn.AvgPool2d(
-            kernel_size=7,
-            stride=1))
+        self.features.add_module('final_pool', nn.AdaptiveAvgPool2d(output_size=1))
 
         self.output = nn.Linear(
             in_features=in_channels,
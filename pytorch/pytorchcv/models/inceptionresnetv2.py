@@ -337,6 +337,8 @@ class InceptionCUnit(nn.Module):
     activate : bool, default True
         Whether activate the convolution block.
     """
+    __constants__ = ["activate"]
+
     def __init__(self,
                  scale=0.2,
                  activate=True):
@@ -517,9 +519,7 @@ class InceptionResNetV2(nn.Module):
         self.features.add_module('final_conv', incept_conv1x1(
             in_channels=2080,
             out_channels=1536))
-        self.features.add_module('final_pool', nn.AvgPool2d(
-            kernel_size=8,
-            stride=1))
+        self.features.add_module('final_pool', nn.AdaptiveAvgPool2d(output_size=1))
 
         self.output = nn.Sequential()
         if dropout_rate > 0.0:
@@ -603,9 +603,7 @@ class InceptionV4(nn.Module):
                 stage.add_module("unit{}".format(j + 1), unit())
             self.features.add_module("stage{}".format(i + 1), stage)
 
-        self.features.add_module('final_pool', nn.AvgPool2d(
-            kernel_size=8,
-            stride=1))
+        self.features.add_module('final_pool', nn.AdaptiveAvgPool2d(output_size=1))
 
         self.output = nn.Sequential()
         if dropout_rate > 0.0:
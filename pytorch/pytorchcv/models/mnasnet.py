@@ -31,6 +31,8 @@ class ConvBlock(nn.Module):
     activate : bool, default True
         Whether activate the convolution block.
     """
+    __constants__ = ["activate"]
+
     def __init__(self,
                  in_channels,
                  out_channels,
@@ -165,6 +167,8 @@ class MnasUnit(nn.Module):
     expansion_factor : int
         Factor for expansion of channels.
     """
+    __constants__ = ["residual"]
+
     def __init__(self,
                  in_channels,
                  out_channels,
@@ -297,9 +301,7 @@ class MnasNet(nn.Module):
             out_channels=final_block_channels,
             activate=True))
         in_channels = final_block_channels
-        self.features.add_module('final_pool', nn.AvgPool2d(
-            kernel_size=7,
-            stride=1))
+        self.features.add_module('final_pool', nn.AdaptiveAvgPool2d(output_size=1))
 
         self.output = nn.Linear(
             in_features=in_channels,
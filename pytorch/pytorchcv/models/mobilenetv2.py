@@ -26,6 +26,8 @@ class LinearBottleneck(nn.Module):
     expansion : bool
         Whether do expansion of channels.
     """
+    __constants__ = ["residual"]
+
     def __init__(self,
                  in_channels,
                  out_channels,
@@ -115,9 +117,7 @@ class MobileNetV2(nn.Module):
             out_channels=final_block_channels,
             activation="relu6"))
         in_channels = final_block_channels
-        self.features.add_module('final_pool', nn.AvgPool2d(
-            kernel_size=7,
-            stride=1))
+        self.features.add_module('final_pool', nn.AdaptiveAvgPool2d(output_size=1))
 
         self.output = conv1x1(
             in_channels=in_channels,
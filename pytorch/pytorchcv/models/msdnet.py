@@ -8,6 +8,7 @@ __all__ = ['MSDNet', 'msdnet22', 'MultiOutputSequential', 'MSDFeatureBlock']
 
 import os
 import math
+from typing import List, Union
 import torch
 import torch.nn as nn
 import torch.nn.init as init
@@ -25,7 +26,7 @@ class MultiOutputSequential(nn.Sequential):
 
     def forward(self, x):
         outs = []
-        for module in self._modules.values():
+        for module in self:
             x = module(x)
             outs.append(x)
         return outs
@@ -40,9 +41,10 @@ class MultiBlockSequential(nn.Sequential):
         super(MultiBlockSequential, self).__init__(*args)
 
     def forward(self, x):
+        # type: (List[torch.Tensor]) -> List[torch.Tensor]
         outs = []
-        for module, x_i in zip(self._modules.values(), x):
-            y = module(x_i)
+        for i, module in enumerate(self):
+            y = module(x[i])
             outs.append(y)
         return outs
 
@@ -64,6 +66,7 @@ class MSDBaseBlock(nn.Module):
     bottleneck_factor : int
         Bottleneck factor.
     """
+    __constants__ = ["use_bottleneck"]
 
     def __init__(self,
                  in_channels,
@@ -231,7 +234,6 @@ class MSDLayer(nn.Module):
     bottleneck_factors : list/tuple of int
         Bottleneck factor for each input scale.
     """
-
     def __init__(self,
                  in_channels,
                  out_channels,
@@ -243,7 +245,7 @@ class MSDLayer(nn.Module):
         self.dec_scales = in_scales - out_scales
         assert (self.dec_scales >= 0)
 
-        self.scale_blocks = nn.Sequential()
+        self.scale_blocks = nn.ModuleDict()
         for i in range(out_scales):
             if (i == 0) and (self.dec_scales == 0):
                 self.scale_blocks.add_module('scale_block{}'.format(i + 1), MSDFirstScaleBlock(
@@ -261,14 +263,15 @@ class MSDLayer(nn.Module):
                     bottleneck_factor=bottleneck_factors[self.dec_scales + i]))
 
     def forward(self, x):
+        # type: (List[torch.Tensor]) -> List[torch.Tensor]
         outs = []
-        for i in range(len(self.scale_blocks)):
-            if (i == 0) and (self.dec_scales == 0):
-                y = self.scale_blocks[i](x[i])
-            else:
-                y = self.scale_blocks[i](
+        for i, scale_block in enumerate(self.scale_blocks.values()):
+            if hasattr(scale_block, "down_block"):
+                y = scale_block(
                     x_prev=x[self.dec_scales + i - 1],
                     x=x[self.dec_scales + i])
+            else:
+                y = scale_block(x[i])
             outs.append(y)
         return outs
 
@@ -298,6 +301,7 @@ class MSDTransitionLayer(nn.Module):
                 out_channels=out_channels[i]))
 
     def forward(self, x):
+        # type: (List[torch.Tensor]) -> List[torch.Tensor]
         y = self.scale_blocks(x)
         return y
 
@@ -324,7 +328,7 @@ class MSDFeatureBlock(nn.Module):
                  use_bottleneck,
                  bottleneck_factors):
         super(MSDFeatureBlock, self).__init__()
-        self.blocks = nn.Sequential()
+        self.blocks = nn.ModuleDict()
         for i, out_channels_per_layer in enumerate(out_channels):
             if len(bottleneck_factors[i]) == 0:
                 self.blocks.add_module('trans{}'.format(i + 1), MSDTransitionLayer(
@@ -339,7 +343,9 @@ class MSDFeatureBlock(nn.Module):
             in_channels = out_channels_per_layer
 
     def forward(self, x):
-        x = self.blocks(x)
+        # type: (List[torch.Tensor]) -> List[torch.Tensor]
+        for block in self.blocks.values():
+            x = block(x)
         return x
 
 
@@ -368,9 +374,7 @@ class MSDClassifier(nn.Module):
             in_channels=in_channels,
             out_channels=in_channels,
             stride=2))
-        self.features.add_module("pool", nn.AvgPool2d(
-            kernel_size=2,
-            stride=2))
+        self.features.add_module("pool", nn.AdaptiveAvgPool2d(output_size=1))
 
         self.output = nn.Linear(
             in_features=in_channels,
@@ -448,6 +452,7 @@ class MSDNet(nn.Module):
                     init.constant_(module.bias, 0)
 
     def forward(self, x, only_last=True):
+        # type: (torch.Tensor, bool) -> Union[torch.Tensor, List[torch.Tensor]]
         x = self.init_layer(x)
         outs = []
         for feature_block, classifier in zip(self.feature_blocks, self.classifiers):
@@ -8,6 +8,8 @@ __all__ = ['CIFAR10MSDNet', 'msdnet22_cifar10']
 
 import os
 import math
+from typing import List, Union
+import torch
 import torch.nn as nn
 import torch.nn.init as init
 from .common import conv3x3_block
@@ -72,9 +74,7 @@ class CIFAR10MSDClassifier(nn.Module):
             in_channels=mid_channels,
             out_channels=mid_channels,
             stride=2))
-        self.features.add_module("pool", nn.AvgPool2d(
-            kernel_size=2,
-            stride=2))
+        self.features.add_module("pool", nn.AdaptiveAvgPool2d(output_size=1))
 
         self.output = nn.Linear(
             in_features=mid_channels,
@@ -152,6 +152,7 @@ class CIFAR10MSDNet(nn.Module):
                     init.constant_(module.bias, 0)
 
     def forward(self, x, only_last=True):
+        # type: (torch.Tensor, bool) -> Union[torch.Tensor, List[torch.Tensor]]
         x = self.init_layer(x)
         outs = []
         for feature_block, classifier in zip(self.feature_blocks, self.classifiers):
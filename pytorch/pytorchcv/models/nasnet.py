@@ -7,79 +7,81 @@
 __all__ = ['NASNet', 'nasnet_4a1056', 'nasnet_6a4032', 'nasnet_dual_path_sequential']
 
 import os
+from typing import Optional
 import torch
 import torch.nn as nn
 import torch.nn.init as init
-from .common import conv1x1, DualPathSequential
+from .common import conv1x1, DualPathSequential, run_branches
 
 
-class NasDualPathScheme(object):
+class NasDualPathSequential(DualPathSequential):
     """
-    NASNet specific scheme of dual path response for a module in a DualPathSequential module.
+    NASNet specific dual path sequential container. Ordinal modules get the current tensor only, other modules get both
+    tensors and return the next tensor (or both tensors). The current tensor becomes the previous one after each module,
+    but the previous tensor is kept after a module with `skip_input` attribute (if the input can be skipped).
 
     Parameters:
     ----------
-    can_skip_input : bool
+    return_two : bool, default True
+        Whether to return two output after execution.
+    first_ordinals : int, default 0
+        Number of the first modules with single input/output.
+    last_ordinals : int, default 0
+        Number of the final modules with single input/output.
+    can_skip_input : bool, default False
         Whether can skip input for some modules.
     """
+    __constants__ = ["return_two", "can_skip_input"]
+
     def __init__(self,
-                 can_skip_input):
-        super(NasDualPathScheme, self).__init__()
+                 return_two=True,
+                 first_ordinals=0,
+                 last_ordinals=0,
+                 can_skip_input=False):
+        super(NasDualPathSequential, self).__init__(
+            return_two=return_two,
+            first_ordinals=first_ordinals,
+            last_ordinals=last_ordinals)
         self.can_skip_input = can_skip_input
 
-    """
-    Scheme function.
-
-    Parameters:
-    ----------
-    module : nn.Module
-        A module.
-    x : Tensor
-        Current processed tensor.
-    x_prev : Tensor
-        Previous processed tensor.
-
-    Returns
-    -------
-    x_next : Tensor
-        Next processed tensor.
-    x : Tensor
-        Current processed tensor.
-    """
-    def __call__(self,
-                 module,
-                 x,
-                 x_prev):
-        x_next = module(x, x_prev)
-        if type(x_next) == tuple:
-            x_next, x = x_next
-        if self.can_skip_input and hasattr(module, 'skip_input') and module.skip_input:
-            x = x_prev
-        return x_next, x
-
-
-def nasnet_dual_path_scheme_ordinal(module,
-                                    x,
-                                    _):
-    """
-    NASNet specific scheme of dual path response for an ordinal module with dual inputs/outputs in a DualPathSequential
-    module.
-
-    Parameters:
-    ----------
-    module : nn.Module
-        A module.
-    x : Tensor
-        Current processed tensor.
-
-    Returns
-    -------
-    x_next : Tensor
-        Next processed tensor.
-    x : Tensor
-        Current processed tensor.
-    """
-    return module(x), x
+    def forward(self, x1, x2=None):
+        # type: (torch.Tensor, Optional[torch.Tensor])
+        if not torch.jit.is_scripting():
+            return self._forward_eager(x1, x2)
+        for module in self:
+            if hasattr(module, "dual_path_ordinal"):
+                x1, x2 = module(x1), x1
+            else:
+                assert (x2 is not None)
+                y = module(x1, x2)
+                if isinstance(y, tuple):
+                    x1, x2 = y
+                else:
+                    if not (self.can_skip_input and hasattr(module, "skip_input")):
+                        x2 = x1
+                    x1 = y
+        if self.return_two:
+            return x1, x2
+        else:
+            return x1
+
+    @torch.jit.unused
+    def _forward_eager(self, x1, x2=None):
+        for module, ordinal in zip(self, self._get_ordinal_mask()):
+            if ordinal:
+                x1, x2 = module(x1), x1
+            else:
+                y = module(x1, x2)
+                if isinstance(y, tuple):
+                    x1, x2 = y
+                else:
+                    if not (self.can_skip_input and hasattr(module, "skip_input")):
+                        x2 = x1
+                    x1 = y
+        if self.return_two:
+            return x1, x2
+        else:
+            return x1
 
 
 def nasnet_dual_path_sequential(return_two=True,
@@ -97,19 +99,14 @@ def nasnet_dual_path_sequential(return_two=True,
         Number of the first modules with single input/output.
     last_ordinals : int, default 0
         Number of the final modules with single input/output.
-    dual_path_scheme : function
-        Scheme of dual path response for a module.
-    dual_path_scheme_ordinal : function
-        Scheme of dual path response for an ordinal module.
     can_skip_input : bool, default False
         Whether can skip input for some modules.
     """
-    return DualPathSequential(
+    return NasDualPathSequential(
         return_two=return_two,
         first_ordinals=first_ordinals,
         last_ordinals=last_ordinals,
-        dual_path_scheme=NasDualPathScheme(can_skip_input=can_skip_input),
-        dual_path_scheme_ordinal=nasnet_dual_path_scheme_ordinal)
+        can_skip_input=can_skip_input)
 
 
 def nasnet_batch_norm(channels):
@@ -169,6 +166,8 @@ class NasMaxPoolBlock(nn.Module):
     extra_padding : bool, default False
         Whether to use extra padding.
     """
+    __constants__ = ["extra_padding"]
+
     def __init__(self,
                  extra_padding=False):
         super(NasMaxPoolBlock, self).__init__()
@@ -199,6 +198,8 @@ class NasAvgPoolBlock(nn.Module):
     extra_padding : bool, default False
         Whether to use extra padding.
     """
+    __constants__ = ["extra_padding"]
+
     def __init__(self,
                  extra_padding=False):
         super(NasAvgPoolBlock, self).__init__()
@@ -352,6 +353,8 @@ class NasDwsConv(nn.Module):
     extra_padding : bool, default False
         Whether to use extra padding.
     """
+    __constants__ = ["extra_padding"]
+
     def __init__(self,
                  in_channels,
                  out_channels,
@@ -555,6 +558,8 @@ class NasPathBranch(nn.Module):
     extra_padding : bool, default False
         Whether to use extra padding.
     """
+    __constants__ = ["extra_padding"]
+
     def __init__(self,
                  in_channels,
                  out_channels,
@@ -629,6 +634,7 @@ class Stem1Unit(nn.Module):
                  in_channels,
                  out_channels):
         super(Stem1Unit, self).__init__()
+        self.branch_executor = None
         mid_channels = out_channels // 4
 
         self.conv1x1 = nas_conv1x1(
@@ -663,6 +669,9 @@ class Stem1Unit(nn.Module):
         self.comb4_right = NasMaxPoolBlock(extra_padding=False)
 
     def forward(self, x, _=None):
+        # type: (torch.Tensor, Optional[torch.Tensor]) -> torch.Tensor
+        if self.branch_executor is not None:
+            return self._forward_concurrent(x, _)
         x_left = self.conv1x1(x)
         x_right = x
 
@@ -675,6 +684,22 @@ class Stem1Unit(nn.Module):
         x_out = torch.cat((x1, x2, x3, x4), dim=1)
         return x_out
 
+    @torch.jit.unused
+    def _forward_concurrent(self, x, _=None):
+        x_left = self.conv1x1(x)
+        x_right = x
+
+        x0, x1, x2 = run_branches(self.branch_executor, [
+            lambda: self.comb0_left(x_left) + self.comb0_right(x_right),
+            lambda: self.comb1_left(x_left) + self.comb1_right(x_right),
+            lambda: self.comb2_left(x_left) + self.comb2_right(x_right)])
+        x3, x4 = run_branches(self.branch_executor, [
+            lambda: x1 + self.comb3_right(x0),
+            lambda: self.comb4_left(x0) + self.comb4_right(x_left)])
+
+        x_out = torch.cat((x1, x2, x3, x4), dim=1)
+        return x_out
+
 
 class Stem2Unit(nn.Module):
     """
@@ -697,6 +722,7 @@ class Stem2Unit(nn.Module):
                  out_channels,
                  extra_padding):
         super(Stem2Unit, self).__init__()
+        self.branch_executor = None
         mid_channels = out_channels // 4
 
         self.conv1x1 = nas_conv1x1(
@@ -736,6 +762,8 @@ class Stem2Unit(nn.Module):
         self.comb4_right = NasMaxPoolBlock(extra_padding=extra_padding)
 
     def forward(self, x, x_prev):
+        if self.branch_executor is not None:
+            return self._forward_concurrent(x, x_prev)
         x_left = self.conv1x1(x)
         x_right = self.path(x_prev)
 
@@ -748,6 +776,23 @@ class Stem2Unit(nn.Module):
         x_out = torch.cat((x1, x2, x3, x4), dim=1)
         return x_out
 
+    @torch.jit.unused
+    def _forward_concurrent(self, x, x_prev):
+        x_left, x_right = run_branches(self.branch_executor, [
+            lambda: self.conv1x1(x),
+            lambda: self.path(x_prev)])
+
+        x0, x1, x2 = run_branches(self.branch_executor, [
+            lambda: self.comb0_left(x_left) + self.comb0_right(x_right),
+            lambda: self.comb1_left(x_left) + self.comb1_right(x_right),
+            lambda: self.comb2_left(x_left) + self.comb2_right(x_right)])
+        x3, x4 = run_branches(self.branch_executor, [
+            lambda: x1 + self.comb3_right(x0),
+            lambda: self.comb4_left(x0) + self.comb4_right(x_left)])
+
+        x_out = torch.cat((x1, x2, x3, x4), dim=1)
+        return x_out
+
 
 class FirstUnit(nn.Module):
     """
@@ -767,6 +812,7 @@ class FirstUnit(nn.Module):
                  prev_in_channels,
                  out_channels):
         super(FirstUnit, self).__init__()
+        self.branch_executor = None
         mid_channels = out_channels // 6
 
         self.conv1x1 = nas_conv1x1(
@@ -801,6 +847,8 @@ class FirstUnit(nn.Module):
             out_channels=mid_channels)
 
     def forward(self, x, x_prev):
+        if self.branch_executor is not None:
+            return self._forward_concurrent(x, x_prev)
         x_left = self.conv1x1(x)
         x_right = self.path(x_prev)
 
@@ -813,6 +861,22 @@ class FirstUnit(nn.Module):
         x_out = torch.cat((x_right, x0, x1, x2, x3, x4), dim=1)
         return x_out
 
+    @torch.jit.unused
+    def _forward_concurrent(self, x, x_prev):
+        x_left, x_right = run_branches(self.branch_executor, [
+            lambda: self.conv1x1(x),
+            lambda: self.path(x_prev)])
+
+        x0, x1, x2, x3, x4 = run_branches(self.branch_executor, [
+            lambda: self.comb0_left(x_left) + self.comb0_right(x_right),
+            lambda: self.comb1_left(x_right) + self.comb1_right(x_right),
+            lambda: self.comb2_left(x_left) + x_right,
+            lambda: self.comb3_left(x_right) + self.comb3_right(x_right),
+            lambda: self.comb4_left(x_left) + x_left])
+
+        x_out = torch.cat((x_right, x0, x1, x2, x3, x4), dim=1)
+        return x_out
+
 
 class NormalUnit(nn.Module):
     """
@@ -832,6 +896,7 @@ class NormalUnit(nn.Module):
                  prev_in_channels,
                  out_channels):
         super(NormalUnit, self).__init__()
+        self.branch_executor = None
         mid_channels = out_channels // 6
 
         self.conv1x1_prev = nas_conv1x1(
@@ -865,6 +930,8 @@ class NormalUnit(nn.Module):
             out_channels=mid_channels)
 
     def forward(self, x, x_prev):
+        if self.branch_executor is not None:
+            return self._forward_concurrent(x, x_prev)
         x_left = self.conv1x1(x)
         x_right = self.conv1x1_prev(x_prev)
 
@@ -877,6 +944,22 @@ class NormalUnit(nn.Module):
         x_out = torch.cat((x_right, x0, x1, x2, x3, x4), dim=1)
         return x_out
 
+    @torch.jit.unused
+    def _forward_concurrent(self, x, x_prev):
+        x_left, x_right = run_branches(self.branch_executor, [
+            lambda: self.conv1x1(x),
+            lambda: self.conv1x1_prev(x_prev)])
+
+        x0, x1, x2, x3, x4 = run_branches(self.branch_executor, [
+            lambda: self.comb0_left(x_left) + self.comb0_right(x_right),
+            lambda: self.comb1_left(x_right) + self.comb1_right(x_right),
+            lambda: self.comb2_left(x_left) + x_right,
+            lambda: self.comb3_left(x_right) + self.comb3_right(x_right),
+            lambda: self.comb4_left(x_left) + x_left])
+
+        x_out = torch.cat((x_right, x0, x1, x2, x3, x4), dim=1)
+        return x_out
+
 
 class ReductionBaseUnit(nn.Module):
     """
@@ -899,6 +982,7 @@ class ReductionBaseUnit(nn.Module):
                  out_channels,
                  extra_padding=True):
         super(ReductionBaseUnit, self).__init__()
+        self.branch_executor = None
         self.skip_input = True
         mid_channels = out_channels // 4
 
@@ -939,6 +1023,8 @@ class ReductionBaseUnit(nn.Module):
         self.comb4_right = NasMaxPoolBlock(extra_padding=extra_padding)
 
     def forward(self, x, x_prev):
+        if self.branch_executor is not None:
+            return self._forward_concurrent(x, x_prev)
         x_left = self.conv1x1(x)
         x_right = self.conv1x1_prev(x_prev)
 
@@ -951,6 +1037,23 @@ class ReductionBaseUnit(nn.Module):
         x_out = torch.cat((x1, x2, x3, x4), dim=1)
         return x_out
 
+    @torch.jit.unused
+    def _forward_concurrent(self, x, x_prev):
+        x_left, x_right = run_branches(self.branch_executor, [
+            lambda: self.conv1x1(x),
+            lambda: self.conv1x1_prev(x_prev)])
+
+        x0, x1, x2 = run_branches(self.branch_executor, [
+            lambda: self.comb0_left(x_left) + self.comb0_right(x_right),
+            lambda: self.comb1_left(x_left) + self.comb1_right(x_right),
+            lambda: self.comb2_left(x_left) + self.comb2_right(x_right)])
+        x3, x4 = run_branches(self.branch_executor, [
+            lambda: x1 + self.comb3_right(x0),
+            lambda: self.comb4_left(x0) + self.comb4_right(x_left)])
+
+        x_out = torch.cat((x1, x2, x3, x4), dim=1)
+        return x_out
+
 
 class Reduction1Unit(ReductionBaseUnit):
     """
@@ -1046,8 +1149,6 @@ class NASNet(nn.Module):
         Number of output channels for the initial unit.
     stem_blocks_channels : list of 2 int
         Number of output channels for the Stem units.
-    final_pool_size : int
-        Size of the pooling windows for final pool.
     extra_padding : bool
         Whether to use extra padding.
     skip_reduction_layer_input : bool
@@ -1063,7 +1164,6 @@ class NASNet(nn.Module):
                  channels,
                  init_block_channels,
                  stem_blocks_channels,
-                 final_pool_size,
                  extra_padding,
                  skip_reduction_layer_input,
                  in_channels=3,
@@ -1124,9 +1224,7 @@ class NASNet(nn.Module):
             self.features.add_module("stage{}".format(i + 1), stage)
 
         self.features.add_module("activ", nn.ReLU())
-        self.features.add_module("final_pool", nn.AvgPool2d(
-            kernel_size=final_pool_size,
-            stride=1))
+        self.features.add_module("final_pool", nn.AdaptiveAvgPool2d(output_size=1))
 
         self.output = nn.Sequential()
         self.output.add_module('dropout', nn.Dropout(p=0.5))
@@ -1153,7 +1251,6 @@ class NASNet(nn.Module):
 def get_nasnet(repeat,
                penultimate_filters,
                init_block_channels,
-               final_pool_size,
                extra_padding,
                skip_reduction_layer_input,
                in_size,
@@ -1172,8 +1269,6 @@ def get_nasnet(repeat,
         Number of filters in the penultimate layer of the network.
     init_block_channels : int
         Number of output channels for the initial unit.
-    final_pool_size : int
-        Size of the pooling windows for final pool.
     extra_padding : bool
         Whether to use extra padding.
     skip_reduction_layer_input : bool
@@ -1201,7 +1296,6 @@ def get_nasnet(repeat,
         channels=channels,
         init_block_channels=init_block_channels,
         stem_blocks_channels=stem_blocks_channels,
-        final_pool_size=final_pool_size,
         extra_padding=extra_padding,
         skip_reduction_layer_input=skip_reduction_layer_input,
         in_size=in_size,
@@ -1235,7 +1329,6 @@ def nasnet_4a1056(**kwargs):
         repeat=4,
         penultimate_filters=1056,
         init_block_channels=32,
-        final_pool_size=7,
         extra_padding=True,
         skip_reduction_layer_input=False,
         in_size=(224, 224),
@@ -1259,7 +1352,6 @@ def nasnet_6a4032(**kwargs):
         repeat=6,
         penultimate_filters=4032,
         init_block_channels=96,
-        final_pool_size=11,
         extra_padding=False,
         skip_reduction_layer_input=True,
         in_size=(331, 331),
@@ -108,9 +108,7 @@ class CIFARNIN(nn.Module):
             in_channels=in_channels,
             out_channels=num_classes,
             kernel_size=1))
-        self.output.add_module('final_pool', nn.AvgPool2d(
-            kernel_size=8,
-            stride=1))
+        self.output.add_module('final_pool', nn.AdaptiveAvgPool2d(output_size=1))
 
         self._init_params()
 
@@ -9,7 +9,7 @@ import os
 import torch
 import torch.nn as nn
 import torch.nn.init as init
-from .common import conv1x1_block, conv3x3_block, Concurrent
+from .common import conv1x1_block, conv3x3_block, Concurrent, DenseSequential
 
 
 class PeleeBranch1(nn.Module):
@@ -148,6 +148,7 @@ class DenseBlock(nn.Module):
                  bottleneck_size):
         super(DenseBlock, self).__init__()
         inc_channels = (out_channels - in_channels) // 2
+        self.inc_channels = 2 * inc_channels
         mid_channels = inc_channels * bottleneck_size
 
         self.branch1 = PeleeBranch1(
@@ -159,11 +160,13 @@ class DenseBlock(nn.Module):
             out_channels=inc_channels,
             mid_channels=mid_channels)
 
-    def forward(self, x):
+    def forward_inc(self, x):
         x1 = self.branch1(x)
         x2 = self.branch2(x)
-        x = torch.cat((x, x1, x2), dim=1)
-        return x
+        return torch.cat((x1, x2), dim=1)
+
+    def forward(self, x):
+        return torch.cat((x, self.forward_inc(x)), dim=1)
 
 
 class TransitionBlock(nn.Module):
@@ -237,7 +240,7 @@ class PeleeNet(nn.Module):
         in_channels = init_block_channels
         for i, channels_per_stage in enumerate(channels):
             bottleneck_size = bottleneck_sizes[i]
-            stage = nn.Sequential()
+            stage = DenseSequential()
             if i != 0:
                 stage.add_module("trans{}".format(i + 1), TransitionBlock(
                     in_channels=in_channels,
@@ -252,9 +255,7 @@ class PeleeNet(nn.Module):
         self.features.add_module("final_block", conv1x1_block(
             in_channels=in_channels,
             out_channels=in_channels))
-        self.features.add_module("final_pool", nn.AvgPool2d(
-            kernel_size=7,
-            stride=1))
+        self.features.add_module("final_pool", nn.AdaptiveAvgPool2d(output_size=1))
 
         self.output = nn.Sequential()
         self.output.add_module('dropout', nn.Dropout(p=dropout_rate))
@@ -10,7 +10,7 @@ import os
 import torch
 import torch.nn as nn
 import torch.nn.init as init
-from .common import conv1x1
+from .common import conv1x1, run_branches
 from .nasnet import nasnet_dual_path_sequential, nasnet_batch_norm, NasConv, NasDwsConv, NasPathBlock, NASNetInitBlock
 
 
@@ -25,6 +25,8 @@ class PnasMaxPoolBlock(nn.Module):
     extra_padding : bool, default False
         Whether to use extra padding.
     """
+    __constants__ = ["extra_padding"]
+
     def __init__(self,
                  stride=2,
                  extra_padding=False):
@@ -243,8 +245,11 @@ class PnasBaseUnit(nn.Module):
     """
     def __init__(self):
         super(PnasBaseUnit, self).__init__()
+        self.branch_executor = None
 
     def cell_forward(self, x, x_prev):
+        if self.branch_executor is not None:
+            return self._cell_forward_concurrent(x, x_prev)
         assert (hasattr(self, 'comb0_left'))
         x_left = x_prev
         x_right = x
@@ -253,7 +258,26 @@ class PnasBaseUnit(nn.Module):
         x1 = self.comb1_left(x_right) + self.comb1_right(x_right)
         x2 = self.comb2_left(x_right) + self.comb2_right(x_right)
         x3 = self.comb3_left(x2) + self.comb3_right(x_right)
-        x4 = self.comb4_left(x_left) + (self.comb4_right(x_right) if self.comb4_right else x_right)
+        x4 = self.comb4_left(x_left) + (self.comb4_right(x_right) if self.comb4_right is not None else x_right)
+
+        x_out = torch.cat((x0, x1, x2, x3, x4), dim=1)
+        return x_out
+
+    @torch.jit.unused
+    def _cell_forward_concurrent(self, x, x_prev):
+        x_left = x_prev
+        x_right = x
+
+        def comb23():
+            x2 = self.comb2_left(x_right) + self.comb2_right(x_right)
+            x3 = self.comb3_left(x2) + self.comb3_right(x_right)
+            return x2, x3
+
+        x0, x1, (x2, x3), x4 = run_branches(self.branch_executor, [
+            lambda: self.comb0_left(x_left) + self.comb0_right(x_left),
+            lambda: self.comb1_left(x_right) + self.comb1_right(x_right),
+            comb23,
+            lambda: self.comb4_left(x_left) + (self.comb4_right(x_right) if self.comb4_right is not None else x_right)])
 
         x_out = torch.cat((x0, x1, x2, x3, x4), dim=1)
         return x_out
@@ -417,11 +441,21 @@ class PnasUnit(PnasBaseUnit):
 
     def forward(self, x, x_prev):
         # print("x.shape={}, x_prev.shape={}".format(x.shape, x_prev.shape))
+        if self.branch_executor is not None:
+            return self._forward_concurrent(x, x_prev)
         x_prev = self.conv_prev_1x1(x_prev)
         x = self.conv_1x1(x)
         x_out = self.cell_forward(x, x_prev)
         return x_out
 
+    @torch.jit.unused
+    def _forward_concurrent(self, x, x_prev):
+        x_prev, x = run_branches(self.branch_executor, [
+            lambda: self.conv_prev_1x1(x_prev),
+            lambda: self.conv_1x1(x)])
+        x_out = self._cell_forward_concurrent(x, x_prev)
+        return x_out
+
 
 class PNASNet(nn.Module):
     """
@@ -486,9 +520,7 @@ class PNASNet(nn.Module):
             self.features.add_module("stage{}".format(i + 1), stage)
 
         self.features.add_module("activ", nn.ReLU())
-        self.features.add_module("final_pool", nn.AvgPool2d(
-            kernel_size=11,
-            stride=1))
+        self.features.add_module("final_pool", nn.AdaptiveAvgPool2d(output_size=1))
 
         self.output = nn.Sequential()
         self.output.add_module('dropout', nn.Dropout(p=0.5))
@@ -7,9 +7,11 @@
 __all__ = ['PolyNet', 'polynet']
 
 import os
+from functools import partial
+import torch
 import torch.nn as nn
 import torch.nn.init as init
-from .common import Concurrent, ParametricSequential, ParametricConcurrent
+from .common import Concurrent, ParametricSequential, ParametricConcurrent, run_branches
 
 
 class ConvBlock(nn.Module):
@@ -31,6 +33,8 @@ class ConvBlock(nn.Module):
     activate : bool, default True
         Whether activate the convolution block.
     """
+    __constants__ = ["activate"]
+
     def __init__(self,
                  in_channels,
                  out_channels,
@@ -160,8 +164,12 @@ class PolyConv(nn.Module):
         self.activ = nn.ReLU(inplace=True)
 
     def forward(self, x, index):
+        # type: (torch.Tensor, int) -> torch.Tensor
         x = self.conv(x)
-        x = self.bns[index](x)
+        # A module list can't be indexed by a variable in TorchScript:
+        for i, bn in enumerate(self.bns):
+            if i == index:
+                x = bn(x)
         x = self.activ(x)
         return x
 
@@ -344,6 +352,7 @@ class PolyConvSeqBranch(nn.Module):
             in_channels = out_channels
 
     def forward(self, x, index):
+        # type: (torch.Tensor, int) -> torch.Tensor
         x = self.conv_list(x, index=index)
         return x
 
@@ -473,6 +482,7 @@ class PolyPreBBlock(nn.Module):
             num_blocks=num_blocks))
 
     def forward(self, x, index):
+        # type: (torch.Tensor, int) -> torch.Tensor
         x = self.branches(x, index=index)
         return x
 
@@ -509,6 +519,7 @@ class PolyPreCBlock(nn.Module):
             num_blocks=num_blocks))
 
     def forward(self, x, index):
+        # type: (torch.Tensor, int) -> torch.Tensor
         x = self.branches(x, index=index)
         return x
 
@@ -553,6 +564,7 @@ class MultiResidual(nn.Module):
                  res_block,
                  num_blocks):
         super(MultiResidual, self).__init__()
+        self.branch_executor = None
         assert (num_blocks >= 1)
         self.scale = scale
 
@@ -561,8 +573,12 @@ class MultiResidual(nn.Module):
 
     def forward(self, x):
         out = x
-        for res_block in self.res_blocks:
-            out = out + self.scale * res_block(x)
+        if self.branch_executor is None:
+            for res_block in self.res_blocks:
+                out = out + self.scale * res_block(x)
+        else:
+            for y in run_branches(self.branch_executor, [partial(res_block, x) for res_block in self.res_blocks]):
+                out = out + self.scale * y
         out = self.activ(out)
         return out
 
@@ -934,9 +950,7 @@ class PolyNet(nn.Module):
                         poly_scale=poly_scale))
             self.features.add_module("stage{}".format(i + 1), stage)
 
-        self.features.add_module('final_pool', nn.AvgPool2d(
-            kernel_size=9,
-            stride=1))
+        self.features.add_module('final_pool', nn.AdaptiveAvgPool2d(output_size=1))
 
         self.output = nn.Sequential()
         self.output.add_module('dropout', nn.Dropout(p=dropout_rate))
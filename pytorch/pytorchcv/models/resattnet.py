@@ -65,6 +65,8 @@ class ResBlock(nn.Module):
     stride : int or tuple/list of 2 int, default 1
         Strides of the convolution.
     """
+    __constants__ = ["resize_identity"]
+
     def __init__(self,
                  in_channels,
                  out_channels,
@@ -103,7 +105,7 @@ class InterpolationBlock(nn.Module):
     def __init__(self,
                  scale_factor):
         super(InterpolationBlock, self).__init__()
-        self.scale_factor = scale_factor
+        self.scale_factor = float(scale_factor)
 
     def forward(self, x):
         return F.interpolate(
@@ -439,9 +441,7 @@ class ResAttNet(nn.Module):
                 in_channels = out_channels
             self.features.add_module("stage{}".format(i + 1), stage)
         self.features.add_module('post_activ', PreActivation(in_channels=in_channels))
-        self.features.add_module('final_pool', nn.AvgPool2d(
-            kernel_size=7,
-            stride=1))
+        self.features.add_module('final_pool', nn.AdaptiveAvgPool2d(output_size=1))
 
         self.output = nn.Linear(
             in_features=in_channels,
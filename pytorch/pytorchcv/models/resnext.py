@@ -78,6 +78,8 @@ class ResNeXtUnit(nn.Module):
     bottleneck_width: int
         Width of bottleneck block.
     """
+    __constants__ = ["resize_identity"]
+
     def __init__(self,
                  in_channels,
                  out_channels,
@@ -162,9 +164,7 @@ class ResNeXt(nn.Module):
                     bottleneck_width=bottleneck_width))
                 in_channels = out_channels
             self.features.add_module("stage{}".format(i + 1), stage)
-        self.features.add_module("final_pool", nn.AvgPool2d(
-            kernel_size=7,
-            stride=1))
+        self.features.add_module("final_pool", nn.AdaptiveAvgPool2d(output_size=1))
 
         self.output = nn.Linear(
             in_features=in_channels,
@@ -80,6 +80,8 @@ class SENetUnit(nn.Module):
     identity_conv3x3 : bool, default False
         Whether to use 3x3 convolution in the identity link.
     """
+    __constants__ = ["resize_identity"]
+
     def __init__(self,
                  in_channels,
                  out_channels,
@@ -216,9 +218,7 @@ class SENet(nn.Module):
                     identity_conv3x3=identity_conv3x3))
                 in_channels = out_channels
             self.features.add_module("stage{}".format(i + 1), stage)
-        self.features.add_module("final_pool", nn.AvgPool2d(
-            kernel_size=7,
-            stride=1))
+        self.features.add_module("final_pool", nn.AdaptiveAvgPool2d(output_size=1))
 
         self.output = nn.Sequential()
         self.output.add_module("dropout", nn.Dropout(p=0.2))
@@ -32,6 +32,8 @@ class ShuffleUnit(nn.Module):
     ignore_group : bool
         Whether ignore group value in the first convolution layer.
     """
+    __constants__ = ["downsample"]
+
     def __init__(self,
                  in_channels,
                  out_channels,
@@ -169,9 +171,7 @@ class ShuffleNet(nn.Module):
                     ignore_group=ignore_group))
                 in_channels = out_channels
             self.features.add_module("stage{}".format(i + 1), stage)
-        self.features.add_module('final_pool', nn.AvgPool2d(
-            kernel_size=7,
-            stride=1))
+        self.features.add_module('final_pool', nn.AdaptiveAvgPool2d(output_size=1))
 
         self.output = nn.Linear(
             in_features=in_channels,
@@ -30,6 +30,8 @@ class ShuffleUnit(nn.Module):
     use_residual : bool
         Whether to use residual connection.
     """
+    __constants__ = ["downsample", "use_se", "use_residual"]
+
     def __init__(self,
                  in_channels,
                  out_channels,
@@ -188,9 +190,7 @@ class ShuffleNetV2(nn.Module):
             in_channels=in_channels,
             out_channels=final_block_channels))
         in_channels = final_block_channels
-        self.features.add_module('final_pool', nn.AvgPool2d(
-            kernel_size=7,
-            stride=1))
+        self.features.add_module('final_pool', nn.AdaptiveAvgPool2d(output_size=1))
 
         self.output = nn.Linear(
             in_features=in_channels,
@@ -32,6 +32,8 @@ class ShuffleUnit(nn.Module):
     shuffle_group_first : bool
         Whether to use channel shuffle in group first mode.
     """
+    __constants__ = ["downsample", "use_se", "use_residual"]
+
     def __init__(self,
                  in_channels,
                  out_channels,
@@ -197,9 +199,7 @@ class ShuffleNetV2b(nn.Module):
             in_channels=in_channels,
             out_channels=final_block_channels))
         in_channels = final_block_channels
-        self.features.add_module('final_pool', nn.AvgPool2d(
-            kernel_size=7,
-            stride=1))
+        self.features.add_module('final_pool', nn.AdaptiveAvgPool2d(output_size=1))
 
         self.output = nn.Linear(
             in_features=in_channels,
@@ -6,7 +6,7 @@
 __all__ = ['SparseNet', 'sparsenet121', 'sparsenet161', 'sparsenet169', 'sparsenet201', 'sparsenet264']
 
 import os
-import math
+from typing import List
 import torch
 import torch.nn as nn
 import torch.nn.init as init
@@ -16,20 +16,26 @@ from .densenet import TransitionBlock
 
 
 def sparsenet_exponential_fetch(lst):
+    # type: (List[torch.Tensor]) -> List[torch.Tensor]
     """
     SparseNet's specific exponential fetch.
 
     Parameters:
     ----------
-    lst : list
-        List of something.
+    lst : list of Tensor
+        List of tensors.
 
     Returns
     -------
-    list
+    list of Tensor
         Filtered list.
     """
-    return [lst[len(lst) - 2**i] for i in range(1 + math.floor(math.log(len(lst), 2)))]
+    out = []
+    i = 1
+    while i <= len(lst):
+        out.append(lst[len(lst) - i])
+        i *= 2
+    return out
 
 
 class SparseBlock(nn.Module):
@@ -45,6 +51,8 @@ class SparseBlock(nn.Module):
     dropout_rate : bool
         Parameter of Dropout layer. Faction of the input units to drop.
     """
+    __constants__ = ["use_dropout"]
+
     def __init__(self,
                  in_channels,
                  out_channels,
@@ -88,6 +96,8 @@ class SparseStage(nn.Module):
     do_transition : bool
         Whether use transition block.
     """
+    __constants__ = ["do_transition"]
+
     def __init__(self,
                  in_channels,
                  channels_per_stage,
@@ -114,11 +124,11 @@ class SparseStage(nn.Module):
         if self.do_transition:
             x = self.trans(x)
         outs = [x]
-        for block in self.blocks._modules.values():
+        for block in self.blocks:
             y = block(x)
             outs.append(y)
             flt_outs = sparsenet_exponential_fetch(outs)
-            x = torch.cat(tuple(flt_outs), dim=1)
+            x = torch.cat(flt_outs, dim=1)
         return x
 
 
@@ -170,9 +180,7 @@ class SparseNet(nn.Module):
             in_channels = channels_per_stage[-1]
             self.features.add_module("stage{}".format(i + 1), stage)
         self.features.add_module("post_activ", PreResActivation(in_channels=in_channels))
-        self.features.add_module("final_pool", nn.AvgPool2d(
-            kernel_size=7,
-            stride=1))
+        self.features.add_module("final_pool", nn.AdaptiveAvgPool2d(output_size=1))
 
         self.output = nn.Linear(
             in_features=in_channels,
@@ -63,6 +63,8 @@ class FireUnit(nn.Module):
     residual : bool
         Whether use residual connection.
     """
+    __constants__ = ["residual"]
+
     def __init__(self,
                  in_channels,
                  squeeze_channels,
@@ -196,9 +198,7 @@ class SqueezeNet(nn.Module):
             out_channels=num_classes,
             kernel_size=1))
         self.output.add_module('final_activ', nn.ReLU(inplace=True))
-        self.output.add_module('final_pool', nn.AvgPool2d(
-            kernel_size=13,
-            stride=1))
+        self.output.add_module('final_pool', nn.AdaptiveAvgPool2d(output_size=1))
 
         self._init_params()
 
@@ -24,6 +24,8 @@ class SqnxtUnit(nn.Module):
     stride : int or tuple/list of 2 int
         Strides of the convolution.
     """
+    __constants__ = ["resize_identity"]
+
     def __init__(self,
                  in_channels,
                  out_channels,
@@ -172,9 +174,7 @@ class SqueezeNext(nn.Module):
             out_channels=final_block_channels,
             bias=True))
         in_channels = final_block_channels
-        self.features.add_module('final_pool', nn.AvgPool2d(
-            kernel_size=7,
-            stride=1))
+        self.features.add_module('final_pool', nn.AdaptiveAvgPool2d(output_size=1))
 
         self.output = nn.Linear(
             in_features=in_channels,
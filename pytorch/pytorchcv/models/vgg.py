@@ -33,6 +33,7 @@ class VGGConv(nn.Module):
     use_bn : bool
         Whether to use BatchNorm layers.
     """
+    __constants__ = ["use_bn"]
 
     def __init__(self,
                  in_channels,
@@ -29,6 +29,8 @@ class WRNConv(nn.Module):
     activate : bool
         Whether activate the convolution block.
     """
+    __constants__ = ["activate"]
+
     def __init__(self,
                  in_channels,
                  out_channels,
@@ -171,6 +173,8 @@ class WRNUnit(nn.Module):
     width_factor : float
         Wide scale factor for width of layers.
     """
+    __constants__ = ["resize_identity"]
+
     def __init__(self,
                  in_channels,
                  out_channels,
@@ -282,9 +286,7 @@ class WRN(nn.Module):
                     width_factor=width_factor))
                 in_channels = out_channels
             self.features.add_module("stage{}".format(i + 1), stage)
-        self.features.add_module('final_pool', nn.AvgPool2d(
-            kernel_size=7,
-            stride=1))
+        self.features.add_module('final_pool', nn.AdaptiveAvgPool2d(output_size=1))
 
         self.output = nn.Linear(
             in_features=in_channels,
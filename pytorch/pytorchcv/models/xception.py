@@ -29,6 +29,8 @@ class ConvBlock(nn.Module):
     activate : bool
         Whether activate the convolution block.
     """
+    __constants__ = ["activate"]
+
     def __init__(self,
                  in_channels,
                  out_channels,
@@ -178,6 +180,8 @@ class DwsConvBlock(nn.Module):
     activate : bool
         Whether activate the convolution block.
     """
+    __constants__ = ["activate"]
+
     def __init__(self,
                  in_channels,
                  out_channels,
@@ -249,6 +253,8 @@ class XceptionUnit(nn.Module):
     grow_first : bool, default True
         Whether start from growing.
     """
+    __constants__ = ["resize_identity"]
+
     def __init__(self,
                  in_channels,
                  out_channels,
@@ -345,9 +351,7 @@ class XceptionFinalBlock(nn.Module):
             out_channels=2048,
             activate=True)
         self.activ = nn.ReLU(inplace=True)
-        self.pool = nn.AvgPool2d(
-            kernel_size=10,
-            stride=1)
+        self.pool = nn.AdaptiveAvgPool2d(output_size=1)
 
     def forward(self, x):
         x = self.conv1(x)
@@ -5,6 +5,8 @@ import numpy as np
 import torch.utils.data
 
 from .pytorchcv.model_provider import get_model
+from .pytorchcv.models.common import DenseSequential
+from .prune_channels import apply_channel_spec, load_channel_spec
 
 
 def prepare_pt_context(num_gpus,
@@ -21,11 +23,23 @@ def prepare_model(model_name,
                   use_data_parallel=True,
                   ignore_extra=False,
                   remap_to_cpu=False,
-                  remove_module=False):
+                  remove_module=False,
+                  channel_spec_file_path='',
+                  use_dense_buffer=False):
     kwargs = {'pretrained': use_pretrained}
 
     net = get_model(model_name, **kwargs)
 
+    if use_dense_buffer:
+        for module in net.modules():
+            if isinstance(module, DenseSequential):
+                module.preallocate = True
+
+    if channel_spec_file_path:
+        assert (os.path.isfile(channel_spec_file_path))
+        logging.info('Applying channel specification: {}'.format(channel_spec_file_path))
+        apply_channel_spec(net, load_channel_spec(channel_spec_file_path))
+
     if pretrained_model_file_path:
         assert (os.path.isfile(pretrained_model_file_path))
         logging.info('Loading model: {}'.format(pretrained_model_file_path))
@@ -57,6 +71,30 @@ def prepare_model(model_name,
     return net
 
 
+def copy_to_cpu(obj):
+    """
+    Recursively copy all tensors in a (nested) state object into host memory.
+
+    Parameters:
+    ----------
+    obj : object
+        Tensor, dict, list, tuple or a plain value.
+
+    Returns
+    -------
+    object
+        Copy of the object with CPU tensors.
+    """
+    if torch.is_tensor(obj):
+        return obj.detach().to('cpu', copy=True)
+    elif isinstance(obj, dict):
+        return type(obj)((k, copy_to_cpu(v)) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple)):
+        return type(obj)(copy_to_cpu(v) for v in obj)
+    else:
+        return obj
+
+
 def calc_net_weight_count(net):
     net.train()
     net_params = filter(lambda p: p.requires_grad, net.parameters())
@@ -96,7 +134,7 @@ def accuracy(output, target, topk=(1,)):
 
         res = []
         for k in topk:
-            correct_k = correct[:k].view(-1).float().sum(0, keepdim=True)
+            correct_k = correct[:k].reshape(-1).float().sum(0, keepdim=True)
             res.append(correct_k.mul_(1.0 / batch_size))
         return res
 
@@ -0,0 +1,152 @@
+"""
+    Runner of concurrent CIFAR training trials over a hyperparameter grid. Each trial is pinned to a disjoint set of CPU
+    cores and all trials read one memory-mapped copy of the dataset, e.g.:
+
+        python run_cifar_trials.py --num-parallel 8 --grid model=resnet20_cifar10,resnet56_cifar10 --grid lr=0.1,0.05
+            --grid seed=1,2 --save-dir ../trials -- --num-epochs 200 -j 2
+
+    Rerunning the same command after an interruption resumes unfinished trials from their last checkpoints.
+"""
+
+import argparse
+import os
+import sys
+
+from common.logger_utils import initialize_logging
+from common.cifar_cache import prepare_cifar_cache
+from common.trial_runner import parse_grid, split_cpu_sets, Trial, run_trials, get_result_table, write_result_table
+
+
+checkpoint_file_exts_dict = {
+    'train_pt_cifar.py': ('.pth', '.states'),
+    'train_gl_cifar.py': ('.params', '.states'),
+}
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description='Run concurrent CIFAR training trials over a hyperparameter grid',
+        formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument(
+        '--script',
+        type=str,
+        default='train_pt_cifar.py',
+        choices=list(checkpoint_file_exts_dict.keys()),
+        help='training script')
+    parser.add_argument(
+        '--dataset',
+        type=str,
+        default="CIFAR10",
+        help='dataset name. options are CIFAR10 and CIFAR100')
+    parser.add_argument(
+        '--data-dir',
+        type=str,
+        default='',
+        help='path to directory with the dataset (the default one of the training script by default)')
+    parser.add_argument(
+        '--data-cache-dir',
+        type=str,
+        default='',
+        help='directory for the memory-mapped copy of the dataset (`cache` subdirectory of the data directory by '
+             'default)')
+
+    parser.add_argument(
+        '--grid',
+        type=str,
+        action='append',
+        required=True,
+        help='grid parameter with values, e.g. `lr=0.1,0.05` (an option of the training script), can be repeated')
+    parser.add_argument(
+        '-k',
+        '--num-parallel',
+        type=int,
+        default=2,
+        help='number of concurrent trials')
+    parser.add_argument(
+        '--cpus-per-trial',
+        type=int,
+        default=0,
+        help='number of CPU cores pinned to a trial (available cores are shared evenly if 0)')
+    parser.add_argument(
+        '--poll-interval',
+        type=float,
+        default=5.0,
+        help='interval of polling trial processes (in seconds)')
+
+    parser.add_argument(
+        '--save-dir',
+        type=str,
+        default='trials',
+        help='directory of trial directories, result table and log-file')
+    parser.add_argument(
+        '--results-file-name',
+        type=str,
+        default='results.tsv',
+        help='filename of the result table')
+    parser.add_argument(
+        '--logging-file-name',
+        type=str,
+        default='trials.log',
+        help='filename of runner log')
+    parser.add_argument(
+        'command',
+        nargs=argparse.REMAINDER,
+        help='common options of the training script')
+    args = parser.parse_args()
+    return args
+
+
+def main():
+    args = parse_args()
+
+    _, log_file_exist = initialize_logging(
+        logging_dir_path=args.save_dir,
+        logging_file_name=args.logging_file_name,
+        script_args=args,
+        log_packages=None,
+        log_pip_packages=None)
+
+    data_dir = args.data_dir if args.data_dir else os.path.join('..', 'imgclsmob_data', args.dataset.lower())
+    data_cache_dir = args.data_cache_dir if args.data_cache_dir else os.path.join(data_dir, 'cache')
+    for train in [True, False]:
+        prepare_cifar_cache(
+            cache_dir_path=data_cache_dir,
+            data_dir=data_dir,
+            dataset_name=args.dataset,
+            train=train)
+
+    command = args.command
+    if command and command[0] == '--':
+        command = command[1:]
+    base_command = [
+        sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), args.script),
+        '--dataset', args.dataset,
+        '--data-dir', data_dir,
+        '--data-cache-dir', data_cache_dir] + command
+
+    trials = [Trial(params, args.save_dir) for params in parse_grid(args.grid)]
+    assert (len(set([trial.name for trial in trials])) == len(trials)), "Grid has duplicated trials"
+    cpus = os.sched_getaffinity(0) if hasattr(os, 'sched_getaffinity') else range(os.cpu_count())
+    cpu_sets = split_cpu_sets(
+        cpus=list(cpus),
+        num_parallel=min(args.num_parallel, len(trials)),
+        cpus_per_trial=args.cpus_per_trial)
+
+    try:
+        num_failed = run_trials(
+            trials=trials,
+            base_command=base_command,
+            cpu_sets=cpu_sets,
+            checkpoint_file_exts=checkpoint_file_exts_dict[args.script],
+            poll_interval=args.poll_interval)
+    finally:
+        columns, rows = get_result_table(trials)
+        write_result_table(
+            columns=columns,
+            rows=rows,
+            file_path=os.path.join(args.save_dir, args.results_file_name))
+    sys.exit(1 if num_failed > 0 else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,290 @@
+"""
+    ImageNet-1K as sharded LMDB files for TensorPack dataflows.
+
+    Each split is serialized (by `LMDBSerializer`) into a number of LMDB shards with [JPEG bytes, label] datapoints
+    and a small JSON index with shard sizes. The training split is shuffled once at building, so a reader goes through
+    shards sequentially (in a random shard order per epoch) and only needs a local shuffle buffer. This replaces
+    per-file reads of 1.28M images, that defeat the page cache and load network filesystems.
+"""
+
+__all__ = ['add_data_format_parser_arguments', 'get_lmdb_index_file_path', 'create_lmdb_shards',
+           'ShardedLMDBDataFlow', 'get_imagenet_lmdb_dataflow', 'measure_dataflow_speed']
+
+import os
+import json
+import math
+import time
+import logging
+import multiprocessing
+import numpy as np
+import cv2
+import lmdb
+from tensorpack.utils.serialize import loads
+from tensorpack.dataflow import imgaug, dataset, DataFromList, MapData, RNGDataFlow, LMDBSerializer,\
+    LocallyShuffleData, MultiProcessMapDataZMQ, MultiThreadMapData, BatchData, PrefetchDataZMQ
+
+
+def add_data_format_parser_arguments(parser):
+    parser.add_argument(
+        '--data-format',
+        type=str,
+        default='folder',
+        choices=['folder', 'lmdb'],
+        help='format of the dataset: image files or sequentially read LMDB shards (see datasets/prep_imagenet_lmdb.py)')
+    parser.add_argument(
+        '--lmdb-dir',
+        type=str,
+        default='',
+        help='directory with LMDB shards (`lmdb` subdirectory of the data directory by default)')
+    parser.add_argument(
+        '--shuffle-buffer-size',
+        type=int,
+        default=10000,
+        help='size of the local shuffle buffer for training data in LMDB format')
+
+
+def get_lmdb_index_file_path(lmdb_dir_path,
+                             split):
+    """
+    Get the path of the shard index file for a split.
+
+    Parameters:
+    ----------
+    lmdb_dir_path : str
+        Directory with LMDB shards.
+    split : str
+        Split name ('train' or 'val').
+
+    Returns
+    -------
+    str
+        Path to the index file.
+    """
+    return os.path.join(lmdb_dir_path, "{}-index.json".format(split))
+
+
+def _read_image_bytes(dp):
+    file_path, label = dp
+    with open(file_path, "rb") as f:
+        return [np.frombuffer(f.read(), dtype=np.uint8), label]
+
+
+def _write_lmdb_shard(args):
+    samples, shard_file_path = args
+    ds = DataFromList([list(sample) for sample in samples], shuffle=False)
+    ds = MapData(ds, _read_image_bytes)
+    LMDBSerializer.save(ds, shard_file_path)
+    return len(samples)
+
+
+def create_lmdb_shards(data_dir,
+                       lmdb_dir_path,
+                       split,
+                       shard_size=20000,
+                       num_workers=4,
+                       meta_dir=None,
+                       seed=0):
+    """
+    Serialize a split of ImageNet-1K (in the layout of `dataset.ILSVRC12`) into LMDB shards with JPEG bytes and labels.
+
+    Parameters:
+    ----------
+    data_dir : str
+        Path to directory with ImageNet-1K dataset.
+    lmdb_dir_path : str
+        Directory for LMDB shards.
+    split : str
+        Split name ('train' or 'val').
+    shard_size : int, default 20000
+        Number of images in a shard.
+    num_workers : int, default 4
+        Number of processes writing shards.
+    meta_dir : str or None, default None
+        Directory with ILSVRC12 metadata (the TensorPack default one if None).
+    seed : int, default 0
+        Random seed for the shuffle of the training split.
+
+    Returns
+    -------
+    str
+        Path to the index file.
+    """
+    files_ds = dataset.ILSVRC12Files(data_dir, split, meta_dir=meta_dir, shuffle=False)
+    samples = [(os.path.join(files_ds.full_dir, file_name), label) for file_name, label in files_ds.imglist]
+    if split == "train":
+        np.random.RandomState(seed).shuffle(samples)
+
+    if not os.path.exists(lmdb_dir_path):
+        os.makedirs(lmdb_dir_path)
+    num_shards = int(math.ceil(float(len(samples)) / shard_size))
+    shard_file_names = ["{}-{:04d}.lmdb".format(split, i) for i in range(num_shards)]
+    tasks = [(samples[i * shard_size:(i + 1) * shard_size], os.path.join(lmdb_dir_path, shard_file_names[i]))
+             for i in range(num_shards)]
+    logging.info("Writing {} images of `{}` split into {} shards".format(len(samples), split, num_shards))
+    if num_workers > 1:
+        pool = multiprocessing.Pool(processes=num_workers)
+        shard_sizes = pool.map(_write_lmdb_shard, tasks, chunksize=1)
+        pool.close()
+        pool.join()
+    else:
+        shard_sizes = [_write_lmdb_shard(task) for task in tasks]
+
+    index = {
+        "split": split,
+        "num_samples": len(samples),
+        "shards": [{"file_name": file_name, "size": size} for file_name, size in zip(shard_file_names, shard_sizes)],
+    }
+    index_file_path = get_lmdb_index_file_path(lmdb_dir_path, split)
+    with open(index_file_path, "w") as f:
+        json.dump(index, f, indent=2)
+    return index_file_path
+
+
+class ShardedLMDBDataFlow(RNGDataFlow):
+    """
+    Dataflow over LMDB shards of a split (see `create_lmdb_shards`). Each shard is opened only while it is read by
+    a cursor in key order (i.e. sequentially), shards are read one after another (in a random order per epoch, if
+    shuffled). Yields [JPEG bytes, label] datapoints.
+
+    Parameters:
+    ----------
+    lmdb_dir_path : str
+        Directory with LMDB shards.
+    split : str
+        Split name ('train' or 'val').
+    shuffle : bool, default False
+        Whether to shuffle the order of shards.
+    """
+    def __init__(self,
+                 lmdb_dir_path,
+                 split,
+                 shuffle=False):
+        super(ShardedLMDBDataFlow, self).__init__()
+        with open(get_lmdb_index_file_path(lmdb_dir_path, split), "r") as f:
+            index = json.load(f)
+        self.num_samples = index["num_samples"]
+        self.shard_file_paths = [os.path.join(lmdb_dir_path, shard["file_name"]) for shard in index["shards"]]
+        self.shuffle = shuffle
+
+    def size(self):
+        return self.num_samples
+
+    def __len__(self):
+        return self.size()
+
+    def get_data(self):
+        shard_ids = np.arange(len(self.shard_file_paths))
+        if self.shuffle:
+            self.rng.shuffle(shard_ids)
+        for i in shard_ids:
+            env = lmdb.open(
+                self.shard_file_paths[i],
+                subdir=False,
+                readonly=True,
+                lock=False,
+                readahead=True,
+                map_size=1099511627776 * 2)
+            try:
+                with env.begin(write=False) as txn:
+                    for key, value in txn.cursor():
+                        if key != b"__keys__":
+                            yield loads(value)
+            finally:
+                env.close()
+
+    def __iter__(self):
+        return self.get_data()
+
+
+def get_imagenet_lmdb_dataflow(lmdb_dir_path,
+                               is_train,
+                               batch_size,
+                               augmentors,
+                               parallel=None,
+                               shuffle_buffer_size=10000):
+    """
+    Get an ImageNet-1K dataflow over LMDB shards with the same datapoints as `get_imagenet_dataflow` from image files
+    (BGR training images, RGB validation images). Shards are read sequentially in one process, JPEG decoding and
+    augmentation are parallel.
+
+    Parameters:
+    ----------
+    lmdb_dir_path : str
+        Directory with LMDB shards.
+    is_train : bool
+        Whether to get training or validation data.
+    batch_size : int
+        Batch size.
+    augmentors : list of ImageAugmentor
+        Augmentors.
+    parallel : int or None, default None
+        Number of decoding processes (threads for validation data).
+    shuffle_buffer_size : int, default 10000
+        Size of the local shuffle buffer for training data.
+
+    Returns
+    -------
+    DataFlow
+        Batched dataflow.
+    """
+    assert isinstance(augmentors, list)
+    if parallel is None:
+        parallel = min(40, multiprocessing.cpu_count() // 2)  # assuming hyperthreading
+    aug = imgaug.AugmentorList(augmentors)
+    if is_train:
+        ds = ShardedLMDBDataFlow(lmdb_dir_path, "train", shuffle=True)
+        ds = LocallyShuffleData(ds, shuffle_buffer_size)
+
+        def mapf(dp):
+            jpeg, cls = dp
+            im = cv2.imdecode(jpeg, cv2.IMREAD_COLOR)
+            im = aug.augment(im)
+            return im, cls
+        ds = MultiProcessMapDataZMQ(ds, parallel, mapf, buffer_size=2000, strict=False)
+        ds = BatchData(ds, batch_size, remainder=False)
+    else:
+        ds = ShardedLMDBDataFlow(lmdb_dir_path, "val", shuffle=False)
+
+        def mapf(dp):
+            jpeg, cls = dp
+            im = cv2.imdecode(jpeg, cv2.IMREAD_COLOR)
+            im = np.flip(im, axis=2)
+            im = aug.augment(im)
+            return im, cls
+        ds = MultiThreadMapData(ds, parallel, mapf, buffer_size=2000, strict=True)
+        ds = BatchData(ds, batch_size, remainder=True)
+        ds = PrefetchDataZMQ(ds, 1)
+    return ds
+
+
+def measure_dataflow_speed(ds,
+                           num_batches=200,
+                           num_warmup_batches=20):
+    """
+    Measure the speed of a batched dataflow.
+
+    Parameters:
+    ----------
+    ds : DataFlow
+        Batched dataflow.
+    num_batches : int, default 200
+        Number of timed batches.
+    num_warmup_batches : int, default 20
+        Number of batches before timing (worker startup, filling of buffers).
+
+    Returns
+    -------
+    float
+        Number of images per second.
+    """
+    ds.reset_state()
+    num_images = 0
+    tic = None
+    for i, dp in enumerate(ds):
+        if i == num_warmup_batches:
+            tic = time.time()
+        elif i > num_warmup_batches:
+            num_images += len(dp[1])
+        if i == num_warmup_batches + num_batches:
+            break
+    return num_images / (time.time() - tic)
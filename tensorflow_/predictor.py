@@ -0,0 +1,139 @@
+"""
+    Predictor for exported (frozen) TensorFlow models.
+
+    A model is exported by `tensorflow_.utils.export_frozen_model` (or export_tf.py) as a single frozen GraphDef file
+    (variables are turned into constants, BatchNorm is folded into convolutions and training ops are stripped) and a
+    small JSON file with the input/output description. This module depends on TensorFlow only, so a serving process
+    neither imports the model zoo nor rebuilds the graph and assigns variables.
+"""
+
+__all__ = ['get_export_file_paths', 'save_export_meta', 'load_export_meta', 'load_frozen_graph_def',
+           'FrozenGraphPredictor']
+
+import json
+import tensorflow as tf
+
+
+def get_export_file_paths(file_prefix):
+    """
+    Get paths of exported model files.
+
+    Parameters:
+    ----------
+    file_prefix : str
+        Path prefix of exported files.
+
+    Returns
+    -------
+    tuple of 2 str
+        Paths of the frozen graph and meta files.
+    """
+    return "{}.pb".format(file_prefix), "{}-meta.json".format(file_prefix)
+
+
+def save_export_meta(file_prefix,
+                     model_name,
+                     input_name,
+                     output_name,
+                     data_shape):
+    """
+    Save the input/output description of an exported model.
+
+    Parameters:
+    ----------
+    file_prefix : str
+        Path prefix of exported files.
+    model_name : str
+        Model name.
+    input_name : str
+        Name of the input node.
+    output_name : str
+        Name of the output node.
+    data_shape : tuple of 4 int
+        Input shape at export (the batch axis is dynamic).
+    """
+    meta = {
+        "model": model_name,
+        "input_name": input_name,
+        "output_name": output_name,
+        "data_shape": list(data_shape),
+    }
+    with open(get_export_file_paths(file_prefix)[1], "w") as f:
+        json.dump(meta, f, indent=2)
+
+
+def load_export_meta(file_prefix):
+    """
+    Load the input/output description of an exported model.
+
+    Parameters:
+    ----------
+    file_prefix : str
+        Path prefix of exported files.
+
+    Returns
+    -------
+    dict
+        Model name, input/output node names and input shape.
+    """
+    with open(get_export_file_paths(file_prefix)[1], "r") as f:
+        return json.load(f)
+
+
+def load_frozen_graph_def(file_path):
+    """
+    Load a frozen GraphDef from a file.
+
+    Parameters:
+    ----------
+    file_path : str
+        Path to the frozen graph file.
+
+    Returns
+    -------
+    GraphDef
+        Graph definition.
+    """
+    graph_def = tf.GraphDef()
+    with tf.gfile.GFile(file_path, "rb") as f:
+        graph_def.ParseFromString(f.read())
+    return graph_def
+
+
+class FrozenGraphPredictor(object):
+    """
+    Predictor, that runs an exported frozen graph in its own graph and session (any batch size is accepted).
+
+    Parameters:
+    ----------
+    file_prefix : str
+        Path prefix of exported files.
+    num_threads : int, default 0
+        Number of intra-op threads (0 means the TensorFlow default).
+    use_gpu : bool, default False
+        Whether to allow placing of ops on a GPU.
+    """
+    def __init__(self,
+                 file_prefix,
+                 num_threads=0,
+                 use_gpu=False):
+        super(FrozenGraphPredictor, self).__init__()
+        graph_file_path, _ = get_export_file_paths(file_prefix)
+        self.meta = load_export_meta(file_prefix)
+        self.graph = tf.Graph()
+        with self.graph.as_default():
+            tf.import_graph_def(load_frozen_graph_def(graph_file_path), name="")
+        self.input = self.graph.get_tensor_by_name(self.meta["input_name"] + ":0")
+        self.output = self.graph.get_tensor_by_name(self.meta["output_name"] + ":0")
+        config = tf.ConfigProto(intra_op_parallelism_threads=num_threads)
+        if use_gpu:
+            config.gpu_options.allow_growth = True
+        else:
+            config.device_count["GPU"] = 0
+        self.sess = tf.Session(graph=self.graph, config=config)
+
+    def __call__(self, x):
+        return self.sess.run(self.output, feed_dict={self.input: x})
+
+    def close(self):
+        self.sess.close()
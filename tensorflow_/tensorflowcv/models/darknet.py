@@ -70,8 +70,6 @@ class DarkNet(object):
         Number of output channels for each unit.
     odd_pointwise : bool
         Whether pointwise convolution layer is used for each odd unit.
-    avg_pool_size : int
-        Window size of the final average pooling.
     cls_activ : bool
         Whether classification convolution layer uses an activation.
     alpha : float, default 0.1
@@ -86,7 +84,6 @@ class DarkNet(object):
     def __init__(self,
                  channels,
                  odd_pointwise,
-                 avg_pool_size,
                  cls_activ,
                  alpha=0.1,
                  in_channels=3,
@@ -96,7 +93,6 @@ class DarkNet(object):
         super(DarkNet, self).__init__(**kwargs)
         self.channels = channels
         self.odd_pointwise = odd_pointwise
-        self.avg_pool_size = avg_pool_size
         self.cls_activ = cls_activ
         self.alpha = alpha
         self.in_channels = in_channels
@@ -150,7 +146,7 @@ class DarkNet(object):
             x = tf.nn.leaky_relu(x, alpha=self.alpha, name="output/final_activ")
         x = tf.layers.average_pooling2d(
             inputs=x,
-            pool_size=self.avg_pool_size,
+            pool_size=x.shape[2:4],
             strides=1,
             data_format='channels_first',
             name="output/final_pool")
@@ -187,18 +183,15 @@ def get_darknet(version,
     if version == 'ref':
         channels = [[16], [32], [64], [128], [256], [512], [1024]]
         odd_pointwise = False
-        avg_pool_size = 3
         cls_activ = True
     elif version == 'tiny':
         channels = [[16], [32], [16, 128, 16, 128], [32, 256, 32, 256], [64, 512, 64, 512, 128]]
         odd_pointwise = True
-        avg_pool_size = 14
         cls_activ = False
     elif version == '19':
         channels = [[32], [64], [128, 64, 128], [256, 128, 256], [512, 256, 512, 256, 512],
                     [1024, 512, 1024, 512, 1024]]
         odd_pointwise = False
-        avg_pool_size = 7
         cls_activ = False
     else:
         raise ValueError("Unsupported DarkNet version {}".format(version))
@@ -206,7 +199,6 @@ def get_darknet(version,
     net = DarkNet(
         channels=channels,
         odd_pointwise=odd_pointwise,
-        avg_pool_size=avg_pool_size,
         cls_activ=cls_activ,
         **kwargs)
 
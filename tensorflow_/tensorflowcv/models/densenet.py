@@ -198,7 +198,7 @@ class DenseNet(object):
             name="features/post_activ")
         x = tf.layers.average_pooling2d(
             inputs=x,
-            pool_size=7,
+            pool_size=x.shape[2:4],
             strides=1,
             data_format="channels_first",
             name="features/final_pool")
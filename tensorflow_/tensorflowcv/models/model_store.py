@@ -2,7 +2,7 @@
     Model store which provides pretrained models.
 """
 
-__all__ = ['get_model_file', 'load_state_dict', 'download_state_dict', 'init_variables_from_state_dict']
+__all__ = ['get_model_file', 'prefetch', 'load_state_dict', 'download_state_dict', 'init_variables_from_state_dict']
 
 import os
 import zipfile
@@ -101,7 +101,12 @@ _model_sha1 = {name: (error, checksum, repo_release_tag) for name, error, checks
     ('igcv3_w1', '0955', 'cb263e3aa49677b1b34bfa7af3b7d33be854dc4b', 'v0.0.126'),
     ('mnasnet', '1144', 'f2b84fc44eabe0722c84bdcb7748fa390c3c1162', 'v0.0.117')]}
 
-imgclsmob_repo_url = 'https://github.com/osmr/imgclsmob'
+imgclsmob_repo_url = os.environ.get('IMGCLSMOB_REPO_URL', 'https://github.com/osmr/imgclsmob')
+
+_default_model_store_dir_path = os.path.join('~', '.tensorflow', 'models')
+
+# Size of buffers for streaming of downloaded and extracted files:
+_chunk_size = 4 * 1024 * 1024
 
 
 def get_model_name_suffix_data(model_name):
@@ -111,11 +116,35 @@ def get_model_name_suffix_data(model_name):
     return error, sha1_hash, repo_release_tag
 
 
+def get_model_store_dir_path(local_model_store_dir_path=os.path.join('~', '.tensorflow', 'models')):
+    """
+    Get the directory for keeping pretrained models. The default location is replaced by a shared cache directory
+    if the `IMGCLSMOB_MODEL_STORE` environment variable is set (file names of different frameworks do not clash, so
+    one directory can be shared by all of them).
+
+    Parameters
+    ----------
+    local_model_store_dir_path : str, default $TENSORFLOW_HOME/models
+        Location for keeping the model parameters.
+
+    Returns
+    -------
+    str
+        Absolute path to the directory.
+    """
+    shared_dir_path = os.environ.get('IMGCLSMOB_MODEL_STORE', '')
+    if shared_dir_path and (local_model_store_dir_path == _default_model_store_dir_path):
+        local_model_store_dir_path = shared_dir_path
+    return os.path.abspath(os.path.expanduser(local_model_store_dir_path))
+
+
 def get_model_file(model_name,
                    local_model_store_dir_path=os.path.join('~', '.tensorflow', 'models')):
     """
     Return location for the pretrained on local file system. This function will download from online model zoo when
-    model cannot be found or has mismatch. The root directory will be created if it doesn't exist.
+    model cannot be found or has mismatch. The root directory will be created if it doesn't exist. It is safe to call
+    this function from concurrent processes and threads sharing the same directory: the file is downloaded only once
+    (under a file lock) and appears under its final name only after its hash is verified.
 
     Parameters
     ----------
@@ -135,39 +164,170 @@ def get_model_file(model_name,
         name=model_name,
         error=error,
         short_sha1=short_sha1)
-    local_model_store_dir_path = os.path.expanduser(local_model_store_dir_path)
+    local_model_store_dir_path = get_model_store_dir_path(local_model_store_dir_path)
     file_path = os.path.join(local_model_store_dir_path, file_name)
-    if os.path.exists(file_path):
-        if _check_sha1(file_path, sha1_hash):
-            return file_path
-        else:
-            logging.warning('Mismatch in the content of model file detected. Downloading again.')
-    else:
-        logging.info('Model file not found. Downloading to {}.'.format(file_path))
+    if os.path.exists(file_path) and _check_sha1(file_path, sha1_hash):
+        return file_path
 
     if not os.path.exists(local_model_store_dir_path):
         os.makedirs(local_model_store_dir_path)
 
-    zip_file_path = file_path + '.zip'
-    _download(
-        url='{repo_url}/releases/download/{repo_release_tag}/{file_name}.zip'.format(
-            repo_url=imgclsmob_repo_url,
-            repo_release_tag=repo_release_tag,
-            file_name=file_name),
-        path=zip_file_path,
-        overwrite=True)
-    with zipfile.ZipFile(zip_file_path) as zf:
-        zf.extractall(local_model_store_dir_path)
-    os.remove(zip_file_path)
-
-    if _check_sha1(file_path, sha1_hash):
-        return file_path
+    with _FileLock(file_path + '.lock'):
+        # The file could be downloaded by another worker while we were waiting for the lock:
+        if os.path.exists(file_path):
+            if _check_sha1(file_path, sha1_hash):
+                return file_path
+            logging.warning('Mismatch in the content of model file detected. Downloading again.')
+        else:
+            logging.info('Model file not found. Downloading to {}.'.format(file_path))
+
+        zip_file_path = _download(
+            url='{repo_url}/releases/download/{repo_release_tag}/{file_name}.zip'.format(
+                repo_url=imgclsmob_repo_url,
+                repo_release_tag=repo_release_tag,
+                file_name=file_name),
+            path=file_path + '.zip',
+            overwrite=True)
+        try:
+            _extract_file(
+                zip_file_path=zip_file_path,
+                file_name=file_name,
+                file_path=file_path,
+                sha1_hash=sha1_hash)
+        finally:
+            os.remove(zip_file_path)
+
+    return file_path
+
+
+def prefetch(model_names,
+             local_model_store_dir_path=os.path.join('~', '.tensorflow', 'models'),
+             num_workers=8):
+    """
+    Download several pretrained models concurrently.
+
+    Parameters
+    ----------
+    model_names : list of str
+        Names of the models.
+    local_model_store_dir_path : str, default $TENSORFLOW_HOME/models
+        Location for keeping the model parameters.
+    num_workers : int, default 8
+        Number of downloading threads.
+
+    Returns
+    -------
+    list of str
+        Paths to the pretrained model files.
+    """
+    from functools import partial
+    from concurrent.futures import ThreadPoolExecutor
+    with ThreadPoolExecutor(max_workers=max(1, num_workers)) as executor:
+        return list(executor.map(
+            partial(get_model_file, local_model_store_dir_path=local_model_store_dir_path),
+            model_names))
+
+
+class _FileLock(object):
+    """
+    Inter-process (and inter-thread) exclusive lock on a file.
+
+    Parameters
+    ----------
+    file_path : str
+        Path to the lock file.
+    """
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.fd = None
+
+    def __enter__(self):
+        self.fd = os.open(self.file_path, os.O_RDWR | os.O_CREAT)
+        if os.name == 'nt':
+            import msvcrt
+            while True:
+                try:
+                    msvcrt.locking(self.fd, msvcrt.LK_LOCK, 1)
+                    break
+                except (IOError, OSError):
+                    pass
+        else:
+            import fcntl
+            fcntl.flock(self.fd, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        if os.name == 'nt':
+            import msvcrt
+            msvcrt.locking(self.fd, msvcrt.LK_UNLCK, 1)
+        else:
+            import fcntl
+            fcntl.flock(self.fd, fcntl.LOCK_UN)
+        os.close(self.fd)
+        self.fd = None
+
+
+def _make_temp_file(file_path):
+    """
+    Create a unique temporary file next to the target one (for a subsequent atomic rename).
+    """
+    import tempfile
+    fd, tmp_file_path = tempfile.mkstemp(
+        suffix='.tmp',
+        prefix=os.path.basename(file_path) + '.',
+        dir=os.path.dirname(file_path))
+    return os.fdopen(fd, 'wb'), tmp_file_path
+
+
+def _replace_file(src_file_path, dst_file_path):
+    """
+    Rename a file, overwriting the destination one (Python 2 has no `os.replace`).
+    """
+    if hasattr(os, 'replace'):
+        os.replace(src_file_path, dst_file_path)
     else:
-        raise ValueError('Downloaded file has different hash. Please try again.')
+        if (os.name == 'nt') and os.path.exists(dst_file_path):
+            os.remove(dst_file_path)
+        os.rename(src_file_path, dst_file_path)
+
+
+def _extract_file(zip_file_path, file_name, file_path, sha1_hash):
+    """
+    Extract a file from a zip archive, verifying its hash on the fly.
+
+    Parameters
+    ----------
+    zip_file_path : str
+        Path to the archive.
+    file_name : str
+        Name of the file in the archive.
+    file_path : str
+        Destination path.
+    sha1_hash : str
+        Expected sha1 hash in hexadecimal digits.
+    """
+    sha1 = hashlib.sha1()
+    f, tmp_file_path = _make_temp_file(file_path)
+    try:
+        with f, zipfile.ZipFile(zip_file_path) as zf, zf.open(file_name) as src:
+            while True:
+                data = src.read(_chunk_size)
+                if not data:
+                    break
+                sha1.update(data)
+                f.write(data)
+        if sha1.hexdigest() != sha1_hash:
+            raise ValueError('Downloaded file has different hash. Please try again.')
+        _replace_file(tmp_file_path, file_path)
+    except BaseException:
+        os.remove(tmp_file_path)
+        raise
 
 
 def _download(url, path=None, overwrite=False, sha1_hash=None, retries=5, verify_ssl=True):
-    """Download an given URL
+    """
+    Download an given URL. The content is streamed into a temporary file (with hashing on the fly) which is renamed
+    to the destination path only after the download is complete.
 
     Parameters
     ----------
@@ -202,7 +362,8 @@ def _download(url, path=None, overwrite=False, sha1_hash=None, retries=5, verify
     if path is None:
         fname = url.split('/')[-1]
         # Empty filenames are invalid
-        assert fname, 'Can\'t construct file-name from this URL. Please set the `path` option manually.'
+        assert fname, 'Can\'t construct file-name from this URL. ' \
+            'Please set the `path` option manually.'
     else:
         path = os.path.expanduser(path)
         if os.path.isdir(path):
@@ -228,15 +389,23 @@ def _download(url, path=None, overwrite=False, sha1_hash=None, retries=5, verify
                 r = requests.get(url, stream=True, verify=verify_ssl)
                 if r.status_code != 200:
                     raise RuntimeError("Failed downloading url {}".format(url))
-                with open(fname, 'wb') as f:
-                    for chunk in r.iter_content(chunk_size=1024):
-                        if chunk:  # filter out keep-alive new chunks
-                            f.write(chunk)
-                if sha1_hash and not _check_sha1(fname, sha1_hash):
-                    raise UserWarning('File {} is downloaded but the content hash does not match.'
-                                      ' The repo may be outdated or download may be incomplete. '
-                                      'If the "repo_url" is overridden, consider switching to '
-                                      'the default repo.'.format(fname))
+                sha1 = hashlib.sha1()
+                f, tmp_fname = _make_temp_file(os.path.abspath(fname))
+                try:
+                    with f:
+                        for chunk in r.iter_content(chunk_size=_chunk_size):
+                            if chunk:  # filter out keep-alive new chunks
+                                sha1.update(chunk)
+                                f.write(chunk)
+                    if sha1_hash and (sha1.hexdigest() != sha1_hash):
+                        raise UserWarning('File {} is downloaded but the content hash does not match.'
+                                          ' The repo may be outdated or download may be incomplete. '
+                                          'If the "repo_url" is overridden, consider switching to '
+                                          'the default repo.'.format(fname))
+                    _replace_file(tmp_fname, fname)
+                except BaseException:
+                    os.remove(tmp_fname)
+                    raise
                 break
             except Exception as e:
                 retries -= 1
@@ -249,12 +418,13 @@ def _download(url, path=None, overwrite=False, sha1_hash=None, retries=5, verify
     return fname
 
 
-def _check_sha1(filename, sha1_hash):
-    """Check whether the sha1 hash of the file content matches the expected hash.
+def _check_sha1(file_name, sha1_hash):
+    """
+    Check whether the sha1 hash of the file content matches the expected hash.
 
     Parameters
     ----------
-    filename : str
+    file_name : str
         Path to the file.
     sha1_hash : str
         Expected sha1 hash in hexadecimal digits.
@@ -265,9 +435,9 @@ def _check_sha1(filename, sha1_hash):
         Whether the file content matches the expected hash.
     """
     sha1 = hashlib.sha1()
-    with open(filename, 'rb') as f:
+    with open(file_name, 'rb') as f:
         while True:
-            data = f.read(1048576)
+            data = f.read(_chunk_size)
             if not data:
                 break
             sha1.update(data)
@@ -316,7 +316,7 @@ class ResNet(object):
                 in_channels = out_channels
         x = tf.layers.average_pooling2d(
             inputs=x,
-            pool_size=7,
+            pool_size=x.shape[2:4],
             strides=1,
             data_format="channels_first",
             name="features/final_pool")
@@ -255,7 +255,7 @@ class SqueezeNet(object):
         x = tf.nn.relu(x, name="output/final_activ")
         x = tf.layers.average_pooling2d(
             inputs=x,
-            pool_size=13,
+            pool_size=x.shape[2:4],
             strides=1,
             data_format='channels_first',
             name="output/final_pool")
@@ -1,7 +1,11 @@
+import os
+import logging
+import collections
 import numpy as np
 import tensorflow as tf
 
 from .tensorflowcv.model_provider import get_model
+from .predictor import get_export_file_paths, save_export_meta
 
 
 def save_model_params(sess,
@@ -51,3 +55,128 @@ def prepare_model(model_name,
                 init_variables_from_state_dict(sess=sess, state_dict=net.state_dict)
 
     return y_net
+
+
+def prepare_model_session(model_name,
+                          use_pretrained,
+                          pretrained_model_file_path,
+                          input_name="xx",
+                          output_name="output",
+                          config=None):
+    """
+    Build an inference graph of a model in a new graph and load the weights in a session, which stays open (unlike
+    in `prepare_model`).
+
+    Parameters:
+    ----------
+    model_name : str
+        Model name.
+    use_pretrained : bool
+        Whether to load pretrained weights.
+    pretrained_model_file_path : str
+        Path to a file with weights (of `save_model_params` format) or empty string.
+    input_name : str, default 'xx'
+        Name of the input placeholder (NCHW, the batch axis is dynamic).
+    output_name : str, default 'output'
+        Name of the output node.
+    config : ConfigProto or None, default None
+        Session configuration.
+
+    Returns
+    -------
+    tuple of 3 elements
+        Session, input placeholder and output tensor.
+    """
+    graph = tf.Graph()
+    with graph.as_default():
+        net = get_model(model_name, pretrained=use_pretrained)
+        in_channels = net.in_channels if hasattr(net, "in_channels") else 3
+        in_size = net.in_size if hasattr(net, "in_size") else (224, 224)
+        x = tf.placeholder(
+            dtype=tf.float32,
+            shape=(None, in_channels, in_size[0], in_size[1]),
+            name=input_name)
+        y_net = tf.identity(net(x, training=False), name=output_name)
+
+        sess = tf.Session(graph=graph, config=config)
+        from .tensorflowcv.model_provider import init_variables_from_state_dict, load_state_dict
+        if pretrained_model_file_path:
+            init_variables_from_state_dict(
+                sess=sess,
+                state_dict=load_state_dict(file_path=pretrained_model_file_path))
+        elif use_pretrained:
+            init_variables_from_state_dict(sess=sess, state_dict=net.state_dict)
+        else:
+            sess.run(tf.global_variables_initializer())
+    return sess, x, y_net
+
+
+def export_frozen_model(sess,
+                        x,
+                        y_net,
+                        model_name,
+                        file_prefix):
+    """
+    Export a model graph as a single frozen GraphDef, to be served by `tensorflow_.predictor` without the model zoo.
+    Variables are turned into constants, BatchNorm is folded into preceding convolutions, training ops are stripped
+    (by `optimize_for_inference`) and constant subgraphs are folded.
+
+    Parameters:
+    ----------
+    sess : Session
+        Session with loaded weights (see `prepare_model_session`).
+    x : Tensor
+        Input placeholder.
+    y_net : Tensor
+        Output tensor.
+    model_name : str
+        Model name.
+    file_prefix : str
+        Path prefix of exported files.
+
+    Returns
+    -------
+    tuple of 2 str
+        Paths of the frozen graph and meta files.
+    """
+    from tensorflow.python.tools import optimize_for_inference_lib
+    from tensorflow.tools.graph_transforms import TransformGraph
+
+    dir_path = os.path.dirname(file_prefix)
+    if dir_path and not os.path.exists(dir_path):
+        os.makedirs(dir_path)
+    input_name = x.op.name
+    output_name = y_net.op.name
+
+    graph_def = tf.graph_util.convert_variables_to_constants(
+        sess=sess,
+        input_graph_def=sess.graph.as_graph_def(),
+        output_node_names=[output_name])
+    op_counts = collections.Counter(node.op for node in graph_def.node)
+    graph_def = optimize_for_inference_lib.optimize_for_inference(
+        input_graph_def=graph_def,
+        input_node_names=[input_name],
+        output_node_names=[output_name],
+        placeholder_type_enum=tf.float32.as_datatype_enum)
+    graph_def = TransformGraph(
+        graph_def,
+        [input_name],
+        [output_name],
+        ["fold_constants(ignore_errors=true)", "sort_by_execution_order"])
+    frozen_op_counts = collections.Counter(node.op for node in graph_def.node)
+
+    batch_norm_ops = ["FusedBatchNorm", "FusedBatchNormV2", "FusedBatchNormV3"]
+    logging.info("Frozen graph of {}: {} -> {} nodes, {} -> {} batch normalizations".format(
+        model_name, sum(op_counts.values()), sum(frozen_op_counts.values()),
+        sum(op_counts[op] for op in batch_norm_ops), sum(frozen_op_counts[op] for op in batch_norm_ops)))
+
+    graph_file_path, _ = get_export_file_paths(file_prefix)
+    with tf.gfile.GFile(graph_file_path, "wb") as f:
+        f.write(graph_def.SerializeToString())
+    save_export_meta(
+        file_prefix=file_prefix,
+        model_name=model_name,
+        input_name=input_name,
+        output_name=output_name,
+        data_shape=[1] + x.shape.as_list()[1:])
+    return get_export_file_paths(file_prefix)
@@ -14,11 +14,13 @@ from tensorpack import InputDesc, PlaceholderInput, TowerContext
 from tensorpack.tfutils import get_model_loader, model_utils
 # from tensorpack.tfutils import get_default_sess_config
 from tensorpack.dataflow import imgaug, dataset, AugmentImageComponent, PrefetchDataZMQ, BatchData
-from tensorpack.dataflow import MultiThreadMapData
+from tensorpack.dataflow import MultiThreadMapData, DataFlow
 # from tensorpack.dataflow import MapData
 from tensorpack.utils import logger
 
+from common.val_cache import ValCache
 from .tensorflowcv.model_provider import get_model
+from .imagenet_lmdb import get_imagenet_lmdb_dataflow
 
 
 class CachedChiefSessionCreator(tf.train.ChiefSessionCreator):
@@ -199,6 +201,24 @@ class GoogleNetResize(imgaug.ImageAugmentor):
         return out
 
 
+def get_val_samples(data_dir_path):
+    """
+    List validation samples of ImageNet-1K in the layout of `dataset.ILSVRC12` (a flat directory with labels in
+    `val.txt`), e.g. for the validation set cache.
+
+    Parameters:
+    ----------
+    data_dir_path : str
+        Path to the dataset directory.
+
+    Returns
+    -------
+    list of tuple
+        Pairs of image file path and label.
+    """
+    return [(fname, int(cls)) for fname, cls in dataset.ILSVRC12Files(data_dir_path, 'val', shuffle=False)]
+
+
 def get_imagenet_dataflow(datadir,
                           is_train,
                           batch_size,
@@ -237,6 +257,41 @@ def get_imagenet_dataflow(datadir,
     return ds
 
 
+class ValCacheDataFlow(DataFlow):
+    """
+    Validation dataflow over preprocessed validation set cache (see `common.val_cache`). Yields batched RGB images in
+    NHWC layout, as the validation dataflow from `get_imagenet_dataflow` does.
+
+    Parameters:
+    ----------
+    file_stem : str
+        Path stem for cache files.
+    batch_size : int
+        Batch size.
+    """
+    def __init__(self,
+                 file_stem,
+                 batch_size):
+        super(ValCacheDataFlow, self).__init__()
+        self.cache = ValCache(
+            file_stem=file_stem,
+            batch_size=batch_size,
+            channels_last=True)
+
+    def size(self):
+        return len(self.cache)
+
+    def __len__(self):
+        return self.size()
+
+    def get_data(self):
+        for data, labels in self.cache:
+            yield [data.astype(np.float32), labels]
+
+    def __iter__(self):
+        return self.get_data()
+
+
 def prepare_tf_context(num_gpus,
                        batch_size):
     batch_size *= max(1, num_gpus)
@@ -271,7 +326,10 @@ def get_data(is_train,
              batch_size,
              data_dir_path,
              input_image_size=224,
-             resize_inv_factor=0.875):
+             resize_inv_factor=0.875,
+             data_format="folder",
+             lmdb_dir_path="",
+             shuffle_buffer_size=10000):
     assert (resize_inv_factor > 0.0)
     resize_value = int(math.ceil(float(input_image_size) / resize_inv_factor))
 
@@ -300,6 +358,13 @@ def get_data(is_train,
             imgaug.CenterCrop((input_image_size, input_image_size))
         ]
 
+    if data_format == "lmdb":
+        return get_imagenet_lmdb_dataflow(
+            lmdb_dir_path=(lmdb_dir_path if lmdb_dir_path else os.path.join(data_dir_path, "lmdb")),
+            is_train=is_train,
+            batch_size=batch_size,
+            augmentors=augmentors,
+            shuffle_buffer_size=shuffle_buffer_size)
     return get_imagenet_dataflow(
         datadir=data_dir_path,
         is_train=is_train,
@@ -0,0 +1,141 @@
+import os
+import json
+import time
+import shutil
+import tempfile
+import threading
+from common.train_log_param_saver import TrainLogParamSaver
+from common.async_validation import AsyncValidator, run_val_queue_evaluator
+
+
+def save_params(file_stem,
+                value):
+    time.sleep(0.05)
+    with open(file_stem + ".json", "w") as f:
+        json.dump({"value": value}, f)
+
+
+def main():
+    val_errors = [0.5, 0.3, 0.4, 0.2, 0.25, 0.35]
+    num_epochs = len(val_errors)
+    tmp_dir_path = tempfile.mkdtemp()
+
+    success = True
+    try:
+        save_dir_path = os.path.join(tmp_dir_path, "save")
+        queue_dir_path = os.path.join(tmp_dir_path, "queue")
+        lp_saver = TrainLogParamSaver(
+            checkpoint_file_name_prefix="model",
+            last_checkpoint_dir_path=save_dir_path,
+            last_checkpoint_file_count=2,
+            best_checkpoint_file_count=1,
+            checkpoint_file_save_callback=save_params,
+            checkpoint_file_snapshot_callback=(lambda value: {"value": value}),
+            max_pending_saves=2,
+            checkpoint_file_exts=(".json",),
+            save_interval=2,
+            num_epochs=num_epochs,
+            param_names=["Val.Err", "Train.Loss"],
+            acc_ind=0,
+            score_log_file_path=os.path.join(save_dir_path, "score.log"))
+
+        # Files of an interrupted earlier run are removed:
+        os.makedirs(queue_dir_path)
+        for file_name, value in (("model_0001.json", {"value": 0.0}), ("model_0002.job.json", {"epoch": 2}),
+                                 ("model_0003.result.json", {"epoch": 3, "values": [0.0]})):
+            with open(os.path.join(queue_dir_path, file_name), "w") as f:
+                json.dump(value, f)
+        async_validator = AsyncValidator(
+            queue_dir_path=queue_dir_path,
+            lp_saver=lp_saver,
+            checkpoint_file_name_prefix="model",
+            val_param_indices=[0],
+            poll_interval=0.01,
+            stale_timeout=0.5)
+        if os.listdir(queue_dir_path):
+            success = False
+            print("Stale files aren't removed: {}".format(os.listdir(queue_dir_path)))
+
+        # The evaluator validates a checkpoint by its content (the validation error of the epoch):
+        def validate_fn(file_stem):
+            time.sleep(0.1)
+            with open(file_stem + ".json", "r") as f:
+                return [json.load(f)["value"]]
+
+        # An evaluator, which dies during validation of the first checkpoint (its job is returned into the queue):
+        def failed_validate_fn(file_stem):
+            raise RuntimeError("Evaluator is killed")
+
+        def run_failed_evaluator():
+            try:
+                run_val_queue_evaluator(
+                    queue_dir_path=queue_dir_path,
+                    validate_fn=failed_validate_fn,
+                    poll_interval=0.01,
+                    stale_timeout=0.5)
+            except RuntimeError:
+                pass
+
+        failed_evaluator = threading.Thread(target=run_failed_evaluator)
+        failed_evaluator.start()
+
+        evaluator_counts = []
+        evaluators = [threading.Thread(target=(lambda: evaluator_counts.append(run_val_queue_evaluator(
+            queue_dir_path=queue_dir_path,
+            validate_fn=validate_fn,
+            poll_interval=0.01,
+            stale_timeout=0.5)))) for _ in range(2)]
+
+        for epoch1, val_error in enumerate(val_errors, 1):
+            async_validator.submit(
+                epoch1=epoch1,
+                params=[None, 1.0 / epoch1],
+                value=val_error)
+            if epoch1 == 1:
+                lp_saver.flush()
+                failed_evaluator.join()
+                for evaluator in evaluators:
+                    evaluator.start()
+            async_validator.collect()
+        async_validator.finish()
+        for evaluator in evaluators:
+            evaluator.join()
+
+        if sum(evaluator_counts) != num_epochs:
+            success = False
+            print("Evaluators validated {} checkpoints".format(evaluator_counts))
+        if os.listdir(queue_dir_path) != ["done"]:
+            success = False
+            print("Queue isn't empty: {}".format(os.listdir(queue_dir_path)))
+        if lp_saver.best_eval_metric_epoch != 4:
+            success = False
+            print("Wrong best epoch: {}".format(lp_saver.best_eval_metric_epoch))
+
+        # Values are logged in epoch order, checkpoints are linked from the queue:
+        with open(os.path.join(save_dir_path, "score.log"), "r") as f:
+            rows = [row.split("\t") for row in f.read().split("\n")[1:]]
+        if [(int(row[1]), float(row[2])) for row in rows] != list(enumerate(val_errors, 1)):
+            success = False
+            print("Wrong score log: {}".format(rows))
+        checkpoint_values = {}
+        for file_name in os.listdir(save_dir_path):
+            if file_name.endswith(".json"):
+                with open(os.path.join(save_dir_path, file_name), "r") as f:
+                    checkpoint_values[file_name] = json.load(f)["value"]
+        expected_values = {
+            "model_last_0004_0.2000.json": 0.2,
+            "model_last_0006_0.3500.json": 0.35,
+            "model_0004_0.2000.json": 0.2,
+        }
+        if checkpoint_values != expected_values:
+            success = False
+            print("Wrong checkpoints: {}".format(checkpoint_values))
+    finally:
+        shutil.rmtree(tmp_dir_path)
+
+    if success:
+        print("All ok.")
+
+
+if __name__ == '__main__':
+    main()
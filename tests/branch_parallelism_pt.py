@@ -0,0 +1,58 @@
+import os
+import time
+import torch
+from pytorch.pytorchcv.model_provider import get_model
+from pytorch.pytorchcv.models.common import BranchExecutor, set_branch_executor
+
+
+def measure_latency(net,
+                    x,
+                    num_iters):
+    with torch.no_grad():
+        y = net(x)
+        tic = time.time()
+        for _ in range(num_iters):
+            net(x)
+    return (time.time() - tic) / num_iters, y
+
+
+def main():
+    model_names = [
+        'nasnet_4a1056',
+        'pnasnet5large',
+        'darts',
+        'inceptionv4',
+        'polynet',
+    ]
+    num_iters = 3
+    max_cores = os.cpu_count()
+    core_counts = sorted(set([1, 2, 4, 8, 16, max_cores]) & set(range(1, max_cores + 1)))
+
+    success = True
+    for model_name in model_names:
+        net = get_model(model_name, pretrained=False)
+        net.eval()
+        x = torch.randn(1, 3, net.in_size[0], net.in_size[1])
+        for num_cores in core_counts:
+            torch.set_num_threads(num_cores)
+            set_branch_executor(net, None)
+            seq_time, y_seq = measure_latency(net, x, num_iters)
+            executor = BranchExecutor(num_workers=num_cores)
+            set_branch_executor(net, executor)
+            par_time, y_par = measure_latency(net, x, num_iters)
+            set_branch_executor(net, None)
+            executor.pool.shutdown()
+            dist = (y_seq - y_par).abs().max().item()
+            if dist > 1e-5 * max(1.0, y_seq.abs().max().item()):
+                success = False
+                print("{}: max_abs_err={}".format(model_name, dist))
+            print("{} ({} cores): sequential {:.1f} ms, parallel branches {:.1f} ms".format(
+                model_name, num_cores, seq_time * 1e3, par_time * 1e3))
+        del net
+
+    if success:
+        print("All ok.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,149 @@
+import time
+import torch
+from pytorch.utils import prepare_model
+from pytorch.pytorchcv.models.common import DenseSequential
+
+
+def set_preallocate(net, preallocate):
+    for module in net.modules():
+        if isinstance(module, DenseSequential):
+            module.preallocate = preallocate
+
+
+def get_preallocate_values(net):
+    return set([module.preallocate for module in net.modules() if isinstance(module, DenseSequential)])
+
+
+def run_train_step(net, x):
+    net.train()
+    net.zero_grad()
+    torch.manual_seed(0)
+    y = net(x)
+    y.pow(2).sum().backward()
+    return y.detach(), torch.cat([param.grad.flatten() for param in net.parameters() if param.grad is not None])
+
+
+def calc_saved_memory(net, x):
+    """
+    Calculate the size of activations saved for backward (shared storages are counted once).
+    """
+    storages = {}
+
+    def pack_hook(tensor):
+        storage = tensor.untyped_storage()
+        storages[storage.data_ptr()] = storage.nbytes()
+        return tensor
+
+    net.train()
+    with torch.autograd.graph.saved_tensors_hooks(pack_hook, lambda tensor: tensor):
+        net(x)
+    return sum(storages.values())
+
+
+def measure_latency(net,
+                    x,
+                    num_iters,
+                    train):
+    net.train(train)
+    tic = time.time()
+    for _ in range(num_iters):
+        if train:
+            net(x).sum().backward()
+        else:
+            with torch.no_grad():
+                net(x)
+    if x.is_cuda:
+        torch.cuda.synchronize()
+    return (time.time() - tic) / num_iters
+
+
+def main():
+    model_names = [
+        'densenet121',
+        'densenet250_k24_bc_cifar10',
+        'ibn_densenet121',
+        'peleenet',
+    ]
+    use_cuda = torch.cuda.is_available()
+    num_iters = 3
+
+    success = True
+    for model_name in model_names:
+        net = prepare_model(
+            model_name=model_name,
+            use_pretrained=False,
+            pretrained_model_file_path='',
+            use_cuda=False,
+            use_dense_buffer=True)
+        if get_preallocate_values(net) != {True}:
+            success = False
+            print("{}: buffer isn't enabled by prepare_model".format(model_name))
+        net = prepare_model(
+            model_name=model_name,
+            use_pretrained=False,
+            pretrained_model_file_path='',
+            use_cuda=False)
+        if get_preallocate_values(net) != {False}:
+            success = False
+            print("{}: buffer is enabled by default".format(model_name))
+        in_size = net.in_size
+        x = torch.randn(2, 3, in_size[0], in_size[1])
+
+        # By default units are called as usual (with concatenation) both in training and inference:
+        unit_calls = []
+        hooks = [module.register_forward_hook(lambda *args: unit_calls.append(1)) for module in net.modules()
+                 if hasattr(module, "forward_inc")]
+        net.train()
+        net(x)
+        net.eval()
+        with torch.no_grad():
+            net(x[:1])
+        for hook in hooks:
+            hook.remove()
+        if len(unit_calls) != 2 * len(hooks):
+            success = False
+            print("{}: buffer is used by default".format(model_name))
+
+        # Equivalence of outputs and gradients in training mode (in double precision to exclude summation order):
+        net.double()
+        results = []
+        for preallocate in (False, True):
+            set_preallocate(net, preallocate)
+            results.append(run_train_step(net, x.double()))
+        net.float()
+        for i in range(2):
+            dist = (results[0][i] - results[1][i]).abs().max().item() / results[0][i].abs().max().item()
+            if dist > 1e-9:
+                success = False
+                print("{}: {} relative error {}".format(model_name, ("output", "gradient")[i], dist))
+        del results
+
+        saved_memory = {}
+        for preallocate in (False, True):
+            set_preallocate(net, preallocate)
+            saved_memory[preallocate] = calc_saved_memory(net, x)
+            print("{} ({}): saved activations {:.1f} MB".format(
+                model_name, "buffer" if preallocate else "cat", saved_memory[preallocate] / 2 ** 20))
+        if saved_memory[True] >= saved_memory[False]:
+            success = False
+            print("{}: buffer doesn't reduce saved activations".format(model_name))
+
+        if use_cuda:
+            net = net.cuda()
+            x = x.cuda()
+        for train in (False, True):
+            for batch_size in (1, 2):
+                for preallocate in (False, True):
+                    set_preallocate(net, preallocate)
+                    elapsed = measure_latency(net, x[:batch_size], num_iters, train)
+                    print("{} ({}, batch {}, {}): {:.1f} ms".format(
+                        model_name, "train" if train else "eval", batch_size, "buffer" if preallocate else "cat",
+                        elapsed * 1e3))
+        del net
+
+    if success:
+        print("All ok.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,181 @@
+import copy
+import time
+import numpy as np
+import torch
+from pytorch.pytorchcv.model_provider import get_model
+from pytorch.pytorchcv.models.common import IBN
+from pytorch.fold_ibn import fold_ibn
+
+
+class SplitIBN(IBN):
+    """
+    Reference IBN implementation with explicit splitting and concatenation.
+    """
+    def forward(self, x):
+        x1, x2 = torch.split(x, split_size_or_sections=self.split_sections, dim=1)
+        if self.inst_first:
+            x1 = self.inst_norm(x1.contiguous())
+            x2 = self.batch_norm(x2.contiguous())
+        else:
+            x1 = self.batch_norm(x1.contiguous())
+            x2 = self.inst_norm(x2.contiguous())
+        x = torch.cat((x1, x2), dim=1)
+        return x
+
+
+def randomize_norm_params(net):
+    for module in net.modules():
+        if isinstance(module, (torch.nn.BatchNorm2d, torch.nn.InstanceNorm2d)):
+            if module.track_running_stats:
+                module.running_mean.uniform_(-0.5, 0.5)
+                module.running_var.uniform_(0.5, 1.5)
+            module.weight.data.uniform_(0.5, 1.5)
+            module.bias.data.uniform_(-0.5, 0.5)
+
+
+def measure_latency(net,
+                    x,
+                    num_iters):
+    with torch.no_grad():
+        net(x)
+        if x.is_cuda:
+            torch.cuda.synchronize()
+        tic = time.time()
+        for _ in range(num_iters):
+            net(x)
+        if x.is_cuda:
+            torch.cuda.synchronize()
+    return (time.time() - tic) / num_iters
+
+
+def check_training(model_name):
+    """
+    Compare outputs, gradients and running statistics of the fused and the reference IBN blocks in training mode.
+    """
+    net = get_model(model_name, pretrained=False)
+    with torch.no_grad():
+        randomize_norm_params(net)
+    net = net.double()
+    ref_net = copy.deepcopy(net)
+    for module in ref_net.modules():
+        if isinstance(module, IBN):
+            module.__class__ = SplitIBN
+    net.train()
+    ref_net.train()
+
+    x = torch.randn(4, 3, 224, 224, dtype=torch.float64)
+    w = torch.randn(4, net.num_classes, dtype=torch.float64)
+    y = net(x)
+    ref_y = ref_net(x)
+    (y * w).sum().backward()
+    (ref_y * w).sum().backward()
+    y_dist = (y - ref_y).abs().max().item() / ref_y.abs().max().item()
+    grad_dist = max([(p.grad - ref_p.grad).abs().max().item() / max(ref_p.grad.abs().max().item(), 1e-6)
+                     for p, ref_p in zip(net.parameters(), ref_net.parameters())])
+    stat_dist = max([(b - ref_b).abs().max().item() for (n, b), ref_b in zip(net.named_buffers(), ref_net.buffers())
+                     if b.dtype.is_floating_point])
+    print("{} training: rel_err={:.2e} grad_rel_err={:.2e} running_stats_err={:.2e}".format(
+        model_name, y_dist, grad_dist, stat_dist))
+    return max(y_dist, grad_dist, stat_dist) < 1e-6
+
+
+def check_float32_precision():
+    """
+    Compare errors of the fused and the reference IBN blocks in float32 against the float64 reference for inputs with a
+    large mean (in training and inference modes).
+    """
+    success = True
+    for offset in (0.0, 10.0, 100.0, 1000.0):
+        for training in (True, False):
+            block = IBN(channels=64)
+            with torch.no_grad():
+                randomize_norm_params(block)
+            ref_block = copy.deepcopy(block)
+            ref_block.__class__ = SplitIBN
+            ref64_block = copy.deepcopy(ref_block).double()
+            for b in (block, ref_block, ref64_block):
+                b.train(training)
+
+            x = torch.randn(8, 64, 28, 28) * 0.5 + offset
+            with torch.no_grad():
+                ref64_y = ref64_block(x.double())
+                y_err = (block(x).double() - ref64_y).abs().max().item()
+                ref_y_err = (ref_block(x).double() - ref64_y).abs().max().item()
+            var_err = (block.batch_norm.running_var.double() - ref64_block.batch_norm.running_var).abs().max().item()
+            print("IBN block float32 offset={:<6} training={:<5} err={:.2e} (split {:.2e}) running_var_err={:.2e}"
+                  .format(offset, str(training), y_err, ref_y_err, var_err))
+            # The fused affine transform `x * scale + shift` has a rounding error of a few ulps of `mean * scale`:
+            if (y_err > 4.0 * ref_y_err + 1e-6) or (var_err > 1e-5):
+                success = False
+    return success
+
+
+def benchmark_blocks(use_cuda):
+    """
+    Compare latency of standalone fused and reference IBN blocks for IBN-ResNet-50 activation shapes.
+    """
+    for batch_size, num_iters in ((1, 50), (32, 10)):
+        for channels, size in ((64, 56), (128, 28), (256, 14)):
+            block = IBN(channels=channels).eval()
+            ref_block = copy.deepcopy(block)
+            ref_block.__class__ = SplitIBN
+            x = torch.randn(batch_size, channels, size, size)
+            if use_cuda:
+                block = block.cuda()
+                ref_block = ref_block.cuda()
+                x = x.cuda()
+            time_ref = measure_latency(ref_block, x, num_iters)
+            time_fused = measure_latency(block, x, num_iters)
+            print("IBN block {}x{}x{}x{}: split {:.3f} ms, fused {:.3f} ms".format(
+                batch_size, channels, size, size, time_ref * 1000.0, time_fused * 1000.0))
+
+
+def main():
+    model_name = 'ibn_resnet50'
+    use_cuda = torch.cuda.is_available()
+
+    success = check_training(model_name)
+    success = check_float32_precision() and success
+    benchmark_blocks(use_cuda)
+
+    net = get_model(model_name, pretrained=False)
+    with torch.no_grad():
+        randomize_norm_params(net)
+    net.eval()
+    ref_net = copy.deepcopy(net)
+    for module in ref_net.modules():
+        if isinstance(module, IBN):
+            module.__class__ = SplitIBN
+    folded_net = fold_ibn(copy.deepcopy(net))
+    if use_cuda:
+        net = net.cuda()
+        ref_net = ref_net.cuda()
+        folded_net = folded_net.cuda()
+
+    for batch_size, num_iters in ((1, 20), (32, 3)):
+        x = torch.randn(batch_size, 3, 224, 224)
+        if use_cuda:
+            x = x.cuda()
+        with torch.no_grad():
+            ref_y = ref_net(x).cpu().numpy()
+            y = net(x).cpu().numpy()
+            folded_y = folded_net(x).cpu().numpy()
+        scale = max(np.max(np.abs(ref_y)), 1e-6)
+        dist = np.max(np.abs(y - ref_y)) / scale
+        folded_dist = np.max(np.abs(folded_y - ref_y)) / scale
+        if max(dist, folded_dist) > 1e-4:
+            success = False
+
+        time_ref = measure_latency(ref_net, x, num_iters)
+        time_fused = measure_latency(net, x, num_iters)
+        time_folded = measure_latency(folded_net, x, num_iters)
+        print("{} batch={:<3} rel_err={:.2e}/{:.2e} latency: split {:.2f} ms, fused {:.2f} ms, fused+folded {:.2f} ms"
+              .format(model_name, batch_size, dist, folded_dist, time_ref * 1000.0, time_fused * 1000.0,
+                      time_folded * 1000.0))
+
+    if success:
+        print("All ok.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,126 @@
+import os
+import shutil
+import tempfile
+import numpy as np
+import cv2
+from tensorpack.dataflow import imgaug
+from tensorflow_.imagenet_lmdb import create_lmdb_shards, ShardedLMDBDataFlow, get_imagenet_lmdb_dataflow
+
+
+def create_fake_imagenet(dir_path,
+                         num_classes=3,
+                         num_train_per_class=9,
+                         num_val=7):
+    """
+    Create a tiny dataset in the layout of `dataset.ILSVRC12` with metadata.
+    """
+    rng = np.random.RandomState(1)
+    meta_dir_path = os.path.join(dir_path, "meta")
+    os.makedirs(meta_dir_path)
+    synsets = ["n{:08d}".format(i) for i in range(num_classes)]
+    with open(os.path.join(meta_dir_path, "synsets.txt"), "w") as f:
+        f.write("\n".join(synsets) + "\n")
+
+    def write_image(file_path):
+        image = rng.randint(0, 256, size=(rng.randint(20, 40), rng.randint(20, 40), 3)).astype(np.uint8)
+        cv2.imwrite(file_path, image)
+
+    train_lines = []
+    for label, synset in enumerate(synsets):
+        os.makedirs(os.path.join(dir_path, "train", synset))
+        for i in range(num_train_per_class):
+            file_name = "{}/{}_{}.JPEG".format(synset, synset, i)
+            write_image(os.path.join(dir_path, "train", file_name))
+            train_lines.append("{} {}".format(file_name, label))
+    with open(os.path.join(meta_dir_path, "train.txt"), "w") as f:
+        f.write("\n".join(train_lines) + "\n")
+
+    val_lines = []
+    os.makedirs(os.path.join(dir_path, "val"))
+    for i in range(num_val):
+        file_name = "val_{:08d}.JPEG".format(i)
+        write_image(os.path.join(dir_path, "val", file_name))
+        val_lines.append("{} {}".format(file_name, i % num_classes))
+    with open(os.path.join(meta_dir_path, "val.txt"), "w") as f:
+        f.write("\n".join(val_lines) + "\n")
+    return meta_dir_path, train_lines, val_lines
+
+
+def main():
+    tmp_dir_path = tempfile.mkdtemp()
+
+    success = True
+    try:
+        data_dir_path = os.path.join(tmp_dir_path, "imagenet")
+        lmdb_dir_path = os.path.join(data_dir_path, "lmdb")
+        meta_dir_path, train_lines, val_lines = create_fake_imagenet(data_dir_path)
+        for split in ["train", "val"]:
+            create_lmdb_shards(
+                data_dir=data_dir_path,
+                lmdb_dir_path=lmdb_dir_path,
+                split=split,
+                shard_size=4,
+                num_workers=2,
+                meta_dir=meta_dir_path)
+
+        # All images are in shards with the same bytes and labels (the training split is shuffled):
+        for split, lines, shuffle in [("train", train_lines, True), ("val", val_lines, False)]:
+            expected = []
+            for line in lines:
+                file_name, label = line.split()
+                with open(os.path.join(data_dir_path, split, file_name), "rb") as f:
+                    expected.append((f.read(), int(label)))
+            ds = ShardedLMDBDataFlow(lmdb_dir_path, split, shuffle=shuffle)
+            ds.reset_state()
+            actual = [(jpeg.tobytes(), int(label)) for jpeg, label in ds]
+            if (len(ds) != len(expected)) or (sorted(actual) != sorted(expected)):
+                success = False
+                print("{}: shards mismatch the images".format(split))
+            if (not shuffle) and (actual != expected):
+                success = False
+                print("{}: order of images is changed".format(split))
+
+        # Validation batches hold the same images as decoded from image files (in the order of decoding threads):
+        augmentors = [imgaug.Resize((16, 16))]
+        aug = imgaug.AugmentorList(augmentors)
+        ds = get_imagenet_lmdb_dataflow(
+            lmdb_dir_path=lmdb_dir_path,
+            is_train=False,
+            batch_size=3,
+            augmentors=augmentors,
+            parallel=2)
+        ds.reset_state()
+        actual = [(int(label), image.tobytes()) for images, labels in ds for image, label in zip(images, labels)]
+        expected = []
+        for line in val_lines:
+            file_name, label = line.split()
+            image = np.flip(cv2.imread(os.path.join(data_dir_path, "val", file_name), cv2.IMREAD_COLOR), axis=2)
+            expected.append((int(label), aug.augment(image).tobytes()))
+        if sorted(actual) != sorted(expected):
+            success = False
+            print("val: batches mismatch the images")
+
+        # Training batches are full and locally shuffled:
+        ds = get_imagenet_lmdb_dataflow(
+            lmdb_dir_path=lmdb_dir_path,
+            is_train=True,
+            batch_size=5,
+            augmentors=augmentors,
+            parallel=2,
+            shuffle_buffer_size=8)
+        ds.reset_state()
+        for i, dp in enumerate(ds):
+            if (dp[0].shape != (5, 16, 16, 3)) or (dp[1].shape != (5,)):
+                success = False
+                print("train: batch shape mismatch")
+            if i == 10:
+                break
+    finally:
+        shutil.rmtree(tmp_dir_path)
+
+    if success:
+        print("All ok.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,47 @@
+import torch
+from pytorch.pytorchcv.model_provider import _models, get_model
+
+
+def has_spatial_classifier(model_name):
+    """
+    Whether the model classifies a fixed-size feature map with dense layers (so that it works only at `in_size`).
+    """
+    return model_name.startswith(("alexnet", "zfnet", "vgg", "bn_vgg"))
+
+
+def main():
+    imagenet_sizes = (128, 160, 192, 224)
+    cifar_sizes = (16, 24, 32)
+
+    success = True
+    torch.set_grad_enabled(False)
+    for model_name in sorted(_models.keys()):
+        net = get_model(model_name, pretrained=False)
+        net.eval()
+        in_size = net.in_size[0]
+        if has_spatial_classifier(model_name):
+            sizes = (in_size,)
+        elif in_size < 128:
+            sizes = cifar_sizes
+        else:
+            sizes = sorted(set(imagenet_sizes + (in_size,)))
+        for size in sizes:
+            try:
+                y = net(torch.randn(1, 3, size, size))
+                if isinstance(y, (list, tuple)):
+                    y = y[-1]
+                ok = (tuple(y.shape) == (1, net.num_classes))
+            except RuntimeError as e:
+                ok = False
+                print("{}: {}".format(model_name, e))
+            if not ok:
+                success = False
+                print("{} failed at {}x{}".format(model_name, size, size))
+        del net
+
+    if success:
+        print("All ok.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,99 @@
+import os
+import json
+import time
+import shutil
+import tempfile
+from common.train_log_param_saver import TrainLogParamSaver
+from common.iter_checkpoint import ResumableRandomSampler, IterCheckpointSaver, load_train_position
+
+
+def save_params(file_stem,
+                value):
+    time.sleep(0.02)
+    with open(file_stem + ".json", "w") as f:
+        json.dump({"value": value}, f)
+
+
+def main():
+    success = True
+
+    # A resumed pass yields the rest of the same permutation, shards of workers don't overlap:
+    sampler = ResumableRandomSampler(length=10, seed=3)
+    first_pass = list(sampler)
+    second_pass = list(sampler)
+    sampler.set_epoch(1, start_index=4)
+    if (sorted(first_pass) != list(range(10))) or (first_pass == second_pass) or (len(sampler) != 6) or\
+            (list(sampler) != second_pass[4:]) or (list(sampler) == second_pass):
+        success = False
+        print("Wrong sampler passes")
+    shards = [ResumableRandomSampler(length=10, seed=3, num_parts=3, part_index=i) for i in range(3)]
+    if [list(shard) for shard in shards] != [first_pass[0:3], first_pass[3:6], first_pass[6:9]]:
+        success = False
+        print("Wrong sampler shards")
+
+    tmp_dir_path = tempfile.mkdtemp()
+    try:
+        lp_saver = TrainLogParamSaver(
+            checkpoint_file_name_prefix="model",
+            last_checkpoint_dir_path=tmp_dir_path,
+            checkpoint_file_save_callback=save_params,
+            checkpoint_file_snapshot_callback=(lambda value: {"value": value}),
+            max_pending_saves=1,
+            checkpoint_file_exts=(".json",),
+            save_interval=2,
+            num_epochs=3,
+            param_names=["Val.Err"],
+            score_log_file_path=None)
+        file_path_prefix = os.path.join(tmp_dir_path, "model_iter")
+        resumed_file_stem = file_path_prefix + "_0001_000003"
+        save_params(resumed_file_stem, None)
+        iter_saver = IterCheckpointSaver(
+            lp_saver=lp_saver,
+            file_path_prefix=file_path_prefix,
+            interval=3,
+            last_file_stem=resumed_file_stem)
+
+        iter_file_names = []
+        for epoch1 in range(1, 4):
+            for batch in range(1, 8):
+                if iter_saver.need_save(batch):
+                    iter_saver.save(
+                        epoch1=epoch1,
+                        batch=batch,
+                        position={"step": 10 * epoch1 + batch},
+                        value=(10 * epoch1 + batch))
+            lp_saver.epoch_test_end_callback(
+                epoch1=epoch1,
+                params=[1.0 / epoch1],
+                value=(10 * epoch1 + 7))
+            iter_saver.end_epoch(epoch1)
+            lp_saver.flush()
+            iter_file_names.append(sorted([name for name in os.listdir(tmp_dir_path) if "_iter_" in name]))
+
+        # The epoch 1 checkpoint isn't saved (`save_interval`), so the last mid-epoch one is kept:
+        expected_file_names = [
+            ["model_iter_0001_000006.iter", "model_iter_0001_000006.json"],
+            [],
+            [],
+        ]
+        if iter_file_names != [sorted(names) for names in expected_file_names]:
+            success = False
+            print("Wrong mid-epoch checkpoints: {}".format(iter_file_names))
+
+        iter_saver.save(epoch1=4, batch=3, position={"step": 43}, value=43)
+        lp_saver.flush()
+        position = load_train_position(file_path_prefix + "_0004_000003.iter")
+        with open(file_path_prefix + "_0004_000003.json", "r") as f:
+            value = json.load(f)["value"]
+        if (position != {"step": 43, "epoch1": 4, "batch": 3}) or (value != 43):
+            success = False
+            print("Wrong mid-epoch checkpoint: {}, {}".format(position, value))
+    finally:
+        shutil.rmtree(tmp_dir_path)
+
+    if success:
+        print("All ok.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+import sys
+import time
+import multiprocessing
+import torch
+from pytorch.pytorchcv.model_provider import _models, get_model
+
+
+def measure_latency(net,
+                    x,
+                    num_iters):
+    with torch.no_grad():
+        net(x)
+        tic = time.time()
+        for _ in range(num_iters):
+            net(x)
+    return (time.time() - tic) / num_iters
+
+
+def calibrate_batch_norms(net,
+                          x):
+    """
+    Set running statistics of batch norms to the statistics of a random batch (a randomly initialized model with
+    default statistics is so ill-conditioned, that rounding differences are amplified to the output scale).
+    """
+    for module in net.modules():
+        if isinstance(module, torch.nn.modules.batchnorm._BatchNorm):
+            module.momentum = None
+    net.train()
+    with torch.no_grad():
+        net(x)
+
+
+def check_model(model_name,
+                num_iters=3):
+    """
+    Script and freeze a model, compare outputs and measure latency.
+
+    Returns
+    -------
+    tuple of 3 elements
+        Error message (None if successful), eager and scripted+frozen latency (in seconds, None if scripting failed).
+    """
+    net = get_model(model_name, pretrained=False)
+    calibrate_batch_norms(net, torch.randn(4, 3, net.in_size[0], net.in_size[1]))
+    net.eval()
+    x = torch.randn(1, 3, net.in_size[0], net.in_size[1])
+    try:
+        net_script = torch.jit.script(net)
+        net_frozen = torch.jit.freeze(net_script)
+    except Exception as e:
+        return "scripting failed: {}".format(str(e).strip().split("\n")[0]), None, None
+
+    error = None
+    with torch.no_grad():
+        y = net(x)
+        y_script = net_script(x)
+        y_frozen = net_frozen(x)
+        # Very deep models are still ill-conditioned, so the rounding differences of folded batch norms are compared
+        # against the output change caused by a tiny input perturbation:
+        y_perturb = net(x * (1.0 + 1e-6))
+    if torch.isfinite(y).all():
+        scale = y.abs().max().item()
+        dist_script = (y - y_script).abs().max().item() / scale
+        dist_frozen = (y - y_frozen).abs().max().item() / scale
+        dist_perturb = (y - y_perturb).abs().max().item() / scale
+        if (dist_script > 1e-5) or (dist_frozen > max(1e-4, 10.0 * dist_perturb)):
+            error = "relative error {} (scripted), {} (frozen)".format(dist_script, dist_frozen)
+
+    eager_time = measure_latency(net, x, num_iters)
+    frozen_time = measure_latency(net_frozen, x, num_iters)
+    return error, eager_time, frozen_time
+
+
+def main():
+    model_names = sys.argv[1].split(",") if len(sys.argv) > 1 else sorted(_models.keys())
+
+    success = True
+    total_eager_time = 0.0
+    total_frozen_time = 0.0
+    # Each model is checked in a separate process, since the memory of frozen modules isn't released:
+    with multiprocessing.Pool(processes=1, maxtasksperchild=1) as pool:
+        for model_name, (error, eager_time, frozen_time) in zip(model_names, pool.imap(check_model, model_names)):
+            if error is not None:
+                success = False
+                print("{}: {}".format(model_name, error))
+            if frozen_time is not None:
+                total_eager_time += eager_time
+                total_frozen_time += frozen_time
+                print("{}: eager {:.1f} ms, scripted+frozen {:.1f} ms ({:.2f}x)".format(
+                    model_name, eager_time * 1e3, frozen_time * 1e3, eager_time / frozen_time))
+
+    if total_frozen_time > 0.0:
+        print("Total: eager {:.2f} s, scripted+frozen {:.2f} s ({:.2f}x)".format(
+            total_eager_time, total_frozen_time, total_eager_time / total_frozen_time))
+    if success:
+        print("All ok.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,78 @@
+import time
+import numpy as np
+import mxnet as mx
+from gluon.gluoncv2.model_provider import get_model
+from gluon.merge_branches import merge_branches
+
+
+def randomize_bn_stats(net):
+    for name, param in net.collect_params().items():
+        if name.endswith("running_mean") or name.endswith("beta"):
+            param.set_data(mx.nd.random.uniform(-0.5, 0.5, shape=param.shape))
+        elif name.endswith("running_var") or name.endswith("gamma"):
+            param.set_data(mx.nd.random.uniform(0.5, 1.5, shape=param.shape))
+
+
+def measure_latency(net,
+                    x,
+                    num_iters):
+    net(x).wait_to_read()
+    tic = time.time()
+    for _ in range(num_iters):
+        net(x).wait_to_read()
+    return (time.time() - tic) / num_iters
+
+
+def main():
+    model_names = [
+        'squeezenet_v1_0',
+        'squeezenet_v1_1',
+        'squeezeresnet_v1_0',
+        'squeezeresnet_v1_1',
+        'inceptionv3',
+        'inceptionv4',
+        'inceptionresnetv2',
+        'bninception',
+        'polynet',
+    ]
+    # ctx = mx.cpu()
+    ctx = mx.gpu(0)
+    batch_size = 1
+    num_iters = 10
+
+    success = True
+    for model_name in model_names:
+        net = get_model(model_name, pretrained=False)
+        net.initialize(mx.init.MSRAPrelu(), ctx=ctx)
+        randomize_bn_stats(net)
+        net.hybridize(static_alloc=True, static_shape=True)
+
+        in_size = net.in_size if hasattr(net, 'in_size') else (224, 224)
+        x = mx.nd.random.normal(shape=(batch_size, 3, in_size[0], in_size[1]), ctx=ctx)
+        y = net(x).asnumpy()
+        time_orig = measure_latency(net, x, num_iters)
+
+        for pad_kernels in (False, True):
+            merged_net = get_model(model_name, pretrained=False)
+            merged_net.initialize(ctx=ctx)
+            merged_params = merged_net._collect_params_with_prefix()
+            for k, v in net._collect_params_with_prefix().items():
+                merged_params[k].set_data(v.data(ctx))
+            merged_net.hybridize(static_alloc=True, static_shape=True)
+            merge_branches(merged_net, pad_kernels=pad_kernels)
+            num_merged = str(merged_net).count("MergedConcurrent(") + str(merged_net).count("MergedUnit(")
+
+            merged_y = merged_net(x).asnumpy()
+            dist = np.max(np.abs(y - merged_y)) / max(np.max(np.abs(y)), 1e-6)
+            if dist > 1e-4:
+                success = False
+            time_merged = measure_latency(merged_net, x, num_iters)
+            print("{:<20} pad_kernels={:<5} merged={:<3} rel_err={:.2e} latency: {:.2f} ms -> {:.2f} ms".format(
+                model_name, str(pad_kernels), num_merged, dist, time_orig * 1000.0, time_merged * 1000.0))
+
+    if success:
+        print("All ok.")
+
+
+if __name__ == '__main__':
+    main()
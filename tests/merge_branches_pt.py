@@ -0,0 +1,82 @@
+import copy
+import time
+import numpy as np
+import torch
+from pytorch.pytorchcv.model_provider import get_model
+from pytorch.merge_branches import merge_branches
+
+
+def randomize_bn_stats(net):
+    for module in net.modules():
+        if isinstance(module, torch.nn.BatchNorm2d):
+            module.running_mean.uniform_(-0.5, 0.5)
+            module.running_var.uniform_(0.5, 1.5)
+            module.weight.data.uniform_(0.5, 1.5)
+            module.bias.data.uniform_(-0.5, 0.5)
+
+
+def measure_latency(net,
+                    x,
+                    num_iters):
+    with torch.no_grad():
+        net(x)
+        if x.is_cuda:
+            torch.cuda.synchronize()
+        tic = time.time()
+        for _ in range(num_iters):
+            net(x)
+        if x.is_cuda:
+            torch.cuda.synchronize()
+    return (time.time() - tic) / num_iters
+
+
+def main():
+    model_names = [
+        'squeezenet_v1_0',
+        'squeezenet_v1_1',
+        'squeezeresnet_v1_0',
+        'squeezeresnet_v1_1',
+        'inceptionv3',
+        'inceptionv4',
+        'inceptionresnetv2',
+        'bninception',
+        'polynet',
+    ]
+    use_cuda = torch.cuda.is_available()
+    batch_size = 1
+    num_iters = 10
+
+    success = True
+    for model_name in model_names:
+        net = get_model(model_name, pretrained=False)
+        with torch.no_grad():
+            randomize_bn_stats(net)
+        net.eval()
+        in_size = net.in_size if hasattr(net, 'in_size') else (224, 224)
+        x = torch.randn(batch_size, 3, in_size[0], in_size[1])
+        if use_cuda:
+            net = net.cuda()
+            x = x.cuda()
+        with torch.no_grad():
+            y = net(x).cpu().numpy()
+        time_orig = measure_latency(net, x, num_iters)
+
+        for pad_kernels in (False, True):
+            merged_net = merge_branches(copy.deepcopy(net), pad_kernels=pad_kernels)
+            num_merged = len([m for m in merged_net.modules() if type(m).__name__ in ("MergedConcurrent",
+                                                                                      "MergedUnit")])
+            with torch.no_grad():
+                merged_y = merged_net(x).cpu().numpy()
+            dist = np.max(np.abs(y - merged_y)) / max(np.max(np.abs(y)), 1e-6)
+            if dist > 1e-4:
+                success = False
+            time_merged = measure_latency(merged_net, x, num_iters)
+            print("{:<20} pad_kernels={:<5} merged={:<3} rel_err={:.2e} latency: {:.2f} ms -> {:.2f} ms".format(
+                model_name, str(pad_kernels), num_merged, dist, time_orig * 1000.0, time_merged * 1000.0))
+
+    if success:
+        print("All ok.")
+
+
+if __name__ == '__main__':
+    main()
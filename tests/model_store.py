@@ -0,0 +1,112 @@
+import os
+import shutil
+import hashlib
+import zipfile
+import tempfile
+import threading
+import multiprocessing
+from functools import partial
+from http.server import HTTPServer, SimpleHTTPRequestHandler
+from pytorch.pytorchcv.models import model_store
+
+
+class CountingHandler(SimpleHTTPRequestHandler):
+    num_requests = 0
+
+    def do_GET(self):
+        CountingHandler.num_requests += 1
+        SimpleHTTPRequestHandler.do_GET(self)
+
+    def log_message(self, format, *args):
+        pass
+
+
+def create_fake_release(release_dir_path,
+                        model_name,
+                        file_size):
+    """
+    Create a fake model file archive in the same layout as the GitHub release has.
+    """
+    data = os.urandom(file_size)
+    sha1_hash = hashlib.sha1(data).hexdigest()
+    error = "0000"
+    repo_release_tag = "v0.0.1"
+    file_name = "{}-{}-{}.pth".format(model_name, error, sha1_hash[:8])
+    dir_path = os.path.join(release_dir_path, "releases", "download", repo_release_tag)
+    if not os.path.exists(dir_path):
+        os.makedirs(dir_path)
+    with zipfile.ZipFile(os.path.join(dir_path, file_name + ".zip"), "w") as zf:
+        zf.writestr(file_name, data)
+    return model_name, (error, sha1_hash, repo_release_tag)
+
+
+def init_worker(repo_url,
+                model_sha1):
+    model_store.imgclsmob_repo_url = repo_url
+    model_store._model_sha1.update(model_sha1)
+
+
+def main():
+    tmp_dir_path = tempfile.mkdtemp()
+    release_dir_path = os.path.join(tmp_dir_path, "release")
+    store_dir_path = os.path.join(tmp_dir_path, "store")
+    try:
+        model_sha1 = dict([create_fake_release(release_dir_path, "fake{}".format(i), 3 * 1024 * 1024 + i)
+                           for i in range(8)])
+        server = HTTPServer(("127.0.0.1", 0), partial(CountingHandler, directory=release_dir_path))
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        repo_url = "http://127.0.0.1:{}".format(server.server_port)
+        init_worker(repo_url, model_sha1)
+        model_names = sorted(model_sha1.keys())
+
+        success = True
+
+        # Several processes ask for the same model at once:
+        ctx = multiprocessing.get_context("fork")
+        with ctx.Pool(processes=4, initializer=init_worker, initargs=(repo_url, model_sha1)) as pool:
+            file_paths = pool.map(partial(model_store.get_model_file, local_model_store_dir_path=store_dir_path),
+                                  [model_names[0]] * 8)
+        if (len(set(file_paths)) != 1) or (CountingHandler.num_requests != 1):
+            success = False
+        print("Concurrent get_model_file: requests={}".format(CountingHandler.num_requests))
+
+        # Bulk prefetch (already cached model isn't downloaded again):
+        CountingHandler.num_requests = 0
+        file_paths = model_store.prefetch(model_names, local_model_store_dir_path=store_dir_path, num_workers=4)
+        for model_name, file_path in zip(model_names, file_paths):
+            if not model_store._check_sha1(file_path, model_sha1[model_name][1]):
+                success = False
+        if CountingHandler.num_requests != len(model_names) - 1:
+            success = False
+        print("Prefetch: requests={}".format(CountingHandler.num_requests))
+
+        # Shared cache directory via environment variable:
+        os.environ["IMGCLSMOB_MODEL_STORE"] = store_dir_path
+        CountingHandler.num_requests = 0
+        if os.path.dirname(model_store.get_model_file(model_names[1])) != store_dir_path:
+            success = False
+        if CountingHandler.num_requests != 0:
+            success = False
+        del os.environ["IMGCLSMOB_MODEL_STORE"]
+
+        # Corrupted file is downloaded again, nothing but model files and locks is left in the directory:
+        with open(file_paths[2], "r+b") as f:
+            f.write(b"\0" * 16)
+        model_store.get_model_file(model_names[2], local_model_store_dir_path=store_dir_path)
+        if not model_store._check_sha1(file_paths[2], model_sha1[model_names[2]][1]):
+            success = False
+        leftovers = [x for x in os.listdir(store_dir_path) if not (x.endswith(".pth") or x.endswith(".lock"))]
+        if leftovers:
+            success = False
+            print("Leftovers: {}".format(leftovers))
+
+        server.shutdown()
+    finally:
+        shutil.rmtree(tmp_dir_path)
+
+    if success:
+        print("All ok.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+import os
+import shutil
+import tempfile
+import numpy as np
+import torch
+from pytorch.pytorchcv.model_provider import get_model
+from pytorch.onnx_export import export_onnx
+from common.onnx_runtime import check_onnx_model, create_ort_session, run_ort_session
+from tests.jit_script_pt import calibrate_batch_norms
+
+
+def main():
+    model_names = [
+        'shufflenet_g1_wd4',
+        'shufflenetv2b_wd2',
+        'condensenet74_c4_g4',
+        'ibn_resnet50',
+        'pyramidnet110_a48_cifar10',
+        'resattnet56',
+        'fishnet99',
+        'densenet121',
+        'nasnet_4a1056',
+    ]
+    tmp_dir_path = tempfile.mkdtemp()
+
+    success = True
+    try:
+        for model_name in model_names:
+            net = get_model(model_name, pretrained=False)
+            in_size = net.in_size
+            calibrate_batch_norms(net, torch.randn(4, 3, in_size[0], in_size[1]))
+            net.eval()
+            file_path = os.path.join(tmp_dir_path, "{}.onnx".format(model_name))
+            export_onnx(
+                net=net,
+                file_path=file_path,
+                in_size=in_size,
+                dynamic_hw=True)
+            check_onnx_model(file_path)
+            session = create_ort_session(file_path)
+
+            # Other batch and spatial sizes than at export:
+            for batch_size, size_inc in [(1, 0), (3, 0), (2, 32)]:
+                x = np.random.normal(size=(batch_size, 3, in_size[0] + size_inc, in_size[1] + size_inc))
+                x = x.astype(np.float32)
+                with torch.no_grad():
+                    y = net(torch.from_numpy(x)).numpy()
+                y_ort = run_ort_session(session, x)
+                dist = np.max(np.abs(y - y_ort)) / np.max(np.abs(y))
+                if dist > 1e-4:
+                    success = False
+                    print("{} ({}x3x{}x{}): relative error {}".format(
+                        model_name, batch_size, in_size[0] + size_inc, in_size[1] + size_inc, dist))
+            del session
+    finally:
+        shutil.rmtree(tmp_dir_path)
+
+    if success:
+        print("All ok.")
+
+
+if __name__ == '__main__':
+    main()
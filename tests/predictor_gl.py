@@ -0,0 +1,51 @@
+import os
+import shutil
+import tempfile
+import numpy as np
+import mxnet as mx
+from gluon.gluoncv2.model_provider import get_model
+from gluon.utils import export_model
+from gluon.predictor import create_predictor
+
+
+def main():
+    model_names = [
+        'resnet18',
+        'mobilenet_w1',
+        'squeezenet_v1_1',
+        'resnet20_cifar10',
+    ]
+    tmp_dir_path = tempfile.mkdtemp()
+
+    success = True
+    try:
+        for model_name in model_names:
+            net = get_model(model_name, pretrained=False)
+            net.initialize(mx.init.Xavier())
+            in_size = net.in_size
+            data_shape = (2, 3, in_size[0], in_size[1])
+            file_prefix = os.path.join(tmp_dir_path, model_name)
+            export_model(
+                net=net,
+                model_name=model_name,
+                file_prefix=file_prefix,
+                data_shape=data_shape)
+
+            x = mx.nd.random.normal(shape=data_shape)
+            y = net(x).asnumpy()
+            for backend in ["module", "symbol_block"]:
+                predictor = create_predictor(file_prefix, backend=backend)
+                y_predictor = predictor(x).asnumpy()
+                dist = np.max(np.abs(y - y_predictor))
+                if dist > 1e-5:
+                    success = False
+                    print("{} ({}): max_abs_err={}".format(model_name, backend, dist))
+    finally:
+        shutil.rmtree(tmp_dir_path)
+
+    if success:
+        print("All ok.")
+
+
+if __name__ == '__main__':
+    main()
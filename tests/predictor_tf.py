@@ -0,0 +1,53 @@
+import os
+import shutil
+import tempfile
+import numpy as np
+from tensorflow_.utils import prepare_model_session, export_frozen_model
+from tensorflow_.predictor import FrozenGraphPredictor
+
+
+def main():
+    model_names = [
+        'resnet18',
+        'mobilenet_w1',
+        'shufflenetv2_wd2',
+        'squeezenet_v1_1',
+    ]
+    tmp_dir_path = tempfile.mkdtemp()
+
+    success = True
+    try:
+        for model_name in model_names:
+            sess, x, y_net = prepare_model_session(
+                model_name=model_name,
+                use_pretrained=False,
+                pretrained_model_file_path="")
+            file_prefix = os.path.join(tmp_dir_path, model_name)
+            export_frozen_model(
+                sess=sess,
+                x=x,
+                y_net=y_net,
+                model_name=model_name,
+                file_prefix=file_prefix)
+            predictor = FrozenGraphPredictor(file_prefix)
+
+            # The batch axis of the frozen graph is dynamic:
+            for batch_size in [1, 3]:
+                data = np.random.normal(size=[batch_size] + x.shape.as_list()[1:]).astype(np.float32)
+                y = sess.run(y_net, feed_dict={x: data})
+                y_predictor = predictor(data)
+                dist = np.max(np.abs(y - y_predictor)) / np.max(np.abs(y))
+                if dist > 1e-4:
+                    success = False
+                    print("{} (batch {}): relative error {}".format(model_name, batch_size, dist))
+            predictor.close()
+            sess.close()
+    finally:
+        shutil.rmtree(tmp_dir_path)
+
+    if success:
+        print("All ok.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,102 @@
+import time
+import numpy as np
+import torch
+from pytorch.pytorchcv.model_provider import get_model
+from pytorch.model_stats import measure_model
+from pytorch.prune_channels import get_channel_groups, prune_channels, apply_channel_spec
+
+
+def randomize_bn_stats(net):
+    for module in net.modules():
+        if isinstance(module, torch.nn.BatchNorm2d):
+            module.running_mean.uniform_(-0.5, 0.5)
+            module.running_var.uniform_(0.5, 1.5)
+            module.weight.data.uniform_(0.5, 1.5)
+            module.bias.data.uniform_(-0.5, 0.5)
+
+
+def zero_channels(net,
+                  ratio,
+                  divisor):
+    """
+    Make the least important (by BatchNorm gamma) channels of each group exactly zero, so that their removal doesn't
+    change the network output.
+    """
+    for group in get_channel_groups(net):
+        num_channels = group.num_channels
+        num_kept = min(max(int(round(num_channels * (1.0 - ratio) / divisor)) * divisor, divisor), num_channels)
+        indices = torch.randperm(num_channels)[num_kept:]
+        for block in group.producers + group.pass_throughs:
+            block.bn.weight.data[indices] = 0.0
+            block.bn.bias.data[indices] = 0.0
+
+
+def measure_latency(net,
+                    x,
+                    num_iters):
+    with torch.no_grad():
+        net(x)
+        tic = time.time()
+        for _ in range(num_iters):
+            net(x)
+    return (time.time() - tic) / num_iters
+
+
+def main():
+    model_names = [
+        'resnet18',
+        'resnet50',
+        'mobilenet_w1',
+        'fdmobilenet_w1',
+    ]
+    ratio = 0.5
+    divisor = 8
+    batch_size = 16
+    num_iters = 5
+
+    success = True
+    for model_name in model_names:
+        net = get_model(model_name, pretrained=False)
+        with torch.no_grad():
+            randomize_bn_stats(net)
+            zero_channels(net, ratio, divisor)
+        net.eval()
+        x = torch.randn(batch_size, 3, 224, 224)
+        with torch.no_grad():
+            y = net(x).numpy()
+        num_flops, _, num_params = measure_model(net, 3, (224, 224))
+        latency = measure_latency(net, x, num_iters)
+
+        channel_spec = prune_channels(net, ratio=ratio, criterion="bn", divisor=divisor)
+        with torch.no_grad():
+            pruned_y = net(x).numpy()
+        dist = np.max(np.abs(y - pruned_y)) / max(np.max(np.abs(y)), 1e-6)
+        if dist > 1e-4:
+            success = False
+        pruned_num_flops, _, pruned_num_params = measure_model(net, 3, (224, 224))
+        pruned_latency = measure_latency(net, x, num_iters)
+
+        # Rebuild the pruned architecture from the specification and load the pruned parameters:
+        rebuilt_net = get_model(model_name, pretrained=False)
+        apply_channel_spec(rebuilt_net, channel_spec)
+        rebuilt_net.load_state_dict(net.state_dict())
+        rebuilt_net.eval()
+        with torch.no_grad():
+            if not np.array_equal(rebuilt_net(x).numpy(), pruned_y):
+                success = False
+
+        # The other criterion should work as well:
+        l1_net = get_model(model_name, pretrained=False)
+        prune_channels(l1_net, ratio=ratio, criterion="l1", divisor=divisor)
+        l1_net(x[:2])
+
+        print("{:<16} rel_err={:.2e} FLOPs: {:.2f}G -> {:.2f}G params: {:.2f}M -> {:.2f}M latency: {:.1f} ms -> "
+              "{:.1f} ms".format(model_name, dist, num_flops / 1e9, pruned_num_flops / 1e9, num_params / 1e6,
+                                 pruned_num_params / 1e6, latency * 1000.0, pruned_latency * 1000.0))
+
+    if success:
+        print("All ok.")
+
+
+if __name__ == '__main__':
+    main()
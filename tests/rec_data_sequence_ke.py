@@ -0,0 +1,74 @@
+import os
+import shutil
+import tempfile
+import numpy as np
+import mxnet as mx
+from keras_.utils import get_data_rec_sequences
+
+
+def create_rec_file(file_stem,
+                    num_samples):
+    """
+    Create an indexed .rec file with small JPEG images, whose labels are their indices.
+    """
+    record = mx.recordio.MXIndexedRecordIO(file_stem + ".idx", file_stem + ".rec", "w")
+    for i in range(num_samples):
+        img = np.full((40, 48, 3), (i * 10) % 256, dtype=np.uint8)
+        header = mx.recordio.IRHeader(flag=0, label=float(i), id=i, id2=0)
+        record.write_idx(i, mx.recordio.pack_img(header, img, quality=95, img_fmt=".jpg"))
+    record.close()
+
+
+def main():
+    num_samples = 23
+    batch_size = 4
+    tmp_dir_path = tempfile.mkdtemp()
+
+    success = True
+    try:
+        file_stem = os.path.join(tmp_dir_path, "val")
+        create_rec_file(file_stem, num_samples)
+        train_seq, val_seq = get_data_rec_sequences(
+            rec_train=(file_stem + ".rec"),
+            rec_train_idx=(file_stem + ".idx"),
+            rec_val=(file_stem + ".rec"),
+            rec_val_idx=(file_stem + ".idx"),
+            batch_size=batch_size,
+            num_workers=3,
+            num_readers=3,
+            prefetch_batches=2,
+            train_num_examples=num_samples,
+            val_num_examples=num_samples,
+            input_image_size=(32, 32))
+        try:
+            # Each pass covers each sample exactly once (the last batch of every reader overflows):
+            for pass_index in range(2):
+                labels = []
+                for i in range(len(val_seq)):
+                    data, batch_labels = val_seq[i]
+                    if data.shape[0] != batch_labels.shape[0]:
+                        success = False
+                        print("Wrong batch shapes: {}, {}".format(data.shape, batch_labels.shape))
+                    labels += batch_labels.flatten().tolist()
+                if sorted(labels) != list(range(num_samples)):
+                    success = False
+                    print("Wrong samples of pass {}: {}".format(pass_index, sorted(labels)))
+
+            # A training pass drops the last incomplete batch:
+            for pass_index in range(2):
+                num_train_samples = sum([train_seq[i][1].shape[0] for i in range(len(train_seq))])
+                if num_train_samples != (num_samples // batch_size) * batch_size:
+                    success = False
+                    print("Wrong number of training samples of pass {}: {}".format(pass_index, num_train_samples))
+        finally:
+            train_seq.close()
+            val_seq.close()
+    finally:
+        shutil.rmtree(tmp_dir_path)
+
+    if success:
+        print("All ok.")
+
+
+if __name__ == '__main__':
+    main()
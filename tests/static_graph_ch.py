@@ -0,0 +1,46 @@
+import time
+import numpy as np
+import chainer
+from chainer_.chainercv2.model_provider import get_model
+from chainer_.chainercv2.models.common import StaticGraphModel
+
+
+def measure_latency(net,
+                    x,
+                    num_iters):
+    y = net(x).array.copy()
+    tic = time.time()
+    for _ in range(num_iters):
+        net(x)
+    return (time.time() - tic) / num_iters, y
+
+
+def main():
+    model_names = [
+        'squeezenet_v1_1',
+        'shufflenet_g1_w1',
+        'shufflenetv2_w1',
+        'condensenet74_c4_g4',
+    ]
+    num_iters = 20
+
+    success = True
+    for model_name in model_names:
+        net = get_model(model_name, pretrained=False)
+        static_net = StaticGraphModel(net)
+        x = chainer.Variable(np.random.randn(1, 3, 224, 224).astype(np.float32))
+        with chainer.using_config('train', False), chainer.no_backprop_mode():
+            time_eager, y_eager = measure_latency(net, x, num_iters)
+            time_static, y_static = measure_latency(static_net, x, num_iters)
+        dist = np.max(np.abs(y_eager - y_static))
+        print("{}: eager={:.2f} ms, static={:.2f} ms per image, max_abs_err={:.2e}".format(
+            model_name, time_eager * 1e3, time_static * 1e3, dist))
+        if dist > 1e-5:
+            success = False
+
+    if success:
+        print("All ok.")
+
+
+if __name__ == '__main__':
+    main()
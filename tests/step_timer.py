@@ -0,0 +1,79 @@
+import os
+import json
+import time
+import shutil
+import tempfile
+from common.step_timer import StepTimer
+
+
+def run_epoch(step_timer,
+              num_iters,
+              log_interval,
+              data_wait):
+    step_timer.start_epoch(1)
+    for i in range(num_iters):
+        time.sleep(data_wait)
+        step_timer.mark("data")
+        time.sleep(0.001)
+        step_timer.mark("forward")
+        step_timer.mark("backward")
+        step_timer.end_iteration()
+        if not (i + 1) % log_interval:
+            time.sleep(0.05)
+            step_timer.end_interval(batch=i)
+    return step_timer.end_epoch()
+
+
+def main():
+    success = True
+    tmp_dir_path = tempfile.mkdtemp()
+    try:
+        file_path = os.path.join(tmp_dir_path, "save", "step_timing.jsonl")
+        sync_counts = []
+        step_timer = StepTimer(
+            file_path=file_path,
+            sync_fn=(lambda: sync_counts.append(1)),
+            phases=("data", "forward", "backward"))
+        stats = run_epoch(step_timer, num_iters=7, log_interval=3, data_wait=0.01)
+
+        with open(file_path, "r") as f:
+            records = [json.loads(line) for line in f]
+        if [(record["type"], record.get("batch"), record["iterations"]) for record in records] !=\
+                [("interval", 2, 3), ("interval", 5, 3), ("interval", 6, 1), ("epoch", None, 7)]:
+            success = False
+            print("Wrong records: {}".format(records))
+        if records[-1] != dict(stats, type="epoch", epoch=1, iterations=7):
+            success = False
+            print("Wrong epoch record: {}".format(records[-1]))
+
+        # Logging time isn't counted, data waiting dominates:
+        if not (10.0 <= stats["data"]["p50"] < 40.0) or not (stats["total"]["p99"] < 50.0):
+            success = False
+            print("Wrong times: {}".format(stats))
+        if not (0.7 < stats["data"]["share"] < 1.0) or\
+                (abs(sum([stats[phase]["share"] for phase in step_timer.phases]) - 1.0) > 1e-6):
+            success = False
+            print("Wrong shares: {}".format(stats))
+        if len(sync_counts) != 1 + 7 * 3 + 3:
+            success = False
+            print("Wrong number of synchronizations: {}".format(len(sync_counts)))
+
+        # A disabled timer neither synchronizes nor writes:
+        sync_counts = []
+        step_timer = StepTimer(
+            enabled=False,
+            file_path=os.path.join(tmp_dir_path, "disabled.jsonl"),
+            sync_fn=(lambda: sync_counts.append(1)))
+        if (run_epoch(step_timer, num_iters=3, log_interval=2, data_wait=0.0) is not None) or sync_counts or\
+                os.path.exists(step_timer.file_path):
+            success = False
+            print("Disabled timer is active")
+    finally:
+        shutil.rmtree(tmp_dir_path)
+
+    if success:
+        print("All ok.")
+
+
+if __name__ == '__main__':
+    main()
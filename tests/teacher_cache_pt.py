@@ -0,0 +1,103 @@
+import os
+import shutil
+import tempfile
+import numpy as np
+import torch
+import torchvision.datasets as datasets
+from PIL import Image
+from common.teacher_cache import get_teacher_cache_file_stem, TeacherLogitsCache
+from pytorch.pytorchcv.model_provider import get_model
+from pytorch.imagenet1k import get_train_data_loader
+from pytorch.distillation import calc_teacher_cache, distillation_loss
+
+
+def create_fake_image_folder(dir_path,
+                             num_classes,
+                             num_images_per_class):
+    for i in range(num_classes):
+        class_dir_path = os.path.join(dir_path, "train", "n{:08d}".format(i))
+        os.makedirs(class_dir_path)
+        for j in range(num_images_per_class):
+            img = np.random.randint(0, 256, size=(96 + 8 * j, 128, 3), dtype=np.uint8)
+            Image.fromarray(img).save(os.path.join(class_dir_path, "{}.jpg".format(j)))
+
+
+def main():
+    input_image_size = 64
+    top_k = 5
+    temperature = 2.0
+    num_views = 2
+
+    tmp_dir_path = tempfile.mkdtemp()
+    try:
+        create_fake_image_folder(tmp_dir_path, num_classes=4, num_images_per_class=5)
+        train_data = get_train_data_loader(
+            data_dir=tmp_dir_path,
+            batch_size=4,
+            num_workers=2,
+            input_image_size=input_image_size,
+            aug_seed=7)
+        dataset = train_data.dataset
+        assert isinstance(dataset.dataset, datasets.ImageFolder)
+
+        success = True
+
+        # Crops are reproducible and differ between views:
+        num_samples = len(dataset)
+        if not torch.equal(dataset[3][0], dataset[3][0]):
+            success = False
+        if torch.equal(dataset[3][0], dataset[num_samples + 3][0]):
+            success = False
+
+        teacher_net = get_model("resnet18", pretrained=False, num_classes=10)
+        teacher_net.eval()
+        caches = []
+        for view in range(num_views):
+            file_stem = get_teacher_cache_file_stem(
+                cache_dir_path=tmp_dir_path,
+                teacher_name="resnet18",
+                aug_seed=dataset.aug_seed,
+                view=view,
+                input_image_size=input_image_size,
+                top_k=top_k)
+            calc_teacher_cache(
+                teacher_net=teacher_net,
+                dataset=dataset,
+                view=view,
+                file_stem=file_stem,
+                batch_size=3,
+                num_workers=2,
+                top_k=top_k,
+                use_cuda=False)
+            caches.append(TeacherLogitsCache(file_stem))
+
+        # The shuffled training loader (with workers) yields the same crops as ones the teacher has seen:
+        for view in range(num_views):
+            train_data.sampler.view = view
+            for data, target, indices in train_data:
+                with torch.no_grad():
+                    logits = teacher_net(data) / temperature
+                top_logits, top_classes = logits.topk(top_k, dim=1)
+                expected = torch.zeros_like(logits).scatter_(1, top_classes, top_logits.softmax(dim=1))
+                soft_targets = caches[view].get_soft_targets(indices.numpy(), logits.size(1), temperature)
+                dist = np.max(np.abs(expected.numpy() - soft_targets))
+                if dist > 1e-2:
+                    success = False
+                    print("view={} max_err={:.2e}".format(view, dist))
+                loss = distillation_loss(
+                    output=logits * temperature,
+                    target=target,
+                    soft_targets=torch.from_numpy(soft_targets),
+                    temperature=temperature,
+                    alpha=0.9)
+                if not torch.isfinite(loss):
+                    success = False
+    finally:
+        shutil.rmtree(tmp_dir_path)
+
+    if success:
+        print("All ok.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,100 @@
+import os
+import sys
+import shutil
+import tempfile
+from common.trial_runner import parse_grid, split_cpu_sets, Trial, run_trials, get_result_table
+
+# Training script stub: logs validation error `lr * epoch` with TrainLogParamSaver, `--fail-epoch` crashes a run,
+# which isn't resumed:
+trial_code = """
+import os, sys, json, argparse
+sys.path.insert(0, {root!r})
+from common.train_log_param_saver import TrainLogParamSaver
+parser = argparse.ArgumentParser()
+parser.add_argument('--lr', type=float)
+parser.add_argument('--fail-epoch', type=int, default=0)
+parser.add_argument('--save-dir', type=str)
+parser.add_argument('--resume', type=str, default='')
+parser.add_argument('--resume-state', type=str, default='')
+parser.add_argument('--start-epoch', type=int, default=1)
+args = parser.parse_args()
+def save_params(file_stem, epoch):
+    for ext in ['.pth', '.states']:
+        with open(file_stem + ext, 'w') as f:
+            f.write(str(epoch))
+lp_saver = TrainLogParamSaver(
+    checkpoint_file_name_prefix='cifar10_model',
+    last_checkpoint_dir_path=args.save_dir,
+    checkpoint_file_save_callback=save_params,
+    checkpoint_file_exts=('.pth', '.states'),
+    num_epochs=4,
+    param_names=['Val.Err', 'Train.Loss'],
+    score_log_file_path=os.path.join(args.save_dir, 'score.log'))
+with open(os.path.join(args.save_dir, 'env.json'), 'w') as f:
+    json.dump({{'threads': os.environ['OMP_NUM_THREADS'], 'cpus': sorted(os.sched_getaffinity(0))}}, f)
+for epoch1 in range(args.start_epoch, 5):
+    if (epoch1 == args.fail_epoch) and (not args.resume):
+        sys.exit(3)
+    lp_saver.epoch_test_end_callback(epoch1=epoch1, params=[args.lr * epoch1, 1.0], epoch=epoch1)
+"""
+
+
+def main():
+    success = True
+
+    if split_cpu_sets(list(range(8)), num_parallel=3) != [[0, 1], [2, 3], [4, 5]]:
+        success = False
+        print("Wrong CPU sets")
+    grid = parse_grid(["lr=0.1,0.2", "--fail-epoch=0,3"])
+    if [list(params.values()) for params in grid] != [["0.1", "0"], ["0.1", "3"], ["0.2", "0"], ["0.2", "3"]]:
+        success = False
+        print("Wrong grid: {}".format(grid))
+
+    tmp_dir_path = tempfile.mkdtemp()
+    try:
+        root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        base_command = [sys.executable, "-c", trial_code.format(root=root)]
+        cpus = sorted(os.sched_getaffinity(0))
+        cpu_sets = [cpus[:1], cpus[-1:]]
+
+        # The first run fails trials at epoch 3, the second one resumes them from epoch 2 checkpoints:
+        for num_expected_failures in [2, 0]:
+            trials = [Trial(params, tmp_dir_path) for params in grid]
+            num_failed = run_trials(
+                trials=trials,
+                base_command=base_command,
+                cpu_sets=cpu_sets,
+                checkpoint_file_exts=(".pth", ".states"),
+                poll_interval=0.05)
+            if num_failed != num_expected_failures:
+                success = False
+                print("{} trials failed instead of {}".format(num_failed, num_expected_failures))
+
+        trials = [Trial(params, tmp_dir_path) for params in grid]
+        if [trial.state["num_launches"] for trial in trials] != [1, 2, 1, 2]:
+            success = False
+            print("Wrong launches: {}".format([trial.state["num_launches"] for trial in trials]))
+        columns, rows = get_result_table(trials)
+        if columns != ["lr", "fail-epoch", "Status", "Epochs", "Best.Val.Err", "Best.Epoch", "Val.Err", "Train.Loss",
+                       "Time"]:
+            success = False
+            print("Wrong columns: {}".format(columns))
+        for row in rows:
+            lr = float(row[0])
+            if (row[2:8] != ["finished", 4, lr, 1, 4 * lr, 1.0]) or (row[8] <= 0.0):
+                success = False
+                print("Wrong row: {}".format(row))
+        with open(os.path.join(trials[0].dir_path, "env.json"), "r") as f:
+            env = f.read()
+        if env not in ['{{"threads": "1", "cpus": [{}]}}'.format(cpu) for cpu in cpus]:
+            success = False
+            print("Wrong trial environment: {}".format(env))
+    finally:
+        shutil.rmtree(tmp_dir_path)
+
+    if success:
+        print("All ok.")
+
+
+if __name__ == '__main__':
+    main()
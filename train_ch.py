@@ -5,7 +5,7 @@ import chainer
 from chainer import cuda
 from chainer import training
 from chainer.training import extensions
-from chainer.serializers import save_npz
+from chainer.serializers import DictionarySerializer
 
 from common.logger_utils import initialize_logging
 from chainer_.utils import prepare_model
@@ -130,6 +130,11 @@ def parse_args():
         type=int,
         default=4,
         help='saving parameters epoch interval, best model will always be saved')
+    parser.add_argument(
+        '--max-pending-saves',
+        type=int,
+        default=1,
+        help='maximal number of checkpoints being written in background (0 means saving on the training thread)')
     parser.add_argument(
         '--save-dir',
         type=str,
@@ -223,15 +228,22 @@ def prepare_trainer(net,
     return trainer
 
 
+def snapshot_params(net,
+                    trainer):
+    def serialize(obj):
+        serializer = DictionarySerializer()
+        serializer.save(obj)
+        return {k: np.array(cuda.to_cpu(v)) for k, v in serializer.target.items()}
+    return {'params': serialize(net), 'states': serialize(trainer)}
+
+
 def save_params(file_stem,
-                net,
-                trainer):
-    save_npz(
-        file=file_stem + '.npz',
-        obj=net)
-    save_npz(
-        file=file_stem + '.states',
-        obj=trainer)
+                params,
+                states):
+    with open(file_stem + '.npz', 'wb') as f:
+        np.savez_compressed(f, **params)
+    with open(file_stem + '.states', 'wb') as f:
+        np.savez_compressed(f, **states)
 
 
 def main():
@@ -287,6 +299,8 @@ def main():
     #         last_checkpoint_file_count=2,
     #         best_checkpoint_file_count=2,
     #         checkpoint_file_save_callback=save_params,
+    #         checkpoint_file_snapshot_callback=snapshot_params,
+    #         max_pending_saves=args.max_pending_saves,
     #         checkpoint_file_exts=['.npz', '.states'],
     #         save_interval=args.save_interval,
     #         num_epochs=args.num_epochs,
@@ -4,6 +4,7 @@ import logging
 import os
 import numpy as np
 import random
+import itertools
 
 import mxnet as mx
 from mxnet import gluon
@@ -11,8 +12,15 @@ from mxnet import autograd as ag
 
 from common.logger_utils import initialize_logging
 from common.train_log_param_saver import TrainLogParamSaver
+from common.teacher_cache import add_teacher_parser_arguments
+from common.resize_schedule import add_resize_schedule_parser_arguments, parse_resize_schedule, ScheduledTrainData
+from common.async_validation import add_async_validation_parser_arguments, AsyncValidator
+from common.step_timer import add_step_timing_parser_arguments, StepTimer
+from common.iter_checkpoint import add_iter_checkpoint_parser_arguments, get_host_rng_state, set_host_rng_state,\
+    load_train_position, IterCheckpointSaver
 from gluon.lr_scheduler import LRScheduler
-from gluon.utils import prepare_mx_context, prepare_model, validate
+from gluon.utils import prepare_mx_context, prepare_mx_kvstore, prepare_model, validate
+from gluon.distillation import prepare_teacher_caches, DistillationSoftmaxCrossEntropyLoss
 
 from gluon.imagenet1k import add_dataset_parser_arguments
 from gluon.imagenet1k import get_batch_fn
@@ -27,6 +35,11 @@ def parse_args():
         formatter_class=argparse.ArgumentDefaultsHelpFormatter)
 
     add_dataset_parser_arguments(parser)
+    add_teacher_parser_arguments(parser)
+    add_resize_schedule_parser_arguments(parser)
+    add_async_validation_parser_arguments(parser)
+    add_step_timing_parser_arguments(parser)
+    add_iter_checkpoint_parser_arguments(parser)
 
     parser.add_argument(
         '--model',
@@ -58,6 +71,12 @@ def parse_args():
         type=int,
         default=0,
         help='number of gpus to use.')
+    parser.add_argument(
+        '--kvstore',
+        type=str,
+        default='device',
+        choices=['local', 'device', 'dist_sync', 'dist_device_sync'],
+        help='kvstore to use for gradient aggregation (dist_* for multi-node training, see launch_gl_dist.py)')
     parser.add_argument(
         '-j',
         '--num-data-workers',
@@ -202,6 +221,11 @@ def parse_args():
         type=int,
         default=4,
         help='saving parameters epoch interval, best model will always be saved')
+    parser.add_argument(
+        '--max-pending-saves',
+        type=int,
+        default=1,
+        help='maximal number of checkpoints being written in background (0 means saving on the training thread)')
     parser.add_argument(
         '--save-dir',
         type=str,
@@ -268,7 +292,9 @@ def prepare_trainer(net,
                     gamma_wd_mult=1.0,
                     beta_wd_mult=1.0,
                     bias_wd_mult=1.0,
-                    state_file_path=None):
+                    state_file_path=None,
+                    kvstore='device',
+                    num_workers=1):
 
     if gamma_wd_mult != 1.0:
         for k, v in net.collect_params('.*gamma').items():
@@ -286,7 +312,7 @@ def prepare_trainer(net,
         lr_decay_epoch = list(range(lr_decay_period, num_epochs, lr_decay_period))
     else:
         lr_decay_epoch = [int(i) for i in lr_decay_epoch.split(',')]
-    num_batches = num_training_samples // batch_size
+    num_batches = num_training_samples // (batch_size * num_workers)
     lr_scheduler = LRScheduler(
         mode=lr_mode,
         base_lr=lr,
@@ -307,10 +333,17 @@ def prepare_trainer(net,
     if dtype != 'float32':
         optimizer_params['multi_precision'] = True
 
+    trainer_kwargs = {}
+    if num_workers > 1:
+        # The optimizer (with the LR scheduler updated on workers) must run on workers, not on servers:
+        trainer_kwargs['update_on_kvstore'] = False
+
     trainer = gluon.Trainer(
         params=net.collect_params(),
         optimizer=optimizer_name,
-        optimizer_params=optimizer_params)
+        optimizer_params=optimizer_params,
+        kvstore=kvstore,
+        **trainer_kwargs)
 
     if (state_file_path is not None) and state_file_path and os.path.exists(state_file_path):
         logging.info('Loading trainer states: {}'.format(state_file_path))
@@ -324,11 +357,20 @@ def prepare_trainer(net,
     return trainer, lr_scheduler
 
 
+def snapshot_params(net,
+                    trainer):
+    params = {key: val._reduce() for key, val in net._collect_params_with_prefix().items()}
+    updater = trainer._kvstore._updater if trainer._update_on_kvstore else trainer._updaters[0]
+    states = updater.get_states(dump_optimizer=True)
+    return {'params': params, 'states': states}
+
+
 def save_params(file_stem,
-                net,
-                trainer):
-    net.save_parameters(file_stem + '.params')
-    trainer.save_states(file_stem + '.states')
+                params,
+                states):
+    mx.nd.save(file_stem + '.params', params)
+    with open(file_stem + '.states', 'wb') as f:
+        f.write(states)
 
 
 def train_epoch(epoch,
@@ -350,20 +392,64 @@ def train_epoch(epoch,
                 num_classes,
                 num_epochs,
                 grad_clip_value,
-                batch_size_scale):
+                batch_size_scale,
+                num_workers=1,
+                teacher_caches=None,
+                lr_iter_scale=1.0,
+                step_timer=None,
+                iter_saver=None,
+                train_position=None):
+
+    if step_timer is None:
+        step_timer = StepTimer(enabled=False)
 
     labels_list_inds = None
     batch_size_extend_count = 0
     tic = time.time()
+    # Resetting of a record iterator counts as data waiting of the first iteration:
+    step_timer.start_epoch(epoch + 1)
     if data_source_needs_reset:
         train_data.reset()
     acc_top1_train.reset()
     train_loss = 0.0
 
+    teacher_cache = None
+    if teacher_caches:
+        # The loader yields crops of the augmentation view, for which the teacher logits were cached:
+        train_data.view_sampler.view = epoch % len(teacher_caches)
+        teacher_cache = teacher_caches[train_data.view_sampler.view]
+
+    start_batch = 0
+    sampler = getattr(train_data, 'resumable_sampler', None)
+    assert (sampler is not None) or ((iter_saver is None) and (train_position is None)),\
+        "Mid-epoch checkpoints require a resumable sampler (the image record iterator isn't supported)"
+    if train_position is not None:
+        start_batch = train_position['batch']
+        train_loss = train_position['train_loss']
+        acc_top1_train.sum_metric, acc_top1_train.num_inst = train_position['acc_top1']
+        set_host_rng_state(train_position['rng'])
+        sampler.seed = train_position['sampler_seed']
+        # The state of MXNet generator can't be saved, it's reseeded by the position:
+        mx.random.seed(sampler.seed + epoch * 1000003 + start_batch)
+        logging.info('Resume training from [Epoch {}] Batch [{}]'.format(epoch + 1, start_batch))
+    if sampler is not None:
+        # Processed samples of the epoch permutation are skipped without reading:
+        sampler.set_epoch(epoch, start_index=(start_batch * batch_size))
+
+    i = start_batch - 1
     btic = time.time()
-    for i, batch in enumerate(train_data):
+    for i, batch in enumerate(train_data, start_batch):
+        step_timer.mark("data")
         data_list, labels_list = batch_fn(batch, ctx)
 
+        if teacher_cache is not None:
+            soft_labels = teacher_cache.get_soft_targets(
+                indices=batch[2].asnumpy().astype(np.int64),
+                num_classes=num_classes,
+                temperature=loss_func.temperature)
+            soft_labels_list = gluon.utils.split_and_load(mx.nd.array(soft_labels), ctx_list=ctx, batch_axis=0)
+        step_timer.mark("transfer")
+
         if mixup:
             labels_list_inds = labels_list
             labels_list = [Y.one_hot(depth=num_classes) for Y in labels_list]
@@ -381,31 +467,56 @@ def train_epoch(epoch,
 
         with ag.record():
             outputs_list = [net(X.astype(dtype, copy=False)) for X in data_list]
-            loss_list = [loss_func(yhat, y.astype(dtype, copy=False)) for yhat, y in zip(outputs_list, labels_list)]
+            if teacher_cache is not None:
+                loss_list = [loss_func(yhat, y.astype(dtype, copy=False), s.astype(dtype, copy=False))
+                             for yhat, y, s in zip(outputs_list, labels_list, soft_labels_list)]
+            else:
+                loss_list = [loss_func(yhat, y.astype(dtype, copy=False))
+                             for yhat, y in zip(outputs_list, labels_list)]
+        step_timer.mark("forward")
         for loss in loss_list:
             loss.backward()
-        lr_scheduler.update(i, epoch)
+        step_timer.mark("backward")
+        # The scheduler counts iterations of the base batch size:
+        lr_scheduler.update(int(i * lr_iter_scale), epoch)
 
         if grad_clip_value is not None:
             grads = [v.grad(ctx[0]) for v in net.collect_params().values() if v._grad is not None]
             gluon.utils.clip_global_norm(grads, max_norm=grad_clip_value)
 
         if batch_size_scale == 1:
-            trainer.step(batch_size)
+            trainer.step(batch_size * num_workers)
         else:
             if (i + 1) % batch_size_scale == 0:
                 batch_size_extend_count = 0
-                trainer.step(batch_size * batch_size_scale)
+                trainer.step(batch_size * batch_size_scale * num_workers)
                 for p in net.collect_params().values():
                     p.zero_grad()
             else:
                 batch_size_extend_count += 1
+        step_timer.mark("step")
 
         train_loss += sum([loss.mean().asscalar() for loss in loss_list]) / len(loss_list)
 
         acc_top1_train.update(
             labels=(labels_list if not (mixup or label_smoothing) else labels_list_inds),
             preds=outputs_list)
+        step_timer.mark("metrics")
+        step_timer.end_iteration()
+
+        # The position of the LR scheduler is defined by the batch index, accumulated gradients aren't saved:
+        if (iter_saver is not None) and iter_saver.need_save(i + 1) and (batch_size_extend_count == 0):
+            iter_saver.save(
+                epoch1=(epoch + 1),
+                batch=(i + 1),
+                position={
+                    'sampler_seed': sampler.seed,
+                    'rng': get_host_rng_state(),
+                    'train_loss': train_loss,
+                    'acc_top1': (acc_top1_train.sum_metric, acc_top1_train.num_inst),
+                },
+                net=net,
+                trainer=trainer)
 
         if log_interval and not (i + 1) % log_interval:
             speed = batch_size * log_interval / (time.time() - btic)
@@ -414,15 +525,17 @@ def train_epoch(epoch,
             err_top1_train = 1.0 - top1
             logging.info('Epoch[{}] Batch [{}]\tSpeed: {:.2f} samples/sec\ttop1-err={:.4f}\tlr={:.5f}'.format(
                 epoch + 1, i, speed, err_top1_train, trainer.learning_rate))
+            step_timer.end_interval(batch=i)
 
     if (batch_size_scale != 1) and (batch_size_extend_count > 0):
-        trainer.step(batch_size * batch_size_extend_count)
+        trainer.step(batch_size * batch_size_extend_count * num_workers)
         for p in net.collect_params().values():
             p.zero_grad()
 
-    throughput = int(batch_size * (i + 1) / (time.time() - tic))
+    throughput = int(batch_size * (i + 1 - start_batch) / (time.time() - tic))
     logging.info('[Epoch {}] speed: {:.2f} samples/sec\ttime cost: {:.2f} sec'.format(
         epoch + 1, throughput, time.time() - tic))
+    step_timer.end_epoch()
 
     train_loss /= (i + 1)
     _, top1 = acc_top1_train.get()
@@ -452,9 +565,20 @@ def train_net(batch_size,
               num_classes,
               grad_clip_value,
               batch_size_scale,
-              ctx):
+              ctx,
+              num_workers=1,
+              teacher_caches=None,
+              kd_temperature=1.0,
+              kd_alpha=0.9,
+              train_data_scheduler=None,
+              async_validator=None,
+              val_num_batches=None,
+              step_timer=None,
+              iter_saver=None,
+              train_position=None):
 
     assert (not (mixup and label_smoothing))
+    assert (not (teacher_caches and (mixup or label_smoothing)))
 
     if batch_size_scale != 1:
         for p in net.collect_params().values():
@@ -467,12 +591,18 @@ def train_net(batch_size,
     acc_top5_val = mx.metric.TopKAccuracy(5)
     acc_top1_train = mx.metric.Accuracy()
 
-    loss_func = gluon.loss.SoftmaxCrossEntropyLoss(sparse_label=(not (mixup or label_smoothing)))
+    if teacher_caches:
+        loss_func = DistillationSoftmaxCrossEntropyLoss(
+            temperature=kd_temperature,
+            alpha=kd_alpha)
+    else:
+        loss_func = gluon.loss.SoftmaxCrossEntropyLoss(sparse_label=(not (mixup or label_smoothing)))
 
     assert (type(start_epoch1) == int)
     assert (start_epoch1 >= 1)
     if start_epoch1 > 1:
         logging.info('Start training from [Epoch {}]'.format(start_epoch1))
+    if (start_epoch1 > 1) and (train_position is None):
         err_top1_val, err_top5_val = validate(
             acc_top1=acc_top1_val,
             acc_top5=acc_top5_val,
@@ -487,6 +617,11 @@ def train_net(batch_size,
 
     gtic = time.time()
     for epoch in range(start_epoch1 - 1, num_epochs):
+        if train_data_scheduler is not None:
+            train_data, epoch_batch_size = train_data_scheduler.get(epoch)
+        else:
+            epoch_batch_size = batch_size
+
         err_top1_train, train_loss = train_epoch(
             epoch=epoch,
             net=net,
@@ -499,7 +634,7 @@ def train_net(batch_size,
             loss_func=loss_func,
             trainer=trainer,
             lr_scheduler=lr_scheduler,
-            batch_size=batch_size,
+            batch_size=epoch_batch_size,
             log_interval=log_interval,
             mixup=mixup,
             mixup_epoch_tail=mixup_epoch_tail,
@@ -507,44 +642,83 @@ def train_net(batch_size,
             num_classes=num_classes,
             num_epochs=num_epochs,
             grad_clip_value=grad_clip_value,
-            batch_size_scale=batch_size_scale)
-
-        err_top1_val, err_top5_val = validate(
-            acc_top1=acc_top1_val,
-            acc_top5=acc_top5_val,
-            net=net,
-            val_data=val_data,
-            batch_fn=batch_fn,
-            data_source_needs_reset=data_source_needs_reset,
-            dtype=dtype,
-            ctx=ctx)
-
-        logging.info('[Epoch {}] validation: err-top1={:.4f}\terr-top5={:.4f}'.format(
-            epoch + 1, err_top1_val, err_top5_val))
+            batch_size_scale=batch_size_scale,
+            num_workers=num_workers,
+            teacher_caches=teacher_caches,
+            lr_iter_scale=(float(epoch_batch_size) / batch_size),
+            step_timer=step_timer,
+            iter_saver=iter_saver,
+            train_position=(train_position if (epoch == start_epoch1 - 1) else None))
+
+        if val_num_batches is None:
+            err_top1_val, err_top5_val = validate(
+                acc_top1=acc_top1_val,
+                acc_top5=acc_top5_val,
+                net=net,
+                val_data=val_data,
+                batch_fn=batch_fn,
+                data_source_needs_reset=data_source_needs_reset,
+                dtype=dtype,
+                ctx=ctx)
+
+            logging.info('[Epoch {}] validation: err-top1={:.4f}\terr-top5={:.4f}'.format(
+                epoch + 1, err_top1_val, err_top5_val))
+        elif val_num_batches > 0:
+            if data_source_needs_reset:
+                val_data.reset()
+            err_top1_subset, err_top5_subset = validate(
+                acc_top1=acc_top1_val,
+                acc_top5=acc_top5_val,
+                net=net,
+                val_data=itertools.islice(val_data, val_num_batches),
+                batch_fn=batch_fn,
+                data_source_needs_reset=False,
+                dtype=dtype,
+                ctx=ctx)
+            logging.info('[Epoch {}] validation on {} batches: err-top1={:.4f}\terr-top5={:.4f}'.format(
+                epoch + 1, val_num_batches, err_top1_subset, err_top5_subset))
 
         if lp_saver is not None:
             lp_saver_kwargs = {'net': net, 'trainer': trainer}
-            lp_saver.epoch_test_end_callback(
-                epoch1=(epoch + 1),
-                params=[err_top1_val, err_top1_train, err_top5_val, train_loss, trainer.learning_rate],
-                **lp_saver_kwargs)
+            if async_validator is not None:
+                async_validator.submit(
+                    epoch1=(epoch + 1),
+                    params=[None, err_top1_train, None, train_loss, trainer.learning_rate],
+                    **lp_saver_kwargs)
+                async_validator.collect()
+            else:
+                lp_saver.epoch_test_end_callback(
+                    epoch1=(epoch + 1),
+                    params=[err_top1_val, err_top1_train, err_top5_val, train_loss, trainer.learning_rate],
+                    **lp_saver_kwargs)
+            if iter_saver is not None:
+                iter_saver.end_epoch(epoch + 1)
 
     logging.info('Total time cost: {:.2f} sec'.format(time.time() - gtic))
+    if async_validator is not None:
+        async_validator.finish()
     if lp_saver is not None:
+        lp_saver.flush()
         logging.info('Best err-top5: {:.4f} at {} epoch'.format(
             lp_saver.best_eval_metric_value, lp_saver.best_eval_metric_epoch))
 
 
 def main():
     args = parse_args()
+
+    kvstore, rank, num_workers = prepare_mx_kvstore(kvstore=args.kvstore)
+    assert (num_workers == 1) or args.use_rec or (args.seed > 0), \
+        "Distributed training with the folder loader requires a fixed seed, to shard the same sample permutation"
     args.seed = init_rand(seed=args.seed)
 
     _, log_file_exist = initialize_logging(
-        logging_dir_path=args.save_dir,
+        logging_dir_path=(args.save_dir if rank == 0 else None),
         logging_file_name=args.logging_file_name,
         script_args=args,
         log_packages=args.log_packages,
         log_pip_packages=args.log_pip_packages)
+    if rank != 0:
+        logging.getLogger().setLevel(logging.WARNING)
 
     ctx, batch_size = prepare_mx_context(
         num_gpus=args.num_gpus,
@@ -565,11 +739,35 @@ def main():
     num_classes = net.classes if hasattr(net, 'classes') else 1000
     input_image_size = net.in_size if hasattr(net, 'in_size') else (args.input_size, args.input_size)
 
-    train_data = get_train_data_source(
-        dataset_args=args,
-        batch_size=batch_size,
-        num_workers=args.num_workers,
-        input_image_size=input_image_size)
+    resize_schedule = parse_resize_schedule(args.resize_schedule)
+    if resize_schedule:
+        assert (not args.teacher), "Teacher logits are cached for crops of the model input size"
+        train_data = None
+        train_data_scheduler = ScheduledTrainData(
+            schedule=resize_schedule,
+            base_size=input_image_size[0],
+            batch_size=batch_size,
+            create_fn=(lambda size, epoch_batch_size: get_train_data_source(
+                dataset_args=args,
+                batch_size=epoch_batch_size,
+                num_workers=args.num_workers,
+                input_image_size=(size, size),
+                num_parts=num_workers,
+                part_index=rank,
+                seed=args.seed)),
+            scale_batch=args.resize_scale_batch,
+            batch_size_divisor=len(ctx))
+    else:
+        train_data = get_train_data_source(
+            dataset_args=args,
+            batch_size=batch_size,
+            num_workers=args.num_workers,
+            input_image_size=input_image_size,
+            num_parts=num_workers,
+            part_index=rank,
+            seed=args.seed,
+            aug_seed=(args.aug_seed if args.teacher else None))
+        train_data_scheduler = None
     val_data = get_val_data_source(
         dataset_args=args,
         batch_size=batch_size,
@@ -579,6 +777,24 @@ def main():
     batch_fn = get_batch_fn(dataset_args=args)
     data_source_needs_reset = args.use_rec
 
+    if args.teacher:
+        teacher_cache_dir = args.teacher_cache_dir if args.teacher_cache_dir else args.save_dir
+        assert teacher_cache_dir, "Teacher cache directory isn't specified"
+        teacher_caches = prepare_teacher_caches(
+            teacher_name=args.teacher,
+            dataset=train_data.dataset,
+            cache_dir_path=teacher_cache_dir,
+            num_views=args.teacher_num_views,
+            input_image_size=input_image_size,
+            top_k=args.teacher_topk,
+            batch_size=batch_size,
+            num_workers=args.num_workers,
+            dtype=args.dtype,
+            ctx=ctx,
+            rank=rank)
+    else:
+        teacher_caches = None
+
     trainer, lr_scheduler = prepare_trainer(
         net=net,
         optimizer_name=args.optimizer_name,
@@ -601,9 +817,18 @@ def main():
         gamma_wd_mult=args.gamma_wd_mult,
         beta_wd_mult=args.beta_wd_mult,
         bias_wd_mult=args.bias_wd_mult,
-        state_file_path=args.resume_state)
+        state_file_path=args.resume_state,
+        kvstore=kvstore,
+        num_workers=num_workers)
+
+    if args.resume_iter:
+        assert (args.resume and args.resume_state), "Mid-epoch resuming requires --resume and --resume-state"
+        train_position = load_train_position(args.resume_iter)
+        args.start_epoch = train_position['epoch1']
+    else:
+        train_position = None
 
-    if args.save_dir and args.save_interval:
+    if args.save_dir and args.save_interval and (rank == 0):
         lp_saver = TrainLogParamSaver(
             checkpoint_file_name_prefix='imagenet_{}'.format(args.model),
             last_checkpoint_file_name_suffix="last",
@@ -613,6 +838,8 @@ def main():
             last_checkpoint_file_count=2,
             best_checkpoint_file_count=2,
             checkpoint_file_save_callback=save_params,
+            checkpoint_file_snapshot_callback=snapshot_params,
+            max_pending_saves=args.max_pending_saves,
             checkpoint_file_exts=('.params', '.states'),
             save_interval=args.save_interval,
             num_epochs=args.num_epochs,
@@ -626,6 +853,33 @@ def main():
     else:
         lp_saver = None
 
+    if args.val_queue_dir and (rank == 0):
+        assert (lp_saver is not None), "Asynchronous validation requires checkpoint saving (--save-dir)"
+        async_validator = AsyncValidator(
+            queue_dir_path=args.val_queue_dir,
+            lp_saver=lp_saver,
+            checkpoint_file_name_prefix='imagenet_{}'.format(args.model),
+            val_param_indices=[0, 2],
+            stale_timeout=args.val_queue_stale_timeout)
+    else:
+        async_validator = None
+
+    if (args.checkpoint_iters > 0) and (rank == 0):
+        assert (lp_saver is not None), "Mid-epoch checkpoints require checkpoint saving (--save-dir)"
+        iter_saver = IterCheckpointSaver(
+            lp_saver=lp_saver,
+            file_path_prefix=os.path.join(args.save_dir, 'imagenet_{}_iter'.format(args.model)),
+            interval=args.checkpoint_iters,
+            last_file_stem=(os.path.splitext(args.resume_iter)[0] if args.resume_iter else None))
+    else:
+        iter_saver = None
+
+    # Asynchronous computations are awaited for each phase:
+    step_timer = StepTimer(
+        enabled=args.step_timing,
+        file_path=(os.path.join(args.save_dir, 'step_timing.jsonl') if args.save_dir and (rank == 0) else None),
+        sync_fn=mx.nd.waitall)
+
     train_net(
         batch_size=batch_size,
         num_epochs=args.num_epochs,
@@ -646,7 +900,17 @@ def main():
         num_classes=num_classes,
         grad_clip_value=args.grad_clip,
         batch_size_scale=args.batch_size_scale,
-        ctx=ctx)
+        ctx=ctx,
+        num_workers=num_workers,
+        teacher_caches=teacher_caches,
+        kd_temperature=args.kd_temperature,
+        kd_alpha=args.kd_alpha,
+        train_data_scheduler=train_data_scheduler,
+        async_validator=async_validator,
+        val_num_batches=(args.val_subset_batches if args.val_queue_dir else None),
+        step_timer=step_timer,
+        iter_saver=iter_saver,
+        train_position=train_position)
 
 
 if __name__ == '__main__':
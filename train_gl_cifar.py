@@ -11,6 +11,8 @@ from mxnet import autograd as ag
 
 from common.logger_utils import initialize_logging
 from common.train_log_param_saver import TrainLogParamSaver
+from common.cifar_cache import add_cifar_cache_parser_arguments
+from common.step_timer import add_step_timing_parser_arguments, StepTimer
 from gluon.lr_scheduler import LRScheduler
 from gluon.utils import prepare_mx_context, prepare_model, validate1
 
@@ -33,6 +35,8 @@ def parse_args():
 
     args, _ = parser.parse_known_args()
     add_dataset_parser_arguments(parser, args.dataset)
+    add_cifar_cache_parser_arguments(parser)
+    add_step_timing_parser_arguments(parser)
 
     parser.add_argument(
         '--model',
@@ -355,11 +359,17 @@ def train_epoch(epoch,
                 num_classes,
                 num_epochs,
                 grad_clip_value,
-                batch_size_scale):
+                batch_size_scale,
+                step_timer=None):
+
+    if step_timer is None:
+        step_timer = StepTimer(enabled=False)
 
     labels_list_inds = None
     batch_size_extend_count = 0
     tic = time.time()
+    # Resetting of a record iterator counts as data waiting of the first iteration:
+    step_timer.start_epoch(epoch + 1)
     if data_source_needs_reset:
         train_data.reset()
     acc_metric_train.reset()
@@ -367,7 +377,9 @@ def train_epoch(epoch,
 
     btic = time.time()
     for i, batch in enumerate(train_data):
+        step_timer.mark("data")
         data_list, labels_list = batch_fn(batch, ctx)
+        step_timer.mark("transfer")
 
         if mixup:
             labels_list_inds = labels_list
@@ -387,8 +399,10 @@ def train_epoch(epoch,
         with ag.record():
             outputs_list = [net(X.astype(dtype, copy=False)) for X in data_list]
             loss_list = [loss_func(yhat, y.astype(dtype, copy=False)) for yhat, y in zip(outputs_list, labels_list)]
+        step_timer.mark("forward")
         for loss in loss_list:
             loss.backward()
+        step_timer.mark("backward")
         lr_scheduler.update(i, epoch)
 
         if grad_clip_value is not None:
@@ -405,12 +419,15 @@ def train_epoch(epoch,
                     p.zero_grad()
             else:
                 batch_size_extend_count += 1
+        step_timer.mark("step")
 
         train_loss += sum([loss.mean().asscalar() for loss in loss_list]) / len(loss_list)
 
         acc_metric_train.update(
             labels=(labels_list if not (mixup or label_smoothing) else labels_list_inds),
             preds=outputs_list)
+        step_timer.mark("metrics")
+        step_timer.end_iteration()
 
         if log_interval and not (i + 1) % log_interval:
             speed = batch_size * log_interval / (time.time() - btic)
@@ -419,6 +436,7 @@ def train_epoch(epoch,
             err_train_value = 1.0 - acc_train_value
             logging.info('Epoch[{}] Batch [{}]\tSpeed: {:.2f} samples/sec\terr={:.4f}\tlr={:.5f}'.format(
                 epoch + 1, i, speed, err_train_value, trainer.learning_rate))
+            step_timer.end_interval(batch=i)
 
     if (batch_size_scale != 1) and (batch_size_extend_count > 0):
         trainer.step(batch_size * batch_size_extend_count)
@@ -428,6 +446,7 @@ def train_epoch(epoch,
     throughput = int(batch_size * (i + 1) / (time.time() - tic))
     logging.info('[Epoch {}] speed: {:.2f} samples/sec\ttime cost: {:.2f} sec'.format(
         epoch + 1, throughput, time.time() - tic))
+    step_timer.end_epoch()
 
     train_loss /= (i + 1)
     _, acc_train_value = acc_metric_train.get()
@@ -456,7 +475,8 @@ def train_net(batch_size,
               num_classes,
               grad_clip_value,
               batch_size_scale,
-              ctx):
+              ctx,
+              step_timer=None):
 
     assert (not (mixup and label_smoothing))
 
@@ -508,7 +528,8 @@ def train_net(batch_size,
             num_classes=num_classes,
             num_epochs=num_epochs,
             grad_clip_value=grad_clip_value,
-            batch_size_scale=batch_size_scale)
+            batch_size_scale=batch_size_scale,
+            step_timer=step_timer)
 
         err_val = validate1(
             accuracy_metric=acc_metric_val,
@@ -567,12 +588,14 @@ def main():
         dataset_name=args.dataset,
         dataset_dir=args.data_dir,
         batch_size=batch_size,
-        num_workers=args.num_workers)
+        num_workers=args.num_workers,
+        data_cache_dir=args.data_cache_dir)
     val_data = get_val_data_source(
         dataset_name=args.dataset,
         dataset_dir=args.data_dir,
         batch_size=batch_size,
-        num_workers=args.num_workers)
+        num_workers=args.num_workers,
+        data_cache_dir=args.data_cache_dir)
 
     trainer, lr_scheduler = prepare_trainer(
         net=net,
@@ -621,6 +644,12 @@ def main():
     else:
         lp_saver = None
 
+    # Asynchronous computations are awaited for each phase:
+    step_timer = StepTimer(
+        enabled=args.step_timing,
+        file_path=(os.path.join(args.save_dir, 'step_timing.jsonl') if args.save_dir else None),
+        sync_fn=mx.nd.waitall)
+
     train_net(
         batch_size=batch_size,
         num_epochs=args.num_epochs,
@@ -640,7 +669,8 @@ def main():
         num_classes=num_classes,
         grad_clip_value=args.grad_clip,
         batch_size_scale=args.batch_size_scale,
-        ctx=ctx)
+        ctx=ctx,
+        step_timer=step_timer)
 
 
 if __name__ == '__main__':
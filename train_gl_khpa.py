@@ -4,6 +4,7 @@ import logging
 import os
 import numpy as np
 import random
+import itertools
 
 import mxnet as mx
 from mxnet import gluon
@@ -11,6 +12,8 @@ from mxnet import autograd as ag
 
 from common.logger_utils import initialize_logging
 from common.train_log_param_saver import TrainLogParamSaver
+from common.async_validation import add_async_validation_parser_arguments, AsyncValidator
+from common.step_timer import add_step_timing_parser_arguments, StepTimer
 from gluon.lr_scheduler import LRScheduler
 from gluon.utils import prepare_mx_context, prepare_model
 
@@ -27,6 +30,8 @@ def parse_args():
         formatter_class=argparse.ArgumentDefaultsHelpFormatter)
 
     add_dataset_parser_arguments(parser)
+    add_async_validation_parser_arguments(parser)
+    add_step_timing_parser_arguments(parser)
 
     parser.add_argument(
         '--model',
@@ -345,10 +350,16 @@ def train_epoch(epoch,
                 batch_size,
                 log_interval,
                 grad_clip_value,
-                batch_size_scale):
+                batch_size_scale,
+                step_timer=None):
+
+    if step_timer is None:
+        step_timer = StepTimer(enabled=False)
 
     batch_size_extend_count = 0
     tic = time.time()
+    # Resetting of a record iterator counts as data waiting of the first iteration:
+    step_timer.start_epoch(epoch + 1)
     if data_source_needs_reset:
         train_data.reset()
     metric_calc.reset()
@@ -356,15 +367,19 @@ def train_epoch(epoch,
 
     btic = time.time()
     for i, batch in enumerate(train_data):
+        step_timer.mark("data")
         data_list, labels_list = batch_fn(batch, ctx)
+        step_timer.mark("transfer")
         onehot_labels_list = [Y.one_hot(depth=2) for Y in labels_list]
 
         with ag.record():
             onehot_outputs_list = [net(X.astype(dtype, copy=False)).reshape(0, -1, 2) for X in data_list]
             loss_list = [loss_func(yhat, y.astype(dtype, copy=False)) for yhat, y in
                          zip(onehot_outputs_list, onehot_labels_list)]
+        step_timer.mark("forward")
         for loss in loss_list:
             loss.backward()
+        step_timer.mark("backward")
         lr_scheduler.update(i, epoch)
 
         if grad_clip_value is not None:
@@ -381,6 +396,7 @@ def train_epoch(epoch,
                     p.zero_grad()
             else:
                 batch_size_extend_count += 1
+        step_timer.mark("step")
 
         train_loss += sum([loss.mean().asscalar() for loss in loss_list]) / len(loss_list)
 
@@ -389,6 +405,8 @@ def train_epoch(epoch,
         metric_calc.update(
             labels=labels_list_,
             preds=onehot_outputs_list_)
+        step_timer.mark("metrics")
+        step_timer.end_iteration()
 
         if log_interval and not (i + 1) % log_interval:
             speed = batch_size * log_interval / (time.time() - btic)
@@ -396,6 +414,7 @@ def train_epoch(epoch,
             metric_name, metric_value = metric_calc.get()
             logging.info('Epoch[{}] Batch [{}]\tSpeed: {:.2f} samples/sec\t{}={:.4f}\tlr={:.5f}'.format(
                 epoch + 1, i, speed, metric_name, metric_value, trainer.learning_rate))
+            step_timer.end_interval(batch=i)
 
     if (batch_size_scale != 1) and (batch_size_extend_count > 0):
         trainer.step(batch_size * batch_size_extend_count)
@@ -405,6 +424,7 @@ def train_epoch(epoch,
     throughput = int(batch_size * (i + 1) / (time.time() - tic))
     logging.info('[Epoch {}] speed: {:.2f} samples/sec\ttime cost: {:.2f} sec'.format(
         epoch + 1, throughput, time.time() - tic))
+    step_timer.end_epoch()
 
     train_loss /= (i + 1)
     metric_name, metric_value = metric_calc.get()
@@ -429,7 +449,10 @@ def train_net(batch_size,
               log_interval,
               grad_clip_value,
               batch_size_scale,
-              ctx):
+              ctx,
+              async_validator=None,
+              val_num_batches=None,
+              step_timer=None):
 
     if batch_size_scale != 1:
         for p in net.collect_params().values():
@@ -475,30 +498,54 @@ def train_net(batch_size,
             batch_size=batch_size,
             log_interval=log_interval,
             grad_clip_value=grad_clip_value,
-            batch_size_scale=batch_size_scale)
-
-        val_metric_name, val_metric_value = validate(
-            metric_calc=val_metric_calc,
-            net=net,
-            val_data=val_data,
-            batch_fn=batch_fn,
-            data_source_needs_reset=data_source_needs_reset,
-            dtype=dtype,
-            ctx=ctx)
-
-        logging.info('[Epoch {}] validation: {}={:.4f}'.format(
-            epoch + 1, val_metric_name, val_metric_value))
+            batch_size_scale=batch_size_scale,
+            step_timer=step_timer)
+
+        if val_num_batches is None:
+            val_metric_name, val_metric_value = validate(
+                metric_calc=val_metric_calc,
+                net=net,
+                val_data=val_data,
+                batch_fn=batch_fn,
+                data_source_needs_reset=data_source_needs_reset,
+                dtype=dtype,
+                ctx=ctx)
+
+            logging.info('[Epoch {}] validation: {}={:.4f}'.format(
+                epoch + 1, val_metric_name, val_metric_value))
+        elif val_num_batches > 0:
+            if data_source_needs_reset:
+                val_data.reset()
+            val_metric_name, val_subset_metric_value = validate(
+                metric_calc=val_metric_calc,
+                net=net,
+                val_data=itertools.islice(val_data, val_num_batches),
+                batch_fn=batch_fn,
+                data_source_needs_reset=False,
+                dtype=dtype,
+                ctx=ctx)
+            logging.info('[Epoch {}] validation on {} batches: {}={:.4f}'.format(
+                epoch + 1, val_num_batches, val_metric_name, val_subset_metric_value))
 
         if lp_saver is not None:
             lp_saver_kwargs = {'net': net, 'trainer': trainer}
-            val_metric_value_dec = -val_metric_value
             train_metric_value_dec = -train_metric_value
-            lp_saver.epoch_test_end_callback(
-                epoch1=(epoch + 1),
-                params=[val_metric_value_dec, train_metric_value_dec, train_loss, trainer.learning_rate],
-                **lp_saver_kwargs)
+            if async_validator is not None:
+                async_validator.submit(
+                    epoch1=(epoch + 1),
+                    params=[None, train_metric_value_dec, train_loss, trainer.learning_rate],
+                    **lp_saver_kwargs)
+                async_validator.collect()
+            else:
+                val_metric_value_dec = -val_metric_value
+                lp_saver.epoch_test_end_callback(
+                    epoch1=(epoch + 1),
+                    params=[val_metric_value_dec, train_metric_value_dec, train_loss, trainer.learning_rate],
+                    **lp_saver_kwargs)
 
     logging.info('Total time cost: {:.2f} sec'.format(time.time() - gtic))
+    if async_validator is not None:
+        async_validator.finish()
     if lp_saver is not None:
         logging.info('Best err-top5: {:.4f} at {} epoch'.format(
             lp_saver.best_eval_metric_value, lp_saver.best_eval_metric_epoch))
@@ -597,6 +644,23 @@ def main():
     else:
         lp_saver = None
 
+    # Asynchronous computations are awaited for each phase:
+    step_timer = StepTimer(
+        enabled=args.step_timing,
+        file_path=(os.path.join(args.save_dir, 'step_timing.jsonl') if args.save_dir else None),
+        sync_fn=mx.nd.waitall)
+
+    if args.val_queue_dir:
+        assert (lp_saver is not None), "Asynchronous validation requires checkpoint saving (--save-dir)"
+        async_validator = AsyncValidator(
+            queue_dir_path=args.val_queue_dir,
+            lp_saver=lp_saver,
+            checkpoint_file_name_prefix='imagenet_{}'.format(args.model),
+            val_param_indices=[0],
+            stale_timeout=args.val_queue_stale_timeout)
+    else:
+        async_validator = None
+
     train_net(
         batch_size=batch_size,
         num_epochs=args.num_epochs,
@@ -613,7 +677,10 @@ def main():
         log_interval=args.log_interval,
         grad_clip_value=args.grad_clip,
         batch_size_scale=args.batch_size_scale,
-        ctx=ctx)
+        ctx=ctx,
+        async_validator=async_validator,
+        val_num_batches=(args.val_subset_batches if args.val_queue_dir else None),
+        step_timer=step_timer)
 
 
 if __name__ == '__main__':
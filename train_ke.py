@@ -13,7 +13,7 @@ import mxnet as mx
 
 from common.logger_utils import initialize_logging
 # from common.train_log_param_saver import TrainLogParamSaver
-from keras_.utils import prepare_ke_context, prepare_model, get_data_rec, get_data_generator, backend_agnostic_compile
+from keras_.utils import prepare_ke_context, prepare_model, get_data_rec_sequences, backend_agnostic_compile
 
 
 def parse_args():
@@ -89,6 +89,16 @@ def parse_args():
         default=4,
         type=int,
         help='number of preprocessing workers')
+    parser.add_argument(
+        '--num-readers',
+        type=int,
+        default=4,
+        help='number of parallel reader threads (each reads its own part of .rec file)')
+    parser.add_argument(
+        '--prefetch-batches',
+        type=int,
+        default=8,
+        help='number of prefetched batches')
 
     parser.add_argument(
         '--batch-size',
@@ -199,9 +209,9 @@ def prepare_trainer(net,
 
     backend_agnostic_compile(
         model=net,
-        loss='categorical_crossentropy',
+        loss='sparse_categorical_crossentropy',
         optimizer=optimizer,
-        metrics=[keras.metrics.categorical_accuracy, keras.metrics.top_k_categorical_accuracy],
+        metrics=[keras.metrics.sparse_categorical_accuracy, keras.metrics.sparse_top_k_categorical_accuracy],
         num_gpus=num_gpus)
 
     if (state_file_path is not None) and state_file_path and os.path.exists(state_file_path):
@@ -216,10 +226,10 @@ def prepare_trainer(net,
 
 
 def train_net(net,
-              train_gen,
-              val_gen,
-              train_num_examples,
-              val_num_examples,
+              train_seq,
+              val_seq,
+              num_workers,
+              max_queue_size,
               num_epochs,
               checkpoint_filepath,
               start_epoch1):
@@ -231,20 +241,24 @@ def train_net(net,
 
     tic = time.time()
 
-    net.fit_generator(
-        generator=train_gen,
-        samples_per_epoch=train_num_examples,
-        epochs=num_epochs,
-        verbose=True,
-        callbacks=[checkpointer],
-        validation_data=val_gen,
-        validation_steps=val_num_examples,
-        class_weight=None,
-        max_queue_size=10,
-        workers=1,
-        use_multiprocessing=False,
-        shuffle=True,
-        initial_epoch=(start_epoch1 - 1))
+    try:
+        net.fit_generator(
+            generator=train_seq,
+            steps_per_epoch=len(train_seq),
+            epochs=num_epochs,
+            verbose=True,
+            callbacks=[checkpointer],
+            validation_data=val_seq,
+            validation_steps=len(val_seq),
+            class_weight=None,
+            max_queue_size=max_queue_size,
+            workers=num_workers,
+            use_multiprocessing=False,
+            shuffle=False,
+            initial_epoch=(start_epoch1 - 1))
+    finally:
+        train_seq.close()
+        val_seq.close()
 
     logging.info('Time cost: {:.4f} sec'.format(
         time.time() - tic))
@@ -269,24 +283,21 @@ def main():
         model_name=args.model,
         use_pretrained=args.use_pretrained,
         pretrained_model_file_path=args.resume.strip())
-    num_classes = net.classes if hasattr(net, 'classes') else 1000
     input_image_size = net.in_size if hasattr(net, 'in_size') else (args.input_size, args.input_size)
 
-    train_data, val_data = get_data_rec(
+    train_seq, val_seq = get_data_rec_sequences(
         rec_train=args.rec_train,
         rec_train_idx=args.rec_train_idx,
         rec_val=args.rec_val,
         rec_val_idx=args.rec_val_idx,
         batch_size=batch_size,
         num_workers=args.num_workers,
+        num_readers=args.num_readers,
+        prefetch_batches=args.prefetch_batches,
+        train_num_examples=1281167,
+        val_num_examples=50000,
         input_image_size=input_image_size,
         resize_inv_factor=args.resize_inv_factor)
-    train_gen = get_data_generator(
-        data_iterator=train_data,
-        num_classes=num_classes)
-    val_gen = get_data_generator(
-        data_iterator=val_data,
-        num_classes=num_classes)
 
     net = prepare_trainer(
         net=net,
@@ -321,10 +332,11 @@ def main():
 
     train_net(
         net=net,
-        train_gen=train_gen,
-        val_gen=val_gen,
-        train_num_examples=1281167,
-        val_num_examples=50048,
+        train_seq=train_seq,
+        val_seq=val_seq,
+        # Batches are served sequentially, the data is read in parallel by reader threads of the sequence:
+        num_workers=1,
+        max_queue_size=args.prefetch_batches,
         num_epochs=args.num_epochs,
         checkpoint_filepath=os.path.join(args.save_dir, 'imagenet_{}.h5'.format(args.model)),
         start_epoch1=args.start_epoch)
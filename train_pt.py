@@ -4,6 +4,7 @@ import logging
 import os
 import warnings
 import random
+import itertools
 import numpy as np
 
 import torch.nn as nn
@@ -12,8 +13,17 @@ import torch.utils.data
 
 from common.logger_utils import initialize_logging
 from common.train_log_param_saver import TrainLogParamSaver
+from common.teacher_cache import add_teacher_parser_arguments
+from common.resize_schedule import add_resize_schedule_parser_arguments, parse_resize_schedule, ScheduledTrainData
+from common.async_validation import add_async_validation_parser_arguments, AsyncValidator
+from common.step_timer import add_step_timing_parser_arguments, StepTimer
+from common.iter_checkpoint import add_iter_checkpoint_parser_arguments, get_host_rng_state, set_host_rng_state,\
+    load_train_position, IterCheckpointSaver
 from pytorch.imagenet1k import add_dataset_parser_arguments, get_train_data_loader, get_val_data_loader
-from pytorch.utils import prepare_pt_context, prepare_model, validate, accuracy, AverageMeter
+from pytorch.utils import prepare_pt_context, prepare_model, calc_net_weight_count, validate, accuracy,\
+    AverageMeter, copy_to_cpu
+from pytorch.prune_channels import prune_channels, save_channel_spec
+from pytorch.distillation import prepare_teacher_caches, distillation_loss
 
 
 def parse_args():
@@ -22,6 +32,11 @@ def parse_args():
         formatter_class=argparse.ArgumentDefaultsHelpFormatter)
 
     add_dataset_parser_arguments(parser)
+    add_teacher_parser_arguments(parser)
+    add_resize_schedule_parser_arguments(parser)
+    add_async_validation_parser_arguments(parser)
+    add_step_timing_parser_arguments(parser)
+    add_iter_checkpoint_parser_arguments(parser)
 
     parser.add_argument(
         '--model',
@@ -42,6 +57,26 @@ def parse_args():
         type=str,
         default='',
         help='resume from previously saved optimizer state if not None')
+    parser.add_argument(
+        '--channel-spec',
+        type=str,
+        default='',
+        help='channel specification file of a pruned model (for resuming its fine-tuning)')
+    parser.add_argument(
+        '--prune-ratio',
+        type=float,
+        default=0.0,
+        help='fraction of channels to prune in each channel group before training (0 to disable).')
+    parser.add_argument(
+        '--prune-criterion',
+        type=str,
+        default='bn',
+        help='channel importance criterion for pruning. options are bn (BatchNorm gamma) and l1 (next layer weights).')
+    parser.add_argument(
+        '--dense-buffer',
+        action='store_true',
+        help='use a preallocated output buffer in dense blocks (DenseNet-style models). it saves about 25%% of '
+             'activation memory, but slows down training (e.g. by 20-30%% on CPU), so it is for memory-bound runs.')
 
     parser.add_argument(
         '--num-gpus',
@@ -138,6 +173,11 @@ def parse_args():
         type=int,
         default=4,
         help='saving parameters epoch interval, best model will always be saved')
+    parser.add_argument(
+        '--max-pending-saves',
+        type=int,
+        default=1,
+        help='maximal number of checkpoints being written in background (0 means saving on the training thread)')
     parser.add_argument(
         '--save-dir',
         type=str,
@@ -184,6 +224,22 @@ def init_rand(seed):
     return seed
 
 
+def get_rng_state(use_cuda):
+    state = get_host_rng_state()
+    state['torch'] = torch.get_rng_state()
+    if use_cuda:
+        state['cuda'] = torch.cuda.get_rng_state_all()
+    return state
+
+
+def set_rng_state(state,
+                  use_cuda):
+    set_host_rng_state(state)
+    torch.set_rng_state(state['torch'])
+    if use_cuda and ('cuda' in state):
+        torch.cuda.set_rng_state_all(state['cuda'])
+
+
 def prepare_trainer(net,
                     optimizer_name,
                     wd,
@@ -252,6 +308,10 @@ def prepare_trainer(net,
     return optimizer, lr_scheduler, start_epoch
 
 
+def snapshot_params(state):
+    return {'state': copy_to_cpu(state)}
+
+
 def save_params(file_stem,
                 state):
     torch.save(
@@ -271,27 +331,105 @@ def train_epoch(epoch,
                 optimizer,
                 # lr_scheduler,
                 batch_size,
-                log_interval):
+                log_interval,
+                teacher_caches=None,
+                kd_temperature=1.0,
+                kd_alpha=0.9,
+                step_timer=None,
+                lr_scheduler=None,
+                iter_saver=None,
+                train_position=None):
+
+    if step_timer is None:
+        step_timer = StepTimer(enabled=False)
 
     tic = time.time()
     net.train()
     acc_top1.reset()
     train_loss = 0.0
 
+    teacher_cache = None
+    if teacher_caches:
+        # The loader yields crops of the augmentation view, for which the teacher logits were cached:
+        train_data.sampler.view = epoch % len(teacher_caches)
+        teacher_cache = teacher_caches[train_data.sampler.view]
+
+    start_batch = 0
+    sampler = getattr(train_data, 'resumable_sampler', None)
+    assert (sampler is not None) or ((iter_saver is None) and (train_position is None)),\
+        "Mid-epoch checkpoints require a resumable sampler"
+    if train_position is not None:
+        start_batch = train_position['batch']
+        train_loss = train_position['train_loss']
+        if train_position['num_samples'] > 0:
+            acc_top1.update(torch.tensor([train_position['acc_top1']]), train_position['num_samples'])
+        sampler.seed = train_position['sampler_seed']
+        logging.info('Resume training from [Epoch {}] Batch [{}]'.format(epoch + 1, start_batch))
+    if sampler is not None:
+        # Processed samples of the epoch permutation are skipped without reading:
+        sampler.set_epoch(epoch, start_index=(start_batch * batch_size))
+
+    i = start_batch - 1
     btic = time.time()
-    for i, (data, target) in enumerate(train_data):
+    step_timer.start_epoch(epoch + 1)
+    train_iter = iter(train_data)
+    if train_position is not None:
+        # The iterator creation takes a seed for data loader workers from the generator, so the state is restored after
+        # it (for a single-process loader the training continues exactly):
+        set_rng_state(train_position['rng'], use_cuda)
+    for i, batch in enumerate(train_iter, start_batch):
+        step_timer.mark("data")
+        data, target = batch[0], batch[1]
         if use_cuda:
             data = data.cuda(non_blocking=True)
             target = target.cuda(non_blocking=True)
+        step_timer.mark("transfer")
         output = net(data)
-        loss = L(output, target)
+        if teacher_cache is not None:
+            soft_targets = torch.from_numpy(teacher_cache.get_soft_targets(
+                indices=batch[2].numpy(),
+                num_classes=output.size(1),
+                temperature=kd_temperature))
+            if use_cuda:
+                soft_targets = soft_targets.cuda(non_blocking=True)
+            loss = distillation_loss(
+                output=output,
+                target=target,
+                soft_targets=soft_targets,
+                temperature=kd_temperature,
+                alpha=kd_alpha)
+        else:
+            loss = L(output, target)
+        step_timer.mark("forward")
         optimizer.zero_grad()
         loss.backward()
+        step_timer.mark("backward")
         optimizer.step()
+        step_timer.mark("step")
 
         train_loss += loss.item()
         prec1 = accuracy(output, target, topk=(1, ))
         acc_top1.update(prec1[0], data.size(0))
+        step_timer.mark("metrics")
+        step_timer.end_iteration()
+
+        if (iter_saver is not None) and iter_saver.need_save(i + 1):
+            iter_saver.save(
+                epoch1=(epoch + 1),
+                batch=(i + 1),
+                position={
+                    'lr_scheduler': lr_scheduler.state_dict(),
+                    'sampler_seed': sampler.seed,
+                    'rng': get_rng_state(use_cuda),
+                    'train_loss': train_loss,
+                    'acc_top1': acc_top1.avg.item(),
+                    'num_samples': acc_top1.count,
+                },
+                state={
+                    'epoch': epoch,
+                    'state_dict': net.state_dict(),
+                    'optimizer': optimizer.state_dict(),
+                })
 
         if log_interval and not (i + 1) % log_interval:
             top1 = acc_top1.avg.item()
@@ -300,16 +438,18 @@ def train_epoch(epoch,
             logging.info('Epoch[{}] Batch [{}]\tSpeed: {:.2f} samples/sec\ttop1-err={:.4f}\tlr={:.4f}'.format(
                 epoch + 1, i, speed, err_top1_train, optimizer.param_groups[0]['lr']))
             btic = time.time()
+            step_timer.end_interval(batch=i)
 
     top1 = acc_top1.avg.item()
     err_top1_train = 1.0 - top1
     train_loss /= (i + 1)
-    throughput = int(batch_size * (i + 1) / (time.time() - tic))
+    throughput = int(batch_size * (i + 1 - start_batch) / (time.time() - tic))
 
     logging.info('[Epoch {}] training: err-top1={:.4f}\tloss={:.4f}'.format(
         epoch + 1, err_top1_train, train_loss))
     logging.info('[Epoch {}] speed: {:.2f} samples/sec\ttime cost: {:.2f} sec'.format(
         epoch + 1, throughput, time.time() - tic))
+    step_timer.end_epoch()
 
     return err_top1_train, train_loss
 
@@ -324,7 +464,16 @@ def train_net(batch_size,
               lr_scheduler,
               lp_saver,
               log_interval,
-              use_cuda):
+              use_cuda,
+              teacher_caches=None,
+              kd_temperature=1.0,
+              kd_alpha=0.9,
+              train_data_scheduler=None,
+              async_validator=None,
+              val_num_batches=None,
+              step_timer=None,
+              iter_saver=None,
+              train_position=None):
     acc_top1 = AverageMeter()
     acc_top5 = AverageMeter()
 
@@ -336,6 +485,7 @@ def train_net(batch_size,
     assert (start_epoch1 >= 1)
     if start_epoch1 > 1:
         logging.info('Start training from [Epoch {}]'.format(start_epoch1))
+    if (start_epoch1 > 1) and (train_position is None):
         err_top1_val, err_top5_val = validate(
             acc_top1=acc_top1,
             acc_top5=acc_top5,
@@ -350,7 +500,17 @@ def train_net(batch_size,
 
     gtic = time.time()
     for epoch in range(start_epoch1 - 1, num_epochs):
-        lr_scheduler.step()
+        epoch_train_position = train_position if (epoch == start_epoch1 - 1) else None
+        if epoch_train_position is not None:
+            # The scheduler was stepped for the interrupted epoch:
+            lr_scheduler.load_state_dict(epoch_train_position['lr_scheduler'])
+        else:
+            lr_scheduler.step()
+
+        if train_data_scheduler is not None:
+            train_data, epoch_batch_size = train_data_scheduler.get(epoch)
+        else:
+            epoch_batch_size = batch_size
 
         err_top1_train, train_loss = train_epoch(
             epoch,
@@ -361,18 +521,35 @@ def train_net(batch_size,
             L,
             optimizer,
             # lr_scheduler,
-            batch_size,
-            log_interval)
-
-        err_top1_val, err_top5_val = validate(
-            acc_top1=acc_top1,
-            acc_top5=acc_top5,
-            net=net,
-            val_data=val_data,
-            use_cuda=use_cuda)
-
-        logging.info('[Epoch {}] validation: err-top1={:.4f}\terr-top5={:.4f}'.format(
-            epoch + 1, err_top1_val, err_top5_val))
+            epoch_batch_size,
+            log_interval,
+            teacher_caches=teacher_caches,
+            kd_temperature=kd_temperature,
+            kd_alpha=kd_alpha,
+            step_timer=step_timer,
+            lr_scheduler=lr_scheduler,
+            iter_saver=iter_saver,
+            train_position=epoch_train_position)
+
+        if val_num_batches is None:
+            err_top1_val, err_top5_val = validate(
+                acc_top1=acc_top1,
+                acc_top5=acc_top5,
+                net=net,
+                val_data=val_data,
+                use_cuda=use_cuda)
+
+            logging.info('[Epoch {}] validation: err-top1={:.4f}\terr-top5={:.4f}'.format(
+                epoch + 1, err_top1_val, err_top5_val))
+        elif val_num_batches > 0:
+            err_top1_subset, err_top5_subset = validate(
+                acc_top1=acc_top1,
+                acc_top5=acc_top5,
+                net=net,
+                val_data=itertools.islice(val_data, val_num_batches),
+                use_cuda=use_cuda)
+            logging.info('[Epoch {}] validation on {} batches: err-top1={:.4f}\terr-top5={:.4f}'.format(
+                epoch + 1, val_num_batches, err_top1_subset, err_top5_subset))
 
         if lp_saver is not None:
             state = {
@@ -381,13 +558,25 @@ def train_net(batch_size,
                 'optimizer': optimizer.state_dict(),
             }
             lp_saver_kwargs = {'state': state}
-            lp_saver.epoch_test_end_callback(
-                epoch1=(epoch + 1),
-                params=[err_top1_val, err_top1_train, err_top5_val, train_loss],
-                **lp_saver_kwargs)
+            if async_validator is not None:
+                async_validator.submit(
+                    epoch1=(epoch + 1),
+                    params=[None, err_top1_train, None, train_loss],
+                    **lp_saver_kwargs)
+                async_validator.collect()
+            else:
+                lp_saver.epoch_test_end_callback(
+                    epoch1=(epoch + 1),
+                    params=[err_top1_val, err_top1_train, err_top5_val, train_loss],
+                    **lp_saver_kwargs)
+            if iter_saver is not None:
+                iter_saver.end_epoch(epoch + 1)
 
     logging.info('Total time cost: {:.2f} sec'.format(time.time() - gtic))
+    if async_validator is not None:
+        async_validator.finish()
     if lp_saver is not None:
+        lp_saver.flush()
         logging.info('Best err-top5: {:.4f} at {} epoch'.format(
             lp_saver.best_eval_metric_value, lp_saver.best_eval_metric_epoch))
 
@@ -411,17 +600,67 @@ def main():
         model_name=args.model,
         use_pretrained=args.use_pretrained,
         pretrained_model_file_path=args.resume.strip(),
-        use_cuda=use_cuda)
+        use_cuda=use_cuda,
+        channel_spec_file_path=args.channel_spec.strip(),
+        use_dense_buffer=args.dense_buffer)
+    if args.prune_ratio > 0.0:
+        net_ = net.module if hasattr(net, 'module') else net
+        weight_count = calc_net_weight_count(net_)
+        channel_spec = prune_channels(
+            net=net_,
+            ratio=args.prune_ratio,
+            criterion=args.prune_criterion)
+        logging.info('Pruned model parameter count: {} -> {}'.format(weight_count, calc_net_weight_count(net_)))
+        if args.save_dir:
+            save_channel_spec(
+                channel_spec=channel_spec,
+                file_path=os.path.join(args.save_dir, 'imagenet_{}_channels.json'.format(args.model)))
     if hasattr(net, 'module'):
         input_image_size = net.module.in_size[0] if hasattr(net.module, 'in_size') else args.input_size
     else:
         input_image_size = net.in_size[0] if hasattr(net, 'in_size') else args.input_size
 
-    train_data = get_train_data_loader(
-        data_dir=args.data_dir,
-        batch_size=batch_size,
-        num_workers=args.num_workers,
-        input_image_size=input_image_size)
+    resize_schedule = parse_resize_schedule(args.resize_schedule)
+    if resize_schedule:
+        assert (not args.teacher), "Teacher logits are cached for crops of the model input size"
+        train_data = None
+        train_data_scheduler = ScheduledTrainData(
+            schedule=resize_schedule,
+            base_size=input_image_size,
+            batch_size=batch_size,
+            create_fn=(lambda size, epoch_batch_size: get_train_data_loader(
+                data_dir=args.data_dir,
+                batch_size=epoch_batch_size,
+                num_workers=args.num_workers,
+                input_image_size=size,
+                seed=args.seed)),
+            scale_batch=args.resize_scale_batch,
+            batch_size_divisor=max(1, args.num_gpus))
+    else:
+        train_data = get_train_data_loader(
+            data_dir=args.data_dir,
+            batch_size=batch_size,
+            num_workers=args.num_workers,
+            input_image_size=input_image_size,
+            seed=args.seed,
+            aug_seed=(args.aug_seed if args.teacher else None))
+        train_data_scheduler = None
+
+    if args.teacher:
+        teacher_cache_dir = args.teacher_cache_dir if args.teacher_cache_dir else args.save_dir
+        assert teacher_cache_dir, "Teacher cache directory isn't specified"
+        teacher_caches = prepare_teacher_caches(
+            teacher_name=args.teacher,
+            dataset=train_data.dataset,
+            cache_dir_path=teacher_cache_dir,
+            num_views=args.teacher_num_views,
+            input_image_size=input_image_size,
+            top_k=args.teacher_topk,
+            batch_size=batch_size,
+            num_workers=args.num_workers,
+            use_cuda=use_cuda)
+    else:
+        teacher_caches = None
 
     val_data = get_val_data_loader(
         data_dir=args.data_dir,
@@ -449,6 +688,13 @@ def main():
     # if start_epoch is not None:
     #     args.start_epoch = start_epoch
 
+    if args.resume_iter:
+        assert (args.resume and args.resume_state), "Mid-epoch resuming requires --resume and --resume-state"
+        train_position = load_train_position(args.resume_iter)
+        args.start_epoch = train_position['epoch1']
+    else:
+        train_position = None
+
     if args.save_dir and args.save_interval:
         lp_saver = TrainLogParamSaver(
             checkpoint_file_name_prefix='imagenet_{}'.format(args.model),
@@ -459,6 +705,8 @@ def main():
             last_checkpoint_file_count=2,
             best_checkpoint_file_count=2,
             checkpoint_file_save_callback=save_params,
+            checkpoint_file_snapshot_callback=snapshot_params,
+            max_pending_saves=args.max_pending_saves,
             checkpoint_file_exts=('.pth', '.states'),
             save_interval=args.save_interval,
             num_epochs=args.num_epochs,
@@ -472,6 +720,32 @@ def main():
     else:
         lp_saver = None
 
+    if args.val_queue_dir:
+        assert (lp_saver is not None), "Asynchronous validation requires checkpoint saving (--save-dir)"
+        async_validator = AsyncValidator(
+            queue_dir_path=args.val_queue_dir,
+            lp_saver=lp_saver,
+            checkpoint_file_name_prefix='imagenet_{}'.format(args.model),
+            val_param_indices=[0, 2],
+            stale_timeout=args.val_queue_stale_timeout)
+    else:
+        async_validator = None
+
+    if args.checkpoint_iters > 0:
+        assert (lp_saver is not None), "Mid-epoch checkpoints require checkpoint saving (--save-dir)"
+        iter_saver = IterCheckpointSaver(
+            lp_saver=lp_saver,
+            file_path_prefix=os.path.join(args.save_dir, 'imagenet_{}_iter'.format(args.model)),
+            interval=args.checkpoint_iters,
+            last_file_stem=(os.path.splitext(args.resume_iter)[0] if args.resume_iter else None))
+    else:
+        iter_saver = None
+
+    step_timer = StepTimer(
+        enabled=args.step_timing,
+        file_path=(os.path.join(args.save_dir, 'step_timing.jsonl') if args.save_dir else None),
+        sync_fn=(torch.cuda.synchronize if use_cuda else None))
+
     train_net(
         batch_size=batch_size,
         num_epochs=args.num_epochs,
@@ -483,7 +757,16 @@ def main():
         lr_scheduler=lr_scheduler,
         lp_saver=lp_saver,
         log_interval=args.log_interval,
-        use_cuda=use_cuda)
+        use_cuda=use_cuda,
+        teacher_caches=teacher_caches,
+        kd_temperature=args.kd_temperature,
+        kd_alpha=args.kd_alpha,
+        train_data_scheduler=train_data_scheduler,
+        async_validator=async_validator,
+        val_num_batches=(args.val_subset_batches if args.val_queue_dir else None),
+        step_timer=step_timer,
+        iter_saver=iter_saver,
+        train_position=train_position)
 
 
 if __name__ == '__main__':
@@ -12,6 +12,8 @@ import torch.utils.data
 
 from common.logger_utils import initialize_logging
 from common.train_log_param_saver import TrainLogParamSaver
+from common.cifar_cache import add_cifar_cache_parser_arguments
+from common.step_timer import add_step_timing_parser_arguments, StepTimer
 from pytorch.cifar import add_dataset_parser_arguments, get_train_data_loader, get_val_data_loader
 from pytorch.utils import prepare_pt_context, prepare_model, validate1, accuracy, AverageMeter
 
@@ -29,6 +31,8 @@ def parse_args():
 
     args, _ = parser.parse_known_args()
     add_dataset_parser_arguments(parser, args.dataset)
+    add_cifar_cache_parser_arguments(parser)
+    add_step_timing_parser_arguments(parser)
 
     parser.add_argument(
         '--model',
@@ -278,7 +282,11 @@ def train_epoch(epoch,
                 optimizer,
                 # lr_scheduler,
                 batch_size,
-                log_interval):
+                log_interval,
+                step_timer=None):
+
+    if step_timer is None:
+        step_timer = StepTimer(enabled=False)
 
     tic = time.time()
     net.train()
@@ -286,19 +294,27 @@ def train_epoch(epoch,
     train_loss = 0.0
 
     btic = time.time()
+    step_timer.start_epoch(epoch + 1)
     for i, (data, target) in enumerate(train_data):
+        step_timer.mark("data")
         if use_cuda:
             data = data.cuda(non_blocking=True)
             target = target.cuda(non_blocking=True)
+        step_timer.mark("transfer")
         output = net(data)
         loss = L(output, target)
+        step_timer.mark("forward")
         optimizer.zero_grad()
         loss.backward()
+        step_timer.mark("backward")
         optimizer.step()
+        step_timer.mark("step")
 
         train_loss += loss.item()
         acc_train_value = accuracy(output, target, topk=(1, ))
         acc_metric_train.update(acc_train_value[0], data.size(0))
+        step_timer.mark("metrics")
+        step_timer.end_iteration()
 
         if log_interval and not (i + 1) % log_interval:
             acc_train_value = acc_metric_train.avg.item()
@@ -307,6 +323,7 @@ def train_epoch(epoch,
             logging.info('Epoch[{}] Batch [{}]\tSpeed: {:.2f} samples/sec\terr={:.4f}\tlr={:.4f}'.format(
                 epoch + 1, i, speed, err_train_value, optimizer.param_groups[0]['lr']))
             btic = time.time()
+            step_timer.end_interval(batch=i)
 
     acc_train_value = acc_metric_train.avg.item()
     err_train_value = 1.0 - acc_train_value
@@ -317,6 +334,7 @@ def train_epoch(epoch,
         epoch + 1, err_train_value, train_loss))
     logging.info('[Epoch {}] speed: {:.2f} samples/sec\ttime cost: {:.2f} sec'.format(
         epoch + 1, throughput, time.time() - tic))
+    step_timer.end_epoch()
 
     return err_train_value, train_loss
 
@@ -331,7 +349,8 @@ def train_net(batch_size,
               lr_scheduler,
               lp_saver,
               log_interval,
-              use_cuda):
+              use_cuda,
+              step_timer=None):
     acc_metric_val = AverageMeter()
     acc_metric_train = AverageMeter()
 
@@ -365,7 +384,8 @@ def train_net(batch_size,
             optimizer,
             # lr_scheduler,
             batch_size,
-            log_interval)
+            log_interval,
+            step_timer=step_timer)
 
         err_val = validate1(
             accuracy_metric=acc_metric_val,
@@ -419,13 +439,15 @@ def main():
         dataset_name=args.dataset,
         dataset_dir=args.data_dir,
         batch_size=batch_size,
-        num_workers=args.num_workers)
+        num_workers=args.num_workers,
+        data_cache_dir=args.data_cache_dir)
 
     val_data = get_val_data_loader(
         dataset_name=args.dataset,
         dataset_dir=args.data_dir,
         batch_size=batch_size,
-        num_workers=args.num_workers)
+        num_workers=args.num_workers,
+        data_cache_dir=args.data_cache_dir)
 
     # num_training_samples = 1281167
     optimizer, lr_scheduler, start_epoch = prepare_trainer(
@@ -469,6 +491,11 @@ def main():
     else:
         lp_saver = None
 
+    step_timer = StepTimer(
+        enabled=args.step_timing,
+        file_path=(os.path.join(args.save_dir, 'step_timing.jsonl') if args.save_dir else None),
+        sync_fn=(torch.cuda.synchronize if use_cuda else None))
+
     train_net(
         batch_size=batch_size,
         num_epochs=args.num_epochs,
@@ -480,7 +507,8 @@ def main():
         lr_scheduler=lr_scheduler,
         lp_saver=lp_saver,
         log_interval=args.log_interval,
-        use_cuda=use_cuda)
+        use_cuda=use_cuda,
+        step_timer=step_timer)
 
 
 if __name__ == '__main__':
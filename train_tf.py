@@ -10,6 +10,7 @@ from tensorpack import ModelSaver, ScheduledHyperParamSetter, EstimatedTimeLeft,
 
 from common.logger_utils import initialize_logging
 from tensorflow_.utils_tp import prepare_tf_context, prepare_model, get_data
+from tensorflow_.imagenet_lmdb import add_data_format_parser_arguments
 
 
 def parse_args():
@@ -21,6 +22,7 @@ def parse_args():
         type=str,
         default='../imgclsmob_data/imagenet',
         help='training and validation pictures to use.')
+    add_data_format_parser_arguments(parser)
 
     parser.add_argument(
         '--model',
@@ -232,13 +234,19 @@ def main():
         batch_size=batch_size,
         data_dir_path=args.data_dir,
         input_image_size=net.image_size,
-        resize_inv_factor=args.resize_inv_factor)
+        resize_inv_factor=args.resize_inv_factor,
+        data_format=args.data_format,
+        lmdb_dir_path=args.lmdb_dir,
+        shuffle_buffer_size=args.shuffle_buffer_size)
     val_dataflow = get_data(
         is_train=False,
         batch_size=batch_size,
         data_dir_path=args.data_dir,
         input_image_size=net.image_size,
-        resize_inv_factor=args.resize_inv_factor)
+        resize_inv_factor=args.resize_inv_factor,
+        data_format=args.data_format,
+        lmdb_dir_path=args.lmdb_dir,
+        shuffle_buffer_size=args.shuffle_buffer_size)
 
     train_net(
         net=net,